@@ -1,4 +1,4 @@
-from flask import Flask, render_template, jsonify, Response, request
+from flask import Flask, render_template, jsonify, Response, request, send_file
 from flask_socketio import SocketIO, emit
 import os
 import sys
@@ -42,12 +42,17 @@ from werkzeug.utils import secure_filename
 import keyboard
 import psutil
 from utils.utils import play_notification_sound
+from utils import interventions
+from utils.supervisor import Supervisor
 
 # Number of scripts to run simultaneously
 MAX_CONCURRENT_SCRIPTS = 4  # Adjust this value to control how many scripts run at once
+SCRIPT_TIMEOUT = 6 * 60 * 60  # Seconds a scraper may run before it is stopped
 
 # Environment Configuration
-PYTHON_PATH = r"C:\Users\AliAmani\Miniconda3\envs\bids\python.exe"  # Path to Python executable
+PYTHON_PATH = (  # Path to Python executable
+    r"C:\Users\AliAmani\Miniconda3\envs\bids\python.exe" if os.name == "nt" else sys.executable
+)
 CONDA_PATH = r"C:\Users\AliAmani\Miniconda3"  # Path to Miniconda installation
 CONDA_ENV = "bids"  # Conda environment name
 CONDA_ENV_PATH = r"C:\Users\AliAmani\Miniconda3\envs\bids"  # Path to Conda environment
@@ -57,7 +62,6 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Add this near other global variables at the top of the file
-running_processes = {}  # Dictionary to keep track of running processes
 auto_started_scripts = set()  # Track scripts that have been automatically started
 
 # Global variables
@@ -76,10 +80,7 @@ UPLOAD_SCRIPT = "upload_bids.py"
 
 # Add script order for automatic chaining
 SCRIPT_ORDER = [
-    "scrapers/01_BuySpeed_01.py",
-    "scrapers/01_BuySpeed_02.py",
-    "scrapers/01_BuySpeed_03.py",
-    "scrapers/01_BuySpeed_04.py",
+    "scrapers/01_BuySpeed.py",
     "scrapers/02_NYC.py",
     "scrapers/03_TXSMartBuy.py",
     "scrapers/05_NYSCR.py",
@@ -89,10 +90,7 @@ SCRIPT_ORDER = [
     "scrapers/09_CGIEVA.py",
     "scrapers/10_BidBuysIllinoise.py",
     "scrapers/11_PlanetBids_Hartford.py",
-    "scrapers/12_Bonfire_FairfaxCounty_1.py",
-    "scrapers/12_Bonfire_FairfaxCounty_2.py",
-    "scrapers/12_Bonfire_FairfaxCounty_3.py",
-    "scrapers/12_Bonfire_FairfaxCounty_4.py",
+    "scrapers/12_Bonfire.py",
     "scrapers/13_eMaryland_eMMA.py",
     "scrapers/14_NorthCarolina_VendorPortal_eVP.py",
     "scrapers/15_State_of_Conneticut_BidBoard.py",
@@ -130,7 +128,6 @@ class ScriptInfo:
         self.end_time = None
         self.progress = 0
         self.log_file = None
-        self.process = None  # Add process tracking
         self.output_buffer = []  # Add output buffer
         self.excel_status = 'Pending'  # Initialize Excel status as Pending
         self.excel_progress = 0   # Add Excel processing progress
@@ -153,8 +150,7 @@ class ScriptInfo:
 
 # Initialize script-related variables
 scripts = [
-    "scrapers/01_BuySpeed_01.py",
-    "scrapers/01_BuySpeed_02.py",
+    "scrapers/01_BuySpeed.py",
     "scrapers/02_NYC.py",
     "scrapers/03_TXSMartBuy.py",
     "scrapers/05_NYSCR.py",
@@ -164,10 +160,7 @@ scripts = [
     "scrapers/09_CGIEVA.py",
     "scrapers/10_BidBuysIllinoise.py",
     "scrapers/11_PlanetBids_Hartford.py",
-    "scrapers/12_Bonfire_FairfaxCounty_1.py",
-    "scrapers/12_Bonfire_FairfaxCounty_2.py",
-    "scrapers/12_Bonfire_FairfaxCounty_3.py",
-    "scrapers/12_Bonfire_FairfaxCounty_4.py",
+    "scrapers/12_Bonfire.py",
     "scrapers/13_eMaryland_eMMA.py",
     "scrapers/14_NorthCarolina_VendorPortal_eVP.py",
     "scrapers/15_State_of_Conneticut_BidBoard.py",
@@ -574,6 +567,41 @@ def match_category(title: str, description: str, category: str, api_categories:
         logger.error(f"Error in category matching: {str(e)}")
         return None, 0.0
 
+def scraper_environment():
+    """Environment the scrapers are started with"""
+    env = os.environ.copy()
+    env["MOZ_HEADLESS"] = "0"  # For Firefox
+    env["HEADLESS"] = "False"  # Generic headless flag
+    # Add GPU acceleration disable flags
+    env["SELENIUM_DISABLE_GPU"] = "1"
+    env["CHROME_DISABLE_GPU"] = "1"
+    env["FIREFOX_DISABLE_GPU"] = "1"
+    # Chrome-specific flags
+    env["CHROME_OPTS"] = "--disable-gpu --no-sandbox --disable-dev-shm-usage"
+    # Firefox-specific flags
+    env["MOZ_DISABLE_GMP_SANDBOX"] = "1"
+    env["MOZ_DISABLE_GPU_SANDBOX"] = "1"
+    env["MOZ_DISABLE_GPU_PROCESS"] = "1"
+    return env
+
+
+def record_script_line(script_name, stream, level, line):
+    """Keep a scraper's latest output for the dashboard"""
+    info = script_infos.get(script_name)
+    if info is not None:
+        info.output_buffer.append(line)
+        del info.output_buffer[:-1000]
+
+
+# Runs the scrapers and streams their output into their logs, see utils/supervisor.py
+supervisor = Supervisor(
+    python=PYTHON_PATH,
+    events_file=os.path.join(os.getcwd(), yesterday, "scrapers.jsonl"),
+    env=scraper_environment(),
+    on_line=record_script_line,
+)
+
+
 def run_script(script_name):
     """Run a single scraper script with enhanced logging and progress tracking"""
     try:
@@ -596,103 +624,17 @@ def run_script(script_name):
             
         script_infos[script_name].log_file = log_file
 
-        # Create completed folder path
-        script_base = os.path.splitext(os.path.basename(script_name))[0]
-        completed_folder = os.path.join(
-            yesterday,
-            f"{script_base}_COMPLETED"
-        )
-
-        # Prepare PowerShell command with output redirection and auto-close
-        # First set the window title to script name, then run the script
-        powershell_command = f"""
-$Host.UI.RawUI.WindowTitle = '{script_base}';
-conda activate bids;
-$env:SELENIUM_DISABLE_GPU = 1;
-$env:CHROME_DISABLE_GPU = 1;
-$env:FIREFOX_DISABLE_GPU = 1;
-try {{
-    & python {script_name} 2>&1 | ForEach-Object {{
-        $line = $_
-        # Skip PowerShell error messages and command lines
-        if (-not ($line -match "At line:|char:|CategoryInfo|RemoteException|NativeCommandError|FullyQualifiedErrorId|\\+\\s+&\\s+python\\s+scrapers/")) {{
-            # Clean up any remaining error patterns
-            $line = $line -replace "\\+\\s+~~~~~~~~~~~~~~~~+", ""
-            $line | Tee-Object -FilePath '{log_file}' -Append
-        }}
-    }}
-}} catch {{
-    # Only log actual error message, not the PowerShell formatting
-    $errorMsg = $_.Exception.Message -replace "At line:.*", "" -replace "\\+.*", ""
-    $errorMsg | Tee-Object -FilePath '{log_file}' -Append
-}}
-if ($LASTEXITCODE -eq 0 -or (Test-Path '{completed_folder}')) {{
-    Start-Sleep -Seconds 1;
-    Stop-Process -Id $PID;
-}}
-"""
-        
-        # Set up environment variables for the process
-        env = os.environ.copy()
-        env["MOZ_HEADLESS"] = "0"  # For Firefox
-        env["HEADLESS"] = "False"  # Generic headless flag
-        env["PYTHONUNBUFFERED"] = "1"  # Ensure Python output is unbuffered
-        env["PYTHONIOENCODING"] = "utf-8"  # Ensure proper encoding
-        # Add GPU acceleration disable flags
-        env["SELENIUM_DISABLE_GPU"] = "1"
-        env["CHROME_DISABLE_GPU"] = "1"
-        env["FIREFOX_DISABLE_GPU"] = "1"
-        # Chrome-specific flags
-        env["CHROME_OPTS"] = "--disable-gpu --no-sandbox --disable-dev-shm-usage"
-        # Firefox-specific flags
-        env["MOZ_DISABLE_GMP_SANDBOX"] = "1"
-        env["MOZ_DISABLE_GPU_SANDBOX"] = "1"
-        env["MOZ_DISABLE_GPU_PROCESS"] = "1"
-
-        # Start PowerShell process with visible window
-        script_process = subprocess.Popen(
-            ["powershell", "-NoExit", "-Command", powershell_command],
-            creationflags=subprocess.CREATE_NEW_CONSOLE | subprocess.CREATE_NEW_PROCESS_GROUP,
-            env=env,
-        )
-
-        # Store process for monitoring
-        script_infos[script_name].process = script_process
-        running_processes[script_name] = script_process
-
-        # Monitor for COMPLETED folder creation
-        while script_process.poll() is None:
-            if os.path.exists(completed_folder):
-                log_to_ui(f"COMPLETED folder detected for {script_name}")
-                # Terminate the process since COMPLETED folder exists
-                terminate_process(script_process, script_name)
-                script_infos[script_name].status = ScriptStatus.SUCCESS
-                script_infos[script_name].progress = 100
-                log_to_ui(f"Script {script_name} completed successfully (COMPLETED folder found)")
-                
-                # Get next script that hasn't been run yet
-                next_script = None
-                current_index = SCRIPT_ORDER.index(script_name)
-                for script in SCRIPT_ORDER[current_index + 1:]:
-                    if script_infos[script].status == ScriptStatus.PENDING:
-                        next_script = script
-                        break
-                
-                if next_script:
-                    log_to_ui(f"Starting next unrun script: {next_script}")
-                    thread = threading.Thread(target=run_script, args=(next_script,))
-                    thread.daemon = True
-                    thread.start()
-                else:
-                    log_to_ui("No more unrun scripts to start")
-                return
-            time.sleep(1)  # Check every second
+        # The scraper's output goes to its log file and the dashboard
+        result = supervisor.run_sync(script_name, log_file=log_file, timeout=SCRIPT_TIMEOUT)
 
-        # Process completed normally
-        if script_process.returncode == 0:
+        if result.ok:
             script_infos[script_name].status = ScriptStatus.SUCCESS
             script_infos[script_name].progress = 100
             log_to_ui(f"Script {script_name} completed successfully")
+        else:
+            script_infos[script_name].status = ScriptStatus.ERROR
+            reason = "timed out" if result.timed_out else f"exited with code {result.returncode}"
+            log_to_ui(f"Script {script_name} {reason}")
 
     except Exception as e:
         logger.error(f"Error running script {script_name}: {str(e)}")
@@ -706,8 +648,6 @@ if ($LASTEXITCODE -eq 0 -or (Test-Path '{completed_folder}')) {{
             except KeyError:
                 logger.warning(f"Script {script_name} not found in active_scripts during cleanup")
                 
-        if script_name in running_processes:
-            del running_processes[script_name]
         script_infos[script_name].end_time = datetime.now()
 
         # Play notification sound when script completes
@@ -864,17 +804,17 @@ def start_next_script():
 def terminate_process(process, script_name=None):
     """Enhanced process termination"""
     try:
-        if process and process.poll() is None:  # If process is still running
+        if process and process.returncode is None:  # If process is still running
             log_to_ui(f"Terminating process {process.pid}")
-            kill_process_tree(process.pid)
-            process.wait(timeout=5)
+            if script_name in supervisor.processes:
+                supervisor.terminate(script_name)
+            else:
+                kill_process_tree(process.pid)
             
             if script_name:
                 # Clean up process tracking
                 if script_name in active_scripts:
                     active_scripts.remove(script_name)
-                if script_name in running_processes:
-                    del running_processes[script_name]
                 
                 # Mark as error and track as run
                 script_infos[script_name].status = ScriptStatus.ERROR
@@ -903,8 +843,6 @@ def terminate_process(process, script_name=None):
             # Clean up even if error occurs
             if script_name in active_scripts:
                 active_scripts.remove(script_name)
-            if script_name in running_processes:
-                del running_processes[script_name]
             # Mark as error and track as run
             script_infos[script_name].status = ScriptStatus.ERROR
             auto_started_scripts.add(script_name)
@@ -918,11 +856,9 @@ def terminate_scripts():
         terminate_flag.set()
 
         # Stop all running processes
-        for script_name, process in list(running_processes.items()):
+        for script_name, process in list(supervisor.processes.items()):
             log_to_ui(f"Stopping script: {script_name}")
             terminate_process(process, script_name)
-            if script_name in running_processes:
-                del running_processes[script_name]
             if script_name in active_scripts:
                 active_scripts.remove(script_name)
 
@@ -1139,6 +1075,44 @@ def create_app():
         """Get the main terminal log"""
         return jsonify({"log": "\n".join(main_log_buffer)})
 
+    @app.route("/api/interventions")
+    def get_interventions():
+        """Get the bids and blockers waiting for an operator"""
+        try:
+            include_closed = request.args.get("all") == "1"
+            return jsonify(interventions.list_interventions(include_closed=include_closed))
+        except Exception as e:
+            log_to_ui(f"Error listing interventions: {str(e)}")
+            return jsonify([])
+
+    @app.route("/api/interventions/<intervention_id>/resolve", methods=["POST"])
+    def resolve_intervention(intervention_id):
+        """Mark an intervention resolved (retry/continue) or skipped"""
+        data = request.get_json(silent=True) or {}
+        try:
+            item = interventions.resolve(
+                intervention_id,
+                action=data.get("action", interventions.RESOLVED),
+                note=data.get("note", ""),
+            )
+        except KeyError:
+            return jsonify({"status": "error", "error": "Unknown intervention"}), 404
+        except ValueError as e:
+            return jsonify({"status": "error", "error": str(e)}), 400
+        log_to_ui(f"Intervention {intervention_id} {item['status']}")
+        return jsonify({"status": "success", "intervention": item})
+
+    @app.route("/api/interventions/<intervention_id>/screenshot")
+    def get_intervention_screenshot(intervention_id):
+        """Get the screenshot taken when the intervention was raised"""
+        try:
+            path = interventions.screenshot_file(intervention_id)
+        except ValueError:
+            path = None
+        if not path:
+            return jsonify({"status": "error", "error": "No screenshot"}), 404
+        return send_file(path, mimetype="image/png")
+
     def match_category(title: str, description: str, category: str, api_categories: list) -> tuple:
         """
         Match a bid to a category using the similarity method
@@ -1206,9 +1180,9 @@ def create_app():
             if script_name:
                 # Stop specific script
                 script_info = script_infos.get(script_name)
-                if script_info and script_info.process:
+                if script_info and script_name in supervisor.processes:
                     log_to_ui(f"Stopping script: {script_name}")
-                    terminate_process(script_info.process, script_name)  # Pass script_name
+                    terminate_process(supervisor.processes[script_name], script_name)  # Pass script_name
                     script_info.status = ScriptStatus.ERROR
                     script_info.end_time = datetime.now()
                     return jsonify({"status": "success", "message": f"Script {script_name} stopped"})
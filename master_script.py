@@ -2,23 +2,23 @@ import os
 import subprocess
 import threading
 import time
-import queue
+import json
 from datetime import datetime, timedelta
 import sys
 import io
 import signal
-import msvcrt
 import pandas as pd
 import shutil
-import winsound
 import argparse
 from enum import Enum
-import ctypes
-import atexit
 import glob
 from pathlib import Path
 import logging
 from utils.excel_processor import ExcelProcessor
+from utils.watermarks import FULL_RESCAN_ENV_VAR
+from utils.metrics import FOLDER_ENV_VAR as METRICS_FOLDER_ENV_VAR, collect_run_metrics
+from utils.supervisor import Supervisor
+from utils.scheduler import Scheduler
 import traceback
 from rich.console import Console
 from rich.progress import (
@@ -34,6 +34,11 @@ from rich.live import Live
 from rich.logging import RichHandler
 from typing import Tuple
 
+try:
+    import winsound
+except ImportError:  # Not available on Linux workers
+    winsound = None
+
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
 # Add this class definition before it's used
@@ -44,21 +49,28 @@ class ScriptStatus(Enum):
     ERROR = "Done"
 
 # Environment Configuration
-PYTHON_PATH = r"C:\Users\AliAmani\Miniconda3\envs\bids\python.exe"  # Path to Python executable
+PYTHON_PATH = (  # Path to Python executable
+    r"C:\Users\AliAmani\Miniconda3\envs\bids\python.exe" if os.name == "nt" else sys.executable
+)
 CONDA_PATH = r"C:\Users\AliAmani\Miniconda3"  # Path to Miniconda installation
 CONDA_ENV = "bids"  # Conda environment name
 CONDA_ENV_PATH = r"C:\Users\AliAmani\Miniconda3\envs\bids"  # Path to Conda environment
 
 # Script Configuration
 MAX_CONCURRENT_SCRIPTS = 4  # Number of scripts to run simultaneously
+SCRIPT_TIMEOUT = 6 * 60 * 60  # Seconds a scraper may run before it is stopped
+SCHEDULE_FILE = "schedule.json"  # Slot utilization report in the date folder
+# Started before the rest when the previous run has no timings for them
+SCRIPT_PRIORITIES = {
+    "scrapers/17_BidNet.py": 600,
+    "scrapers/15_State_of_Conneticut_BidBoard.py": 300,
+}
+RESUME_PRIORITY = 100000  # An interrupted SF City Partner run resumes first
 UPLOAD_SCRIPT = "upload_bids.py"  # Script for uploading data
 
 # Script Order and Lists
 SCRIPT_ORDER = [
-    "scrapers/01_BuySpeed_01.py",
-    "scrapers/01_BuySpeed_02.py",
-    "scrapers/01_BuySpeed_03.py",
-    "scrapers/01_BuySpeed_04.py",
+    "scrapers/01_BuySpeed.py",
     "scrapers/02_NYC.py",
     "scrapers/03_TXSMartBuy.py",
     "scrapers/05_NYSCR.py",
@@ -68,10 +80,7 @@ SCRIPT_ORDER = [
     "scrapers/09_CGIEVA.py",
     "scrapers/10_BidBuysIllinoise.py",
     "scrapers/11_PlanetBids_Hartford.py",
-    "scrapers/12_Bonfire_FairfaxCounty_1.py",
-    "scrapers/12_Bonfire_FairfaxCounty_2.py",
-    "scrapers/12_Bonfire_FairfaxCounty_3.py",
-    "scrapers/12_Bonfire_FairfaxCounty_4.py",
+    "scrapers/12_Bonfire.py",
     "scrapers/13_eMaryland_eMMA.py",
     "scrapers/14_NorthCarolina_VendorPortal_eVP.py",
     "scrapers/15_State_of_Conneticut_BidBoard.py",
@@ -87,9 +96,7 @@ scripts = SCRIPT_ORDER.copy()  # Create a copy of script order for the scripts l
 # Global Variables
 yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 terminate_flag = threading.Event()
-script_queue = queue.Queue()
 print_lock = threading.Lock()
-running_processes = {}  # Dictionary to keep track of running processes
 auto_started_scripts = set()  # Track scripts that have been started
 active_scripts = set()  # Track currently running scripts
 active_scripts_lock = threading.Lock()
@@ -99,10 +106,6 @@ main_log_buffer = []  # Store main terminal logs
 processed_excel_folders = set()  # Track which folders have been processed
 processed_scripts = set()  # Track which scripts have been fully completed
 
-# Initialize script queue at startup
-for script in scripts:
-    script_queue.put(script)
-
 # Initialize script statuses
 script_statuses = {script: ScriptStatus.PENDING for script in scripts}
 
@@ -113,8 +116,7 @@ UPLOAD_SCRIPT = (
 
 # List of scripts to run
 scripts = [
-    "scrapers/01_BuySpeed_01.py",
-    "scrapers/01_BuySpeed_02.py",
+    "scrapers/01_BuySpeed.py",
     "scrapers/02_NYC.py",
     "scrapers/03_TXSMartBuy.py",
     "scrapers/05_NYSCR.py",
@@ -124,10 +126,7 @@ scripts = [
     "scrapers/09_CGIEVA.py",
     "scrapers/10_BidBuysIllinoise.py",
     "scrapers/11_PlanetBids_Hartford.py",
-    "scrapers/12_Bonfire_FairfaxCounty_1.py",
-    "scrapers/12_Bonfire_FairfaxCounty_2.py",
-    "scrapers/12_Bonfire_FairfaxCounty_3.py",
-    "scrapers/12_Bonfire_FairfaxCounty_4.py",
+    "scrapers/12_Bonfire.py",
     "scrapers/13_eMaryland_eMMA.py",
     "scrapers/14_NorthCarolina_VendorPortal_eVP.py",
     "scrapers/15_State_of_Conneticut_BidBoard.py",
@@ -138,20 +137,12 @@ scripts = [
     "scrapers/20_County_of_San_Diego.py",
 ]
 
-# Queue to manage scripts
-script_queue = queue.Queue()
-for script in scripts:
-    script_queue.put(script)
-
 # Lock for thread-safe printing
 print_lock = threading.Lock()
 
 # Global flag to signal script termination
 terminate_flag = threading.Event()
 
-# Dictionary to keep track of running processes
-running_processes = {}
-
 # Semaphore to limit concurrent scripts
 max_concurrent_scripts = 4
 script_semaphore = threading.Semaphore(max_concurrent_scripts)
@@ -237,49 +228,50 @@ def check_and_start_processing():
     except Exception as e:
         print(f"❌ Error in batch processing: {str(e)}")
 
-def start_next_script():
-    """Start the next pending script that hasn't been run yet"""
-    try:
-        # Get list of pending scripts that haven't been started or completed
-        pending_scripts = [
-            script for script, status in script_statuses.items()
-            if status == ScriptStatus.PENDING 
-            and script not in auto_started_scripts
-            and script not in processed_scripts
-        ]
-        
-        # Count currently running scripts
-        running_count = len([
-            script for script, status in script_statuses.items()
-            if status == ScriptStatus.RUNNING
-        ])
-        
-        # Start next script if we have pending scripts and room to run more
-        if pending_scripts and running_count < max_concurrent_scripts and not terminate_flag.is_set():
-            next_script = pending_scripts[0]
-            script_statuses[next_script] = ScriptStatus.RUNNING  # Mark as running before starting
-            auto_started_scripts.add(next_script)  # Track that we've started this script
-            thread = threading.Thread(target=run_script, args=(next_script,))
-            thread.daemon = True
-            thread.start()
-            return True
-            
-        # If no more pending scripts to start, check if we should start processing
-        elif not pending_scripts and all_scripts_completed():
-            print("\n✅ All scripts have been run. Starting batch processing...")
-            check_and_start_processing()
-            
-        return False
-    except Exception as e:
-        print(f"Error starting next script: {e}")
-        return False
-
-# Function to close CMD window
-def close_cmd_window(hwnd):
+def previous_durations() -> dict:
+    """Wall seconds per scraper from the latest earlier run_metrics.json"""
+    for path in sorted(glob.glob(os.path.join("*", "run_metrics.json")), reverse=True):
+        if os.path.basename(os.path.dirname(path)) >= yesterday:
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                scrapers = json.load(f).get("scrapers", {})
+        except (OSError, ValueError):
+            continue
+        return {name: data.get("wall_seconds", 0) for name, data in scrapers.items()}
+    return {}
+
+
+def script_priority(script: str, durations: dict) -> int:
+    """Longest scrapers first, so no slot is left with a long tail at the end"""
+    name = os.path.splitext(os.path.basename(script))[0]
+    if name == "08_SFCityPartner":
+        # Its progress file means an earlier run today was interrupted
+        progress_file = os.path.join(yesterday, "08_SFCityPartner_IN_PROGRESS", "scraping_progress.json")
+        if os.path.exists(progress_file):
+            return RESUME_PRIORITY
+    if name in durations:
+        return int(durations[name])
+    return SCRIPT_PRIORITIES.get(script, 0)
+
+
+def build_scheduler() -> Scheduler:
+    """One slot per concurrent scraper, see utils/scheduler.py"""
+    durations = previous_durations()
+    scheduler = Scheduler(MAX_CONCURRENT_SCRIPTS, run_script)
+    for script in SCRIPT_ORDER:
+        scheduler.add(script, priority=script_priority(script, durations))
+    return scheduler
+
+
+def save_schedule_report(report: dict):
+    path = os.path.join(yesterday, SCHEDULE_FILE)
     try:
-        ctypes.windll.user32.PostMessageA(hwnd, 0x0112, 0xF060, 0)
-    except Exception as e:
-        print(f"Error closing CMD window: {e}")
+        os.makedirs(yesterday, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        print(f"Could not save {path}: {e}")
 
 
 def parse_arguments():
@@ -292,6 +284,11 @@ def parse_arguments():
         default=2,
         help="Number of days to look back for bids (default: 2)",
     )
+    parser.add_argument(
+        "--full-rescan",
+        action="store_true",
+        help="Ignore the stored watermarks and scan the whole --days window",
+    )
     return parser.parse_args()
 
 
@@ -700,20 +697,34 @@ class ProcessingStats:
 # Initialize stats tracker
 processing_stats = ProcessingStats()
 
+def show_script_line(script_name, stream, level, line):
+    """Show a scraper's latest output line in its progress row"""
+    if script_progress is not None:
+        script_progress.update_script(script_name, line[:80])
+
+
+# Runs the scrapers and streams their output into their logs, see utils/supervisor.py
+supervisor = Supervisor(python=PYTHON_PATH, on_line=show_script_line)
+scheduler = None  # Dispatches run_script over the slots, built in main()
+
+
 # Modify the run_script function to use rich for output
-def run_script(script_name):
+def run_script(script_name) -> bool:
+    """Run one scraper to completion; True if it succeeded"""
     if terminate_flag.is_set():
-        return
+        return False
 
     # Skip if script has already been run
     if script_name in processed_scripts:
         print(f"Skipping {script_name} - already completed")
-        return
+        return False
         
     if script_name in auto_started_scripts and script_statuses[script_name] != ScriptStatus.RUNNING:
         print(f"Skipping {script_name} - already started")
-        return
+        return False
 
+    auto_started_scripts.add(script_name)
+    ok = False
     with script_semaphore:
         start_time = datetime.now()
         script_progress.add_script(script_name)
@@ -726,130 +737,31 @@ def run_script(script_name):
             console.print(f"\n[bold cyan]Starting {script_name} at {start_time}[/bold cyan]")
 
         try:
-            window_title = f"Scraper - {os.path.basename(script_name)}"
-
-            # Add environment variables to potentially help with webdriver startup
-            env = os.environ.copy()
-            env["PYTHONUNBUFFERED"] = "1"
-            env["PATH"] = env["PATH"] + os.pathsep + os.path.dirname(PYTHON_PATH)
-
-            # Enhanced PowerShell command with better output formatting
-            powershell_command = (
-                # Setup console encoding
-                "[Console]::OutputEncoding = [System.Text.Encoding]::UTF8; "
-                "[Console]::InputEncoding = [System.Text.Encoding]::UTF8; "
-                "$OutputEncoding = [System.Text.Encoding]::UTF8; "
-                f'$host.ui.RawUI.WindowTitle = "{window_title}"; '
-                # Setup transcript logging
-                f'Start-Transcript -Path "{log_file}" -Append; '
-                # Initial status display with colors
-                'Write-Host "`n=== Scraper Status ===" -ForegroundColor Cyan; '
-                'Write-Host "Script: '
-                + os.path.basename(script_name)
-                + '" -ForegroundColor Yellow; '
-                'Write-Host "Status: Running" -ForegroundColor Green; '
-                'Write-Host "Start Time: '
-                + start_time.strftime("%H:%M:%S")
-                + '" -ForegroundColor Yellow; '
-                'Write-Host "Log File: ' + log_file + '" -ForegroundColor Cyan; '
-                'Write-Host "==============================`n"; '
-                # Enhanced output formatting function
-                "function Format-ScraperOutput { "
-                "    param($Message) "
-                '    $timestamp = Get-Date -Format "HH:mm:ss"; '
-                '    if ($Message -match "^ERROR|FAILED|CRITICAL") { '
-                '        Write-Host "[$timestamp] " -NoNewline; '
-                "        Write-Host $Message -ForegroundColor Red; "
-                "    } "
-                '    elseif ($Message -match "^WARNING") { '
-                '        Write-Host "[$timestamp] " -NoNewline; '
-                "        Write-Host $Message -ForegroundColor Yellow; "
-                "    } "
-                '    elseif ($Message -match "^SUCCESS|COMPLETED|✓") { '
-                '        Write-Host "[$timestamp] " -NoNewline; '
-                "        Write-Host $Message -ForegroundColor Green; "
-                "    } "
-                '    elseif ($Message -match "^INFO|PROGRESS") { '
-                '        Write-Host "[$timestamp] " -NoNewline; '
-                "        Write-Host $Message -ForegroundColor Cyan; "
-                "    } "
-                "    else { "
-                '        Write-Host "[$timestamp] $Message"; '
-                "    } "
-                "}; "
-                # Run the script with enhanced output
-                f'& "{PYTHON_PATH}" "{script_name}" --days {args.days} 2>&1 | '
-                "ForEach-Object { "
-                "    Format-ScraperOutput $_; "
-                f'    $host.ui.RawUI.WindowTitle = "{window_title} - Running..."; '
-                "}; "
-                # Handle script completion and update log file name
-                "$exitCode = $LASTEXITCODE; "
-                "Stop-Transcript; "
-                "if ($exitCode -eq 0) { "
-                f'    Rename-Item -Path "{log_file}" -NewName "{os.path.splitext(log_file)[0].replace("IN_PROGRESS", "COMPLETED")}.log" -Force; '
-                "} else { "
-                f'    Rename-Item -Path "{log_file}" -NewName "{os.path.splitext(log_file)[0].replace("IN_PROGRESS", "FAILED")}.log" -Force; '
-                "} "
-                # Final status display
-                'Write-Host "`n=== Final Status ===" -ForegroundColor Cyan; '
-                'Write-Host "End Time: " -NoNewline; '
-                'Write-Host $(Get-Date -Format "HH:mm:ss") -ForegroundColor Yellow; '
-                'Write-Host "Duration: " -NoNewline; '
-                'Write-Host $([math]::Round(((Get-Date) - (Get-Date "'
-                + start_time.strftime("%H:%M:%S")
-                + '")).TotalMinutes, 2)) -NoNewline -ForegroundColor Yellow; '
-                'Write-Host " minutes"; '
-                "if ($exitCode -eq 0) { "
-                '    Write-Host "Status: " -NoNewline; '
-                '    Write-Host "Completed Successfully" -ForegroundColor Green; '
-                f'    $host.ui.RawUI.WindowTitle = "{window_title} - Completed ✓"; '
-                "} else { "
-                '    Write-Host "Status: " -NoNewline; '
-                '    Write-Host "Failed" -ForegroundColor Red; '
-                f'    $host.ui.RawUI.WindowTitle = "{window_title} - Failed ✗"; '
-                '    Write-Host "Exit Code: $exitCode" -ForegroundColor Red; '
-                "} "
-                'Write-Host "==============================" -ForegroundColor Cyan; '
-                "exit $exitCode; "
+            result = supervisor.run_sync(
+                script_name, ["--days", str(args.days)], log_file=log_file, timeout=SCRIPT_TIMEOUT
             )
+            return_code = result.returncode
+            ok = result.ok
 
-            # Start PowerShell with a visible window
-            process = subprocess.Popen(
-                ["powershell", "-NoExit", "-Command", powershell_command],
-                creationflags=subprocess.CREATE_NEW_CONSOLE,
-                env=env,
-            )
-            running_processes[script_name] = process
-
-            # Wait for process to complete or detect if window was closed
-            while True:
-                try:
-                    return_code = process.wait(timeout=1)  # Check every second
-                    break
-                except subprocess.TimeoutExpired:
-                    # Check if process is still running
-                    if process.poll() is not None:  # Process ended
-                        return_code = process.returncode
-                        break
-                    continue
+            # Name the log after the outcome
+            final_status = "COMPLETED" if result.ok else "FAILED"
+            os.replace(log_file, f"{os.path.splitext(log_file)[0].replace('IN_PROGRESS', final_status)}.log")
 
             end_time = datetime.now()
             execution_time = end_time - start_time
 
             with print_lock:
-                if return_code == 0 or process.poll() is not None:  # Success or window closed
+                if result.ok:
                     print(f"\n{'='*50}")
-                    print(f"Script {script_name} completed successfully")
+                    print(f"Script {script_name} completed successfully in {execution_time}")
                     print(f"{'='*50}")
                     script_statuses[script_name] = ScriptStatus.SUCCESS
                     processed_scripts.add(script_name)  # Mark as fully completed
-                    start_next_script()
                 else:
-                    print(f"\nScript {script_name} failed with return code {return_code}")
+                    reason = "timed out" if result.timed_out else f"failed with return code {return_code}"
+                    print(f"\nScript {script_name} {reason}: {result.last_line}")
                     script_statuses[script_name] = ScriptStatus.ERROR
                     processed_scripts.add(script_name)  # Mark as completed even if failed
-                    start_next_script()
 
                 print_status_report()
 
@@ -859,59 +771,15 @@ def run_script(script_name):
                 script_statuses[script_name] = ScriptStatus.ERROR
                 processed_scripts.add(script_name)  # Mark as completed on error
                 print_status_report()
-                start_next_script()
 
         finally:
-            if script_name in running_processes:
-                del running_processes[script_name]
-            
             # Update completion stats
             if script_statuses[script_name] in [ScriptStatus.RUNNING, ScriptStatus.PENDING]:
                 script_statuses[script_name] = ScriptStatus.SUCCESS
                 processing_stats.completed_scripts += 1
                 processing_stats.log_progress()
-            
-            # Check if all scripts are either completed or terminated
-            remaining_scripts = [
-                script for script, status in script_statuses.items()
-                if status not in [ScriptStatus.SUCCESS, ScriptStatus.ERROR]
-                and script not in auto_started_scripts
-            ]
-            
-            if not remaining_scripts:  # No more scripts to run
-                print("\n✅ All scripts have completed or been terminated")
-                print("Starting batch processing...")
-                check_and_start_processing()
-            elif not terminate_flag.is_set():  # Still have scripts to run
-                start_next_script()
-
 
-def close_script_window(window_title):
-    """Close the CMD window for a completed script"""
-    try:
-
-        def enum_windows_callback(hwnd, _):
-            if ctypes.windll.user32.IsWindowVisible(hwnd):
-                length = ctypes.windll.user32.GetWindowTextLengthW(hwnd)
-                buff = ctypes.create_unicode_buffer(length + 1)
-                ctypes.windll.user32.GetWindowTextW(hwnd, buff, length + 1)
-                # Make the window title match more flexible
-                if window_title.lower() in buff.value.lower():
-                    close_cmd_window(hwnd)
-                    return False  # Stop enumeration after finding the window
-            return True
-
-        # Give the window a moment to finish any final output
-        time.sleep(1)
-
-        ctypes.windll.user32.EnumWindows(
-            ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_int, ctypes.c_int)(
-                enum_windows_callback
-            ),
-            0,
-        )
-    except Exception as e:
-        print(f"Error closing window {window_title}: {e}")
+    return ok
 
 
 def terminate_scripts():
@@ -921,18 +789,16 @@ def terminate_scripts():
         
         # Set terminate flag to prevent new scripts
         terminate_flag.set()
+        if scheduler is not None:
+            scheduler.stop()
         
-        # Stop all running processes
-        for script_name, process in list(running_processes.items()):
+        # Stop all running scrapers with their browsers
+        for script_name in supervisor.running():
             print(f"Stopping script: {script_name}")
             try:
-                process.terminate()
-                process.wait(timeout=5)
+                supervisor.terminate(script_name)
             except Exception as e:
                 print(f"Error stopping {script_name}: {e}")
-            
-            if script_name in running_processes:
-                del running_processes[script_name]
                 
         print("All scripts stopped")
         
@@ -968,30 +834,6 @@ def print_final_status():
     print("-" * 50)
 
 
-def cleanup_windows():
-    """Clean up any remaining CMD windows on script exit"""
-    try:
-
-        def enum_windows_callback(hwnd, _):
-            if ctypes.windll.user32.IsWindowVisible(hwnd):
-                length = ctypes.windll.user32.GetWindowTextLengthW(hwnd)
-                buff = ctypes.create_unicode_buffer(length + 1)
-                ctypes.windll.user32.GetWindowTextW(hwnd, buff, length + 1)
-                # Close any window with "Scraper -" in the title
-                if "Scraper -" in buff.value:
-                    close_cmd_window(hwnd)
-            return True
-
-        ctypes.windll.user32.EnumWindows(
-            ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_int, ctypes.c_int)(
-                enum_windows_callback
-            ),
-            0,
-        )
-    except Exception as e:
-        print(f"Error during cleanup: {e}")
-
-
 def signal_handler(signum, frame):
     print("\nCtrl+C detected. Cleaning up...")
     terminate_scripts()
@@ -1133,10 +975,15 @@ def display_final_summary():
     table.add_column("Script Name", style="cyan")
     table.add_column("Status", style="green")
     table.add_column("Duration", justify="right")
+    table.add_column("Slowest Phase", style="yellow")
     table.add_column("Log File", style="blue")
 
+    # Per-scraper phase timings, gathered into <date folder>/run_metrics.json
+    run_metrics = collect_run_metrics(os.environ.get(METRICS_FOLDER_ENV_VAR, os.path.join(os.getcwd(), yesterday)))
+
     for script_name, status in script_statuses.items():
         script_base = os.path.basename(script_name)
+        script_stem = os.path.splitext(script_base)[0]
         log_status = "COMPLETED" if status == ScriptStatus.SUCCESS else "FAILED"
         log_file = os.path.join(
             os.path.dirname(script_name),
@@ -1145,12 +992,16 @@ def display_final_summary():
         )
 
         status_style = "green" if status == ScriptStatus.SUCCESS else "red"
-        duration = "N/A"  # You could track actual duration if needed
+        metrics = run_metrics["scrapers"].get(script_stem)
+        duration = f"{metrics['wall_seconds']:.0f}s" if metrics else "N/A"
+        slowest = run_metrics["slowest"].get(script_stem)
+        slowest_phase = f"{slowest[0]} ({slowest[1]:.0f}s)" if slowest else "N/A"
 
         table.add_row(
             script_base,
             f"[{status_style}]{status.value}[/{status_style}]",
             duration,
+            slowest_phase,
             os.path.basename(log_file) if os.path.exists(log_file) else "N/A",
         )
 
@@ -1167,20 +1018,26 @@ script_progress = None
 
 def main():
     try:
-        # Register cleanup function to run on exit
-        atexit.register(cleanup_windows)
-
         # Set up signal handler for Ctrl+C
         signal.signal(signal.SIGINT, signal_handler)
 
         # Get command line arguments
-        global args, script_progress
+        global args, script_progress, scheduler
         args = parse_arguments()
+        if args.full_rescan:
+            # Inherited by every scraper, see utils/watermarks.py
+            os.environ[FULL_RESCAN_ENV_VAR] = "1"
 
         # Change to the script's directory
         script_dir = os.path.dirname(os.path.abspath(__file__))
         os.chdir(script_dir)
         print(f"Changed working directory to: {script_dir}")
+        # Scrapers write their phase timings into the date folder, see utils/metrics.py
+        os.environ.setdefault(METRICS_FOLDER_ENV_VAR, os.path.join(script_dir, yesterday))
+        # Helps the scrapers' webdriver startup find the interpreter's tools
+        os.environ["PATH"] = os.environ["PATH"] + os.pathsep + os.path.dirname(PYTHON_PATH)
+        # Every line the scrapers print, with starts and exits, as JSON lines
+        supervisor.events_file = os.path.join(script_dir, yesterday, "scrapers.jsonl")
 
         # Check if Python is available
         if not os.path.exists(PYTHON_PATH):
@@ -1202,33 +1059,18 @@ def main():
             status_thread.daemon = True
             status_thread.start()
 
-            # Process scripts in batches of 4
-            while not script_queue.empty() and not terminate_flag.is_set():
-                # Start batch of 4 scripts
-                batch_threads = []
-                for _ in range(min(4, script_queue.qsize())):
-                    if not terminate_flag.is_set():
-                        script = script_queue.get()
-                        thread = threading.Thread(target=run_script, args=(script,))
-                        thread.start()
-                        batch_threads.append(thread)
-
-                # Wait for all scripts in batch to complete
-                for thread in batch_threads:
-                    thread.join()
-
-                if terminate_flag.is_set():
-                    break
-
-            # Wait for any remaining scripts to finish
-            time.sleep(5)
+            # A freed slot starts the next scraper right away, longest ones first
+            scheduler = build_scheduler()
+            save_schedule_report(scheduler.run())
+            console.print(scheduler.summary())
 
             # Only start processing after ALL scripts are done or terminated
             if terminate_flag.is_set():
                 console.print("[yellow]Script execution terminated by user.[/yellow]")
             else:
                 console.print("[green]All scripts completed normally[/green]")
-                winsound.Beep(2000, 1000)
+                if winsound is not None:
+                    winsound.Beep(2000, 1000)
 
             # Now start the batch processing
             if all_scripts_completed() or terminate_flag.is_set():
@@ -1243,7 +1085,7 @@ def main():
         logging.error(f"Error in main execution: {str(e)}")
         logging.error(traceback.format_exc())
     finally:
-        cleanup_windows()
+        supervisor.close()
 
 
 if __name__ == "__main__":
@@ -12,7 +12,6 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import time
 from datetime import datetime, timedelta
 import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -25,10 +24,18 @@ from selenium.common.exceptions import (
 from selenium.webdriver.common.action_chains import ActionChains
 import argparse
 from utils.utils import safe_move, play_notification_sound
-from concurrent.futures import ThreadPoolExecutor
-import concurrent
+from utils.download_slots import DownloadSlotManager, sweep_slots
+from utils.driver_pool import DriverPool
+from utils.driver_factory import create_driver
+from utils.rate_limit import throttle
+from utils.waits import network_idle
+from utils.listing import KEEP, DateWindow
+from utils.interventions import get_intervention_queue
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 from urllib.parse import urlparse
 import json
+import glob
+import queue
 
 # Add these imports at the top
 import signal
@@ -36,8 +43,7 @@ import threading
 
 # Add these global variables after imports
 stop_processing = threading.Event()
-active_drivers = []
-thread_pool = None
+driver_pool = None
 base_folder = None
 main_folder = None
 script_download_folder = None
@@ -46,25 +52,60 @@ script_name = None
 # Add log_lock definition after other global variables
 log_lock = threading.Lock()
 
+# Tenants run on concurrent drivers, so the shared Excel file, cache file and
+# serial number counter are guarded by their own locks
+excel_lock = threading.Lock()
+cache_lock = threading.Lock()
+sl_no_lock = threading.Lock()
+next_sl_no = 1
+
+DEFAULT_WORKERS = 4  # Concurrent browsers
+MAX_TENANT_RETRIES = 3
+
 # Add these constants after the imports
+SEARCH_PATH = "/bso/view/search/external/advancedSearchBid.xhtml"
+
+# Every BuySpeed tenant, in the order they are queued
 SITES_CONFIG = {
-    "gvibuy.buyspeed.com": {"name": "GVI Buy", "prefix": "GVI"},
+    "www.commbuys.com": {"name": "COMMBUYS", "prefix": "CB"},
+    "gvibuy.buyspeed.com": {"name": "GVI Buy", "prefix": "GVI", "open_bids": False},
     "longbeachbuys.buyspeed.com": {"name": "Long Beach Buys", "prefix": "LB"},
     "procure.portlandoregon.gov": {"name": "Portland Procurement", "prefix": "PRT"},
-    "knoxbuys.buyspeed.com": {"name": "Knox Buys", "prefix": "KNOX"},
-    "oregon-uat.buyspeed.com": {"name": "Oregon UAT", "prefix": "OR_UAT"},
-    "www.njstart.gov": {"name": "NJ Start", "prefix": "NJ"},
-    "epro.sbcounty.gov": {"name": "SB County", "prefix": "SBC"},
     "oregonbuys.gov": {"name": "Oregon Buys", "prefix": "OR"},
     "arbuy.arkansas.gov": {"name": "Arkansas Buy", "prefix": "AR"},
     "nevadaepro.com": {"name": "Nevada ePro", "prefix": "NV"},
+    "knoxbuys.buyspeed.com": {"name": "Knox Buys", "prefix": "KNOX"},
+    "oregon-uat.buyspeed.com": {"name": "Oregon UAT", "prefix": "OR_UAT"},
+    "www.njstart.gov": {"name": "NJ Start", "prefix": "NJ"},
+    "epro.sbcounty.gov": {"name": "SB County", "prefix": "SBC", "open_bids": False},
     "www.nttamarketplace.org": {"name": "NTTA Marketplace", "prefix": "NTTA"},
     "www.phlcontracts.phila.gov": {"name": "PHL Contracts", "prefix": "PHL"},
     "alohaebuys-uat.hawaii.gov": {"name": "Hawaii eBuys", "prefix": "HI"},
-    "www.commbuys.com": {"name": "COMMBUYS", "prefix": "CB"},
 }
 
 
+def get_tenant_urls(prefixes=None):
+    """
+    Build the search URL of every configured tenant.
+
+    Args:
+        prefixes (list): Optional tenant prefixes (e.g. ["CB", "NJ"]) to limit the run to.
+
+    Returns:
+        list: Advanced search URLs in SITES_CONFIG order.
+    """
+    wanted = {p.upper() for p in prefixes} if prefixes else None
+    urls = []
+    for domain, config in SITES_CONFIG.items():
+        if wanted and config["prefix"] not in wanted:
+            continue
+        url = f"https://{domain}{SEARCH_PATH}"
+        if config.get("open_bids", True):
+            url += "?openBids=true"
+        urls.append(url)
+    return urls
+
+
 # Update the folder setup code
 def setup_folders():
     """Set up the required folder structure."""
@@ -93,43 +134,33 @@ def get_site_info(url):
 
 
 # Function to handle errors
-def handle_error(error_message):
+def handle_error(error_message, driver=None):
     """
-    Handle errors by playing a notification sound and pausing the script.
+    Handle errors by playing a notification sound and reporting them to the dashboard.
 
     Args:
         error_message (str): The error message to display.
+        driver (webdriver.Chrome, optional): Driver to take a screenshot from.
     """
     print(f"❗ Error: {error_message}")
     play_notification_sound()
-    input("Press Enter to continue...")
+    get_intervention_queue().report(error_message, driver)
 
 
 def setup_driver():
     """Set up and configure the Chrome WebDriver."""
-    chrome_options = webdriver.ChromeOptions()
-    prefs = {
-        "download.default_directory": script_download_folder,
-        "download.prompt_for_download": False,
-        "download.directory_upgrade": True,
-        "safebrowsing.enabled": True,
-        "pageLoadStrategy": "none",  # Add this to prevent waiting for full page load
-    }
-    chrome_options.add_experimental_option("prefs", prefs)
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-software-rasterizer")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-browser-side-navigation")
-    chrome_options.add_argument("--disable-infobars")
-    chrome_options.add_argument("--disable-notifications")
-
-    driver = webdriver.Chrome(options=chrome_options)
-    driver.set_page_load_timeout(60)  # Increase timeout to 60 seconds
-    driver.set_script_timeout(60)  # Add script timeout
-    driver.implicitly_wait(20)  # Increase implicit wait
-    return driver
+    # Profile, headless mode, eager page loads and resource blocking come from
+    # the shared factory; pageLoadStrategy used to sit in prefs where Chrome ignored it
+    return create_driver(
+        download_folder=script_download_folder,
+        site="buyspeed",  # One browser serves every tenant
+        arguments=[
+            "--disable-software-rasterizer",
+            "--disable-browser-side-navigation",
+        ],
+        implicit_wait=5,
+        network_events=True,
+    )
 
 
 def click_advanced_search(driver):
@@ -307,6 +338,7 @@ def extract_bid_details(driver, bid_link):
         dict: A dictionary containing the extracted bid details.
     """
     log_message(f"\n📄 Processing bid page: {bid_link}")
+    throttle(bid_link)
     driver.get(bid_link)
 
     bid_details = {}
@@ -430,56 +462,46 @@ def download_attachments(driver, bid_number):
 
     log_message(f"📎 Found {total_attachments} attachments to download")
 
-    for index, attachment in enumerate(attachments, start=1):
-        file_name = attachment.text
-        log_message(f"\n⬇️ [{index}/{total_attachments}] Downloading: {file_name}")
-
-        try:
-            before = os.listdir(script_download_folder)
-            log_message(f"🔄 Initiating download...")
-
-            ActionChains(driver).move_to_element(attachment).click().perform()
-
-            # Increase wait time for downloads
-            wait_time = max(60, min(120, 20 * len(attachments)))
-
-            # Wait for the file to be downloaded
-            downloaded_file = None
-            for _ in range(wait_time):
-                time.sleep(1)
-                after = os.listdir(script_download_folder)
-                new_files = [f for f in after if f not in before]
-                if new_files:
-                    downloaded_file = new_files[0]
-                    if not downloaded_file.endswith(".crdownload"):
-                        break
-
-            if not downloaded_file:
-                log_message(f"⚠️ Download timeout for {file_name}")
-                continue
+    # Increase wait time for downloads
+    wait_time = max(60, min(120, 20 * len(attachments)))
 
-            log_message(f"✅ Download completed: {downloaded_file}")
+    # Start every download in its own slot folder so they can run side by side
+    slots = DownloadSlotManager(driver, script_download_folder, leftovers_folder=leftovers_folder())
+    try:
+        started = []
+        for index, attachment in enumerate(attachments, start=1):
+            file_name = attachment.text
+            log_message(f"\n⬇️ [{index}/{total_attachments}] Downloading: {file_name}")
 
-            # Move file to bid folder
-            source_path = os.path.join(script_download_folder, downloaded_file)
-            destination_path = os.path.join(bid_folder, downloaded_file)
+            try:
+                log_message(f"🔄 Initiating download...")
+                slot = slots.start(
+                    lambda attachment=attachment: ActionChains(driver)
+                    .move_to_element(attachment)
+                    .click()
+                    .perform(),
+                    label=file_name,
+                )
+                started.append((file_name, slot))
+            except Exception as e:
+                log_message(f"❌ Error downloading attachment: {str(e)}")
 
-            log_message(f"📦 Moving file to bid folder...")
-            for attempt in range(5):
-                try:
-                    safe_move(source_path, destination_path)
-                    attachments_downloaded = True
-                    downloaded_files.append(downloaded_file)
-                    log_message(f"✅ Successfully moved file to: {destination_path}")
-                    break
-                except PermissionError:
-                    log_message(f"⚠️ Move attempt {attempt + 1}/5 failed, retrying...")
-                    time.sleep(1)
-            else:
-                log_message(f"❌ Failed to move {downloaded_file} after 5 attempts")
+        for file_name, slot in started:
+            try:
+                downloaded_file = slots.collect(slot, bid_folder, timeout=wait_time)
+                if not downloaded_file:
+                    log_message(f"⚠️ Download timeout for {file_name}")
+                    continue
 
-        except Exception as e:
-            log_message(f"❌ Error downloading attachment: {str(e)}")
+                attachments_downloaded = True
+                downloaded_files.append(downloaded_file)
+                log_message(
+                    f"✅ Download completed: {os.path.join(bid_folder, downloaded_file)}"
+                )
+            except Exception as e:
+                log_message(f"❌ Error downloading attachment: {str(e)}")
+    finally:
+        slots.close()
 
     log_message(f"\n📊 Download Summary for bid {bid_number}:")
     log_message(f"Total files attempted: {total_attachments}")
@@ -494,6 +516,12 @@ def download_attachments(driver, bid_number):
 
 def update_excel(bid_data, sl_no):
     """Update the Excel file with new bid data."""
+    with excel_lock:
+        _update_excel(bid_data, sl_no)
+
+
+def _update_excel(bid_data, sl_no):
+    """Write one bid to the Excel file; callers must hold excel_lock."""
     try:
         bid_data["SL No"] = sl_no
         excel_file = os.path.join(main_folder, f"{script_name}.xlsx")
@@ -567,7 +595,7 @@ def parse_arguments():
     Returns:
         argparse.Namespace: Parsed arguments.
     """
-    parser = argparse.ArgumentParser(description="COMMBUYS bid scraper")
+    parser = argparse.ArgumentParser(description="BuySpeed multi-tenant bid scraper")
     parser.add_argument(
         "--days",
         type=int,
@@ -584,6 +612,17 @@ def parse_arguments():
         type=str,
         help="End date in YYYY-MM-DD format (defaults to today if start-date is provided)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of tenants processed concurrently (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--sites",
+        nargs="+",
+        help="Only process these tenant prefixes, e.g. --sites CB NJ (default: all)",
+    )
     return parser.parse_args()
 
 
@@ -612,18 +651,6 @@ def get_date_range(args):
     return start_date, end_date
 
 
-def should_process_bid(posted_date_str, start_date, end_date):
-    """
-    Determine if a bid should be processed based on its posted date and the date range.
-    """
-    try:
-        posted_date = datetime.strptime(posted_date_str, "%Y-%m-%d").date()
-        return start_date <= posted_date <= end_date
-    except ValueError:
-        log_message(f"⚠️ Could not parse date: {posted_date_str}")
-        return False
-
-
 def clean_up_script_folder():
     """
     Clean up the script-specific download folder by moving all files to their respective bid folders.
@@ -636,6 +663,11 @@ def clean_up_script_folder():
             # You can decide what to do with these files (e.g., move to a 'misc' folder or delete)
 
 
+def leftovers_folder():
+    """Folder for downloads that finished after their bid stopped waiting for them."""
+    return os.path.join(main_folder, "unmatched_downloads")
+
+
 def signal_handler(signum, frame):
     """Handle Ctrl+C by stopping all processing and closing drivers."""
     log_message("\n\n🛑 Ctrl+C detected. Initiating graceful shutdown...")
@@ -643,178 +675,251 @@ def signal_handler(signum, frame):
     # Set the stop event to signal all threads to stop
     stop_processing.set()
 
-    # Close all active browser instances
-    log_message("🌐 Closing all browser instances...")
-    for driver in active_drivers:
-        try:
-            driver.quit()
-            log_message("✅ Closed a browser instance")
-        except Exception as e:
-            log_message(f"⚠️ Error closing browser: {str(e)}")
-
-    # Shutdown thread pool if it exists
-    if thread_pool:
-        log_message("🧵 Shutting down thread pool...")
-        thread_pool.shutdown(wait=False)
+    # Close all browser instances
+    if driver_pool:
+        log_message("🌐 Closing all browser instances...")
+        driver_pool.close()
 
     log_message("👋 Shutdown complete. Exiting...")
     sys.exit(0)
 
 
-def process_site(url, args):
-    """Process a single procurement site."""
+def allocate_sl_no():
+    """Return the next serial number shared by all tenants."""
+    global next_sl_no
+    with sl_no_lock:
+        sl_no = next_sl_no
+        next_sl_no += 1
+        return sl_no
+
+
+def process_site(driver, url, start_date, end_date):
+    """
+    Process a single BuySpeed tenant.
+
+    Args:
+        driver (webdriver.Chrome): Driver checked out for this tenant.
+        url (str): Advanced search URL of the tenant.
+        start_date (date): First posted date to keep.
+        end_date (date): Last posted date to keep.
+
+    Returns:
+        int: Number of bids saved for the tenant.
+
+    Raises:
+        Exception: If the site could not be loaded or searched, so the tenant is retried.
+    """
     site_info = get_site_info(url)
+    metrics = get_metrics()
     log_message(f"\n{'='*80}")
     log_message(f"🌐 Starting process for {site_info['name']} ({url})")
     log_message(f"{'='*80}")
 
-    driver = setup_driver()
-    active_drivers.append(driver)
+    throttle(url)
+    driver.get(url)
+    log_message(f"✅ Successfully loaded site: {url}")
 
-    try:
-        driver.get(url)
-        log_message(f"✅ Successfully loaded {site_info['name']}")
-
-        if stop_processing.is_set():
-            log_message(f"🛑 Stopping processing of {site_info['name']}")
-            return
+    # Wait for the page to settle instead of a fixed delay
+    network_idle(driver, replaces=10, label="tenant page load")
 
-        # Perform advanced search
+    # Perform advanced search
+    with metrics.span(SEARCH):
         click_advanced_search(driver)
-        log_message(f"✅ Completed advanced search setup for {site_info['name']}")
-
-        processed_bids = 0
-        sl_no = 1
-        cutoff_date = datetime.now() - timedelta(days=args.days)
+    log_message(f"✅ Completed advanced search for {site_info['name']}")
 
-        # Extract bid links
+    # Extract bid links
+    with metrics.span(LISTING):
         bid_links = extract_bid_links(driver, max_links=50)
-        total_bids = len(bid_links)
-        log_message(f"\n📊 Found {total_bids} bids for {site_info['name']}")
+    total_bids = len(bid_links)
+    log_message(f"\n📊 Found {total_bids} bids for {site_info['name']}")
 
-        # Process each bid
-        for index, link in enumerate(bid_links, start=1):
-            if stop_processing.is_set():
-                log_message(f"🛑 Stopping bid processing for {site_info['name']}")
-                break
+    processed_bids = 0
+
+    # The results grid has no posted date column, so the date is only known
+    # once the detail page is open; the window reports how many loads that cost
+    window = DateWindow(start_date, end_date, label=site_info["name"])
+
+    # Process each bid
+    for index, link in enumerate(bid_links, start=1):
+        if stop_processing.is_set():
+            log_message(f"🛑 Stopping bid processing for {site_info['name']}")
+            break
 
-            log_message(f"\n{'='*50}")
-            log_message(f"🔍 Processing {site_info['name']} bid {index}/{total_bids}")
+        try:
+            log_message(f"\n🔍 Processing {site_info['name']} bid {index}/{total_bids}")
+            log_message(f"🔗 URL: {link}")
+
+            # Check cache before processing
+            if not should_process_bid_link(link):
+                continue
 
-            bid_details = extract_bid_details(driver, link)
+            with metrics.span(DETAIL):
+                bid_details = extract_bid_details(driver, link)
             if bid_details is None or "Solicitation Number" not in bid_details:
                 continue
 
-            if "Posted Date" in bid_details and bid_details["Posted Date"] != "N/A":
-                try:
-                    posted_date = datetime.strptime(
-                        bid_details["Posted Date"].strip(),
-                        "%Y-%m-%d",
-                    )
-                    if posted_date > cutoff_date:
-                        # Download attachments
-                        attachments_downloaded, downloaded_files = download_attachments(
-                            driver,
-                            f"{site_info['prefix']}_{bid_details['Solicitation Number']}",
-                        )
-                        if attachments_downloaded:
-                            bid_details["Attachments"] = downloaded_files
-                        # Update Excel file
-                        update_excel(bid_details, sl_no)
-                        processed_bids += 1
-                        sl_no += 1
-                    else:
-                        log_message(
-                            f"⏭️ Skipping bid {bid_details['Solicitation Number']} - Posted Date: {posted_date}"
-                        )
-                except ValueError:
-                    log_message(
-                        f"⚠️ Could not parse date for bid {bid_details['Solicitation Number']}"
-                    )
-            else:
+            if "Posted Date" not in bid_details or bid_details["Posted Date"] == "N/A":
                 log_message(
                     f"⚠️ No Posted Date found for bid {bid_details.get('Solicitation Number', 'Unknown')}"
                 )
+                continue
 
-        log_message(f"\n📊 {site_info['name']} Summary:")
-        log_message(f"Total bids found: {total_bids}")
-        log_message(f"Bids processed: {processed_bids}")
+            if window.classify(bid_details["Posted Date"]) != KEEP:
+                log_message(
+                    f"⏭️ Skipping bid - Posted Date: {bid_details['Posted Date']} (outside date range {start_date} to {end_date})"
+                )
+                continue
 
-    except Exception as e:
-        log_message(f"❌ Error processing {site_info['name']}: {str(e)}")
-        raise
-    finally:
-        try:
-            driver.quit()
-            active_drivers.remove(driver)
-        except:
-            pass
+            log_message(
+                f"✅ Bid qualifies for processing - Posted Date: {bid_details['Posted Date']}"
+            )
 
+            # Check for attachments before downloading
+            attachments = driver.find_elements(
+                By.XPATH,
+                "//a[contains(@href, 'javascript:downloadFile') or contains(@href, 'javascript:downloadForm')]",
+            )
 
-def process_site_with_retry(url, args, max_retries=3):
-    """Process a site with retry mechanism."""
-    site_info = get_site_info(url)
-    retry_count = 0
+            if attachments:
+                attachment_names = [att.text for att in attachments]
+                log_message(f"📎 Found {len(attachments)} attachments:")
+                for att in attachment_names:
+                    log_message(f"   - {att}")
 
-    while retry_count < max_retries:
+                # Download attachments
+                with metrics.span(DOWNLOAD):
+                    attachments_downloaded, downloaded_files = download_attachments(
+                        driver, bid_details["Solicitation Number"]
+                    )
+                if attachments_downloaded:
+                    bid_details["Attachments"] = downloaded_files
+                    log_message(f"✅ Successfully downloaded attachments")
+            else:
+                log_message("ℹ️ No attachments found for this bid")
+                bid_details["Attachments"] = ""
+
+            # Update Excel file
+            log_message("💾 Saving bid to Excel...")
+            with metrics.span(EXCEL):
+                update_excel(bid_details, allocate_sl_no())
+            metrics.count(BIDS_SAVED)
+            log_message(
+                f"✅ Successfully saved bid {bid_details['Solicitation Number']} to Excel"
+            )
+
+            # Save to cache after successful processing
+            bid_details["Bid Detail Page URL"] = link
+            save_to_cache(link, bid_details)
+
+            processed_bids += 1
+
+        except Exception as e:
+            log_message(f"❌ Error processing bid: {str(e)}")
+            continue
+
+    log_message(window.summary())
+    log_message(f"\n📊 {site_info['name']} Summary:")
+    log_message(f"Total bids found: {total_bids}")
+    log_message(f"Bids processed: {processed_bids}")
+    return processed_bids
+
+
+def tenant_worker(work_queue, results, start_date, end_date):
+    """
+    Pull tenants from the shared work queue and process them on a pooled driver.
+
+    A tenant that fails is put back on the queue until it has been tried
+    MAX_TENANT_RETRIES times, so another worker (and browser) can pick it up.
+    """
+    while not stop_processing.is_set():
         try:
-            return process_site(url, args)
+            url, attempt = work_queue.get_nowait()
+        except queue.Empty:
+            return
+
+        site_info = get_site_info(url)
+        healthy = True
+        driver = None
+        try:
+            driver = driver_pool.checkout(url)
+            saved = process_site(driver, url, start_date, end_date)
+            results[url] = {"status": "success", "bids": saved, "attempts": attempt}
         except Exception as e:
-            retry_count += 1
-            if retry_count >= max_retries:
+            healthy = False
+            if attempt < MAX_TENANT_RETRIES and not stop_processing.is_set():
                 log_message(
-                    f"❌ Failed to process {site_info['name']} after {max_retries} attempts"
+                    f"⚠️ Retry {attempt}/{MAX_TENANT_RETRIES} for {site_info['name']}: {str(e)}"
                 )
-                raise
-            log_message(f"⚠️ Retry {retry_count}/{max_retries} for {site_info['name']}")
-            time.sleep(5 * retry_count)  # Exponential backoff
+                time.sleep(5 * attempt)  # Back off before the tenant is retried
+                work_queue.put((url, attempt + 1))
+            else:
+                log_message(
+                    f"❌ Failed to process {site_info['name']} after {attempt} attempts: {str(e)}"
+                )
+                results[url] = {"status": "failed", "bids": 0, "attempts": attempt}
+        finally:
+            if driver:
+                driver_pool.checkin(driver, healthy)
+            work_queue.task_done()
+
+
+def get_cache_file():
+    """Return the path of the shared BuySpeed cache file."""
+    cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(
+        cache_dir, f"{os.path.splitext(os.path.basename(__file__))[0]}_cache.json"
+    )
 
 
 def load_cache():
     """Load the cache from JSON file."""
-    cache_file = os.path.join(
-        os.path.dirname(os.path.dirname(__file__)),
-        "cache",
-        f"{os.path.splitext(os.path.basename(__file__))[0]}_cache.json",
-    )
+    cache_file = get_cache_file()
     if os.path.exists(cache_file):
         with open(cache_file, "r") as f:
             return json.load(f)
-    return {}
+
+    # Fold in the caches of the former 01_BuySpeed_01..04 copies on first run
+    cache = {}
+    for legacy_file in sorted(
+        glob.glob(os.path.join(os.path.dirname(cache_file), "01_BuySpeed_0*_cache.json"))
+    ):
+        try:
+            with open(legacy_file, "r") as f:
+                cache.update(json.load(f))
+        except Exception as e:
+            log_message(f"⚠️ Could not read legacy cache {legacy_file}: {str(e)}")
+    return cache
 
 
 def save_to_cache(bid_link, bid_details):
     """Save bid details to cache."""
-    # Create cache directory if it doesn't exist
-    cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache")
-    os.makedirs(cache_dir, exist_ok=True)
-
-    cache_file = os.path.join(
-        cache_dir, f"{os.path.splitext(os.path.basename(__file__))[0]}_cache.json"
-    )
+    with cache_lock:
+        cache = load_cache()
 
-    cache = load_cache()
+        # Add/update the bid in cache
+        cache[bid_link] = {
+            "posted_date": bid_details.get("Posted Date", ""),
+            "last_checked": datetime.now().strftime("%Y-%m-%d"),
+        }
 
-    # Add/update the bid in cache
-    cache[bid_link] = {
-        "posted_date": bid_details.get("Posted Date", ""),
-        "last_checked": datetime.now().strftime("%Y-%m-%d"),
-    }
+        # Remove bids older than 3 months
+        three_months_ago = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
+        cache = {
+            k: v
+            for k, v in cache.items()
+            if v.get("posted_date", "") >= three_months_ago
+        }
 
-    # Remove bids older than 3 months
-    three_months_ago = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
-    cache = {
-        k: v for k, v in cache.items() if v.get("posted_date", "") >= three_months_ago
-    }
-
-    # Save updated cache
-    with open(cache_file, "w") as f:
-        json.dump(cache, f, indent=2)
+        # Save updated cache
+        with open(get_cache_file(), "w") as f:
+            json.dump(cache, f, indent=2)
 
 
 def should_process_bid_link(bid_link):
     """Check if bid should be processed based on cache."""
-    cache = load_cache()
+    with cache_lock:
+        cache = load_cache()
     if bid_link in cache:
         bid_data = cache[bid_link]
         log_message(
@@ -824,61 +929,6 @@ def should_process_bid_link(bid_link):
     return True
 
 
-def process_bid(bid_details, site_info, cutoff_date, sl_no, driver):
-    """Process a single bid."""
-    if bid_details is None or "Solicitation Number" not in bid_details:
-        return False
-
-    bid_link = bid_details.get("Bid Detail Page URL")
-    if not should_process_bid_link(bid_link):
-        return False
-
-    if "Posted Date" in bid_details and bid_details["Posted Date"] != "N/A":
-        try:
-            posted_date = datetime.strptime(
-                bid_details["Posted Date"].strip(),
-                "%Y-%m-%d",
-            )
-            if posted_date.date() >= cutoff_date.date():
-                log_message(
-                    f"✅ Processing bid from {posted_date.strftime('%Y-%m-%d')}"
-                )
-
-                # Download attachments
-                attachments_downloaded, downloaded_files = download_attachments(
-                    driver,
-                    f"{site_info['prefix']}_{bid_details['Solicitation Number']}",
-                )
-                if attachments_downloaded:
-                    bid_details["Attachments"] = downloaded_files
-                    log_message(f"✅ Downloaded attachments: {downloaded_files}")
-
-                # Update Excel file
-                update_excel(bid_details, sl_no)
-                log_message(
-                    f"✅ Saved bid {bid_details['Solicitation Number']} to Excel"
-                )
-
-                # Save to cache
-                save_to_cache(bid_link, bid_details)
-
-                return True
-            else:
-                log_message(
-                    f"⏭️ Skipping bid {bid_details['Solicitation Number']} - Posted Date: {posted_date.strftime('%Y-%m-%d')} is before cutoff date {cutoff_date.strftime('%Y-%m-%d')}"
-                )
-        except ValueError:
-            log_message(
-                f"⚠️ Could not parse date for bid {bid_details['Solicitation Number']}"
-            )
-    else:
-        log_message(
-            f"⚠️ No Posted Date found for bid {bid_details.get('Solicitation Number', 'Unknown')}"
-        )
-
-    return False
-
-
 def log_message(message):
     """Thread-safe logging function."""
     with log_lock:
@@ -908,148 +958,70 @@ def load_page_with_retry(driver, url, max_retries=3):
 
 
 def main():
-    """Main function to execute the bid extraction process for multiple sites."""
-    global base_folder, main_folder, script_download_folder, script_name
+    """Main function to execute the bid extraction process for all BuySpeed tenants."""
+    global base_folder, main_folder, script_download_folder, script_name, driver_pool
 
     # Setup folders
     base_folder, main_folder, script_download_folder = setup_folders()
+    get_metrics().set_folder(main_folder)
     script_name = os.path.splitext(os.path.basename(__file__))[0]
 
     args = parse_arguments()
     start_date, end_date = get_date_range(args)
 
+    urls = get_tenant_urls(args.sites)
+    workers = max(1, min(args.workers, len(urls)))
+
     log_message(f"🚀 Multi-Site Bids Extraction Started")
     log_message(f"📅 Looking for bids from {start_date} to {end_date}")
+    log_message(f"🌐 {len(urls)} tenants on {workers} concurrent browsers")
     log_message(f"📁 Saving data in folder: {main_folder}")
     log_message(f"📁 Temporary download folder: {script_download_folder}")
 
-    # Keep all URLs
-    urls = [
-        "https://oregonbuys.gov/bso/view/search/external/advancedSearchBid.xhtml?openBids=true",
-        "https://arbuy.arkansas.gov/bso/view/search/external/advancedSearchBid.xhtml?openBids=true",
-        "https://nevadaepro.com/bso/view/search/external/advancedSearchBid.xhtml?openBids=true"
-    ]
-
-    sl_no = 1  # Global counter for all bids across all sites
+    signal.signal(signal.SIGINT, signal_handler)
 
+    # Shared work queue of (url, attempt); workers pull the next tenant as soon as they are free
+    work_queue = queue.Queue()
     for url in urls:
-        driver = None
-        try:
-            driver = setup_driver()
-            driver.get(url)
-            log_message(f"✅ Successfully loaded site: {url}")
-
-            # Add delay for page stabilization
-            time.sleep(10)
-
-            try:
-                # Perform advanced search
-                click_advanced_search(driver)
-                log_message(f"✅ Completed advanced search")
-
-                # Extract bid links
-                bid_links = extract_bid_links(driver, max_links=50)
-                total_bids = len(bid_links)
-                log_message(f"\n📊 Found {total_bids} bids")
-
-                # Process each bid
-                for index, link in enumerate(bid_links, start=1):
-                    try:
-                        log_message(f"\n🔍 Processing bid {index}/{total_bids}")
-                        log_message(f"🔗 URL: {link}")
-
-                        # Check cache before processing
-                        if not should_process_bid_link(link):
-                            continue
-
-                        bid_details = extract_bid_details(driver, link)
-                        if (
-                            bid_details is None
-                            or "Solicitation Number" not in bid_details
-                        ):
-                            continue
-
-                        if (
-                            "Posted Date" in bid_details
-                            and bid_details["Posted Date"] != "N/A"
-                        ):
-                            if should_process_bid(
-                                bid_details["Posted Date"], start_date, end_date
-                            ):
-                                log_message(
-                                    f"✅ Bid qualifies for processing - Posted Date: {bid_details['Posted Date']}"
-                                )
-
-                                # Check for attachments before downloading
-                                attachments = driver.find_elements(
-                                    By.XPATH,
-                                    "//a[contains(@href, 'javascript:downloadFile') or contains(@href, 'javascript:downloadForm')]",
-                                )
-
-                                if attachments:
-                                    attachment_names = [att.text for att in attachments]
-                                    log_message(
-                                        f"📎 Found {len(attachments)} attachments:"
-                                    )
-                                    for att in attachment_names:
-                                        log_message(f"   - {att}")
-
-                                    # Download attachments
-                                    attachments_downloaded, downloaded_files = (
-                                        download_attachments(
-                                            driver, bid_details["Solicitation Number"]
-                                        )
-                                    )
-                                    if attachments_downloaded:
-                                        bid_details["Attachments"] = downloaded_files
-                                        log_message(
-                                            f"✅ Successfully downloaded attachments"
-                                        )
-                                else:
-                                    log_message("ℹ️ No attachments found for this bid")
-                                    bid_details["Attachments"] = ""
-
-                                # Update Excel file
-                                log_message("💾 Saving bid to Excel...")
-                                update_excel(bid_details, sl_no)
-                                log_message(
-                                    f"✅ Successfully saved bid {bid_details['Solicitation Number']} to Excel"
-                                )
-
-                                # Save to cache after successful processing
-                                bid_details["Bid Detail Page URL"] = link
-                                save_to_cache(link, bid_details)
-
-                                sl_no += 1
-                            else:
-                                log_message(
-                                    f"⏭️ Skipping bid - Posted Date: {bid_details['Posted Date']} (outside date range {start_date} to {end_date})"
-                                )
-
-                    except Exception as e:
-                        log_message(f"❌ Error processing bid: {str(e)}")
-                        continue
-
-            except Exception as e:
-                log_message(f"❌ Error in search process: {str(e)}")
+        work_queue.put((url, 1))
 
-        except Exception as e:
-            log_message(f"❌ Error processing site: {str(e)}")
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                except:
-                    pass
+    results = {}
+    run_start = time.time()
+    driver_pool = DriverPool(setup_driver, size=workers)
+    try:
+        threads = [
+            threading.Thread(
+                target=tenant_worker,
+                args=(work_queue, results, start_date, end_date),
+                name=f"buyspeed-worker-{index}",
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        driver_pool.close()
 
     # Final cleanup - Add this before renaming the folder
     try:
+        sweep_slots(script_download_folder, leftovers_folder())
         if os.path.exists(script_download_folder):
             shutil.rmtree(script_download_folder)
             log_message("✅ Removed temporary download folder")
     except Exception as e:
         log_message(f"⚠️ Error removing temporary folder: {str(e)}")
 
+    log_message(f"\n📊 Tenant Summary ({(time.time() - run_start) / 60:.1f} minutes):")
+    for url in urls:
+        result = results.get(url, {"status": "not run", "bids": 0, "attempts": 0})
+        log_message(
+            f"  {get_site_info(url)['name']:<22} {result['status']:<8} "
+            f"bids: {result['bids']:<4} attempts: {result['attempts']}"
+        )
+
     log_message(f"\n💾 Final results saved to {script_name}.xlsx")
 
     # Mark folder as completed
@@ -15,14 +15,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.utils import safe_move, play_notification_sound
 import time
 from datetime import datetime, timedelta
-import random
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from bs4 import BeautifulSoup
+from utils.page_parser import ParsedPage, compile_xpath, has_class, node_text
+from utils.waits import pace
+from utils.interventions import get_intervention_queue
+from utils.sessions import get_session_vault
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -50,6 +53,28 @@ import traceback
 # Disable SSL warnings (use with caution in production)
 urllib3.disable_warnings(InsecureRequestWarning)
 
+# Selectors for the search results and bid detail pages, compiled once
+NOTICE_XPATH = compile_xpath(f"//div[{has_class('notice-container')}]")
+NEXT_PAGE_XPATH = compile_xpath("//a[@class='page-link next']")
+AVAILABLE_DATE_XPATH = compile_xpath(
+    f"//label[.='Available Date']/following::div[{has_class('form-control-static')}][1]"
+)
+FORM_BODY_XPATH = compile_xpath("//div[@class='portlet-body form']")
+FORM_VALUE_XPATH = compile_xpath(".//div[@class='form-control form-control-static']")
+FORM_LABEL_XPATH = compile_xpath(".//label")
+PIN_DUE_DATE_XPATH = compile_xpath(
+    f"//label[.='PIN - Due Date']/preceding::div[{has_class('form-control-static')}][1]"
+)
+TITLE_XPATH = compile_xpath("//span[@class='caption-subject bold']")
+DESCRIPTION_XPATH = compile_xpath(
+    "//span[@class='caption-subject bold uppercase'][.=' Description']"
+    f"/ancestor::div[@class='portlet light'][1]//div[{has_class('col-md-12')}]"
+)
+ATTACHMENTS_HEADER_XPATH = compile_xpath(
+    "//span[@class='caption-subject bold uppercase'][.=' Attachments']"
+)
+PASSPORT_LINK_XPATH = compile_xpath("//a[contains(@href, 'passport.cityofnewyork.us')]")
+
 # Load environment variables
 load_dotenv()
 
@@ -154,7 +179,7 @@ def random_sleep(min_seconds, max_seconds):
         min_seconds (float): Minimum sleep duration in seconds.
         max_seconds (float): Maximum sleep duration in seconds.
     """
-    time.sleep(random.uniform(min_seconds, max_seconds))
+    pace(min_seconds, max_seconds)
 
 
 def login(driver, email, password):
@@ -222,6 +247,40 @@ def login(driver, email, password):
         return False
 
 
+def login_with_retries(driver, email, password, max_attempts=3):
+    """
+    Log in, retrying a few times on failure.
+
+    Returns:
+        bool: True if the login succeeded.
+    """
+    for attempt in range(max_attempts):
+        print(f"Attempting login (attempt {attempt + 1})")
+        if login(driver, email, password):
+            print("Login successful")
+            return True
+        print(f"Login attempt {attempt + 1} failed. Retrying...")
+        random_sleep(5, 10)
+    return False
+
+
+def is_logged_in(driver):
+    """
+    Cheap session check on the Notification page, where a login leaves the
+    browser; visitors are offered a login link instead.
+
+    Returns:
+        bool: True if the browser is logged in.
+    """
+    driver.get("https://a856-cityrecord.nyc.gov/Notification")
+    WebDriverWait(driver, 20).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+    return driver.current_url.startswith(
+        "https://a856-cityrecord.nyc.gov/Notification"
+    ) and not driver.find_elements(By.XPATH, "//a[contains(@href, '/Visitor/LogIn')]")
+
+
 def navigate_to_advanced_search(driver):
     """
     Navigate to the Advanced Search page on the NYC procurement website.
@@ -342,7 +401,7 @@ def extract_bid_data(driver, max_bids=30):
         max_bids (int): Maximum number of bids to extract.
 
     Returns:
-        list: A list of BeautifulSoup objects representing the extracted bid data.
+        list: A list of lxml elements, one notice-container per bid.
     """
     all_bids = []
     page = 1
@@ -354,8 +413,8 @@ def extract_bid_data(driver, max_bids=30):
             EC.presence_of_element_located((By.CLASS_NAME, "notice-container"))
         )
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        bids = soup.find_all("div", class_="notice-container")
+        page_snapshot = ParsedPage.from_driver(driver, fixture="02_NYC/search")
+        bids = page_snapshot.select(NOTICE_XPATH)
 
         if not bids:
             print("No bids found on this page. Ending extraction.")
@@ -369,8 +428,7 @@ def extract_bid_data(driver, max_bids=30):
         if len(all_bids) >= max_bids:
             break
 
-        next_page = soup.find("a", class_="page-link next")
-        if not next_page:
+        if not page_snapshot.exists(NEXT_PAGE_XPATH):
             break
 
         next_page_link = WebDriverWait(driver, 10).until(
@@ -397,19 +455,17 @@ def extract_bid_data(driver, max_bids=30):
     return all_bids
 
 
-def check_available_date(driver, bid_link):
+def load_bid_page(driver, bid_link):
     """
-    Check if the bid has an "Available Date" on its detail page.
-
-    This function navigates to the bid detail page and checks for the presence of an "Available Date" field.
+    Open a bid detail page and parse it once.
 
     Args:
         driver (webdriver.Chrome): The WebDriver instance.
-        bid_link (str): The URL of the bid detail page.
+        bid_link (str): The site-relative URL of the bid detail page.
 
     Returns:
-        tuple: A tuple containing a boolean indicating whether the "Available Date" is found,
-               and the "Available Date" string if found, or None otherwise.
+        ParsedPage: The parsed detail page, shared by check_available_date()
+        and extract_bid_details().
     """
     driver.get("https://a856-cityrecord.nyc.gov" + bid_link)
     random_sleep(2, 4)
@@ -418,18 +474,27 @@ def check_available_date(driver, bid_link):
         EC.presence_of_element_located((By.CLASS_NAME, "portlet-body"))
     )
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    available_date_label = soup.find("label", string="Available Date")
+    return ParsedPage.from_driver(driver, fixture="02_NYC/detail")
+
+
+def check_available_date(page):
+    """
+    Check if the bid has an "Available Date" on its detail page.
+
+    Args:
+        page (ParsedPage): The parsed bid detail page.
 
-    if available_date_label:
-        available_date = available_date_label.find_next(
-            "div", class_="form-control-static"
-        ).text.strip()
-        return True, available_date
+    Returns:
+        tuple: A tuple containing a boolean indicating whether the "Available Date" is found,
+               and the "Available Date" string if found, or None otherwise.
+    """
+    available_date_div = page.select_one(AVAILABLE_DATE_XPATH)
+    if available_date_div is not None:
+        return True, node_text(available_date_div)
     return False, None
 
 
-def extract_bid_details(driver, bid, index):
+def extract_bid_details(driver, page, index):
     """
     Extract details from a specific bid page.
 
@@ -438,7 +503,7 @@ def extract_bid_details(driver, bid, index):
 
     Args:
         driver (webdriver.Chrome): The WebDriver instance.
-        bid (BeautifulSoup): The BeautifulSoup object representing the bid data.
+        page (ParsedPage): The parsed bid detail page.
         index (int): The index of the bid in the overall extraction process.
 
     Returns:
@@ -461,16 +526,14 @@ def extract_bid_details(driver, bid, index):
         "Attachments": "",
     }
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-
-    form_body = soup.find("div", class_="portlet-body form")
-    if form_body:
-        divs = form_body.find_all("div", class_="form-control form-control-static")
-        labels = form_body.find_all("label")
+    form_body = page.select_one(FORM_BODY_XPATH)
+    if form_body is not None:
+        divs = page.select(FORM_VALUE_XPATH, form_body)
+        labels = page.select(FORM_LABEL_XPATH, form_body)
 
         for div, label in zip(divs, labels):
-            text = div.text.strip()
-            label_text = label.text.strip()
+            text = node_text(div)
+            label_text = node_text(label)
 
             if label_text == "Publication Date":
                 details["Posted Date"] = text
@@ -485,11 +548,9 @@ def extract_bid_details(driver, bid, index):
             elif label_text == "Contact Information":
                 details["Contact Information"] = text
 
-    pin_due_date_div = soup.find("label", string="PIN - Due Date")
-    if pin_due_date_div:
-        pin_due_date_text = pin_due_date_div.find_previous(
-            "div", class_="form-control-static"
-        ).text.strip()
+    pin_due_date_div = page.select_one(PIN_DUE_DATE_XPATH)
+    if pin_due_date_div is not None:
+        pin_due_date_text = node_text(pin_due_date_div)
         pin_match = re.search(r"PIN#([\w-]+)", pin_due_date_text)
         due_date_match = re.search(
             r"Due:\s*([\d/]+\s*[\d:]+\s*[APM]+)", pin_due_date_text
@@ -502,30 +563,18 @@ def extract_bid_details(driver, bid, index):
         if due_date_match:
             details["Response Date"] = due_date_match.group(1)
 
-    title_span = soup.find("span", class_="caption-subject bold")
-    if title_span:
-        details["Solicitation Title"] = title_span.text.strip()
-
-    description_div = soup.find(
-        "span", string=" Description", class_="caption-subject bold uppercase"
-    )
-    if description_div:
-        description_content = description_div.find_parent(
-            "div", class_="portlet light"
-        ).find("div", class_="col-md-12")
-        if description_content:
-            details["Description"] = " ".join(
-                [p.text.strip() for p in description_content.find_all("p")]
-            )
+    title_span = page.select_one(TITLE_XPATH)
+    if title_span is not None:
+        details["Solicitation Title"] = node_text(title_span)
 
-    attachments_section = soup.find(
-        "span", string=" Attachments", class_="caption-subject bold uppercase"
-    )
-    if attachments_section:
-        external_link = soup.find(
-            "a", href=lambda x: x and "passport.cityofnewyork.us" in x
+    description_content = page.select_one(DESCRIPTION_XPATH)
+    if description_content is not None:
+        details["Description"] = " ".join(
+            [node_text(p) for p in page.select(".//p", description_content)]
         )
-        if external_link:
+
+    if page.exists(ATTACHMENTS_HEADER_XPATH):
+        if page.exists(PASSPORT_LINK_XPATH):
             details["Attachments"] = (
                 "Attachments Available"  # We'll handle this in download_attachments
             )
@@ -1193,6 +1242,53 @@ def move_remaining_downloads(download_folder, main_folder):
                 print(f"Moved remaining file {filename} to main folder")
 
 
+def process_bid(driver, bid_link, sl_no, excel_path, total_bids, index):
+    """
+    Scrape one bid, download its attachments and save it to the Excel file.
+
+    Args:
+        driver (webdriver.Chrome): The WebDriver instance.
+        bid_link (str): The site-relative URL of the bid detail page.
+        sl_no (int): Serial number for the Excel row.
+        excel_path (str): Path of the Excel file.
+        total_bids (int): Number of bids on the listing page.
+        index (int): Position of the bid on the listing page.
+
+    Returns:
+        bool: True if the bid has an 'Available Date', which ends the extraction.
+    """
+    metrics = get_metrics()
+    with metrics.span(DETAIL):
+        bid_page = load_bid_page(driver, bid_link)
+
+        has_available_date, available_date = check_available_date(bid_page)
+        if has_available_date:
+            print(f"Found 'Available Date': {available_date}. Stopping extraction.")
+            return True
+
+        bid_details = extract_bid_details(driver, bid_page, sl_no)
+
+    # Pass main_folder instead of a subfolder path
+    with metrics.span(DOWNLOAD):
+        attachments_result = download_attachments(
+            driver,
+            bid_details["Solicitation Number"],
+            main_folder,  # Changed from download_folder to main_folder
+            download_folder,
+            total_bids,
+            index,
+        )
+    bid_details["Attachments"] = attachments_result
+
+    with metrics.span(EXCEL):
+        update_excel(bid_details, excel_path)
+        update_attachments_for_bid(
+            excel_path, bid_details["Solicitation Number"], main_folder
+        )
+    metrics.count(BIDS_SAVED)
+    return False
+
+
 def scrape_city_record():
     """
     Main function to execute the NYC procurement bid extraction process.
@@ -1200,86 +1296,69 @@ def scrape_city_record():
     print("Bids Extraction Started")
     print(f"📁 Saving data in folder: {main_folder}")
 
+    metrics = get_metrics()
+    metrics.set_folder(script_folder)
     driver = setup_driver()
     print("Browser initialized")
 
     try:
-        login_attempts = 0
-        max_login_attempts = 3
-
-        while login_attempts < max_login_attempts:
-            print(f"Attempting login (attempt {login_attempts + 1})")
-            if login(driver, os.getenv("NYC_EMAIL"), os.getenv("NYC_PASSWORD")):
-                print("Login successful")
-                break
-            login_attempts += 1
-            print(f"Login attempt {login_attempts} failed. Retrying...")
-            random_sleep(5, 10)
-
-        if login_attempts == max_login_attempts:
+        # Reuse the saved session when it is still valid, log in otherwise
+        email = os.getenv("NYC_EMAIL")
+        logged_in = get_session_vault().ensure(
+            driver,
+            "nyc",
+            email,
+            "https://a856-cityrecord.nyc.gov/",
+            is_logged_in,
+            lambda d: login_with_retries(d, email, os.getenv("NYC_PASSWORD")),
+        )
+        print(get_session_vault().summary())
+        if not logged_in:
             print("Failed to log in after multiple attempts. Exiting.")
             return
 
-        if not navigate_to_advanced_search(driver):
+        with metrics.span(SEARCH):
+            on_search_page = navigate_to_advanced_search(driver)
+            if on_search_page:
+                apply_filters(driver)
+        if not on_search_page:
             print("Failed to navigate to Advanced Search page. Exiting.")
             return
 
-        apply_filters(driver)
-
+        interventions = get_intervention_queue()
         total_bids_processed = 0
         # Excel file saved in the script folder with IN_PROGRESS suffix
         excel_path = os.path.join(script_folder, "02_NYC.xlsx")
 
         while True:
-            bids = extract_bid_data(driver, max_bids=30)
+            with metrics.span(LISTING):
+                bids = extract_bid_data(driver, max_bids=30)
             total_bids = len(bids)
 
+            has_available_date = False
             for index, bid in enumerate(bids, start=1):
+                bid_link = None
                 try:
-                    bid_link = bid.find("a")["href"]
-                    driver.get("https://a856-cityrecord.nyc.gov" + bid_link)
-                    random_sleep(2, 4)
-
-                    has_available_date, available_date = check_available_date(
-                        driver, bid_link
+                    bid_link = bid.xpath(".//a/@href")[0]
+                    has_available_date = process_bid(
+                        driver, bid_link, total_bids_processed + index, excel_path, total_bids, index
                     )
-
                     if has_available_date:
-                        print(
-                            f"Found 'Available Date': {available_date}. Stopping extraction."
-                        )
                         break
 
-                    bid_details = extract_bid_details(
-                        driver, bid, total_bids_processed + index
-                    )
-
-                    # Pass main_folder instead of a subfolder path
-                    attachments_result = download_attachments(
-                        driver,
-                        bid_details["Solicitation Number"],
-                        main_folder,  # Changed from download_folder to main_folder
-                        download_folder,
-                        total_bids,
-                        index,
-                    )
-                    bid_details["Attachments"] = attachments_result
-
-                    update_excel(bid_details, excel_path)
-                    update_attachments_for_bid(
-                        excel_path, bid_details["Solicitation Number"], main_folder
-                    )
-
                     total_bids_processed += 1
                 except Exception as e:
                     print(f"Error processing bid {index}: {str(e)}")
                     traceback.print_exc()  # Print the full traceback for debugging
                     play_notification_sound()
-                    user_input = input(
-                        "Press Enter to continue or type 'exit' to stop: "
+                    # Park the bid for the operator and keep going; resolved bids are retried below
+                    interventions.park(
+                        f"Error processing bid {index}: {str(e)}",
+                        driver,
+                        url="https://a856-cityrecord.nyc.gov" + bid_link if bid_link else None,
+                        bid=bid_link,
+                        context={"bid_link": bid_link, "index": index, "total_bids": total_bids},
                     )
-                    if user_input.lower() == "exit":
-                        break  # Exit the loop if user chooses to stop
 
             print(
                 f"Bids with Posting Range within 2 Days Successfully Extracted: {total_bids_processed}"
@@ -1302,6 +1381,26 @@ def scrape_city_record():
             driver.execute_script("arguments[0].click();", next_page_link)
             random_sleep(2, 4)
 
+        # Retry the bids an operator resolved while the listing was being read
+        for item in interventions.drain():
+            context = item["context"]
+            if not context.get("bid_link"):
+                continue
+            print(f"Retrying parked bid {context['bid_link']}")
+            try:
+                process_bid(
+                    driver,
+                    context["bid_link"],
+                    total_bids_processed + 1,
+                    excel_path,
+                    context["total_bids"],
+                    context["index"],
+                )
+                total_bids_processed += 1
+            except Exception as e:
+                print(f"Retry of parked bid {context['bid_link']} failed: {str(e)}")
+                traceback.print_exc()
+
         # After all processing is done:
         move_remaining_downloads(download_folder, main_folder)
         remove_empty_folders(main_folder)
@@ -1338,7 +1437,7 @@ def scrape_city_record():
     except Exception as e:
         print(f"Error during scraping: {str(e)}")
         play_notification_sound()
-        input("Press Enter to continue...")
+        get_intervention_queue().report(f"Error during scraping: {str(e)}", driver)
         traceback.print_exc()
         driver.save_screenshot("scraping_error.png")
         print("Screenshot saved as scraping_error.png")
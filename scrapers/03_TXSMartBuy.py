@@ -16,7 +16,6 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.utils import safe_move, play_notification_sound
 import time
-import random
 from datetime import datetime, timedelta
 import pandas as pd
 from selenium import webdriver
@@ -24,7 +23,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from bs4 import BeautifulSoup
+from utils.page_parser import ParsedPage, compile_xpath, has_class, node_text
+from utils.waits import pace
+from utils.interventions import get_intervention_queue
+from utils.http_fetch import HttpFetcher, http_fetch_enabled
+from utils.http_cache import CachingAdapter, get_http_cache
+from utils.metrics import (
+    BIDS_SAVED, BIDS_SEEN, BIDS_SKIPPED, CLEANUP, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics,
+)
 import requests
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
@@ -50,6 +56,27 @@ os.makedirs(script_folder, exist_ok=True)
 progress_folder = os.path.join(script_folder, script_name)
 os.makedirs(progress_folder, exist_ok=True)
 
+# Selectors for the ESBD search results and bid detail pages, compiled once
+RESULTS_REGION = ("esbd-result-title", None)
+RESULT_LINK_XPATH = compile_xpath(f"//div[{has_class('esbd-result-title')}]/descendant::a[1]/@href")
+NEXT_PAGE_XPATH = compile_xpath("//a[@id='Next']")
+RESULT_CELL_XPATH = compile_xpath(f"//div[{has_class('esbd-result-cell')}]")
+RESULT_TITLE_XPATH = compile_xpath(f"//div[{has_class('esbd-result-title')}]")
+DESCRIPTION_XPATH = compile_xpath(
+    f"//*[@id='content']/div/div/div[{has_class('esbd-container')}]"
+    f"/div[{has_class('esbd-result-body-columns')}]/*[3][self::div]/*[3][self::p]/span"
+)
+DESCRIPTION_FALLBACK_XPATH = compile_xpath(
+    "//strong[contains(text(), 'Solicitation Description')]/following-sibling::p"
+)
+ATTACHMENT_LINK_XPATH = compile_xpath(
+    f"//div[{has_class('esbd-attachment-row-content')}]/descendant::a[@data-action='downloadURL'][1]"
+)
+# A result cell holding nothing but the "Available Date" text
+AVAILABLE_DATE_XPATH = compile_xpath(
+    f"//div[{has_class('esbd-result-cell')}][count(node()) = 1][contains(text(), 'Available Date')]"
+)
+
 
 def setup_driver():
     """
@@ -80,7 +107,7 @@ def random_sleep(min_seconds, max_seconds):
         min_seconds (float): Minimum sleep duration in seconds.
         max_seconds (float): Maximum sleep duration in seconds.
     """
-    time.sleep(random.uniform(min_seconds, max_seconds))
+    pace(min_seconds, max_seconds)
 
 
 def apply_filters(driver):
@@ -147,6 +174,10 @@ def extract_bid_links(driver, batch_size=30):
     """
     Extract bid links from the search results page.
 
+    Whole result pages are read, so a batch can be a little larger than
+    batch_size but always ends at a page boundary and the next batch starts
+    on the following page.
+
     Args:
         driver (webdriver.Chrome): The WebDriver instance.
         batch_size (int): Number of bids to extract in this batch.
@@ -165,19 +196,18 @@ def extract_bid_links(driver, batch_size=30):
             EC.presence_of_element_located((By.CLASS_NAME, "esbd-result-title"))
         )
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        bid_links = soup.find_all("div", class_="esbd-result-title")
+        # Only the results and pager are parsed, not the page head and menus
+        page_snapshot = ParsedPage.from_driver(
+            driver, region=RESULTS_REGION, fixture="03_TXSMartBuy/search"
+        )
 
-        for link in bid_links:
-            all_links.append(link.find("a")["href"])
-            if len(all_links) >= batch_size:
-                break
+        for href in page_snapshot.select(RESULT_LINK_XPATH):
+            all_links.append(str(href))
 
         if len(all_links) >= batch_size:
             break
 
-        next_page = soup.find("a", id="Next")
-        if not next_page:
+        if not page_snapshot.exists(NEXT_PAGE_XPATH):
             break
 
         next_page_link = WebDriverWait(driver, 10).until(
@@ -192,7 +222,7 @@ def extract_bid_links(driver, batch_size=30):
     return all_links
 
 
-def extract_bid_details(driver, bid_link, index, total_bids, max_retries=3):
+def extract_bid_details(driver, bid_link, index, total_bids, max_retries=3, page=None):
     """
     Extract details from a specific bid page.
 
@@ -202,6 +232,8 @@ def extract_bid_details(driver, bid_link, index, total_bids, max_retries=3):
         index (int): The index of the current bid.
         total_bids (int): The total number of bids to process.
         max_retries (int): Maximum number of retries for loading the page.
+        page (ParsedPage): The detail page fetched over HTTP, if it was. The
+            browser only loads the page when this is None.
 
     Returns:
         tuple: A tuple containing the bid details, a boolean indicating if an Available Date was found,
@@ -211,7 +243,7 @@ def extract_bid_details(driver, bid_link, index, total_bids, max_retries=3):
         f"📄 Processing bid {index}/{total_bids} - URL: https://www.txsmartbuy.gov{bid_link}"
     )
 
-    for attempt in range(max_retries):
+    for attempt in range(max_retries if page is None else 0):
         try:
             driver.get("https://www.txsmartbuy.gov" + bid_link)
             WebDriverWait(driver, 20).until(
@@ -229,7 +261,8 @@ def extract_bid_details(driver, bid_link, index, total_bids, max_retries=3):
                 )
                 return None, False, None
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    if page is None:
+        page = ParsedPage.from_driver(driver, fixture="03_TXSMartBuy/detail")
 
     details = {
         "Posted Date": "",
@@ -243,16 +276,16 @@ def extract_bid_details(driver, bid_link, index, total_bids, max_retries=3):
         "Additional Summary": "",
         "Contracting Office Address": "",
         "Contact Information": "",
-        "Bid Detail Page URL": driver.current_url,
+        "Bid Detail Page URL": page.url or driver.current_url,
         "Attachments": [],
     }
 
     # Extract details
-    for div in soup.find_all("div", class_="esbd-result-cell"):
-        label = div.find("strong")
-        if label:
-            key = label.text.strip().rstrip(":")
-            value = div.find("p").text.strip() if div.find("p") else ""
+    for div in page.select(RESULT_CELL_XPATH):
+        label = page.select_one(".//strong", div)
+        if label is not None:
+            key = node_text(label).rstrip(":")
+            value = page.text(".//p", div)
 
             if key == "Solicitation Posting Date":
                 details["Posted Date"] = value
@@ -274,33 +307,21 @@ def extract_bid_details(driver, bid_link, index, total_bids, max_retries=3):
                 print(f"   {key}: {value}")
 
     # Extract title
-    title_div = soup.find("div", class_="esbd-result-title")
-    if title_div:
-        details["Solicitation Title"] = title_div.text.strip()
+    title_div = page.select_one(RESULT_TITLE_XPATH)
+    if title_div is not None:
+        details["Solicitation Title"] = node_text(title_div)
         print(f"   Title: {details['Solicitation Title']}")
 
     # Extract Description using multiple methods
     description = ""
-    try:
-        description_element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located(
-                (
-                    By.CSS_SELECTOR,
-                    "#content > div > div > div.esbd-container > div.esbd-result-body-columns > div:nth-child(3) > p:nth-child(3) > span",
-                )
-            )
-        )
-        description = description_element.text.strip()
-    except TimeoutException:
-        print(f"Description not found with CSS selector for bid {index}")
-        try:
-            description_element = driver.find_element(
-                By.XPATH,
-                "//strong[contains(text(), 'Solicitation Description')]/following-sibling::p",
-            )
-            description = description_element.text.strip()
-        except NoSuchElementException:
+    description_element = page.select_one(DESCRIPTION_XPATH)
+    if description_element is None:
+        print(f"Description not found in the result body for bid {index}")
+        description_element = page.select_one(DESCRIPTION_FALLBACK_XPATH)
+        if description_element is None:
             print(f"Description not found with XPath for bid {index}")
+    if description_element is not None:
+        description = node_text(description_element)
 
     details["Description"] = description
     print(
@@ -308,34 +329,20 @@ def extract_bid_details(driver, bid_link, index, total_bids, max_retries=3):
     )  # Print first 100 characters of description
 
     # Extract attachments
-    attachments_div = soup.find_all("div", class_="esbd-attachment-row-content")
     details["Attachments"] = []
     details["_attachment_urls"] = []
-    if attachments_div:
-        for attachment_row in attachments_div:
-            attachment_link = attachment_row.find(
-                "a", attrs={"data-action": "downloadURL"}
-            )
-            if attachment_link:
-                details["Attachments"].append(attachment_link.text.strip())
-                details["_attachment_urls"].append(
-                    "https://www.txsmartbuy.gov" + attachment_link["data-href"]
-                )
+    for attachment_link in page.select(ATTACHMENT_LINK_XPATH):
+        details["Attachments"].append(node_text(attachment_link))
+        details["_attachment_urls"].append(
+            "https://www.txsmartbuy.gov" + attachment_link.get("data-href")
+        )
 
     print(f"   Found {len(details['Attachments'])} attachments")
 
     # Check for Available Date
-    available_date_div = soup.find(
-        "div",
-        class_="esbd-result-cell",
-        string=lambda text: "Available Date" in text if text else False,
-    )
-    if available_date_div:
-        available_date = (
-            available_date_div.find("p").text.strip()
-            if available_date_div.find("p")
-            else ""
-        )
+    available_date_div = page.select_one(AVAILABLE_DATE_XPATH)
+    if available_date_div is not None:
+        available_date = page.text(".//p", available_date_div)
         print(f"   Available Date found: {available_date}")
         return details, True, available_date
 
@@ -411,13 +418,19 @@ def update_excel(data, excel_path):
     print(f"✅ Excel file updated: {excel_path}")
 
 
-def download_attachments(details, folder_name):
+http_session = None  # Created by download_attachments() on first use without a fetcher
+
+
+def download_attachments(details, folder_name, fetcher=None):
     """
     Download all attachments for a specific bid and move them to the related folder.
 
     Args:
         details (dict): The bid details containing attachment information.
         folder_name (str): The name of the folder to save the attachments.
+        fetcher (HttpFetcher): Downloads the bid's attachments concurrently
+            when given; otherwise they are fetched one by one. Either way
+            unchanged attachments are answered from the HTTP cache.
     """
     print(f"📎 Downloading attachments for bid {details['Solicitation Number']}")
     if not details["Attachments"]:
@@ -433,6 +446,28 @@ def download_attachments(details, folder_name):
         f"Downloading {total_attachments} attachments for bid {details['Solicitation Number']}"
     )
 
+    if fetcher is not None:
+        files = list(zip(details["Attachments"], details["_attachment_urls"]))
+        temp_paths = [os.path.join(progress_folder, file_name) for file_name, _ in files]
+        results = fetcher.download_all(
+            [(file_url, temp_path) for (_, file_url), temp_path in zip(files, temp_paths)]
+        )
+        for (file_name, file_url), temp_path, downloaded in zip(files, temp_paths, results):
+            if not downloaded:
+                print(f"❌ Failed to download {file_name} from {file_url}")
+                continue
+            safe_move(temp_path, os.path.join(bid_folder, file_name))
+            print(f"✅ Successfully downloaded and moved: {file_name}")
+        print(f"✅ All attachments downloaded for bid {details['Solicitation Number']}")
+        return
+
+    global http_session
+    if http_session is None:
+        http_session = requests.Session()
+        adapter = CachingAdapter(portal=script_name)
+        http_session.mount("http://", adapter)
+        http_session.mount("https://", adapter)
+
     for index, (file_name, file_url) in enumerate(
         zip(details["Attachments"], details["_attachment_urls"]), start=1
     ):
@@ -442,7 +477,7 @@ def download_attachments(details, folder_name):
         print(f"   Solicitation Number: {details['Solicitation Number']}")
         print(f"   Posted Date: {details['Posted Date']}")
         try:
-            response = requests.get(file_url)
+            response = http_session.get(file_url)
             if response.status_code == 200:
                 # Save the file temporarily in the progress folder
                 temp_file_path = os.path.join(progress_folder, file_name)
@@ -496,16 +531,17 @@ def move_remaining_files():
         print(f"Warning: Error checking for remaining files: {str(e)}")
 
 
-def handle_error(error_message):
+def handle_error(error_message, driver=None):
     """
-    Handle errors by playing a notification sound and pausing the script.
+    Handle errors by playing a notification sound and reporting them to the dashboard.
 
     Args:
         error_message (str): The error message to display.
+        driver (webdriver.Chrome, optional): Driver to take a screenshot from.
     """
     print(f"❌ Error: {error_message}")
     play_notification_sound()
-    input("Press Enter to continue...")
+    get_intervention_queue().report(error_message, driver)
 
 
 def load_cache():
@@ -572,23 +608,60 @@ def scrape_texas_smartbuy(batch_size=30):
     print(f"🚀 Starting Texas SmartBuy scraping (batch size: {batch_size})")
     print(f"📁 Saving data in folder: {script_folder}")
 
+    metrics = get_metrics()
+    metrics.set_folder(script_folder)
     driver = setup_driver()
     print("Headless browser initialized")
+    fetcher = None
 
     try:
         # Apply filters to the search page
-        apply_filters(driver)
+        with metrics.span(SEARCH):
+            apply_filters(driver)
+
+        # Detail pages and attachments are server-rendered, so they are fetched
+        # over HTTP with the browser's session while the browser stays on the results
+        if http_fetch_enabled():
+            fetcher = HttpFetcher.from_driver(
+                driver, base_url="https://www.txsmartbuy.gov", label=script_name,
+                cache=get_http_cache(),
+            )
 
         excel_path = os.path.join(script_folder, f"{script_name}.xlsx")
         total_bids_processed = 0
 
         while True:
             print(f"\n📃 Processing new batch of bids...")
-            bid_links = extract_bid_links(driver, batch_size=batch_size)
+            with metrics.span(LISTING):
+                bid_links = extract_bid_links(driver, batch_size=batch_size)
 
             if not bid_links:
                 print("No more bids available. Ending extraction.")
                 break
+            metrics.count(BIDS_SEEN, len(bid_links))
+
+            # Fetch the batch's new detail pages concurrently; any that fail
+            # are loaded in the browser below. Bids processed on an earlier
+            # run are revalidated, and only those whose page changed since
+            # (an addendum, a new deadline) are processed again
+            prefetched = {}
+            changed = {}
+            if fetcher is not None:
+                processed = load_cache()
+                new_links = [
+                    link for link in bid_links
+                    if "https://www.txsmartbuy.gov" + link not in processed
+                ]
+                with metrics.span(DETAIL):
+                    pages = fetcher.pages(new_links, expect=RESULT_CELL_XPATH)
+                    changed = fetcher.changed_pages(
+                        [link for link in bid_links if link not in new_links], expect=RESULT_CELL_XPATH
+                    )
+                prefetched = dict(zip(new_links, pages))
+                prefetched.update(changed)
+                print(f"🌐 Fetched {sum(p is not None for p in pages)}/{len(new_links)} bid pages over HTTP")
+                if changed:
+                    print(f"🔄 {len(changed)} previously processed bids changed since the last run")
 
             for index, link in enumerate(bid_links, start=1):
                 print(
@@ -599,12 +672,17 @@ def scrape_texas_smartbuy(batch_size=30):
 
                     # Add cache check here
                     bid_url = "https://www.txsmartbuy.gov" + link
-                    if not should_process_bid_link(bid_url):
+                    if link in changed:
+                        print("🔄 Bid changed since it was processed, updating")
+                    elif not should_process_bid_link(bid_url):
+                        metrics.count(BIDS_SKIPPED)
                         continue
 
-                    details, has_available_date, available_date = extract_bid_details(
-                        driver, link, total_bids_processed + index, len(bid_links)
-                    )
+                    with metrics.span(DETAIL):
+                        details, has_available_date, available_date = extract_bid_details(
+                            driver, link, total_bids_processed + index, len(bid_links),
+                            page=prefetched.get(link),
+                        )
 
                     if details is None:
                         print(
@@ -620,15 +698,18 @@ def scrape_texas_smartbuy(batch_size=30):
 
                     print(f"✅ Scraping bid: {details['Solicitation Number']}")
 
-                    update_excel(details, excel_path)
+                    with metrics.span(EXCEL):
+                        update_excel(details, excel_path)
 
                     folder_name = details["Solicitation Number"]
-                    download_attachments(details, folder_name)
+                    with metrics.span(DOWNLOAD):
+                        download_attachments(details, folder_name, fetcher)
 
                     # Save to cache after successful processing
                     save_to_cache(bid_url, details)
 
                     total_bids_processed += 1
+                    metrics.count(BIDS_SAVED)
                     print(f"✅ Bid {total_bids_processed} processed successfully")
                 except Exception as e:
                     print(
@@ -666,10 +747,15 @@ def scrape_texas_smartbuy(batch_size=30):
         driver.save_screenshot("scraping_error.png")
         print("Screenshot saved as scraping_error.png")
     finally:
-        driver.quit()
-        print("Browser closed")
-        move_remaining_files()
-        print("Remaining files moved to respective bid folders")
+        if fetcher is not None:
+            fetcher.close()
+            print(fetcher.summary())
+            print(get_http_cache().summary())
+        with metrics.span(CLEANUP):
+            driver.quit()
+            print("Browser closed")
+            move_remaining_files()
+            print("Remaining files moved to respective bid folders")
         print("🏁 Scraping process finished")
 
 
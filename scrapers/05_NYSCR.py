@@ -38,9 +38,11 @@ import shutil
 from urllib.parse import urljoin
 from fake_useragent import UserAgent
 from selenium_stealth import stealth
-import pickle
-import zipfile
 from utils.utils import safe_move, play_notification_sound
+from utils.archive_expander import get_archive_expander
+from utils.interventions import get_intervention_queue
+from utils.sessions import get_session_vault
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 import json
 
 # Load environment variables
@@ -132,17 +134,16 @@ def random_scroll(driver):
         random_wait(0.1, 0.5)
 
 
-def load_cookies(driver, path):
-    if os.path.exists(path):
-        with open(path, "rb") as cookiesfile:
-            cookies = pickle.load(cookiesfile)
-            for cookie in cookies:
-                driver.add_cookie(cookie)
-
-
-def save_cookies(driver, path):
-    with open(path, "wb") as filehandler:
-        pickle.dump(driver.get_cookies(), filehandler)
+def is_logged_in(driver):
+    """Cheap session check: visitors are sent from the search page to the login."""
+    driver.get(SEARCH_URL)
+    try:
+        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "orderBy")))
+    except TimeoutException:
+        return False
+    return driver.current_url.startswith(SEARCH_URL) and not driver.find_elements(
+        By.ID, "username"
+    )
 
 
 def login(driver, max_attempts=3):
@@ -202,7 +203,11 @@ def login(driver, max_attempts=3):
                 in driver.page_source.lower()
             ):
                 print("CAPTCHA detected. Please solve the CAPTCHA manually.")
-                input("Press Enter after solving the CAPTCHA...")
+                if not get_intervention_queue().wait(
+                    "Login CAPTCHA: solve it in the browser, then resolve", driver
+                ):
+                    print("CAPTCHA was not solved in time. Exiting script.")
+                    return False
             else:
                 print("Unexpected error. Retrying...")
                 random_wait(5, 0.2)
@@ -618,13 +623,11 @@ def move_remaining_files(download_folder, main_folder):
                     destination = os.path.join(bid_folder_path, filename)
                     try:
                         if filename.lower().endswith((".zip", ".rar", ".7z")):
-                            # Unzip compressed files
-                            with zipfile.ZipFile(source, "r") as zip_ref:
-                                zip_ref.extractall(bid_folder_path)
+                            # Unzip compressed files (the archive is removed afterwards)
+                            get_archive_expander().expand(source, bid_folder_path)
                             print(
                                 f"Extracted compressed file {filename} to {bid_folder}"
                             )
-                            os.remove(source)  # Remove the original compressed file
                             moved = True
                         else:
                             # Move other files using move_file_with_retry
@@ -788,6 +791,8 @@ def main():
     global SCRIPT_DOWNLOAD_FOLDER
     SCRIPT_DOWNLOAD_FOLDER = temp_download_folder
 
+    metrics = get_metrics()
+    metrics.set_folder(main_folder)
     driver = webdriver.Chrome(options=chrome_options)
 
     stealth(
@@ -801,14 +806,21 @@ def main():
     )
 
     try:
-        if not login(driver):
+        # Reuse the saved session when it is still valid, log in otherwise
+        logged_in = get_session_vault().ensure(
+            driver, "nyscr", os.getenv("NYSCR_EMAIL"), BASE_URL, is_logged_in, login
+        )
+        print(get_session_vault().summary())
+        if not logged_in:
             print("Login failed. Exiting script.")
             return
 
-        select_ad_types(driver)
-        sort_by_issue_date(driver)
+        with metrics.span(SEARCH):
+            select_ad_types(driver)
+            sort_by_issue_date(driver)
 
-        bid_links = get_bid_links(driver, days_back=days_back)
+        with metrics.span(LISTING):
+            bid_links = get_bid_links(driver, days_back=days_back)
         if not bid_links:
             print(f"No bids found within the last {days_back} days.")
             return
@@ -816,21 +828,25 @@ def main():
         print(f"Found {len(bid_links)} bids within the last {days_back} days.")
 
         data = []
-        for i, url in enumerate(bid_links, 1):
+        interventions = get_intervention_queue()
+        # Bids that fail are parked for the operator and retried once resolved
+        for i, url in interventions.with_retries(enumerate(bid_links, 1)):
             print(f"Processing bid {i}/{len(bid_links)}")
             try:
                 # Add cache check here
                 if not should_process_bid_link(url):
                     continue
 
-                details = extract_bid_details(driver, url)
+                with metrics.span(DETAIL):
+                    details = extract_bid_details(driver, url)
                 details["SL No"] = i
                 cr_number = details.get("CR Number", f"unknown_bid_{i}")
 
                 # Get attachments without creating folder initially
-                attachment_names = get_attachments(
-                    driver, SCRIPT_DOWNLOAD_FOLDER, cr_number, main_folder
-                )
+                with metrics.span(DOWNLOAD):
+                    attachment_names = get_attachments(
+                        driver, SCRIPT_DOWNLOAD_FOLDER, cr_number, main_folder
+                    )
                 print(f"Downloading {len(attachment_names)} attachments for bid {i}")
 
                 # Add additional wait time after processing each bid
@@ -842,60 +858,62 @@ def main():
                 )
                 data.append(details)
 
-                # Update Excel file after each bid
-                df = pd.DataFrame(data)
-                # Map the old column names to the new standardized column names
-                column_mapping = {
-                    "SL No": "SL No",
-                    "Date of Issue": "Posted Date",
-                    "Due Date/Time": "Response Date",
-                    "Opportunity Type": "Notice Type",
-                    "CR Number": "Solicitation Number",
-                    "Title": "Solicitation Title",
-                    "Agency": "Agency",
-                    "Classification(s)": "Category",
-                    "Description": "Description",
-                    "Additional Summary": "Additional Summary, if any",
-                    "Location": "Contracting Office Address",
-                    "Primary contact": "Contact Information",
-                    "Bid Detail Page URL": "Bid Detail Page URL",
-                    "Attachments": "Attachments"
-                }
+                with metrics.span(EXCEL):
+                    # Update Excel file after each bid
+                    df = pd.DataFrame(data)
+                    # Map the old column names to the new standardized column names
+                    column_mapping = {
+                        "SL No": "SL No",
+                        "Date of Issue": "Posted Date",
+                        "Due Date/Time": "Response Date",
+                        "Opportunity Type": "Notice Type",
+                        "CR Number": "Solicitation Number",
+                        "Title": "Solicitation Title",
+                        "Agency": "Agency",
+                        "Classification(s)": "Category",
+                        "Description": "Description",
+                        "Additional Summary": "Additional Summary, if any",
+                        "Location": "Contracting Office Address",
+                        "Primary contact": "Contact Information",
+                        "Bid Detail Page URL": "Bid Detail Page URL",
+                        "Attachments": "Attachments"
+                    }
                 
-                # Rename the columns
-                df = df.rename(columns=column_mapping)
+                    # Rename the columns
+                    df = df.rename(columns=column_mapping)
                 
-                # Ensure the correct order of columns
-                columns_order = [
-                    "SL No",
-                    "Posted Date",
-                    "Response Date",
-                    "Notice Type",
-                    "Solicitation Number",
-                    "Solicitation Title",
-                    "Agency",
-                    "Category",
-                    "Description",
-                    "Additional Summary, if any",
-                    "Contracting Office Address",
-                    "Contact Information",
-                    "Bid Detail Page URL",
-                    "Attachments"
-                ]
-                df = df[columns_order]
-                df["Posted Date"] = pd.to_datetime(
-                    df["Posted Date"], format="%m/%d/%Y", errors="coerce"
-                ).dt.strftime("%Y-%m-%d")
-                df["Response Date"] = pd.to_datetime(
-                    df["Response Date"], format="%m/%d/%Y", errors="coerce"
-                ).dt.strftime("%Y-%m-%d")
-
-                # Save Excel file in the main folder
-                excel_file = os.path.join(main_folder, f"{SCRIPT_NAME}.xlsx")
-                df.to_excel(excel_file, index=False)
+                    # Ensure the correct order of columns
+                    columns_order = [
+                        "SL No",
+                        "Posted Date",
+                        "Response Date",
+                        "Notice Type",
+                        "Solicitation Number",
+                        "Solicitation Title",
+                        "Agency",
+                        "Category",
+                        "Description",
+                        "Additional Summary, if any",
+                        "Contracting Office Address",
+                        "Contact Information",
+                        "Bid Detail Page URL",
+                        "Attachments"
+                    ]
+                    df = df[columns_order]
+                    df["Posted Date"] = pd.to_datetime(
+                        df["Posted Date"], format="%m/%d/%Y", errors="coerce"
+                    ).dt.strftime("%Y-%m-%d")
+                    df["Response Date"] = pd.to_datetime(
+                        df["Response Date"], format="%m/%d/%Y", errors="coerce"
+                    ).dt.strftime("%Y-%m-%d")
+
+                    # Save Excel file in the main folder
+                    excel_file = os.path.join(main_folder, f"{SCRIPT_NAME}.xlsx")
+                    df.to_excel(excel_file, index=False)
 
                 # Save to cache after successful processing
                 save_to_cache(url, details)
+                metrics.count(BIDS_SAVED)
 
                 # Rewrite the Attachments column based on the actual files in the bid folder
                 if os.path.exists(os.path.join(main_folder, cr_number)):
@@ -914,7 +932,13 @@ def main():
             except Exception as e:
                 print(f"Error processing bid {i}: {str(e)}")
                 play_notification_sound()
-                input("Press Enter to continue...")
+                interventions.park(
+                    f"Error processing bid {i}: {str(e)}",
+                    driver,
+                    url=url,
+                    bid=url,
+                    context={"retry": [i, url]},
+                )
                 continue
 
         # Add additional wait time before moving remaining files
@@ -942,15 +966,6 @@ def main():
         print(f"Renamed folder to: {completed_folder}")
 
     finally:
-        # Save cookies before quitting
-        cookie_file = "cookies.pkl"
-        if os.path.exists(cookie_file):
-            try:
-                os.remove(cookie_file)
-                print("🗑️ Removed cookies file")
-            except Exception as e:
-                print(f"Error removing cookies file: {e}")
-                
         driver.quit()
         # Clean up the temporary download folder
         shutil.rmtree(temp_download_folder, ignore_errors=True)
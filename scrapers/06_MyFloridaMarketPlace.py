@@ -34,6 +34,9 @@ import threading
 import queue
 import argparse
 from utils.utils import safe_move, play_notification_sound
+from utils.waits import element_stable, enable_network_events, network_idle
+from utils.interventions import get_intervention_queue
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 
 
 def parse_arguments():
@@ -64,6 +67,7 @@ def setup_driver(download_dir):
             "safebrowsing.enabled": True,
         },
     )
+    enable_network_events(chrome_options)
     return webdriver.Chrome(options=chrome_options)
 
 
@@ -71,23 +75,9 @@ def wait_and_click(driver, by, value, wait_time=60, retries=3):
     """Wait for an element to be clickable and then click it, with retries."""
     for attempt in range(retries):
         try:
-            # Wait for document ready state with longer timeout
-            WebDriverWait(driver, wait_time).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            
-            # Wait for any jQuery animations with longer timeout
-            WebDriverWait(driver, wait_time).until(
-                lambda d: d.execute_script("return jQuery.active == 0") if driver.execute_script("return typeof jQuery !== 'undefined'") else True
-            )
-            
-            # Wait for network requests to complete
-            WebDriverWait(driver, wait_time).until(
-                lambda d: d.execute_script(
-                    "return window.performance.getEntriesByType('resource').filter(r => !r.responseEnd).length == 0"
-                )
-            )
-            
+            # Wait for the page load and any AJAX requests to settle
+            network_idle(driver, timeout=wait_time)
+
             # Wait for element and click with longer timeout
             element = WebDriverWait(driver, wait_time).until(
                 EC.element_to_be_clickable((by, value))
@@ -95,21 +85,22 @@ def wait_and_click(driver, by, value, wait_time=60, retries=3):
             
             # Scroll element into view
             driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            time.sleep(28)  # Longer pause after scroll
+            element_stable(driver, element, replaces=28, label="scroll into view")
             
             # Try to click with both Selenium and JavaScript
             try:
                 element.click()
             except:
                 driver.execute_script("arguments[0].click();", element)
-                time.sleep(7)  # Wait after JavaScript click
+                network_idle(driver, replaces=7, label="after JavaScript click")
                 
             return element
             
         except Exception as e:
             if attempt < retries - 1:
                 print(f"Attempt {attempt + 1} failed. Retrying...")
-                time.sleep(15)  # Longer wait between retries
+                # Let whatever the failed attempt started finish before refreshing
+                network_idle(driver, replaces=15, label="before retry")
                 # Try refreshing the page
                 driver.refresh()
                 WebDriverWait(driver, wait_time).until(
@@ -457,94 +448,98 @@ def main():
     downloads_folder = os.path.join(script_folder, "downloads")
     os.makedirs(downloads_folder)
 
+    metrics = get_metrics()
+    metrics.set_folder(script_folder)
     # Initialize driver with downloads folder
     driver = setup_driver(downloads_folder)
 
     try:
-        driver.get("https://vendor.myfloridamarketplace.com/search/bids")
+        with metrics.span(SEARCH):
+            driver.get("https://vendor.myfloridamarketplace.com/search/bids")
 
-        # Wait for the page to load completely
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+            # Wait for the page to load completely
+            WebDriverWait(driver, 30).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
 
-        # Set maximum results to 50
-        wait_and_click(driver, By.ID, "mat-select-0")
-        wait_and_click(driver, By.XPATH, "//span[contains(text(), ' 50 ')]")
+            # Set maximum results to 50
+            wait_and_click(driver, By.ID, "mat-select-0")
+            wait_and_click(driver, By.XPATH, "//span[contains(text(), ' 50 ')]")
 
-        # Set Ad Type filters
-        wait_and_click(
-            driver, By.XPATH, "//mat-panel-title[contains(text(), 'Ad Type')]"
-        )
-        ad_types = [
-            "Grant Opportunities",
-            "Invitation to Bid",
-            "Request for Proposals",
-            "Request for Information",
-            "Request for Statement of Qualifications",
-        ]
-        for ad_type in ad_types:
+            # Set Ad Type filters
+            wait_and_click(
+                driver, By.XPATH, "//mat-panel-title[contains(text(), 'Ad Type')]"
+            )
+            ad_types = [
+                "Grant Opportunities",
+                "Invitation to Bid",
+                "Request for Proposals",
+                "Request for Information",
+                "Request for Statement of Qualifications",
+            ]
+            for ad_type in ad_types:
+                wait_and_click(
+                    driver,
+                    By.XPATH,
+                    f"//div[contains(text(), '{ad_type}')]/preceding-sibling::mat-pseudo-checkbox",
+                )
+
+            # Set Ad Status to OPEN
+            wait_and_click(
+                driver, By.XPATH, "//mat-panel-title[contains(text(), 'Ad Status')]"
+            )
             wait_and_click(
                 driver,
                 By.XPATH,
-                f"//div[contains(text(), '{ad_type}')]/preceding-sibling::mat-pseudo-checkbox",
+                "//div[contains(text(), ' OPEN ')]/preceding-sibling::mat-pseudo-checkbox",
             )
 
-        # Set Ad Status to OPEN
-        wait_and_click(
-            driver, By.XPATH, "//mat-panel-title[contains(text(), 'Ad Status')]"
-        )
-        wait_and_click(
-            driver,
-            By.XPATH,
-            "//div[contains(text(), ' OPEN ')]/preceding-sibling::mat-pseudo-checkbox",
-        )
-
-        # Click Search
-        wait_and_click(driver, By.XPATH, "//span[contains(text(), ' Search ')]")
-
-        # Wait for results to load
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "tbody tr"))
-        )
+            # Click Search
+            wait_and_click(driver, By.XPATH, "//span[contains(text(), ' Search ')]")
 
-        all_bids = []
-        page_number = 1
-        while True:
-            print(f"Current Page Number: {page_number}")
-            WebDriverWait(driver, 10).until(
+            # Wait for results to load
+            WebDriverWait(driver, 30).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "tbody tr"))
             )
-            bids = extract_bids(driver, days)
-            all_bids.extend(bids)
 
-            try:
-                next_button = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "button.mat-paginator-navigation-next")
-                    )
+        with metrics.span(LISTING):
+            all_bids = []
+            page_number = 1
+            while True:
+                print(f"Current Page Number: {page_number}")
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "tbody tr"))
                 )
-                if "disabled" in next_button.get_attribute("class"):
-                    print("Reached the last page.")
-                    break
+                bids = extract_bids(driver, days)
+                all_bids.extend(bids)
 
-                # Scroll the button into view
-                driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-                time.sleep(1)  # Short pause to allow any animations to complete
+                try:
+                    next_button = WebDriverWait(driver, 10).until(
+                        EC.presence_of_element_located(
+                            (By.CSS_SELECTOR, "button.mat-paginator-navigation-next")
+                        )
+                    )
+                    if "disabled" in next_button.get_attribute("class"):
+                        print("Reached the last page.")
+                        break
 
-                # Use ActionChains to move to and click the button
-                actions = ActionChains(driver)
-                actions.move_to_element(next_button).click().perform()
+                    # Scroll the button into view
+                    driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
+                    time.sleep(1)  # Short pause to allow any animations to complete
 
-                # Wait for the page to update
-                WebDriverWait(driver, 10).until(
-                    EC.staleness_of(driver.find_element(By.CSS_SELECTOR, "tbody tr"))
-                )
-                page_number += 1
-                time.sleep(2)  # Additional wait to ensure page has loaded
-            except Exception as e:
-                print(f"Error navigating to next page: {str(e)}")
-                break
+                    # Use ActionChains to move to and click the button
+                    actions = ActionChains(driver)
+                    actions.move_to_element(next_button).click().perform()
+
+                    # Wait for the page to update
+                    WebDriverWait(driver, 10).until(
+                        EC.staleness_of(driver.find_element(By.CSS_SELECTOR, "tbody tr"))
+                    )
+                    page_number += 1
+                    time.sleep(2)  # Additional wait to ensure page has loaded
+                except Exception as e:
+                    print(f"Error navigating to next page: {str(e)}")
+                    break
 
         print("Bids Extraction Completed")
         print(f"Total bids found: {len(all_bids)}")
@@ -576,7 +571,8 @@ def main():
             all_bids, start=1
         ):
             print(f"Processing bid {i}/{len(all_bids)}: {bid_number}")
-            details = extract_bid_details(driver, bid_url)
+            with metrics.span(DETAIL):
+                details = extract_bid_details(driver, bid_url)
             if details:
                 details["SL No"] = i
                 details["Posted Date"] = start_date
@@ -599,10 +595,12 @@ def main():
                 os.makedirs(bid_folder, exist_ok=True)
 
                 # Download attachments and move them to the bid-specific folder
-                download_attachments(driver, bid_number, main_folder, downloads_folder)
+                with metrics.span(DOWNLOAD):
+                    download_attachments(driver, bid_number, main_folder, downloads_folder)
 
-                # Wait for all downloads to complete
-                if wait_for_downloads_to_complete(downloads_folder):
+                    # Wait for all downloads to complete
+                    downloads_completed = wait_for_downloads_to_complete(downloads_folder)
+                if downloads_completed:
                     # Update Attachments column based on actual downloaded files
                     attachments = []
                     script_folder = os.path.join(
@@ -624,7 +622,9 @@ def main():
                     ] = ", ".join(attachments)
 
                     # Save updated DataFrame to Excel file directly in the script folder
-                    df.to_excel(excel_file, index=False)
+                    with metrics.span(EXCEL):
+                        df.to_excel(excel_file, index=False)
+                    metrics.count(BIDS_SAVED)
                     print(f"Excel file updated: {excel_file}")
 
                     print(f"Attachments downloaded and moved to: {bid_folder}")
@@ -665,7 +665,7 @@ def main():
         import traceback
         print(traceback.format_exc())
         play_notification_sound()
-        input("Press Enter to continue...")
+        get_intervention_queue().report(f"An error occurred: {str(e)}", driver)
     finally:
         driver.quit()
         # Clean up downloads folder
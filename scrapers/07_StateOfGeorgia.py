@@ -38,6 +38,17 @@ from urllib3.util import Retry
 from selenium.webdriver.common.action_chains import ActionChains
 import urllib.parse
 from utils.utils import safe_move, play_notification_sound
+from utils.table_extract import extract_rows
+from utils.waits import downloads_finished, folder_changed, wait_until
+from utils.interventions import get_intervention_queue
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
+
+# Event search results, read in one batch per page by extract_bid_links()
+EVENT_ROWS_XPATH = "//table[@id='eventSearchTable']/tbody/tr"
+EVENT_ROW_COLUMNS = {
+    "link": ("./td[2]/a", "href"),
+    "title": "./td[3]",
+}
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -160,24 +171,15 @@ def extract_bid_links(driver):
                     EC.invisibility_of_element_located((By.ID, "loadingDiv"))
                 )
 
-                rows = WebDriverWait(driver, 10).until(
-                    EC.presence_of_all_elements_located(
-                        (By.XPATH, "//table[@id='eventSearchTable']/tbody/tr")
-                    )
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_all_elements_located((By.XPATH, EVENT_ROWS_XPATH))
                 )
 
-                for row in rows:
-                    link = (
-                        WebDriverWait(row, 10)
-                        .until(EC.presence_of_element_located((By.XPATH, ".//td[2]/a")))
-                        .get_attribute("href")
-                    )
-                    title = (
-                        WebDriverWait(row, 10)
-                        .until(EC.presence_of_element_located((By.XPATH, ".//td[3]")))
-                        .text
-                    )
-                    bid_links.append((link, title))
+                # Links and titles for the whole page in one script call
+                rows = extract_rows(driver, EVENT_ROWS_XPATH, EVENT_ROW_COLUMNS)
+                bid_links.extend(
+                    (row["link"], row["title"] or "") for row in rows if row["link"]
+                )
 
                 break  # If successful, break the retry loop
             except (StaleElementReferenceException, TimeoutException) as e:
@@ -475,16 +477,20 @@ def download_button_file(driver, button, index, folder):
             print(f"Clicked download button for {file_name}")
 
             # Wait for the download to complete
-            time.sleep(20)  # Increased wait time
+            wait_until(
+                downloads_finished(script_download_folder, prefix=file_name),
+                replaces=20,
+                label="attachment button download",
+            )
 
             # Move the downloaded file to the bid folder
             source_files = [
                 f
-                for f in os.listdir(main_folder)
+                for f in os.listdir(script_download_folder)
                 if f.lower().startswith(file_name.lower())
             ]
             if source_files:
-                source_path = os.path.join(main_folder, source_files[0])
+                source_path = os.path.join(script_download_folder, source_files[0])
                 _, extension = os.path.splitext(source_files[0])
                 if not extension:
                     extension = ".bin"  # Default extension if none is present
@@ -564,14 +570,19 @@ def download_attachments(driver, event_id):
                         )
                     print(f"Attempting to download file: {file_name}")
 
-                    # Use JavaScript to click the link
+                    # Use JavaScript to click the link and wait for the download to start
+                    started = folder_changed(script_download_folder)
                     driver.execute_script("arguments[0].click();", link)
-                    time.sleep(5)  # Wait for download to start
+                    wait_until(started, replaces=5, label="direct link download start")
                 except Exception as e:
                     print(f"Error clicking download link: {str(e)}")
 
             # Wait for downloads to complete and move files
-            time.sleep(10)
+            wait_until(
+                downloads_finished(script_download_folder, ignore=["07_StateOfGeorgia.xlsx"]),
+                replaces=10,
+                label="direct link downloads",
+            )
             for file in os.listdir(script_download_folder):
                 if (
                     os.path.isfile(os.path.join(script_download_folder, file))
@@ -704,24 +715,32 @@ def main():
     """
     Main function to execute the Georgia Procurement Registry bid extraction process.
     """
+    metrics = get_metrics()
+    metrics.set_folder(script_folder)
     driver = setup_driver()
     try:
-        driver.get("https://ssl.doas.state.ga.us/gpr/index")
+        with metrics.span(SEARCH):
+            driver.get("https://ssl.doas.state.ga.us/gpr/index")
 
-        set_search_criteria(driver)
-        bid_links = extract_bid_links(driver)
+            set_search_criteria(driver)
+        with metrics.span(LISTING):
+            bid_links = extract_bid_links(driver)
 
-        for index, (link, title) in enumerate(bid_links, start=1):
+        interventions = get_intervention_queue()
+        # Bids that fail are parked for the operator and retried once resolved
+        for index, (link, title) in interventions.with_retries(enumerate(bid_links, start=1)):
             try:
                 print(f"Processing bid {index} of {len(bid_links)}: {title}")
 
-                bid_details = extract_bid_details(driver, link, title)
+                with metrics.span(DETAIL):
+                    bid_details = extract_bid_details(driver, link, title)
                 bid_details["SL No"] = index
 
                 # Download attachments without creating folder initially
-                attachments_result = download_attachments(
-                    driver, bid_details["Solicitation Number"]
-                )
+                with metrics.span(DOWNLOAD):
+                    attachments_result = download_attachments(
+                        driver, bid_details["Solicitation Number"]
+                    )
                 if attachments_result:
                     if isinstance(attachments_result[0], str) and attachments_result[
                         0
@@ -732,7 +751,9 @@ def main():
                 else:
                     bid_details["Attachments"] = ""
 
-                update_excel(bid_details)
+                with metrics.span(EXCEL):
+                    update_excel(bid_details)
+                metrics.count(BIDS_SAVED)
 
                 time.sleep(5)
             except NoSuchWindowException:
@@ -740,7 +761,12 @@ def main():
                     f"Error: Browser window closed unexpectedly. Restarting browser for bid {index}"
                 )
                 play_notification_sound()
-                input("Press Enter to continue...")
+                interventions.park(
+                    f"Browser window closed while processing bid {index}",
+                    url=link,
+                    bid=title,
+                    context={"retry": [index, [link, title]]},
+                )
                 driver.quit()
                 driver = setup_driver()
                 driver.get("https://ssl.doas.state.ga.us/gpr/index")
@@ -748,7 +774,13 @@ def main():
             except Exception as e:
                 print(f"Error processing bid {index}: {str(e)}")
                 play_notification_sound()
-                input("Press Enter to continue...")
+                interventions.park(
+                    f"Error processing bid {index}: {str(e)}",
+                    driver,
+                    url=link,
+                    bid=title,
+                    context={"retry": [index, [link, title]]},
+                )
                 continue
 
         print("All Bids and Attachments Extraction Successfully Completed")
@@ -772,7 +804,7 @@ def main():
     except Exception as e:
         print(f"An error occurred during execution: {str(e)}")
         play_notification_sound()
-        input("Press Enter to continue...")
+        get_intervention_queue().report(f"An error occurred during execution: {str(e)}", driver)
     finally:
         driver.quit()
         # Clean up the script-specific download folder
@@ -1,10 +1,8 @@
-import subprocess
-import time
+import importlib.util
 import json
 import os
 from datetime import datetime, timedelta
 import shutil
-import sys
 
 
 def get_progress_file_path():
@@ -16,28 +14,6 @@ def get_progress_file_path():
     return os.path.join(main_folder, "scraping_progress.json")
 
 
-def get_total_bids():
-    """Get total number of bids from progress file or return default of 3."""
-    progress_file = get_progress_file_path()
-    if os.path.exists(progress_file):
-        with open(progress_file, "r") as f:
-            data = json.load(f)
-            return data.get("total_bids", 3)  # Default to 3 if not found
-    return 3  # Default number of bids
-
-
-def get_scraped_bids_count():
-    """Get number of already processed bids (both scraped and skipped)."""
-    progress_file = get_progress_file_path()
-    if os.path.exists(progress_file):
-        with open(progress_file, "r") as f:
-            data = json.load(f)
-            scraped = len(data.get("scraped_bids", []))
-            skipped = len(data.get("skipped_bids", []))
-            return scraped + skipped
-    return 0
-
-
 def check_all_bids_processed():
     """Check if all bids have been processed (either scraped or skipped)."""
     progress_file = get_progress_file_path()
@@ -73,74 +49,31 @@ def check_all_bids_processed():
     return False
 
 
-def main():
-    print("🚀 Starting SF City Partner Multi-Run Scraper")
-
-    # Check if all bids are already processed
-    if check_all_bids_processed():
-        return
-
-    # Path to the scraper utility script (in the same directory)
+def load_scraper_module():
+    """Import 08_SFCityPartner_util.py (its name is not a valid module name)."""
     scraper_path = os.path.join(
         os.path.dirname(os.path.abspath(__file__)), "08_SFCityPartner_util.py"
     )
+    spec = importlib.util.spec_from_file_location("sf_city_partner_util", scraper_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
-    total_bids = get_total_bids()
-    current_bid = get_scraped_bids_count()
 
-    print(f"Total bids to scrape: {total_bids}")
-    print(f"Already scraped: {current_bid}")
-    print(f"Remaining bids: {total_bids - current_bid}")
+def main():
+    print("🚀 Starting SF City Partner Scraper")
+
+    # Check if all bids are already processed
+    if check_all_bids_processed():
+        return
 
     try:
-        while current_bid < total_bids:
-            try:
-                print(f"\n📑 Starting scrape for bid {current_bid + 1} of {total_bids}")
-                print("=" * 50)
-
-                # Get days argument from command line
-                days_arg = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] == '--days' else None
-                days_value = sys.argv[2] if days_arg and len(sys.argv) > 2 else None
-
-                # Run the scraper script with days argument if provided
-                cmd = ["python", scraper_path]
-                if days_value:
-                    cmd.extend(["--days", days_value])
-                
-                result = subprocess.run(cmd, check=True, text=True)
-
-                # Check if the folder was marked as completed (indicating no bids found)
-                yesterday = datetime.now() - timedelta(days=1)
-                base_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                date_folder = os.path.join(base_folder, yesterday.strftime("%Y-%m-%d"))
-                completed_folder = os.path.join(date_folder, "08_SFCityPartner_COMPLETED")
-                
-                if os.path.exists(completed_folder):
-                    print("\n✅ No bids found - Scraping completed")
-                    return
-
-                # Check if all bids are processed after each run
-                if check_all_bids_processed():
-                    break
-
-                # Update progress
-                current_bid = get_scraped_bids_count()
-
-                if current_bid < total_bids:
-                    print(f"\n⏳ Waiting 30 seconds before next bid...")
-                    time.sleep(30)  # Wait between runs
-
-            except subprocess.CalledProcessError as e:
-                print(f"❌ Error running scraper: {e}")
-                retry = input("\nRetry this bid? (y/n): ").lower().strip()
-                if retry != "y":
-                    break
-            except KeyboardInterrupt:
-                print("\n⚠️ Script interrupted by user")
-                break
-            except Exception as e:
-                print(f"❌ Unexpected error: {e}")
-                break
+        # Run every remaining bid in this process; the scraper restarts its
+        # browser itself when the site's bot detection requires it
+        scraper = load_scraper_module()
+        scraper.main()
+    except KeyboardInterrupt:
+        print("\n⚠️ Script interrupted by user")
 
     finally:
         # Ensure cleanup of temporary download folder
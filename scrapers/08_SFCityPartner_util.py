@@ -33,19 +33,21 @@ import threading
 import urllib3
 import openpyxl
 from openpyxl import Workbook
-from bs4 import BeautifulSoup
 import concurrent.futures
 import argparse
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse, unquote
 import shutil
 import winsound  # For playing notification sounds
 import sys
 from selenium.webdriver.common.actions.action_builder import ActionBuilder
 import glob
-import zipfile
 from utils.utils import safe_move, play_notification_sound
+from utils.archive_expander import get_archive_expander
+from utils.page_parser import ParsedPage, block_text
+from utils.interventions import get_intervention_queue
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 import base64
-from PIL import Image
+import re
 import tempfile
 import atexit
 import logging
@@ -68,6 +70,22 @@ DAYS_TO_SEARCH = 2  # Default to 2 days, can be changed for testing
 # Constants
 SCRIPT_NAME = "08_SFCityPartner"
 BASE_URL = "https://sfcitypartner.sfgov.org/pages/index.aspx"
+SEARCH_URL = "https://sfcitypartner.sfgov.org/pages/Events-BS3/event-search.aspx"
+
+# Browser restarts allowed per bid when the site redirects to the lookup page
+MAX_RESTARTS_PER_BID = 1
+
+# Event details fields. Plain strings so the same XPath serves Selenium waits
+# and ParsedPage, which compiles each one once.
+POSTED_DATE_XPATH = "//div[@class='text-muted']/span[@data-if-label='startDate']"
+RESPONSE_DATE_XPATH = "//div[@class='bold']/span[@data-if-label='expireDate']"
+EVENT_ID_XPATH = "//span[@data-if-source='#RESP_AUC_H0B_WK_AUC_ID_BUS_UNIT']"
+EVENT_NAME_XPATH = "//h3[@data-if-label='eventName']"
+DESCRIPTION_XPATH = "//div[@data-if-label='descriptiondetails']"
+CONTACT_NAME_XPATH = "//strong[@data-if-label='contactName']"
+CONTACT_PHONE_XPATH = "//span[@data-if-label='phoneText']"
+CONTACT_EMAIL_XPATH = "//span[@data-if-label='emffffailText']"
+ATTACHMENTS_BUTTON_XPATH = "//button[@data-if-ps-clickable='true']"
 
 # Create folder structure
 yesterday = datetime.now() - timedelta(days=1)
@@ -86,43 +104,18 @@ os.makedirs(date_folder, exist_ok=True)
 os.makedirs(MAIN_FOLDER, exist_ok=True)
 os.makedirs(TEMP_DOWNLOAD_FOLDER, exist_ok=True)
 
-# Chrome options setup
-chrome_options = Options()
-chrome_options.add_argument("--ignore-certificate-errors")
-chrome_options.add_argument("--ignore-ssl-errors")
-chrome_options.add_argument("--disable-gpu")
-chrome_options.add_argument("--disable-software-rasterizer")
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-
-# Enable safe browsing
-chrome_options.add_argument("--safebrowsing-disable-download-protection")
-chrome_options.add_argument("--safebrowsing-disable-extension-blacklist")
-
-# Set download preferences
-prefs = {
-    "download.prompt_for_download": False,
-    "download.directory_upgrade": True,
-    "safebrowsing.enabled": True,
-    "safebrowsing.disable_download_protection": True,
-    "plugins.always_open_pdf_externally": True,
-    "download.default_directory": TEMP_DOWNLOAD_FOLDER,
-}
-chrome_options.add_experimental_option("prefs", prefs)
-
-driver = webdriver.Chrome(options=chrome_options)
-driver.maximize_window()
-
 # Add this global variable near the top of the file
 scraped_bids = set()
+# Bids the operator chose to scrape despite a missing date
+accepted_missing_dates = set()
 
 
 # Function to handle errors
-def handle_error(error_message):
-    """Handle errors by playing a notification and pausing the script."""
+def handle_error(error_message, driver=None):
+    """Handle errors by playing a notification and reporting them to the dashboard."""
     print(f"❗ Error: {error_message}")
     play_notification_sound()
-    input("Press Enter to continue...")
+    get_intervention_queue().report(error_message, driver)
 
 
 def get_random_user_agent():
@@ -466,10 +459,9 @@ def move_downloaded_files(driver, bid_folder, event_id, max_retries=3, retry_del
 
                     # Handle zip files
                     if file_name.lower().endswith(".zip"):
-                        with zipfile.ZipFile(file, "r") as zip_ref:
-                            zip_ref.extractall(bid_folder)
-                        os.remove(file)
-                        moved_files.extend(zip_ref.namelist())
+                        moved_files.extend(
+                            get_archive_expander().expand(file, bid_folder)
+                        )
                         print(f"Extracted {file_name} to {bid_folder}")
                     else:
                         # Move file with overwrite if exists
@@ -543,8 +535,14 @@ def download_attachments(driver, event_id):
                     popup_button = WebDriverWait(driver, 10).until(
                         EC.element_to_be_clickable((By.ID, "downloadButton"))
                     )
-                    driver.execute_script("arguments[0].click();", popup_button)
-                    print("Clicked download button using JavaScript")
+
+                    # The document goes straight into the bid folder; only a
+                    # plain browser download still goes through the download folder
+                    if save_popup_document(driver, popup_button, event_id, bid_folder):
+                        attachment_count += 1
+                        continue
+
+                    print("Download button started a browser download")
                     attachment_count += 1
 
                     # Wait for download to complete
@@ -655,30 +653,33 @@ def update_excel_with_attachments(excel_file, event_id, attachment_names):
         print(f"Error updating Excel file with attachments: {str(e)}")
 
 
-def handle_missing_date(bid_id, date_type):
+def handle_missing_date(driver, bid_id, date_type):
     """
-    Handle missing date by prompting user for action.
+    Handle missing date by parking the bid for the operator.
+
+    The bid is skipped for now. If the operator resolves it on the dashboard,
+    main() retries it and the missing date is accepted.
 
     Args:
+        driver (webdriver.Chrome): The WebDriver instance
         bid_id (str): The bid ID
         date_type (str): Type of missing date (Posted/Response)
 
     Returns:
         bool: True to continue with current bid, False to skip it
     """
-    print(f"\n⚠️ Warning: {date_type} Date is missing for bid {bid_id}")
-    print("Options:")
-    print("1. Press Enter to continue scraping this bid")
-    print("2. Press 'S' to skip this bid")
+    if bid_id in accepted_missing_dates:
+        return True
 
-    while True:
-        choice = input("Your choice (Enter/S): ").strip().upper()
-        if choice == "":
-            return True
-        elif choice == "S":
-            return False
-        else:
-            print("Invalid input. Please press Enter to continue or 'S' to skip.")
+    print(f"\n⚠️ Warning: {date_type} Date is missing for bid {bid_id}")
+    print("Parked for review; resolve it on the dashboard to scrape it anyway")
+    get_intervention_queue().park(
+        f"{date_type} Date is missing for bid {bid_id}",
+        driver,
+        bid=bid_id,
+        context={"retry": bid_id},
+    )
+    return False
 
 
 def is_lookup_page(driver):
@@ -703,6 +704,7 @@ def extract_bid_details(driver, event_id, sl_no, total_bids):
 
     global scraped_bids
 
+    metrics = get_metrics()
     print(f"Processing bid {sl_no} out of {total_bids}")
 
     if event_id in scraped_bids:
@@ -733,84 +735,63 @@ def extract_bid_details(driver, event_id, sl_no, total_bids):
         if handle_lookup_page(driver, event_id):
             return None
 
+        # Wait for the event header, then read every field from one snapshot
+        with metrics.span(DETAIL):
+            try:
+                wait_for_element(driver, By.XPATH, POSTED_DATE_XPATH)
+            except TimeoutException:
+                pass
+            page = ParsedPage.from_driver(driver, fixture="08_SFCityPartner/event")
+            if not page.exists(EVENT_NAME_XPATH):
+                # The description panel renders after the header on slow loads
+                wait_for_element(driver, By.XPATH, EVENT_NAME_XPATH)
+                page = ParsedPage.from_driver(driver)
+            fields = parse_event_page(page)
+
         # Extract Posted Date
         try:
-            posted_date_element = wait_for_element(
-                driver,
-                By.XPATH,
-                "//div[@class='text-muted']/span[@data-if-label='startDate']",
-            )
-            posted_date = posted_date_element.text.split()[0]
+            posted_date = fields["Start Date"]
             if posted_date != "This":
                 bid_details["Posted Date"] = datetime.strptime(
                     posted_date, "%m/%d/%Y"
                 ).strftime("%Y-%m-%d")
             else:
                 # Handle missing Posted Date
-                if not handle_missing_date(event_id, "Posted"):
+                if not handle_missing_date(driver, event_id, "Posted"):
                     print(f"Skipping bid {event_id} due to missing Posted Date")
                     return None
-        except (TimeoutException, ValueError) as e:
-            if not handle_missing_date(event_id, "Posted"):
+        except ValueError as e:
+            if not handle_missing_date(driver, event_id, "Posted"):
                 print(f"Skipping bid {event_id} due to missing Posted Date")
                 return None
 
         # Extract Response Date
         try:
-            response_date_element = wait_for_element(
-                driver,
-                By.XPATH,
-                "//div[@class='bold']/span[@data-if-label='expireDate']",
-                timeout=5,
-            )
-            response_date = response_date_element.text.split()[0]
+            response_date = fields["Due by"]
             if response_date != "This":
                 bid_details["Response Date"] = datetime.strptime(
                     response_date, "%m/%d/%Y"
                 ).strftime("%Y-%m-%d")
             else:
                 # Handle missing Response Date
-                if not handle_missing_date(event_id, "Response"):
+                if not handle_missing_date(driver, event_id, "Response"):
                     print(f"Skipping bid {event_id} due to missing Response Date")
                     return None
-        except (TimeoutException, ValueError) as e:
-            if not handle_missing_date(event_id, "Response"):
+        except ValueError as e:
+            if not handle_missing_date(driver, event_id, "Response"):
                 print(f"Skipping bid {event_id} due to missing Response Date")
                 return None
 
-        # Extract Solicitation Number
-        bid_details["Solicitation Number"] = wait_for_element(
-            driver,
-            By.XPATH,
-            "//span[@data-if-source='#RESP_AUC_H0B_WK_AUC_ID_BUS_UNIT']",
-        ).text
-
-        # Extract Solicitation Title
-        bid_details["Solicitation Title"] = wait_for_element(
-            driver, By.XPATH, "//h3[@data-if-label='eventName']"
-        ).text
-
-        # Extract Description
-        bid_details["Description"] = wait_for_element(
-            driver, By.XPATH, "//div[@data-if-label='descriptiondetails']"
-        ).text
-
-        # Extract Contact Information
-        contact_name = wait_for_element(
-            driver, By.XPATH, "//strong[@data-if-label='contactName']"
-        ).text
-        contact_phone = wait_for_element(
-            driver, By.XPATH, "//span[@data-if-label='phoneText']"
-        ).text
-        contact_email = wait_for_element(
-            driver, By.XPATH, "//span[@data-if-label='emffffailText']"
-        ).text
+        bid_details["Solicitation Number"] = fields["Event"]
+        bid_details["Solicitation Title"] = fields["Solicitation Title"]
+        bid_details["Description"] = fields["Details"]
         bid_details["Contact Information"] = (
-            f"{contact_name}, {contact_phone}, {contact_email}"
+            f"{fields['Contact Name']}, {fields['Phone']}, {fields['Email']}"
         )
 
         # Download attachments
-        bid_details["Attachments"] = download_attachments(driver, event_id)
+        with metrics.span(DOWNLOAD):
+            bid_details["Attachments"] = download_attachments(driver, event_id)
 
         print(f"Successfully extracted details for bid {event_id}")
 
@@ -823,15 +804,18 @@ def extract_bid_details(driver, event_id, sl_no, total_bids):
         if handle_lookup_page(driver, event_id):
             return None
 
-        update_excel(bid_details)
+        with metrics.span(EXCEL):
+            update_excel(bid_details)
         scraped_bids.add(event_id)
 
         bid_folder = os.path.join(SCRIPT_FOLDER, f"SFGOV-{event_id}")
         os.makedirs(bid_folder, exist_ok=True)
-        move_downloaded_files(driver, bid_folder, event_id)
+        with metrics.span(DOWNLOAD):
+            move_downloaded_files(driver, bid_folder, event_id)
 
         attachment_names = get_attachment_names(bid_folder)
-        update_excel_with_attachments(EXCEL_FILE, event_id, attachment_names)
+        with metrics.span(EXCEL):
+            update_excel_with_attachments(EXCEL_FILE, event_id, attachment_names)
 
     return bid_details
 
@@ -916,31 +900,49 @@ def fetch_html(url):
     return response.text
 
 
-def parse_html(html):
+def parse_event_page(page):
+    """Read the event fields from a parsed event details page.
+
+    Dates are the first word of their label ("10/20/2026 3:00PM PDT"), or
+    "This" when the page says "This event has no ..." in their place.
+    """
+
+    def first_word(selector):
+        words = page.text(selector).split()
+        return words[0] if words else ""
+
+    return {
+        "Start Date": first_word(POSTED_DATE_XPATH),
+        "Due by": first_word(RESPONSE_DATE_XPATH),
+        "Event": page.text(EVENT_ID_XPATH),
+        "Solicitation Title": page.text(EVENT_NAME_XPATH),
+        "Details": block_text(page.select_one(DESCRIPTION_XPATH)),
+        "Contact Name": page.text(CONTACT_NAME_XPATH),
+        "Phone": page.text(CONTACT_PHONE_XPATH),
+        "Email": page.text(CONTACT_EMAIL_XPATH),
+        "See Attachments": "Yes" if page.exists(ATTACHMENTS_BUTTON_XPATH) else "No",
+    }
+
+
+def parse_html(html, url=""):
     """Parse the HTML content and extract the required fields."""
-    soup = BeautifulSoup(html, "html.parser")
+    fields = parse_event_page(ParsedPage(html, url=url))
 
     data = {
         "SL No": 1,  # This will be incremented for each bid
-        "Start Date": soup.select_one('span[data-if-label="startDate"]').text.split()[
-            0
-        ],
-        "Due by": soup.select_one('span[data-if-label="expireDate"]').text.split()[0],
+        "Start Date": fields["Start Date"],
+        "Due by": fields["Due by"],
         "Notice Type": "",  # Not available on website
-        "Event": soup.select_one(
-            'span[data-if-source="#RESP_AUC_H0B_WK_AUC_ID_BUS_UNIT"]'
-        ).text,
-        "Solicitation Title": soup.select_one('h3[data-if-label="eventName"]').text,
+        "Event": fields["Event"],
+        "Solicitation Title": fields["Solicitation Title"],
         "Agency": "",  # Not available on website
         "Category": "",  # Not available on website
-        "Details": soup.select_one('div[data-if-label="descriptiondetails"]').text,
-        "Contact Name": soup.select_one('strong[data-if-label="contactName"]').text,
-        "Phone": soup.select_one('span[data-if-label="phoneText"]').text,
-        "Email": soup.select_one('span[data-if-label="emffffailText"]').text,
+        "Details": fields["Details"],
+        "Contact Name": fields["Contact Name"],
+        "Phone": fields["Phone"],
+        "Email": fields["Email"],
         "Bid Detail Page URL": url,
-        "See Attachments": (
-            "Yes" if soup.select_one('button[data-if-ps-clickable="true"]') else "No"
-        ),
+        "See Attachments": fields["See Attachments"],
     }
 
     return data
@@ -1047,61 +1049,170 @@ def move_remaining_files():
             print(f"Could not find folder for {filename}")
 
 
-def crop_images(images, left, right, top, bottom):
-    """Crop all images in the list."""
-    cropped_images = []
-    for img in images:
-        width, height = img.size
-        cropped = img.crop((left, top, width - right, height - bottom))
-        cropped_images.append(cropped)
-    return cropped_images
+def session_from_driver(driver):
+    """Build a requests session carrying the browser's cookies and user agent."""
+    session = requests.Session()
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/")
+        )
+    return session
+
+
+def filename_from_response(response, url):
+    """Pick a file name from Content-Disposition or the URL path."""
+    disposition = response.headers.get("Content-Disposition", "")
+    match = re.search(r"filename\*?=(?:UTF-8'')?\"?([^\";]+)", disposition, re.IGNORECASE)
+    if match:
+        name = unquote(match.group(1))
+    else:
+        name = unquote(os.path.basename(urlparse(url).path)) or "document"
+    return re.sub(r'[<>:"/\\|?*]', "_", name).strip() or "document"
 
 
-def save_pdf_from_viewer(driver, event_id):
-    """Save PDF from the viewer page by clicking the download button."""
+def fetch_document(driver, url, bid_folder, filename=None, timeout=120):
+    """
+    Download url with the browser's session cookies and write the bytes
+    directly into bid_folder.
+
+    Returns:
+        str: The saved file name, or None if the request failed.
+    """
     try:
-        print(f"Attempting to save PDF for event {event_id}...")
+        start_time = time.time()
+        with session_from_driver(driver) as session:
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()
+            if "text/html" in response.headers.get("Content-Type", ""):
+                print(f"⚠️ {url} returned an HTML page instead of a document")
+                return None
+            filename = filename or filename_from_response(response, url)
+            os.makedirs(bid_folder, exist_ok=True)
+            with open(os.path.join(bid_folder, filename), "wb") as f:
+                f.write(response.content)
+        print(f"📄 Saved {filename} ({len(response.content) / 1024:.0f} KB) in {time.time() - start_time:.1f}s")
+        return filename
+    except Exception as e:
+        print(f"Could not fetch {url} directly: {str(e)}")
+        return None
 
-        # JavaScript to click the download button
-        download_button_js = """
-        // Access the 'download' button within multiple shadow roots and click it
-        const downloadButton = document
-          .querySelector("#viewer")
-          .shadowRoot
-          .querySelector("#toolbar")
-          .shadowRoot
-          .querySelector("#downloads")
-          .shadowRoot
-          .querySelector("#download");
-
-        // Click the button if it exists
-        if (downloadButton) {
-            downloadButton.click();
-            return "Download button clicked successfully.";
-        } else {
-            return "Download button not found.";
-        }
-        """
 
-        # Execute the JavaScript to click the download button
-        result = driver.execute_script(download_button_js)
-        print(result)
+def print_page_to_pdf(driver, path):
+    """Render the current page to a PDF file with CDP Page.printToPDF."""
+    result = driver.execute_cdp_cmd(
+        "Page.printToPDF", {"printBackground": True, "preferCSSPageSize": True}
+    )
+    with open(path, "wb") as f:
+        f.write(base64.b64decode(result["data"]))
+    return path
+
 
-        # Wait for the download to complete
-        wait_for_download(driver, 60)  # Wait up to 60 seconds for download
+def save_pdf_from_viewer(driver, event_id, bid_folder=None):
+    """
+    Save the PDF shown in Chrome's viewer into the bid folder.
 
-        # Move the downloaded file to the event folder
-        event_folder = os.path.join(MAIN_FOLDER, f"Event_{event_id}")
-        os.makedirs(event_folder, exist_ok=True)
-        move_downloaded_files(driver, event_folder)
+    The viewer's source URL is fetched with the session cookies, so the bytes
+    go straight to the bid folder without the download button or the download
+    folder. If the source cannot be fetched the page is rendered with CDP
+    Page.printToPDF instead.
 
-        print(f"PDF saved for event {event_id}")
-        return True
+    Returns:
+        str: The saved file name, or None on failure.
+    """
+    bid_folder = bid_folder or os.path.join(MAIN_FOLDER, f"SFGOV-{event_id}")
+    start_time = time.time()
+    try:
+        print(f"Attempting to save PDF for event {event_id}...")
+
+        # The viewer is loaded either as the page itself or through an embed
+        source_url = driver.execute_script(
+            """
+            const embed = document.querySelector('embed[type="application/pdf"], embed#plugin');
+            return (embed && embed.src && !embed.src.startsWith('about:')) ? embed.src : window.location.href;
+            """
+        )
+        saved = None
+        if source_url and source_url.startswith("http"):
+            saved = fetch_document(driver, source_url, bid_folder)
+
+        if not saved:
+            saved = f"{event_id}.pdf"
+            os.makedirs(bid_folder, exist_ok=True)
+            print_page_to_pdf(driver, os.path.join(bid_folder, saved))
+
+        print(f"PDF saved for event {event_id} in {time.time() - start_time:.1f}s")
+        return saved
 
     except Exception as e:
         print(f"Error saving PDF from viewer for event {event_id}: {str(e)}")
         print(f"Current URL: {driver.current_url}")
-        return False
+        return None
+
+
+# Records the URLs the page opens, so they can be fetched directly
+RECORD_WINDOW_OPEN_JS = """
+window.__openedUrls = [];
+if (!window.__openRecorded) {
+    const open = window.open;
+    window.open = function(url) {
+        window.__openedUrls.push(String(url || ''));
+        return open.apply(this, arguments);
+    };
+    window.__openRecorded = true;
+}
+"""
+
+
+def save_popup_document(driver, popup_button, event_id, bid_folder, timeout=10):
+    """
+    Save the document behind the attachment popup's download button into the bid folder.
+
+    The button's URL (its href, or the URL it opens) is fetched with the
+    session cookies. If only a viewer tab can be had, the PDF is taken from
+    it by save_pdf_from_viewer, without the viewer's download button.
+
+    Returns:
+        str: The saved file name, or None if the button started a browser
+        download instead.
+    """
+    href = popup_button.get_attribute("href") or ""
+    if href.startswith("http"):
+        saved = fetch_document(driver, href, bid_folder)
+        if saved:
+            return saved
+
+    original = driver.current_window_handle
+    handles = set(driver.window_handles)
+    driver.execute_script(RECORD_WINDOW_OPEN_JS)
+    driver.execute_script("arguments[0].click();", popup_button)
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: set(d.window_handles) - handles
+            or d.execute_script("return (window.__openedUrls || []).length")
+        )
+    except TimeoutException:
+        return None
+
+    saved = None
+    for url in driver.execute_script("return window.__openedUrls || []"):
+        url = urljoin(driver.current_url, url)
+        if url.startswith("http"):
+            saved = fetch_document(driver, url, bid_folder)
+            if saved:
+                break
+
+    new_tabs = [handle for handle in driver.window_handles if handle not in handles]
+    try:
+        if not saved and new_tabs:
+            driver.switch_to.window(new_tabs[0])
+            saved = save_pdf_from_viewer(driver, event_id, bid_folder)
+    finally:
+        for handle in new_tabs:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(original)
+    return saved
 
 
 def cleanup_temp_folder():
@@ -1161,12 +1272,9 @@ def final_cleanup():
 
         try:
             if filename.lower().endswith(".zip"):
-                # Unzip the file
-                with zipfile.ZipFile(file_path, "r") as zip_ref:
-                    zip_ref.extractall(bid_folder)
+                # Unzip the file (the archive is removed afterwards)
+                moved_files = get_archive_expander().expand(file_path, bid_folder)
                 print(f"Unzipped {filename} to {bid_folder}")
-                os.remove(file_path)  # Remove the zip file after extraction
-                moved_files = zip_ref.namelist()
             else:
                 # Move non-zip files directly
                 safe_move(file_path, os.path.join(bid_folder, filename))
@@ -1213,13 +1321,14 @@ def load_progress():
     return set(), set()
 
 
-def save_progress(scraped_bids, skipped_bids, total_bids=None):
+def save_progress(scraped_bids, skipped_bids, total_bids=None, browser_restarts=0):
     """Save the list of scraped and skipped bid IDs to the progress file."""
     try:
         data = {
             "scraped_bids": list(scraped_bids),
             "skipped_bids": list(skipped_bids),  # Add skipped bids
             "total_bids": total_bids,
+            "browser_restarts": browser_restarts,
         }
         with open(PROGRESS_FILE, "w") as f:
             json.dump(data, f)
@@ -1285,8 +1394,53 @@ def cleanup_drivers():
         logging.error(f"Error cleaning up drivers: {e}")
 
 
+def start_browser():
+    """Start a fresh browser and open the event search page to get a session."""
+    driver = setup_driver()
+    # Add random delay before first request
+    time.sleep(random.uniform(2, 5))
+    driver.get(SEARCH_URL)
+    return driver
+
+
+def restart_browser(driver):
+    """Replace a browser the site's bot detection has flagged."""
+    try:
+        driver.quit()
+    except:
+        pass
+    cleanup_drivers()
+    return start_browser()
+
+
+def open_bid(driver, auc_id):
+    """
+    Open a bid's detail page, restarting the browser if the site redirects to
+    the lookup page (its bot detection).
+
+    Returns:
+        tuple: (driver, restarts) - the driver to keep using and how many
+        times it was restarted.
+    """
+    restarts = 0
+    bid_url = construct_bid_url(auc_id)
+    driver.get(bid_url)
+    while is_lookup_page(driver) and restarts < MAX_RESTARTS_PER_BID:
+        print(f"🔁 Lookup page for bid {auc_id}, restarting browser...")
+        driver = restart_browser(driver)
+        restarts += 1
+        driver.get(bid_url)
+    return driver, restarts
+
+
 def main():
-    """Main function to execute the SF City Partner bid extraction process."""
+    """Main function to execute the SF City Partner bid extraction process.
+
+    Runs as one long-lived process: the search is done once and every bid is
+    processed on the same browser, which is only restarted when the site's bot
+    detection forces it. Progress is kept in memory and flushed to the progress
+    file after every bid, so an interrupted run resumes where it stopped.
+    """
     global scraped_bids, DAYS_TO_SEARCH
 
     # Parse command line arguments
@@ -1301,27 +1455,29 @@ def main():
         f"🔄 Loaded {len(scraped_bids)} scraped bids and {len(skipped_bids)} skipped bids"
     )
 
+    browser_restarts = 0
+    driver = None
+    start_time = time.time()
+    metrics = get_metrics()
+    metrics.set_folder(MAIN_FOLDER)
+
     try:
         # Force cleanup any existing Chrome instances
         cleanup_drivers()
 
         # Start fresh driver instance with random configuration
-        driver = setup_driver()
+        driver = start_browser()
 
         try:
-            # Add random delay before first request
-            time.sleep(random.uniform(2, 5))
-
-            # Load the page
-            driver.get("https://sfcitypartner.sfgov.org/pages/Events-BS3/event-search.aspx")
-
             # Add random delay before search
             time.sleep(random.uniform(1, 3))
 
-            perform_advanced_search(driver)
+            with metrics.span(SEARCH):
+                perform_advanced_search(driver)
 
             # Extract all AUC IDs
-            auc_ids = extract_auc_ids(driver)
+            with metrics.span(LISTING):
+                auc_ids = extract_auc_ids(driver)
             if auc_ids is None:  # Changed from if not auc_ids
                 logging.warning("No bids found")
                 # Clean up before marking as completed
@@ -1335,65 +1491,65 @@ def main():
                 mark_folder_as_completed()
                 return
 
-            # Save total number of bids
-            save_progress(scraped_bids, skipped_bids, len(auc_ids))
-
-            # Find the first unprocessed bid
-            next_bid = None
-            for auc_id in auc_ids:
-                if auc_id not in scraped_bids and auc_id not in skipped_bids:
-                    next_bid = auc_id
-                    break
-
-            if next_bid is None:
-                logging.info("✅ All bids have been processed!")
-                mark_folder_as_completed()
-                return
-
-            # Process the next unprocessed bid
-            bid_url = construct_bid_url(next_bid)
-            driver.get(bid_url)
+            total_bids = len(auc_ids)
+            save_progress(scraped_bids, skipped_bids, total_bids, browser_restarts)
 
-            # Check for lookup page
-            if handle_lookup_page(driver, next_bid):
-                skipped_bids.add(next_bid)
-                save_progress(scraped_bids, skipped_bids, len(auc_ids))
-                print(f"Moving on to next bid...")
-                return
-
-            # Extract bid details
-            result = extract_bid_details(
-                driver, next_bid, len(scraped_bids) + 1, len(auc_ids)
-            )
+            pending = [
+                auc_id
+                for auc_id in auc_ids
+                if auc_id not in scraped_bids and auc_id not in skipped_bids
+            ]
+            print(f"Total bids: {total_bids}, remaining: {len(pending)}")
+
+            # Bids parked for a missing date come back once the operator resolves them
+            for auc_id in get_intervention_queue().with_retries(pending):
+                if auc_id in skipped_bids:
+                    skipped_bids.discard(auc_id)
+                    accepted_missing_dates.add(auc_id)
+
+                with metrics.span(DETAIL):
+                    driver, restarts = open_bid(driver, auc_id)
+                browser_restarts += restarts
+
+                # Still on the lookup page after a fresh browser
+                if handle_lookup_page(driver, auc_id):
+                    skipped_bids.add(auc_id)
+                else:
+                    # Extract bid details
+                    result = extract_bid_details(
+                        driver, auc_id, len(scraped_bids) + 1, total_bids
+                    )
 
-            # Handle the result
-            if result is None:  # Bid was skipped
-                skipped_bids.add(next_bid)
-            else:  # Bid was successfully scraped
-                scraped_bids.add(next_bid)
+                    # Handle the result
+                    if result is None:  # Bid was skipped
+                        skipped_bids.add(auc_id)
+                    else:  # Bid was successfully scraped
+                        scraped_bids.add(auc_id)
+                        metrics.count(BIDS_SAVED)
 
-            # Save progress
-            save_progress(scraped_bids, skipped_bids, len(auc_ids))
+                # Flush progress after every bid
+                save_progress(scraped_bids, skipped_bids, total_bids, browser_restarts)
 
-            # Show remaining bids
-            remaining = len(auc_ids) - len(scraped_bids) - len(skipped_bids)
-            if remaining > 0:
+                remaining = total_bids - len(scraped_bids) - len(skipped_bids)
                 print(f"\n🔄 {remaining} bids remaining to process")
                 print(f"Scraped: {len(scraped_bids)}, Skipped: {len(skipped_bids)}")
-                print("Please run the script again for the next bid.")
-            else:
-                print("\n✅ All bids have been processed!")
-                print(
-                    f"Final count - Scraped: {len(scraped_bids)}, Skipped: {len(skipped_bids)}"
-                )
-                # Clean up before marking as completed
-                try:
-                    driver.quit()
-                except:
-                    pass
-                cleanup_drivers()
-                cleanup_temp_folder()
-                mark_folder_as_completed()
+
+            print("\n✅ All bids have been processed!")
+            print(
+                f"Final count - Scraped: {len(scraped_bids)}, Skipped: {len(skipped_bids)}"
+            )
+            print(
+                f"Browser restarts: {browser_restarts} "
+                f"({(time.time() - start_time) / 60:.1f} minutes)"
+            )
+            # Clean up before marking as completed
+            try:
+                driver.quit()
+            except:
+                pass
+            cleanup_drivers()
+            cleanup_temp_folder()
+            mark_folder_as_completed()
 
         finally:
             # Clean up driver in all cases
@@ -1404,11 +1560,15 @@ def main():
             time.sleep(1)
             cleanup_drivers()
             cleanup_temp_folder()
+            logging.info(f"🔁 Browser restarts this run: {browser_restarts}")
 
     except Exception as e:
         error_message = f"An error occurred: {str(e)}"
-        if 'driver' in locals():
-            error_message += f"\nCurrent URL: {driver.current_url}"
+        if driver is not None:
+            try:
+                error_message += f"\nCurrent URL: {driver.current_url}"
+            except:
+                pass
         handle_error(error_message)
 
 
@@ -30,9 +30,10 @@ from selenium.common.exceptions import (
 )
 from selenium.webdriver.common.action_chains import ActionChains
 from fake_useragent import UserAgent
-import pickle
 import argparse
 from utils.utils import safe_move, play_notification_sound
+from utils.interventions import get_intervention_queue
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 from selenium_stealth import stealth
 import json
 
@@ -111,12 +112,6 @@ def setup_driver(download_directory):
     except NameError:
         print("Stealth mode not available - continuing without it")
 
-    # Load cookies if available
-    if os.path.exists("cookies.pkl"):
-        cookies = pickle.load(open("cookies.pkl", "rb"))
-        for cookie in cookies:
-            driver.add_cookie(cookie)
-
     return driver
 
 
@@ -363,7 +358,11 @@ def handle_captcha(driver):
         )
         print("CAPTCHA detected. Please solve it manually.")
         play_notification_sound()  # Play notification sound
-        input("Press Enter after solving the CAPTCHA...")
+        if not get_intervention_queue().wait(
+            "CAPTCHA: solve it in the browser, then resolve", driver
+        ):
+            print("CAPTCHA was not solved in time.")
+            return
         time.sleep(random.uniform(5, 8))  # Wait a bit after solving
     except Exception as e:
         print(f"Error handling captcha: {str(e)}")
@@ -458,7 +457,15 @@ def download_attachments(driver, bid_number):
                             "Image-based CAPTCHA detected. Manual intervention required."
                         )
                         play_notification_sound()
-                        input("Press Enter after solving the CAPTCHA...")
+                        if not get_intervention_queue().wait(
+                            f"Image CAPTCHA for attachment {attachment_name} of bid "
+                            f"{bid_number}: solve it in the browser, then resolve",
+                            driver,
+                        ):
+                            print(
+                                f"CAPTCHA was not solved in time. Skipping attachment: {attachment_name}"
+                            )
+                            continue
 
                         # Click download button after manual CAPTCHA solution
                         download_button = WebDriverWait(driver, 20).until(
@@ -768,19 +775,24 @@ def main():
     days_to_search = args.days
     print(f"Searching for bids posted in the last {days_to_search} days")
 
+    metrics = get_metrics()
+    metrics.set_folder(script_folder)
     driver = setup_driver(
         temp_download_folder
     )  # Use temp_download_folder for initial downloads
     driver.get("https://mvendor.cgieva.com/Vendor/public/AllOpportunities.jsp")
 
     try:
-        perform_advanced_search(driver)
-        bid_links = extract_bid_links(driver)
+        with metrics.span(SEARCH):
+            perform_advanced_search(driver)
+        with metrics.span(LISTING):
+            bid_links = extract_bid_links(driver)
         total_bids = len(bid_links)
         print(f"📊 Total bid links extracted: {total_bids}")
 
         cutoff_date = datetime.now() - timedelta(days=days_to_search)
 
+        interventions = get_intervention_queue()
         for index, bid_element in enumerate(bid_links, start=1):
             try:
                 print(f"Processing bid {index}/{total_bids}...")
@@ -790,7 +802,8 @@ def main():
                 time.sleep(random.uniform(2, 4))
 
                 # Click the bid element first
-                bid_details = extract_bid_details(driver, bid_element)
+                with metrics.span(DETAIL):
+                    bid_details = extract_bid_details(driver, bid_element)
 
                 # Now get the URL after the page has loaded
                 bid_url = driver.current_url
@@ -833,7 +846,8 @@ def main():
                     }
                     driver.execute("send_command", params)
 
-                    attachments = download_attachments(driver, bid_number)
+                    with metrics.span(DOWNLOAD):
+                        attachments = download_attachments(driver, bid_number)
                     if attachments:
                         bid_details["Attachments"] = attachments
                     else:
@@ -848,10 +862,12 @@ def main():
 
                     time.sleep(random.uniform(3, 5))
 
-                    update_excel(bid_details)
+                    with metrics.span(EXCEL):
+                        update_excel(bid_details)
 
                     # Save to cache after successful processing
                     save_to_cache(bid_url, bid_details)
+                    metrics.count(BIDS_SAVED)
 
                     print(f"Navigating back to the main page...")
                     driver.back()
@@ -862,18 +878,22 @@ def main():
                     )
                     driver.back()
                     time.sleep(random.uniform(10, 15))
-            except ElementNotInteractableException:
+            except ElementNotInteractableException as e:
                 print(f"Interaction error for bid {index}/{total_bids}. Skipping...")
                 play_notification_sound()
-                input("Press Enter to continue...")
+                interventions.report(
+                    f"Bid {index}/{total_bids} skipped: {str(e)}", driver
+                )
                 driver.back()
                 time.sleep(random.uniform(10, 15))
-            except StaleElementReferenceException:
+            except StaleElementReferenceException as e:
                 print(
                     f"Stale element reference for bid {index}/{total_bids}. Skipping..."
                 )
                 play_notification_sound()
-                input("Press Enter to continue...")
+                interventions.report(
+                    f"Bid {index}/{total_bids} skipped: {str(e)}", driver
+                )
                 driver.back()
                 time.sleep(random.uniform(10, 15))
             except Exception as e:
@@ -881,7 +901,9 @@ def main():
                     f"Error processing bid {index}/{total_bids}: {str(e)}. Skipping..."
                 )
                 play_notification_sound()
-                input("Press Enter to continue...")
+                interventions.report(
+                    f"Bid {index}/{total_bids} skipped: {str(e)}", driver
+                )
                 driver.back()
                 time.sleep(random.uniform(10, 15))
 
@@ -891,18 +913,9 @@ def main():
     except Exception as e:
         print(f"❗ An error occurred: {str(e)}")
         play_notification_sound()  # Play notification sound on error
-        input("Press Enter to continue...")
+        get_intervention_queue().report(f"An error occurred: {str(e)}", driver)
 
     finally:
-        # Remove cookies file
-        cookie_file = "cookies.pkl"
-        if os.path.exists(cookie_file):
-            try:
-                os.remove(cookie_file)
-                print("🗑️ Removed cookies file")
-            except Exception as e:
-                print(f"Error removing cookies file: {e}")
-                
         driver.quit()
         update_attachments_in_excel()
         cleanup_script_folder()  # Clean up the script-specific folder
@@ -16,7 +16,6 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import time
 from datetime import datetime, timedelta
 import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -36,6 +35,10 @@ import sys
 import winsound  # For Windows notification sounds
 import argparse
 from utils.utils import safe_move, play_notification_sound
+from utils.download_slots import DownloadSlotManager, sweep_slots
+from utils.driver_factory import create_driver
+from utils.interventions import get_intervention_queue
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 import json
 
 # Script name following the new convention
@@ -74,20 +77,16 @@ def parse_arguments():
 
 def setup_driver():
     """Set up and configure the Chrome WebDriver."""
-    chrome_options = webdriver.ChromeOptions()
-    prefs = {
-        "download.default_directory": main_folder,
-        "download.prompt_for_download": False,
-        "download.directory_upgrade": True,
-        "safebrowsing.enabled": True,
-    }
-    chrome_options.add_experimental_option("prefs", prefs)
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--ignore-certificate-errors")
-    chrome_options.add_argument("--ignore-ssl-errors")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-software-rasterizer")
-    return webdriver.Chrome(options=chrome_options)
+    return create_driver(
+        download_folder=main_folder,
+        site="https://www.bidbuy.illinois.gov",
+        arguments=[
+            "--start-maximized",
+            "--ignore-certificate-errors",
+            "--ignore-ssl-errors",
+            "--disable-software-rasterizer",
+        ],
+    )
 
 
 def click_advanced_search(driver):
@@ -365,63 +364,27 @@ def download_attachments(driver, bid_number):
 
     print(f"Found {len(attachments)} attachments for bid {bid_number}")
 
-    for index, attachment in enumerate(attachments, start=1):
-        file_name = attachment.text
-        print(f"Downloading attachment {index}/{len(attachments)}: {file_name}")
-        try:
-            before = os.listdir(main_folder)
-            attachment.click()
-
-            # Wait for up to 5 minutes (300 seconds) in 30-second intervals
-            max_wait_time = 300
-            interval = 30
-            downloaded_file = None
-
-            for _ in range(0, max_wait_time, interval):
-                time.sleep(interval)
-                after = os.listdir(main_folder)
-                new_files = [f for f in after if f not in before]
-
-                if new_files:
-                    downloaded_file = new_files[0]
-                    source_path = os.path.join(main_folder, downloaded_file)
-
-                    # Check if the file has finished downloading
-                    if not downloaded_file.endswith(".crdownload") and os.path.exists(
-                        source_path
-                    ):
-                        break
-
-            if downloaded_file:
-                source_path = os.path.join(main_folder, downloaded_file)
-                destination_path = os.path.join(bid_folder, file_name)
-
-                # Retry moving the file
-                move_success = False
-                for attempt in range(5):
-                    try:
-                        safe_move(source_path, destination_path)
-                        print(f"Successfully moved {file_name} to {bid_folder}")
-                        attachments_downloaded = True
-                        move_success = True
-                        break
-                    except FileNotFoundError:
-                        if attempt < 4:
-                            time.sleep(2)
-                        else:
-                            print(f"Failed to move {file_name} after 5 attempts")
-                    except Exception as e:
-                        if attempt < 4:
-                            time.sleep(2)
-                        else:
-                            print(f"Error moving {file_name}: {str(e)}")
-
-                if not move_success:
-                    print(f"Failed to move {file_name}. It will be moved later.")
-            else:
-                print(f"⚠️ Download did not complete for: {file_name} within 5 minutes")
-        except Exception as e:
-            print(f"⚠️ Error downloading attachment for bid {bid_number}: {str(e)}")
+    # Give every download its own slot folder so files cannot be mixed up
+    with DownloadSlotManager(driver, main_folder) as slots:
+        started = []
+        for index, attachment in enumerate(attachments, start=1):
+            file_name = attachment.text
+            print(f"Downloading attachment {index}/{len(attachments)}: {file_name}")
+            try:
+                started.append((file_name, slots.start(attachment.click, label=file_name)))
+            except Exception as e:
+                print(f"⚠️ Error downloading attachment for bid {bid_number}: {str(e)}")
+
+        # Wait for up to 5 minutes per file while the downloads run in parallel
+        for file_name, slot in started:
+            try:
+                if slots.collect(slot, bid_folder, filename=file_name, timeout=300):
+                    print(f"Successfully moved {file_name} to {bid_folder}")
+                    attachments_downloaded = True
+                else:
+                    print(f"⚠️ Download did not complete for: {file_name} within 5 minutes")
+            except Exception as e:
+                print(f"⚠️ Error downloading attachment for bid {bid_number}: {str(e)}")
 
     if attachments_downloaded:
         print(f"✅ Successfully downloaded attachments for bid {bid_number}")
@@ -496,7 +459,7 @@ def update_excel(bid_data, sl_no):
     except Exception as e:
         print(f"Error updating Excel file: {str(e)}")
         play_notification_sound()
-        input("Press Enter to continue...")
+        get_intervention_queue().report(f"Error updating Excel file: {str(e)}")
 
 
 def signal_handler(sig, frame):
@@ -508,6 +471,8 @@ def signal_handler(sig, frame):
 
 def move_remaining_files():
     """Move any remaining files in the download folder to appropriate bid folders."""
+    # Downloads that finished after their bid gave up on them are still in slot folders
+    sweep_slots(main_folder, main_folder)
     for file in os.listdir(main_folder):
         file_path = os.path.join(main_folder, file)
         if os.path.isfile(file_path):
@@ -620,6 +585,8 @@ def main(days_to_scrape):
     )
 
     signal.signal(signal.SIGINT, signal_handler)
+    metrics = get_metrics()
+    metrics.set_folder(script_folder)
 
     max_retries = 3
     for attempt in range(max_retries):
@@ -630,7 +597,8 @@ def main(days_to_scrape):
                 "https://www.bidbuy.illinois.gov/bso/view/search/external/advancedSearchBid.xhtml?openBids=true"
             )
 
-            click_advanced_search(driver)
+            with metrics.span(SEARCH):
+                click_advanced_search(driver)
 
             # Open a new tab for bid details
             driver.execute_script("window.open('');")
@@ -646,7 +614,8 @@ def main(days_to_scrape):
             while True:
                 print(f"Current Page Number: {page_number}")
                 driver.switch_to.window(search_window)
-                bid_links = extract_bid_links(driver, max_links=25)
+                with metrics.span(LISTING):
+                    bid_links = extract_bid_links(driver, max_links=25)
                 print(f"📊 Total bid links extracted: {len(bid_links)}")
 
                 if not bid_links:
@@ -669,14 +638,15 @@ def main(days_to_scrape):
                             if not should_process_bid_link(link):
                                 break
 
-                            driver.get(link)
+                            with metrics.span(DETAIL):
+                                driver.get(link)
 
-                            # Wait for the page to load completely
-                            WebDriverWait(driver, 30).until(
-                                EC.presence_of_element_located((By.XPATH, "//body"))
-                            )
+                                # Wait for the page to load completely
+                                WebDriverWait(driver, 30).until(
+                                    EC.presence_of_element_located((By.XPATH, "//body"))
+                                )
 
-                            bid_details = extract_bid_details(driver, link)
+                                bid_details = extract_bid_details(driver, link)
                             if bid_details is None:
                                 print(f"Failed to extract details for bid: {link}")
                                 break
@@ -690,10 +660,13 @@ def main(days_to_scrape):
                                         bid_details["Posted Date"], "%Y-%m-%d"
                                     )
                                     if posted_date > cutoff_date:
-                                        attachments_downloaded = download_attachments(
-                                            driver, bid_details["Solicitation Number"]
-                                        )
-                                        update_excel(bid_details, sl_no)
+                                        with metrics.span(DOWNLOAD):
+                                            attachments_downloaded = download_attachments(
+                                                driver, bid_details["Solicitation Number"]
+                                            )
+                                        with metrics.span(EXCEL):
+                                            update_excel(bid_details, sl_no)
+                                        metrics.count(BIDS_SAVED)
 
                                         # Save to cache after successful processing
                                         save_to_cache(link, bid_details)
@@ -744,7 +717,9 @@ def main(days_to_scrape):
                         except Exception as e:
                             print(f"Error processing bid: {str(e)}")
                             play_notification_sound()
-                            input("Press Enter to continue...")
+                            get_intervention_queue().report(
+                                f"Error processing bid: {str(e)}", driver, url=link
+                            )
                             break
 
                     # Add a small delay between processing bids to avoid overwhelming the server
@@ -796,8 +771,11 @@ def main(days_to_scrape):
                 f"❗ An error occurred (Attempt {attempt + 1}/{max_retries}): {str(e)}"
             )
             play_notification_sound()  # Error notification
+            get_intervention_queue().report(
+                f"An error occurred (Attempt {attempt + 1}/{max_retries}): {str(e)}", driver
+            )
             if attempt < max_retries - 1:
-                input("Press Enter to retry...")
+                print("Retrying...")
             else:
                 print("Max retries reached. Exiting.")
                 move_remaining_files()  # Ensure remaining files are moved even if max retries are reached
@@ -36,7 +36,6 @@ from dateutil import parser
 import pytz
 import argparse
 import traceback
-import zipfile
 import glob
 import shutil
 from selenium.webdriver.common.keys import Keys
@@ -44,8 +43,13 @@ import winsound  # For playing notification sounds
 from fake_useragent import UserAgent
 from selenium_stealth import stealth
 import random
-import pickle
 from utils.utils import safe_move, play_notification_sound
+from utils.archive_expander import get_archive_expander
+from utils.table_extract import extract_rows
+from utils.waits import dom_quiet, element_ready, pace, wait_until
+from utils.interventions import get_intervention_queue
+from utils.sessions import get_session_vault
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 
 # Load environment variables
 load_dotenv()
@@ -56,6 +60,15 @@ logging.basicConfig(
 )
 
 
+# Bid search results, read in one batch per page by process_bids()
+BID_ROWS_XPATH = "//table[contains(@class, 'pb-datatable data')]//tbody/tr"
+BID_ROW_COLUMNS = {
+    "posted_date": "./td[1]",
+    "solicitation_number": "./td[3]",
+    "row_attribute": (".", "rowattribute"),
+}
+
+
 def setup_driver():
     """Set up and return a configured Chrome WebDriver with anti-bot measures."""
     options = webdriver.ChromeOptions()
@@ -106,7 +119,7 @@ def wait_and_click(driver, xpath, timeout=60):
 
 def random_delay(min_delay=1, max_delay=5):
     """Add a random delay to mimic human behavior."""
-    time.sleep(random.uniform(min_delay, max_delay))
+    pace(min_delay, max_delay)
 
 
 def mimic_human_interaction(driver):
@@ -119,6 +132,20 @@ def mimic_human_interaction(driver):
         # If an error occurs, we'll just log it and continue without raising an exception
 
 
+def is_logged_in(driver):
+    """Cheap session check: visitors are sent from the search page to the portal home."""
+    driver.get("https://vendors.planetbids.com/portal/22554/bo/bo-search")
+    try:
+        WebDriverWait(driver, 15).until(
+            EC.visibility_of_element_located((By.ID, "stageId-field"))
+        )
+    except TimeoutException:
+        return False
+    return "bo/bo-search" in driver.current_url and not driver.find_elements(
+        By.XPATH, "//a[contains(text(), 'Log In')]"
+    )
+
+
 def login(driver):
     """Log in to the PlanetBids website and navigate to the search page."""
     try:
@@ -227,9 +254,7 @@ def login(driver):
         )
 
         logging.info("🟢 Login Successful and on correct page")
-
-        # Persist cookies
-        pickle.dump(driver.get_cookies(), open("cookies.pkl", "wb"))
+        return True
 
     except TimeoutException:
         logging.error("Login failed: Timeout while waiting for an element")
@@ -655,17 +680,9 @@ def download_attachments(driver, options, bid_number):
                     key=os.path.getctime,
                 )
 
-                # Unzip directly to bid folder
-                with zipfile.ZipFile(latest_zip, "r") as zip_ref:
-                    total_files = len(zip_ref.namelist())
-                    for index, file in enumerate(zip_ref.namelist(), start=1):
-                        logging.info(
-                            f"Extracting file {index} of {total_files}: {file}"
-                        )
-                        zip_ref.extract(file, bid_folder)
-
-                # Remove the zip file
-                os.remove(latest_zip)
+                # Unzip directly to bid folder and remove the zip file
+                extracted = get_archive_expander().expand(latest_zip, bid_folder)
+                logging.info(f"Extracted {len(extracted)} files from {latest_zip}")
 
                 # Check if any files were downloaded and remove empty folder if none were
                 if not os.path.exists(bid_folder) or not os.listdir(bid_folder):
@@ -695,7 +712,16 @@ def download_attachments(driver, options, bid_number):
         return ""
 
 
+def listing_page_turned(old_row, old_attribute):
+    """True once the grid's first row was removed or shows another bid."""
+    try:
+        return old_row.get_attribute("rowattribute") != old_attribute
+    except StaleElementReferenceException:
+        return True
+
+
 def process_bids(driver, options, days_to_scrape):
+    metrics = get_metrics()
     bids_data = []
     current_date = datetime.now(pytz.timezone("US/Eastern")).date()
     cutoff_date = current_date - timedelta(days=days_to_scrape)
@@ -716,116 +742,120 @@ def process_bids(driver, options, days_to_scrape):
     os.makedirs(temp_download_folder, exist_ok=True)
 
     try:
-        while True:
-            logging.info("Waiting for bid rows to be present...")
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located(
-                    (
-                        By.XPATH,
-                        "//table[contains(@class, 'pb-datatable data')]//tbody/tr",
-                    )
+        with metrics.span(LISTING):
+            while True:
+                logging.info("Waiting for bid rows to be present...")
+                WebDriverWait(driver, 20).until(
+                    EC.presence_of_element_located((By.XPATH, BID_ROWS_XPATH))
                 )
-            )
 
-            bid_rows = driver.find_elements(
-                By.XPATH, "//table[contains(@class, 'pb-datatable data')]//tbody/tr"
-            )
+                # One script call for the whole page instead of three lookups per row
+                bid_rows = extract_rows(driver, BID_ROWS_XPATH, BID_ROW_COLUMNS)
 
-            logging.info(f"Found {len(bid_rows)} bid rows on the current page.")
+                logging.info(f"Found {len(bid_rows)} bid rows on the current page.")
 
-            for row in bid_rows:
-                try:
-                    date_element = row.find_element(By.XPATH, "./td[1]")
-                    displayed_date_str = date_element.text.strip()
+                for row in bid_rows:
+                    displayed_date_str = row["posted_date"] or ""
+                    solicitation_number = row["solicitation_number"] or ""
+                    row_attribute = row["row_attribute"]
 
-                    solicitation_number_element = row.find_element(By.XPATH, "./td[3]")
-                    solicitation_number = solicitation_number_element.text.strip()
+                    if not row_attribute:
+                        logging.warning(
+                            f"Could not find rowattribute for bid on {displayed_date_str}"
+                        )
+                        continue
 
-                    row_attribute = row.get_attribute("rowattribute")
+                    bid_detail_url = f"https://vendors.planetbids.com/portal/22554/bo/bo-detail/{row_attribute}"
 
-                    if row_attribute:
-                        bid_detail_url = f"https://vendors.planetbids.com/portal/22554/bo/bo-detail/{row_attribute}"
+                    try:
+                        displayed_date = datetime.strptime(
+                            displayed_date_str, "%m/%d/%Y"
+                        ).date()
+                        ymd_date_str = displayed_date.strftime("%Y-%m-%d")
+                    except ValueError:
+                        logging.warning(f"Could not parse date: {displayed_date_str}")
+                        continue
+
+                    if cutoff_date <= displayed_date <= current_date:
+                        bid_links.append(
+                            {
+                                "url": bid_detail_url,
+                                "posted_date": ymd_date_str,
+                                "solicitation_number": solicitation_number,
+                            }
+                        )
+                        logging.info(
+                            f"Added bid link: {bid_detail_url}, Posted Date: {ymd_date_str}, Solicitation Number: {solicitation_number}"
+                        )
 
-                        try:
-                            displayed_date = datetime.strptime(
-                                displayed_date_str, "%m/%d/%Y"
-                            ).date()
-                            ymd_date_str = displayed_date.strftime("%Y-%m-%d")
-                        except ValueError:
-                            logging.warning(
-                                f"Could not parse date: {displayed_date_str}"
-                            )
-                            continue
-
-                        if cutoff_date <= displayed_date <= current_date:
-                            bid_links.append(
-                                {
-                                    "url": bid_detail_url,
-                                    "posted_date": ymd_date_str,
-                                    "solicitation_number": solicitation_number,
-                                }
-                            )
-                            logging.info(
-                                f"Added bid link: {bid_detail_url}, Posted Date: {ymd_date_str}, Solicitation Number: {solicitation_number}"
+                # Check if there's a next page
+                try:
+                    next_button = WebDriverWait(driver, 10).until(
+                        EC.element_to_be_clickable(
+                            (
+                                By.XPATH,
+                                "//a[contains(@class, 'page-link') and contains(text(), 'Next')]",
                             )
-                    else:
-                        logging.warning(
-                            f"Could not find rowattribute for bid on {displayed_date_str}"
                         )
-
-                except StaleElementReferenceException:
-                    logging.warning(
-                        "Stale element encountered. Refreshing page and retrying."
                     )
-                    driver.refresh()
-                    time.sleep(5)
+                    # The old rows satisfy the presence wait above, so remember the
+                    # first one and wait for the grid to replace it
+                    first_rows = driver.find_elements(By.XPATH, BID_ROWS_XPATH)[:1]
+                    old_attribute = first_rows[0].get_attribute("rowattribute") if first_rows else None
+                    next_button.click()
+                    if first_rows and not wait_until(
+                        lambda: listing_page_turned(first_rows[0], old_attribute),
+                        timeout=20,
+                        label="next listing page rows",
+                    ):
+                        logging.warning("The listing did not change after clicking Next, stopping pagination")
+                        break
+                    # Then for the grid to finish redrawing
+                    dom_quiet(driver, replaces=5, label="next listing page")
+                except TimeoutException:
+                    logging.info("No more pages to process.")
                     break
                 except Exception as e:
-                    logging.error(f"Error processing bid row: {str(e)}")
-                    logging.error(f"Traceback: {traceback.format_exc()}")
-
-            # Check if there's a next page
-            try:
-                next_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable(
-                        (
-                            By.XPATH,
-                            "//a[contains(@class, 'page-link') and contains(text(), 'Next')]",
-                        )
-                    )
-                )
-                next_button.click()
-                time.sleep(5)  # Wait for next page to load
-            except TimeoutException:
-                logging.info("No more pages to process.")
-                break
-            except Exception as e:
-                logging.error(f"Error navigating to next page: {str(e)}")
-                break
+                    logging.error(f"Error navigating to next page: {str(e)}")
+                    break
 
         # Process collected bid links
         total_bids = len(bid_links)
-        for index, bid_link in enumerate(bid_links, start=1):
+        interventions = get_intervention_queue()
+        # Bids that fail are parked for the operator and retried once resolved
+        for index, bid_link in interventions.with_retries(enumerate(bid_links, start=1)):
             try:
                 logging.info(f"Processing bid {index} out of {total_bids}")
 
-                driver.get(bid_link["url"])
-                time.sleep(5)
+                # Keep a human-like gap between bid pages; load time counts toward it
+                requested_at = time.monotonic()
+                with metrics.span(DETAIL):
+                    driver.get(bid_link["url"])
+                    element_ready(
+                        driver,
+                        (By.CLASS_NAME, "bid-detail-item-title"),
+                        replaces=5,
+                        label="bid detail page",
+                    )
+                    pace(2, 4, since=requested_at)
 
-                bid_details = extract_bid_details(driver, bid_link["posted_date"])
+                    bid_details = extract_bid_details(driver, bid_link["posted_date"])
                 if bid_details:
                     bid_details["Posted Date"] = bid_link["posted_date"]
                     bid_details["Solicitation Number"] = bid_link["solicitation_number"]
 
                     # Download attachments
-                    attachments = download_attachments(
-                        driver, options, bid_link["solicitation_number"]
-                    )
+                    with metrics.span(DOWNLOAD):
+                        attachments = download_attachments(
+                            driver, options, bid_link["solicitation_number"]
+                        )
                     bid_details["Attachments"] = attachments
                     bids_data.append(bid_details)
 
                     # Save Excel file inside script folder
-                    save_to_excel(bids_data, days_to_scrape, script_folder_path)
+                    with metrics.span(EXCEL):
+                        save_to_excel(bids_data, days_to_scrape, script_folder_path)
+                    metrics.count(BIDS_SAVED)
 
                     # Clean up empty bid folder if it exists
                     bid_folder = os.path.join(
@@ -837,20 +867,24 @@ def process_bids(driver, options, days_to_scrape):
                 else:
                     logging.error("Failed to extract bid details")
                     play_notification_sound()
-                    user_input = input(
-                        "An error occurred. Press Enter to continue or type 'q' to quit: "
+                    interventions.park(
+                        f"Failed to extract details for bid {bid_link['solicitation_number']}",
+                        driver,
+                        url=bid_link["url"],
+                        bid=bid_link["solicitation_number"],
+                        context={"retry": [index, bid_link]},
                     )
-                    if user_input.lower() == "q":
-                        break
 
             except Exception as e:
                 logging.error(f"Error processing bid {index}: {str(e)}")
                 play_notification_sound()
-                user_input = input(
-                    "An error occurred. Press Enter to continue or type 'q' to quit: "
+                interventions.park(
+                    f"Error processing bid {index}: {str(e)}",
+                    driver,
+                    url=bid_link["url"],
+                    bid=bid_link["solicitation_number"],
+                    context={"retry": [index, bid_link]},
                 )
-                if user_input.lower() == "q":
-                    break
 
                 # Clean up empty bid folder if it exists after an error
                 bid_folder = os.path.join(
@@ -863,7 +897,7 @@ def process_bids(driver, options, days_to_scrape):
         logging.error(f"Error processing bids: {str(e)}")
         logging.error(f"Traceback: {traceback.format_exc()}")
         play_notification_sound()
-        input("Press Enter to continue...")
+        get_intervention_queue().report(f"Error processing bids: {str(e)}", driver)
 
     # Clean up temporary download folder if empty
     if os.path.exists(temp_download_folder) and not os.listdir(temp_download_folder):
@@ -964,18 +998,34 @@ def main(days_to_scrape):
 
     # Create IN_PROGRESS folder
     os.makedirs(temp_folder_path, exist_ok=True)
+    metrics = get_metrics()
+    metrics.set_folder(temp_folder_path)
 
     while retry_count < max_retries:
         try:
             driver, options = setup_driver()
 
-            # Perform login
-            login(driver)
+            # Reuse the saved session when it is still valid, log in otherwise
+            logged_in = get_session_vault().ensure(
+                driver,
+                "planetbids_hartford",
+                os.getenv("HARTFORD_EMAIL"),
+                "https://vendors.planetbids.com/portal/22554/login",
+                is_logged_in,
+                login,
+            )
+            logging.info(get_session_vault().summary())
+            if not logged_in:
+                logging.error("Login failed. Exiting script.")
+                play_notification_sound()
+                get_intervention_queue().report("Login failed, no bids were scraped", driver)
+                break
 
             # Add a delay after login
             time.sleep(10)
 
-            set_filters(driver)
+            with metrics.span(SEARCH):
+                set_filters(driver)
             bids_data = process_bids(driver, options, days_to_scrape)
             if bids_data:
                 save_to_excel(bids_data, days_to_scrape, temp_folder_path)
@@ -1022,15 +1072,6 @@ def main(days_to_scrape):
         finally:
             if driver:
                 driver.quit()
-            
-            # Remove cookies file
-            cookie_file = "cookies.pkl"
-            if os.path.exists(cookie_file):
-                try:
-                    os.remove(cookie_file)
-                    print("🗑️ Removed cookies file")
-                except Exception as e:
-                    print(f"Error removing cookies file: {e}")
 
     if bids_data is None:
         logging.error("Failed to retrieve any bid data after all attempts.")
@@ -9,6 +9,10 @@ import urllib3
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.utils import safe_move
+from utils.interventions import get_intervention_queue
+from utils.sessions import get_session_vault
+from utils.rate_limit import get_rate_limiter, throttle
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, get_metrics
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
@@ -36,11 +40,12 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.action_chains import ActionChains
 import tempfile
 import atexit
-from selenium.webdriver.chrome.options import Options
-from selenium_stealth import stealth
-from fake_useragent import UserAgent
 import json
+import glob
+import queue
+import threading
 from pathlib import Path
+from urllib.parse import urlparse
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -58,8 +63,15 @@ if not os.getenv("FAIRFAX_EMAIL") or not os.getenv("FAIRFAX_PASSWORD"):
     logger.error("FAIRFAX_EMAIL or FAIRFAX_PASSWORD environment variables are not set.")
     sys.exit(1)
 
-# Add this list of URLs at the beginning of the script, after the imports
+# Every Bonfire portal, formerly split across 12_Bonfire_FairfaxCounty_1..4
 BONFIRE_URLS = [
+    "https://mtc.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://adacounty.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://aps.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://brazoriacounty.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://bridgew.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://brucecounty.bonfirehub.ca/portal/?tab=openOpportunities",
+    "https://buffaloschools.bonfirehub.com/portal/?tab=openOpportunities",
     "https://burlesontx.bonfirehub.com/portal/?tab=openOpportunities",
     "https://cabq.bonfirehub.com/portal/?tab=openOpportunities",
     "https://cayman.bonfirehub.com/portal/?tab=openOpportunities",
@@ -67,21 +79,72 @@ BONFIRE_URLS = [
     "https://cityofalpharetta.bonfirehub.com/portal/?tab=openOpportunities",
     "https://coloradospringsgov.bonfirehub.com/portal/?tab=openOpportunities",
     "https://columbiacountyga.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://columbus.bonfirehub.com/opportunities/19900",
+    "https://co-newton-ga.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://countymilwaukee.bonfirehub.com/portal",
+    "https://cps.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://dallascityhall.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://ncsu.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://bjwsa.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://cityofmilwaukee.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://utrgv.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://fortbendisd.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://tuhsd.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://npc.bonfirehub.com/portal/?tab=openOpportunities",
+    "https://fairfaxcounty.bonfirehub.com/portal/?tab=openOpportunities",
 ]
 
+LOGIN_URL = "https://co-newton-ga.bonfirehub.com/portal/?tab=openOpportunities"
+
+DEFAULT_SHARDS = 4  # Concurrent browsers, one per former script copy
+MAX_PORTAL_ATTEMPTS = 2
+
+# Cache files written by the former copies, folded into the shared cache
+LEGACY_CACHE_PATTERNS = ["bonfire_bids_cache.json", "12_Bonfire_FairfaxCounty_*.json"]
+
 # Update the script_name variable
 script_name = os.path.splitext(os.path.basename(__file__))[0]
 
 # Parse command-line arguments
-parser = argparse.ArgumentParser(description="Scrape Bonfire FairfaxCounty bids.")
+parser = argparse.ArgumentParser(description="Scrape bids from Bonfire portals.")
 parser.add_argument(
     "--days", type=int, default=2, help="Number of days to scrape (default: 2)"
 )
+parser.add_argument(
+    "--shards",
+    type=int,
+    default=DEFAULT_SHARDS,
+    help=f"Number of browsers working through the portal list (default: {DEFAULT_SHARDS})",
+)
+parser.add_argument(
+    "--portals",
+    nargs="+",
+    help="Only scrape portals whose URL contains one of these names, e.g. cabq ncsu",
+)
 args = parser.parse_args()
 
 # Use the provided number of days or default to 2
 days_to_scrape = args.days
 
+# Shards share the cache, the Excel file and the run statistics
+cache_lock = threading.Lock()
+excel_lock = threading.Lock()
+stats_lock = threading.Lock()
+
+# Cookies from the single login, copied into every shard's browser
+session_cookies = []
+
+run_stats = {
+    "portals_done": 0,
+    "portals_failed": 0,
+    "links_found": 0,
+    "duplicate_links": 0,
+    "cache_skips": 0,
+    "details_loaded": 0,
+    "bids_saved": 0,
+    "attachments": 0,
+}
+
 # Create a folder named after yesterday's date
 yesterday = datetime.now() - timedelta(days=1)
 main_folder = os.path.join(
@@ -98,11 +161,11 @@ def play_notification():
     winsound.Beep(frequency, duration)
 
 
-def handle_error(error_message):
-    """Handle errors by logging, playing a notification and pausing the script."""
+def handle_error(error_message, driver=None):
+    """Handle errors by logging, playing a notification and reporting them to the dashboard."""
     logging.error(f"Error: {error_message}")
     play_notification()
-    input("Press Enter to continue...")
+    get_intervention_queue().report(error_message, driver)
 
 
 def create_temp_folder():
@@ -110,6 +173,7 @@ def create_temp_folder():
     # Create the script folder with IN_PROGRESS suffix
     script_folder = os.path.join(main_folder, f"{script_name}_IN_PROGRESS")
     os.makedirs(script_folder, exist_ok=True)
+    get_metrics().set_folder(script_folder)
 
     # Create downloads subfolder within the script folder
     downloads_folder = os.path.join(script_folder, script_name)
@@ -137,10 +201,14 @@ def create_temp_folder():
     return downloads_folder
 
 
-def setup_driver():
-    """Set up and configure the Chrome WebDriver."""
+def setup_driver(download_root, driver_path=None):
+    """Set up and configure a Chrome WebDriver with its own download folder.
+
+    Every shard gets a folder of its own under download_root, so attachments
+    downloaded by one browser are never moved into another shard's bid.
+    """
     chrome_options = webdriver.ChromeOptions()
-    temp_download_dir = create_temp_folder()
+    temp_download_dir = tempfile.mkdtemp(prefix="shard_", dir=download_root)
     prefs = {
         "download.default_directory": temp_download_dir,
         "download.prompt_for_download": False,
@@ -161,12 +229,44 @@ def setup_driver():
     chrome_options.add_argument("--ignore-ssl-errors")
 
     # Use ChromeDriverManager to automatically download and manage the ChromeDriver
-    service = Service(ChromeDriverManager().install())
+    service = Service(driver_path or ChromeDriverManager().install())
 
     driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver, temp_download_dir
 
 
+def share_session(driver, url):
+    """Copy the login cookies into a shard's browser for the portal's domain.
+
+    Selenium only accepts cookies for the domain currently loaded, so this is
+    called after the portal page is open. Returns True if any cookie was added
+    and the page needs a refresh to pick up the session.
+    """
+    host = urlparse(url).netloc.lower()
+    shared_domains = getattr(driver, "shared_domains", set())
+    added_domains = set()
+    for cookie in session_cookies:
+        domain = cookie.get("domain", "").lstrip(".").lower()
+        if not domain or domain in shared_domains:
+            continue
+        if host != domain and not host.endswith("." + domain):
+            continue
+        try:
+            driver.add_cookie(
+                {
+                    key: cookie[key]
+                    for key in ("name", "value", "domain", "path", "secure", "expiry")
+                    if key in cookie
+                }
+            )
+            added_domains.add(domain)
+        except WebDriverException as e:
+            logging.warning(f"Could not share cookie {cookie.get('name')} with {host}: {str(e)}")
+
+    driver.shared_domains = shared_domains | added_domains
+    return bool(added_domains)
+
+
 def is_logged_in(driver):
     try:
         # Check for elements that are visible when logged in
@@ -190,14 +290,18 @@ def is_logged_in(driver):
             return True
 
 
+def check_session(driver):
+    """Cheap session check on the portal page the login starts from."""
+    driver.get(LOGIN_URL)
+    return is_logged_in(driver)
+
+
 def login(driver, max_retries=3):
     logger.info("Checking login status...")
 
     for attempt in range(max_retries):
         try:
-            driver.get(
-                "https://co-newton-ga.bonfirehub.com/portal/?tab=openOpportunities"
-            )
+            driver.get(LOGIN_URL)
             time.sleep(5)  # Wait for page to load
 
             if is_logged_in(driver):
@@ -335,7 +439,7 @@ def extract_bid_links(driver):
     max_retries = 3
     max_scrolls = 10  # Set a maximum number of scrolls to prevent infinite loops
     scroll_wait_time = 10  # Increase wait time between scrolls
-    initial_page_load_wait = 15  # Increase initial page load wait time
+    initial_page_load_wait = 25  # Covers the fixed 10 s sleep callers used to add
 
     logging.info("Starting to extract bid links")
 
@@ -419,6 +523,7 @@ def extract_bid_details(driver, bid_link, url):
     max_retries = 3
     for attempt in range(max_retries):
         try:
+            throttle(bid_link)
             driver.get(bid_link)
             bid_details = {}
 
@@ -548,13 +653,10 @@ def extract_bid_details(driver, bid_link, url):
 
             return bid_details
         except WebDriverException as e:
-            if "target window already closed" in str(e) and attempt < max_retries - 1:
-                logging.warning(
-                    f"WebDriver lost connection. Attempt {attempt + 1} of {max_retries}. Restarting driver..."
-                )
-                driver.quit()
-                driver = setup_driver()
-                login(driver)
+            if "target window already closed" in str(e):
+                # The shard restarts its browser and retries the portal
+                logging.warning("WebDriver lost connection while extracting bid details")
+                raise
             elif attempt < max_retries - 1:
                 logging.warning(
                     f"Error extracting bid details. Attempt {attempt + 1} of {max_retries}. Retrying..."
@@ -711,47 +813,80 @@ def update_excel(bid_data, downloaded_attachments):
     )
 
     try:
-        if os.path.exists(excel_file):
-            logging.info(f"Existing Excel file found. Updating: {excel_file}")
-            df = pd.read_excel(excel_file)
-            df = pd.concat([df, pd.DataFrame([bid_data])], ignore_index=True)
-        else:
-            logging.info(f"Creating new Excel file: {excel_file}")
-            df = pd.DataFrame([bid_data])
+        # Shards append to the same workbook, so the read-modify-write and the
+        # serial number are done under one lock
+        with excel_lock:
+            if os.path.exists(excel_file):
+                logging.info(f"Existing Excel file found. Updating: {excel_file}")
+                df = pd.read_excel(excel_file)
+                bid_data["SL No"] = len(df) + 1
+                df = pd.concat([df, pd.DataFrame([bid_data])], ignore_index=True)
+            else:
+                logging.info(f"Creating new Excel file: {excel_file}")
+                bid_data["SL No"] = 1
+                df = pd.DataFrame([bid_data])
 
-        df = df.reindex(columns=column_order)
-        df.to_excel(excel_file, index=False)
+            df = df.reindex(columns=column_order)
+            df.to_excel(excel_file, index=False)
         logging.info(f"Successfully updated Excel file: {excel_file}")
     except Exception as e:
         handle_error(f"Error updating Excel file: {str(e)}")
 
 
+def get_cache_file():
+    """Return the path of the cache file shared by all shards."""
+    cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    return Path(cache_dir) / f"{script_name}_cache.json"
+
+
+def read_cache_file(cache_file):
+    """Read one cache file, converting posted dates back to datetime objects."""
+    with cache_file.open("r") as f:
+        cache = json.load(f)
+    for url, data in cache.items():
+        if data.get("posted_date"):
+            data["posted_date"] = datetime.strptime(data["posted_date"], "%Y-%m-%d")
+    return cache
+
+
 def load_bid_cache():
-    """Load the cached bid data from JSON file."""
-    cache_file = Path("cache/bonfire_bids_cache.json")
-    if not cache_file.exists():
-        cache_file.parent.mkdir(exist_ok=True)
-        return {}
+    """Load the cached bid data from JSON file.
 
-    try:
-        with cache_file.open("r") as f:
-            cache = json.load(f)
-            # Convert string dates back to datetime objects
-            for url, data in cache.items():
-                if data["posted_date"]:
-                    data["posted_date"] = datetime.strptime(
-                        data["posted_date"], "%Y-%m-%d"
-                    )
-            return cache
-    except Exception as e:
-        logging.warning(f"Error loading bid cache: {e}")
-        return {}
+    On the first run the caches of the former 12_Bonfire_FairfaxCounty_1..4
+    copies are merged, keeping the most recently checked entry for each bid.
+    """
+    cache_file = get_cache_file()
+    if cache_file.exists():
+        try:
+            return read_cache_file(cache_file)
+        except Exception as e:
+            logging.warning(f"Error loading bid cache: {e}")
+            return {}
+
+    cache = {}
+    for pattern in LEGACY_CACHE_PATTERNS:
+        for legacy_file in sorted(glob.glob(str(cache_file.parent / pattern))):
+            try:
+                legacy_cache = read_cache_file(Path(legacy_file))
+            except Exception as e:
+                logging.warning(f"Could not read legacy cache {legacy_file}: {e}")
+                continue
+            for url, data in legacy_cache.items():
+                current = cache.get(url)
+                if current is None or str(data.get("last_checked")) > str(current.get("last_checked")):
+                    cache[url] = data
+            logging.info(f"Merged {len(legacy_cache)} entries from legacy cache {legacy_file}")
+    return cache
 
 
 def save_bid_cache(cache):
-    """Save the bid cache to JSON file."""
-    script_name = os.path.splitext(os.path.basename(__file__))[0]
-    cache_file = Path(f"cache/{script_name}.json")
+    """Save the bid cache to JSON file.
+
+    Callers hold cache_lock. The file is written to a temporary name and
+    swapped in, so an interrupted run never leaves a truncated cache behind.
+    """
+    cache_file = get_cache_file()
     try:
         # Convert datetime objects to strings for JSON serialization
         serializable_cache = {}
@@ -778,11 +913,11 @@ def save_bid_cache(cache):
                 logging.warning(f"Error processing cache entry for {url}: {e}")
                 continue
 
-        with cache_file.open("w") as f:
+        temp_file = cache_file.with_suffix(".json.tmp")
+        with temp_file.open("w") as f:
             json.dump(serializable_cache, f, indent=2)
-            logging.info(
-                f"Successfully saved {len(serializable_cache)} entries to cache"
-            )
+        os.replace(temp_file, cache_file)
+        logging.info(f"Successfully saved {len(serializable_cache)} entries to cache")
     except Exception as e:
         logging.warning(f"Error saving bid cache: {e}")
 
@@ -840,176 +975,277 @@ def should_process_bid(bid_link, bid_cache):
     )
 
 
-def process_single_site(driver, url, temp_download_dir, url_number, total_urls):
-    """Process a single Bonfire site."""
-    logging.info(f"Processing URL {url_number}/{total_urls}: {url}")
+def claim_bid(bid_link, bid_cache, claimed_links):
+    """
+    Decide whether this shard should open a bid, and claim it if so.
+    Returns (should_process, reason) tuple; a link already claimed by another
+    shard or portal in this run is reported as a duplicate.
+    """
+    with cache_lock:
+        if bid_link in claimed_links:
+            return False, "Duplicate - already handled in this run"
+        should_process, reason = should_process_bid(bid_link, bid_cache)
+        if should_process:
+            claimed_links.add(bid_link)
+        return should_process, reason
+
+
+def release_bid(bid_link, claimed_links):
+    """Give up a claim whose bid failed, so a retry of the portal can open it again."""
+    with cache_lock:
+        claimed_links.discard(bid_link)
+
+
+def record_bid(bid_link, bid_cache, posted_date):
+    """Store a bid's posted date in the shared cache."""
+    with cache_lock:
+        bid_cache[bid_link] = {
+            "posted_date": posted_date,
+            "last_checked": datetime.now(),
+        }
+
+
+def count(stat, amount=1):
+    """Add to one of the run statistics."""
+    with stats_lock:
+        run_stats[stat] += amount
 
-    # Load the bid cache
-    bid_cache = load_bid_cache()
-    cache_modified = False
+
+def process_single_site(shard, url, url_number, total_urls, bid_cache, claimed_links):
+    """Process a single Bonfire site on a shard's browser.
+
+    Returns the number of bids saved. Browser failures are raised so the
+    shard can restart its browser and retry the portal.
+    """
+    driver = shard["driver"]
+    label = f"[Shard {shard['index']}] [URL {url_number}/{total_urls}]"
+    logging.info(f"{label} Processing {url}")
+    saved = 0
+    metrics = get_metrics()
 
     try:
-        driver.get(url)
-        time.sleep(10)
+        with metrics.span(LISTING):
+            throttle(url)
+            driver.get(url)
+            if share_session(driver, url):
+                driver.refresh()
 
-        bid_links = extract_bid_links(driver)
-        logging.info(f"Found {len(bid_links)} bid links")
+            bid_links = extract_bid_links(driver)
+        logging.info(f"{label} Found {len(bid_links)} bid links")
+        count("links_found", len(bid_links))
 
         for index, link in enumerate(bid_links, start=1):
             # Check if we should process this bid
-            should_process, reason = should_process_bid(link, bid_cache)
-
-            if link in bid_cache:
-                cache_info = bid_cache[link]
-                posted_date_str = (
-                    cache_info["posted_date"].strftime("%Y-%m-%d")
-                    if hasattr(cache_info["posted_date"], "strftime")
-                    else cache_info["posted_date"]
-                )
-                last_checked_str = (
-                    cache_info["last_checked"].strftime("%Y-%m-%d")
-                    if hasattr(cache_info["last_checked"], "strftime")
-                    else cache_info["last_checked"]
-                )
-
-                logging.info(
-                    f"[URL {url_number}/{total_urls}] Bid {index}/{len(bid_links)}:"
-                )
-                logging.info(
-                    f"  └─ Cache Status: Posted: {posted_date_str}, Last Checked: {last_checked_str}"
-                )
-                logging.info(
-                    f"  └─ Decision: {'Will process' if should_process else 'Skipping'} - {reason}"
-                )
-            else:
-                logging.info(
-                    f"[URL {url_number}/{total_urls}] Bid {index}/{len(bid_links)}: Not in cache - will process"
-                )
+            should_process, reason = claim_bid(link, bid_cache, claimed_links)
+            logging.info(
+                f"{label} Bid {index}/{len(bid_links)}: "
+                f"{'Will process' if should_process else 'Skipping'} - {reason}"
+            )
 
             if not should_process:
+                count("duplicate_links" if reason.startswith("Duplicate") else "cache_skips")
                 continue
 
-            bid_details = extract_bid_details(driver, link, url)
-            if bid_details:
-                posted_date = (
-                    datetime.strptime(bid_details["Posted Date"], "%Y-%m-%d")
-                    if bid_details["Posted Date"]
-                    else None
-                )
-
-                # Update cache with this bid's information
-                bid_cache[link] = {
-                    "posted_date": posted_date,
-                    "last_checked": datetime.now(),
-                }
-                cache_modified = True
-
-                if posted_date and posted_date >= datetime.now() - timedelta(
-                    days=days_to_scrape
-                ):
-                    bid_details["SL No"] = index
-                    downloaded_attachments = download_attachments(
-                        driver, bid_details["Solicitation Number"], temp_download_dir
-                    )
-                    update_excel(bid_details, downloaded_attachments)
-                    logging.info(
-                        f"✅ Successfully processed bid: {bid_details['Solicitation Number']}"
-                    )
-                else:
-                    logging.info(
-                        f"Skipping bid {bid_details.get('Solicitation Number', 'Unknown')} - older than {days_to_scrape} days or no date"
+            try:
+                with metrics.span(DETAIL):
+                    bid_details = extract_bid_details(driver, link, url)
+                count("details_loaded")
+                if bid_details:
+                    posted_date = (
+                        datetime.strptime(bid_details["Posted Date"], "%Y-%m-%d")
+                        if bid_details["Posted Date"]
+                        else None
                     )
 
-            time.sleep(5)
+                    if posted_date and posted_date >= datetime.now() - timedelta(
+                        days=days_to_scrape
+                    ):
+                        with metrics.span(DOWNLOAD):
+                            downloaded_attachments = download_attachments(
+                                driver, bid_details["Solicitation Number"], shard["download_dir"]
+                            )
+                        with metrics.span(EXCEL):
+                            update_excel(bid_details, downloaded_attachments)
+                        saved += 1
+                        count("bids_saved")
+                        metrics.count(BIDS_SAVED)
+                        count("attachments", len(downloaded_attachments))
+                        logging.info(
+                            f"✅ Successfully processed bid: {bid_details['Solicitation Number']}"
+                        )
+                    else:
+                        logging.info(
+                            f"Skipping bid {bid_details.get('Solicitation Number', 'Unknown')} - older than {days_to_scrape} days or no date"
+                        )
 
-        # Save the updated cache if it was modified
-        if cache_modified:
+                    # Update cache with this bid's information once it is handled
+                    record_bid(link, bid_cache, posted_date)
+            except Exception:
+                # The portal is retried; leave this bid for the retry to open
+                release_bid(link, claimed_links)
+                raise
+    finally:
+        # Persist what this portal added, even if it failed part way
+        with cache_lock:
             save_bid_cache(bid_cache)
 
-    except Exception as e:
-        logging.error(
-            f"Error processing site {url_number}/{total_urls} - {url}: {str(e)}"
-        )
-        # Still try to save cache if modified
-        if cache_modified:
-            save_bid_cache(bid_cache)
+    return saved
 
 
-def take_screenshot(driver, filename):
+def restart_shard_driver(shard, download_root, driver_path):
+    """Replace a shard's browser after it failed."""
     try:
-        screenshot_path = os.path.join(main_folder, f"{filename}.png")
-        driver.save_screenshot(screenshot_path)
-        logger.info(f"Screenshot saved: {screenshot_path}")
-    except Exception as e:
-        logger.error(f"Failed to take screenshot {filename}: {str(e)}")
+        shard["driver"].quit()
+    except Exception:
+        pass
+    shard["driver"], shard["download_dir"] = setup_driver(download_root, driver_path)
 
 
-def init_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-software-rasterizer")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)
-
-    ua = UserAgent()
-    chrome_options.add_argument(f"user-agent={ua.random}")
-
-    driver = webdriver.Chrome(options=chrome_options)
-    stealth(
-        driver,
-        languages=["en-US", "en"],
-        vendor="Google Inc.",
-        platform="Win32",
-        webgl_vendor="Intel Inc.",
-        renderer="Intel Iris OpenGL Engine",
-        fix_hairline=True,
-    )
+def shard_worker(shard, work_queue, total_urls, bid_cache, claimed_links, results, download_root, driver_path):
+    """Take portals from the shared queue until it is empty."""
+    while True:
+        try:
+            url_number, url, attempt = work_queue.get_nowait()
+        except queue.Empty:
+            break
 
-    return driver
+        start = time.time()
+        try:
+            if shard["driver"] is None:
+                shard["driver"], shard["download_dir"] = setup_driver(download_root, driver_path)
+            saved = process_single_site(
+                shard, url, url_number, total_urls, bid_cache, claimed_links
+            )
+            results[url] = {
+                "status": "done",
+                "shard": shard["index"],
+                "bids": saved,
+                "seconds": time.time() - start,
+                "attempts": attempt,
+            }
+            count("portals_done")
+        except Exception as e:
+            logging.error(f"[Shard {shard['index']}] Error processing {url}: {str(e)}")
+            results[url] = {
+                "status": "failed",
+                "shard": shard["index"],
+                "bids": 0,
+                "seconds": time.time() - start,
+                "attempts": attempt,
+            }
+            try:
+                restart_shard_driver(shard, download_root, driver_path)
+            except Exception as restart_error:
+                logging.error(f"[Shard {shard['index']}] Could not restart browser: {restart_error}")
+                shard["driver"] = None
+            if attempt < MAX_PORTAL_ATTEMPTS:
+                work_queue.put((url_number, url, attempt + 1))
+            else:
+                count("portals_failed")
 
 
-def login_to_first_portal(driver, url):
-    driver.get(url)
-    # Add login logic here if needed
-    WebDriverWait(driver, 20).until(
-        EC.presence_of_element_located((By.ID, "some-login-element-id"))
-    )
-    print("Login successful.")
+def get_portal_urls(names=None):
+    """Return the portals to scrape, optionally filtered by name."""
+    urls = list(dict.fromkeys(BONFIRE_URLS))
+    if names:
+        urls = [url for url in urls if any(name.lower() in url.lower() for name in names)]
+    return urls
 
 
-def scrape_portal(driver, url):
-    driver.get(url)
-    WebDriverWait(driver, 20).until(
-        EC.presence_of_element_located((By.ID, "some-element-id"))
+def print_run_summary(urls, results, shards, elapsed):
+    """Log per-portal results and the throughput and dedup totals."""
+    hours = max(elapsed, 1) / 3600
+    logging.info(f"📊 Portal Summary ({elapsed / 60:.1f} minutes on {shards} shards):")
+    for url in urls:
+        result = results.get(url, {"status": "not run", "shard": "-", "bids": 0, "seconds": 0})
+        logging.info(
+            f"  {urlparse(url).netloc:<40} {result['status']:<8} shard: {result['shard']} "
+            f"bids: {result['bids']:<4} {result['seconds']:.0f}s"
+        )
+    logging.info(
+        f"  Portals: {run_stats['portals_done']} done, {run_stats['portals_failed']} failed "
+        f"({run_stats['portals_done'] / hours:.1f}/hour)"
+    )
+    logging.info(
+        f"  Bid links: {run_stats['links_found']} found, {run_stats['cache_skips']} skipped by cache, "
+        f"{run_stats['duplicate_links']} duplicates"
+    )
+    logging.info(
+        f"  Detail pages: {run_stats['details_loaded']} loaded ({run_stats['details_loaded'] / hours:.1f}/hour), "
+        f"{run_stats['bids_saved']} bids saved with {run_stats['attachments']} attachments"
     )
-    print(f"Scraping portal: {url}")
-    # Add scraping logic here
+    logging.info(f"  Logins: {get_session_vault().summary()}, shared by every shard")
+    logging.info(f"  {get_rate_limiter().summary()}")
 
 
 def main():
+    global session_cookies
+
+    urls = get_portal_urls(args.portals)
+    shards = max(1, min(args.shards, len(urls)))
     logging.info(
         f"🚀 Bids Extraction Started (Scraping bids from the last {days_to_scrape} days)"
     )
-    driver, temp_download_dir = setup_driver()
+    logging.info(f"🌐 {len(urls)} Bonfire portals on {shards} shards")
+
+    download_root = create_temp_folder()
+    driver_path = ChromeDriverManager().install()
+    bid_cache = load_bid_cache()
+    claimed_links = set()
+    results = {}
+    shard_states = [
+        {"index": index, "driver": None, "download_dir": None}
+        for index in range(1, shards + 1)
+    ]
+    run_start = time.time()
 
     try:
-        # Attempt to log in once at the beginning
-        if not login(driver):
+        # Log in once; the other shards reuse the session through its cookies
+        first = shard_states[0]
+        first["driver"], first["download_dir"] = setup_driver(download_root, driver_path)
+        if not get_session_vault().ensure(
+            first["driver"],
+            "bonfire",
+            os.getenv("FAIRFAX_EMAIL"),
+            LOGIN_URL,
+            check_session,
+            login,
+        ):
             raise Exception("Failed to log in after multiple attempts")
-
-        # Double-check login status
-        if is_logged_in(driver):
-            logging.info("Login confirmed successful")
-        else:
-            logging.warning("Login may have failed. Proceeding with caution.")
-
-        total_urls = len(BONFIRE_URLS)
-        for url_number, url in enumerate(BONFIRE_URLS, start=1):
-            process_single_site(driver, url, temp_download_dir, url_number, total_urls)
-            time.sleep(10)  # Wait between processing different sites
-
+        session_cookies = first["driver"].get_cookies()
+        first["driver"].shared_domains = {
+            cookie.get("domain", "").lstrip(".").lower() for cookie in session_cookies
+        }
+        logging.info(f"Login confirmed, sharing {len(session_cookies)} cookies with {shards} shards")
+
+        work_queue = queue.Queue()
+        for url_number, url in enumerate(urls, start=1):
+            work_queue.put((url_number, url, 1))
+
+        threads = [
+            threading.Thread(
+                target=shard_worker,
+                args=(
+                    shard,
+                    work_queue,
+                    len(urls),
+                    bid_cache,
+                    claimed_links,
+                    results,
+                    download_root,
+                    driver_path,
+                ),
+                name=f"bonfire-shard-{shard['index']}",
+                daemon=True,
+            )
+            for shard in shard_states
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        print_run_summary(urls, results, shards, time.time() - run_start)
         logging.info("🎉 All Bids and Attachments Extraction Successfully Completed")
         play_notification()
 
@@ -1018,7 +1254,13 @@ def main():
         logging.error("Traceback:", exc_info=True)
 
     finally:
-        driver.quit()
+        for shard in shard_states:
+            if shard["driver"] is not None:
+                try:
+                    shard["driver"].quit()
+                except Exception:
+                    pass
+        # The download folders are removed by the cleanup registered in create_temp_folder()
 
 
 if __name__ == "__main__":
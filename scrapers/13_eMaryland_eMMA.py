@@ -36,6 +36,7 @@ import argparse
 import logging
 import re
 from utils.utils import safe_move, play_notification_sound
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 import requests
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -953,6 +954,8 @@ def should_process_bid_link(bid_url):
 
 def main(days_to_scrape=2):
     logger.info(f"🚀 Bids Extraction Started for {script_name}")
+    metrics = get_metrics()
+    metrics.set_folder(main_folder)
     driver = setup_driver()
 
     # Create a thread to keep the session alive
@@ -978,48 +981,50 @@ def main(days_to_scrape=2):
     )
 
     try:
-        driver.get("https://emma.maryland.gov/page.aspx/en/rfp/request_browse_public")
-        logger.info("Navigated to the main page")
+        with metrics.span(SEARCH):
+            driver.get("https://emma.maryland.gov/page.aspx/en/rfp/request_browse_public")
+            logger.info("Navigated to the main page")
 
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.ID, "body_x_grid_grd"))
-        )
-
-        try:
-            status_dropdown = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.ID, "body_x_selStatusCode_search"))
+            WebDriverWait(driver, 30).until(
+                EC.presence_of_element_located((By.ID, "body_x_grid_grd"))
             )
-            status_dropdown.click()
-            WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//li[text()='Open']"))
-            ).click()
-            time.sleep(2)
-            logger.info("Set 'Open' filter successfully")
-        except TimeoutException:
-            logger.warning("'Open' filter is already set.")
-
-        bid_links = extract_bid_links(driver, start_date)
-        logger.info(f"{len(bid_links)} bid links found, checking for new bids...")
 
-        new_bids = []
-        for link, posted_date, response_date in bid_links:
             try:
-                driver.get(link)
-                WebDriverWait(driver, 30).until(
-                    EC.presence_of_element_located(
-                        (By.ID, "body_x_tabc_rfp_ext_prxrfp_ext_x_lblProcessCode")
-                    )
+                status_dropdown = WebDriverWait(driver, 10).until(
+                    EC.element_to_be_clickable((By.ID, "body_x_selStatusCode_search"))
                 )
-                bid_number = driver.find_element(
-                    By.ID, "body_x_tabc_rfp_ext_prxrfp_ext_x_lblProcessCode"
-                ).text
-
-                if bid_number not in processed_bids:
-                    new_bids.append((link, posted_date, response_date))
-                    processed_bids.add(bid_number)
-            except Exception as e:
-                logger.error(f"Error checking bid number for {link}: {str(e)}")
-                continue
+                status_dropdown.click()
+                WebDriverWait(driver, 10).until(
+                    EC.element_to_be_clickable((By.XPATH, "//li[text()='Open']"))
+                ).click()
+                time.sleep(2)
+                logger.info("Set 'Open' filter successfully")
+            except TimeoutException:
+                logger.warning("'Open' filter is already set.")
+
+        with metrics.span(LISTING):
+            bid_links = extract_bid_links(driver, start_date)
+            logger.info(f"{len(bid_links)} bid links found, checking for new bids...")
+
+            new_bids = []
+            for link, posted_date, response_date in bid_links:
+                try:
+                    driver.get(link)
+                    WebDriverWait(driver, 30).until(
+                        EC.presence_of_element_located(
+                            (By.ID, "body_x_tabc_rfp_ext_prxrfp_ext_x_lblProcessCode")
+                        )
+                    )
+                    bid_number = driver.find_element(
+                        By.ID, "body_x_tabc_rfp_ext_prxrfp_ext_x_lblProcessCode"
+                    ).text
+
+                    if bid_number not in processed_bids:
+                        new_bids.append((link, posted_date, response_date))
+                        processed_bids.add(bid_number)
+                except Exception as e:
+                    logger.error(f"Error checking bid number for {link}: {str(e)}")
+                    continue
 
         logger.info(f"Found {len(new_bids)} new bids to process")
 
@@ -1035,14 +1040,15 @@ def main(days_to_scrape=2):
                     if not should_process_bid_link(link):
                         break
 
-                    driver.get(link)  # Navigate to the bid page
-                    WebDriverWait(driver, 30).until(
-                        EC.presence_of_element_located(
-                            (By.ID, "body_x_tabc_rfp_ext_prxrfp_ext_x_lblProcessCode")
+                    with metrics.span(DETAIL):
+                        driver.get(link)  # Navigate to the bid page
+                        WebDriverWait(driver, 30).until(
+                            EC.presence_of_element_located(
+                                (By.ID, "body_x_tabc_rfp_ext_prxrfp_ext_x_lblProcessCode")
+                            )
                         )
-                    )
 
-                    bid_details = extract_bid_details(driver, link)
+                        bid_details = extract_bid_details(driver, link)
                     if bid_details:
                         bid_details["SL No"] = index
                         bid_details["Posted Date"] = posted_date.strftime("%Y-%m-%d")
@@ -1051,18 +1057,21 @@ def main(days_to_scrape=2):
                         ).strftime("%Y-%m-%d")
 
                         # Download attachments
-                        downloaded_attachments = download_attachments(
-                            driver, bid_details["Solicitation Number"]
-                        )
+                        with metrics.span(DOWNLOAD):
+                            downloaded_attachments = download_attachments(
+                                driver, bid_details["Solicitation Number"]
+                            )
 
                         # Update bid_details with correct attachment filenames
                         bid_details["Attachments"] = " | ".join(downloaded_attachments)
 
                         # Update Excel (Attachments column will be updated here)
-                        update_excel(bid_details)
+                        with metrics.span(EXCEL):
+                            update_excel(bid_details)
 
                         # Save to cache after successful processing
                         save_to_cache(link, bid_details)
+                        metrics.count(BIDS_SAVED)
 
                         logger.info(
                             f"✅ Processed bid: {bid_details['Solicitation Number']}"
@@ -38,7 +38,13 @@ from selenium.webdriver.common.action_chains import ActionChains
 from pathlib import Path
 import re
 from utils.utils import safe_move, play_notification_sound
+from utils.table_extract import extract_rows
+from utils.listing import DateWindow, iter_listing, sort_newest_first
+from utils.interventions import get_intervention_queue
+from utils.watermarks import Watermark
+from utils.metrics import BIDS_SAVED, CLEANUP, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 import tempfile
+from itertools import islice
 
 # Set up logging
 logging.basicConfig(
@@ -54,6 +60,11 @@ parser.add_argument(
     default=2,
     help="Number of days to look back for bid posted dates (default: 2, maximum: 30)",
 )
+parser.add_argument(
+    "--full-rescan",
+    action="store_true",
+    help="Ignore the watermark and read the whole look-back window",
+)
 args = parser.parse_args()
 days = args.days if args.days <= 30 else 30
 
@@ -74,6 +85,14 @@ os.makedirs(TEMP_DOWNLOAD_FOLDER, exist_ok=True)
 # Update the excel_filename to be directly in the working_folder
 excel_filename = os.path.join(working_folder, f"{SCRIPT_NAME}.xlsx")
 
+# Solicitations listing, read one page at a time by get_bid_links()
+LISTING_ROWS_XPATH = "//table//tbody/tr"
+LISTING_COLUMNS = {
+    "link": ("./td[1]//a", "href"),
+    "posted_date": ("./td[5]//time", "datetime"),
+}
+POSTED_HEADER_XPATH = "//table//thead//th[5]//a"
+
 # Configure Selenium WebDriver with anti-bot measures
 options = Options()
 options.headless = False  # Change to True for headless mode
@@ -122,9 +141,10 @@ def play_notification_sound(message):
     play_notification_sound(message)
 
 
-def pause_script(message):
+def pause_script(message, driver=None, url=None):
+    """Report a problem on the dashboard and carry on."""
     play_notification_sound(message)
-    input("Press Enter to continue...")
+    get_intervention_queue().report(message, driver, url=url)
 
 
 def find_file_in_downloads(file_name):
@@ -209,7 +229,7 @@ def download_attachment(attachment_element):
     except Exception as e:
         logger.error(f"Failed to download attachment: {e}", exc_info=True)
         play_notification_sound(f"Failed to download {file_name}")
-        pause_script("Paused due to download error.")
+        pause_script(f"Failed to download {file_name}: {e}")
         return None, None
 
 
@@ -277,71 +297,70 @@ def parse_date(date_string):
                 return date_string
 
 
-def get_bid_links(date_threshold, count=30):
-    all_bid_links = []
-    current_page = 1
+def read_listing_page():
+    """Read the rows of the current solicitations page in one script call."""
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.XPATH, LISTING_ROWS_XPATH))
+    )
+    return extract_rows(driver, LISTING_ROWS_XPATH, LISTING_COLUMNS)
 
-    while len(all_bid_links) < count and current_page <= 3:
-        logger.info(f"Scanning page {current_page} for bid links")
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr"))
+
+def next_listing_page():
+    """Move to the next solicitations page; False on the last one."""
+    try:
+        next_button = WebDriverWait(driver, 10).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, "a.entity-pager-next-link"))
         )
+        next_button.click()
+        logger.info("Moving to the next page")
+        time.sleep(random.uniform(2, 4))
+        human_like_interaction()
+        return True
+    except (NoSuchElementException, TimeoutException):
+        logger.info("No more pages to scan")
+        return False
 
-        bids = driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
-        for bid in bids:
-            try:
-                posted_date_element = bid.find_element(
-                    By.CSS_SELECTOR, "td:nth-child(5) time"
-                )
-                posted_date_str = posted_date_element.get_attribute("datetime")
-                posted_date = datetime.strptime(posted_date_str, "%Y-%m-%d")
-                if posted_date >= date_threshold:
-                    link = bid.find_element(
-                        By.CSS_SELECTOR, "td:nth-child(1) a"
-                    ).get_attribute("href")
-                    all_bid_links.append((link, posted_date_str))
-                    logger.info(f"Added bid link: {link} (Posted: {posted_date_str})")
-                    if len(all_bid_links) >= count:
-                        return all_bid_links
-            except NoSuchElementException:
-                logger.warning(
-                    "Failed to extract date or link for a bid", exc_info=True
-                )
-                continue
 
-        if current_page < 3:
-            try:
-                next_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable(
-                        (By.CSS_SELECTOR, "a.entity-pager-next-link")
-                    )
-                )
-                next_button.click()
-                current_page += 1
-                logger.info(f"Moving to page {current_page}")
-                time.sleep(random.uniform(2, 4))
-                human_like_interaction()
-            except (NoSuchElementException, TimeoutException):
-                logger.info("No more pages to scan")
-                break
-        else:
-            break
+def get_bid_links(window, count=30):
+    """Collect up to count (link, posted date) pairs posted inside the window.
+
+    Rows outside the window are dropped from the listing, and a listing
+    sorted newest first stops at the first row older than the window.
+    """
+    all_bid_links = []
+    rows = iter_listing(
+        window,
+        read_listing_page,
+        next_listing_page,
+        posted_date=lambda row: row["posted_date"],
+        max_pages=3,
+        row_id=lambda row: row["link"],
+    )
+    for row in islice(rows, count):
+        if not row["link"] or not row["posted_date"]:
+            logger.warning("Failed to extract date or link for a bid")
+            continue
+        all_bid_links.append((row["link"], row["posted_date"]))
+        logger.info(f"Added bid link: {row['link']} (Posted: {row['posted_date']})")
+    rows.close()
 
     return all_bid_links
 
 
-def process_bid_links(bid_links):
+def process_bid_links(bid_links, watermark=None):
     logger.info(f"Processing {len(bid_links)} bid links")
+    metrics = get_metrics()
     for idx, (link, posted_date) in enumerate(bid_links, start=1):
         logger.info(f"Processing bid {idx}/{len(bid_links)}: {link}")
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                driver.get(link)
-                # Increase the wait time for the page to load
-                WebDriverWait(driver, 60).until(
-                    EC.presence_of_element_located((By.ID, "evp_solicitationnbr"))
-                )
+                with metrics.span(DETAIL):
+                    driver.get(link)
+                    # Increase the wait time for the page to load
+                    WebDriverWait(driver, 60).until(
+                        EC.presence_of_element_located((By.ID, "evp_solicitationnbr"))
+                    )
 
                 human_like_interaction()
 
@@ -404,13 +423,14 @@ def process_bid_links(bid_links):
                 os.makedirs(bid_folder, exist_ok=True)
 
                 downloaded_attachments = []
-                for attachment in attachment_elements:
-                    attachment_name, source_path = download_attachment(attachment)
-                    if attachment_name and source_path:
-                        downloaded_attachments.append((attachment_name, source_path))
-                    time.sleep(random.uniform(2, 4))
-
-                moved_attachments = move_attachments(downloaded_attachments, bid_folder)
+                with metrics.span(DOWNLOAD):
+                    for attachment in attachment_elements:
+                        attachment_name, source_path = download_attachment(attachment)
+                        if attachment_name and source_path:
+                            downloaded_attachments.append((attachment_name, source_path))
+                        time.sleep(random.uniform(2, 4))
+
+                    moved_attachments = move_attachments(downloaded_attachments, bid_folder)
                 attachments_str = ", ".join(moved_attachments)
 
                 bid_detail = {
@@ -431,25 +451,29 @@ def process_bid_links(bid_links):
                 }
 
                 df = pd.DataFrame([bid_detail])
-                if not os.path.exists(excel_filename):
-                    df.to_excel(excel_filename, index=False, engine="openpyxl")
-                else:
-                    with pd.ExcelWriter(
-                        excel_filename,
-                        engine="openpyxl",
-                        mode="a",
-                        if_sheet_exists="overlay",
-                    ) as writer:
-                        df.to_excel(
-                            writer,
-                            index=False,
-                            header=False,
-                            startrow=writer.sheets["Sheet1"].max_row,
-                        )
+                with metrics.span(EXCEL):
+                    if not os.path.exists(excel_filename):
+                        df.to_excel(excel_filename, index=False, engine="openpyxl")
+                    else:
+                        with pd.ExcelWriter(
+                            excel_filename,
+                            engine="openpyxl",
+                            mode="a",
+                            if_sheet_exists="overlay",
+                        ) as writer:
+                            df.to_excel(
+                                writer,
+                                index=False,
+                                header=False,
+                                startrow=writer.sheets["Sheet1"].max_row,
+                            )
 
                 logger.info(
                     f"✅ Bid {solicitation_number} successfully processed and saved to Excel."
                 )
+                metrics.count(BIDS_SAVED)
+                if watermark is not None:
+                    watermark.advance(posted_date, link)
 
                 break  # If successful, break out of the retry loop
             except TimeoutException:
@@ -462,11 +486,15 @@ def process_bid_links(bid_links):
                     logger.error(
                         f"Failed to load bid {link} after {max_retries} attempts"
                     )
+                    if watermark is not None:
+                        watermark.hold(posted_date)
                     break  # Move to the next bid
             except Exception as e:
                 logger.error(f"Error processing bid {link}: {e}", exc_info=True)
                 play_notification_sound(f"Error processing bid {link}")
-                pause_script("Paused due to error.")
+                pause_script(f"Error processing bid {link}: {e}", driver, url=link)
+                if watermark is not None:
+                    watermark.hold(posted_date)
                 break  # Move to the next bid
 
 
@@ -500,6 +528,9 @@ def cleanup_temp_folder():
 
 
 def main():
+    metrics = get_metrics()
+    metrics.set_folder(working_folder)
+    search_started = time.perf_counter()
     try:
         logger.info("🟢 Login Successful - Bids Extraction Started")
 
@@ -529,16 +560,35 @@ def main():
         ) - timedelta(days=days)
         logger.info(f"Date threshold set to: {date_threshold.strftime('%Y-%m-%d')}")
 
+        sorted_desc = sort_newest_first(
+            driver,
+            POSTED_HEADER_XPATH,
+            lambda: [row["posted_date"] for row in read_listing_page()],
+            label=SCRIPT_NAME,
+        )
+        # Bids up to the last run's watermark were already scraped
+        watermark = Watermark(SCRIPT_NAME, full_rescan=args.full_rescan)
+        logger.info(f"Incremental crawl: {watermark.describe()}")
+        window = DateWindow(
+            date_threshold, sorted_desc=sorted_desc, label=SCRIPT_NAME, watermark=watermark
+        )
+        metrics.add_time(SEARCH, time.perf_counter() - search_started)
+
         while True:
-            bid_links = get_bid_links(date_threshold, count=30)
+            with metrics.span(LISTING):
+                bid_links = get_bid_links(window, count=30)
             if not bid_links:
                 logger.info("No more bids found within the date range")
                 break
 
-            process_bid_links(bid_links)
+            process_bid_links(bid_links, watermark)
             move_remaining()
             update_attachments_column(excel_filename, working_folder)
 
+            if window.stopped_early:
+                logger.info("Reached bids older than the date range, skipping the remaining pages")
+                break
+
             logger.info("Processed 30 bids. Moving to the next batch...")
 
             # Move to the next set of 3 pages
@@ -555,8 +605,10 @@ def main():
                     human_like_interaction()
                 except (NoSuchElementException, TimeoutException):
                     logger.info("No more pages to scan")
+                    watermark.save()
                     return  # Exit the function if there are no more pages
 
+        watermark.save()
         logger.info("🎉 All Bids and Attachments Extraction Successfully Completed.")
 
         # Rename folder to indicate completion
@@ -582,10 +634,11 @@ def main():
     except Exception as e:
         logger.error(f"An error occurred: {e}", exc_info=True)
         play_notification_sound("An error occurred during execution.")
-        pause_script("Paused due to unexpected error.")
+        pause_script(f"An error occurred: {e}", driver)
     finally:
-        cleanup_temp_folder()
-        driver.quit()
+        with metrics.span(CLEANUP):
+            cleanup_temp_folder()
+            driver.quit()
 
 
 if __name__ == "__main__":
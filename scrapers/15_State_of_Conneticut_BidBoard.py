@@ -34,6 +34,8 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import re
 import pyautogui
 from utils.utils import play_notification_sound, safe_move
+from utils.interventions import get_intervention_queue
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 from fuzzywuzzy import fuzz
 import shutil
 
@@ -404,7 +406,10 @@ def apply_filters(driver):
         if "not found" in sort_result:
             print("⚠️ Warning: Could not set sort order to 'Start Date (Descending)'")
             play_notification_sound()
-            input("Please set the sort order manually, then press Enter to continue...")
+            get_intervention_queue().wait(
+                "Set the sort order to 'Start Date (Descending)' in the browser, then resolve",
+                driver,
+            )
             return
 
         # Wait for the page to update after sorting
@@ -414,7 +419,10 @@ def apply_filters(driver):
     except Exception as e:
         print(f"Error in apply_filters: {str(e)}")
         play_notification_sound()
-        input("Please apply filters manually, then press Enter to continue...")
+        get_intervention_queue().wait(
+            f"Could not apply filters ({str(e)}): apply them in the browser, then resolve",
+            driver,
+        )
 
 
 @retry(Exception, tries=3, delay=1)
@@ -459,6 +467,7 @@ def sort_using_action_chains(driver):
 
 
 def extract_bids(driver, days, main_dir, script_download_dir):
+    metrics = get_metrics()
     bids = []
     cutoff_date = datetime.now() - timedelta(days=days)
 
@@ -508,7 +517,8 @@ def extract_bids(driver, days, main_dir, script_download_dir):
     while True:  # Loop to handle pagination
         try:
             print("\n📑 Extracting bid data from current page...")
-            bid_data = driver.execute_script(bid_data_script)
+            with metrics.span(LISTING):
+                bid_data = driver.execute_script(bid_data_script)
             if bid_data is None or len(bid_data) == 0:
                 print("❌ No bid elements found on the page.")
                 break
@@ -546,13 +556,14 @@ def extract_bids(driver, days, main_dir, script_download_dir):
                 click_script = f"""
                 document.querySelectorAll('span.title > a')[{index}].click();
                 """
-                driver.execute_script(click_script)
+                with metrics.span(DETAIL):
+                    driver.execute_script(click_script)
 
-                print("⏳ Waiting for bid details page to load...")
-                WebDriverWait(driver, 20).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-                time.sleep(5)
+                    print("⏳ Waiting for bid details page to load...")
+                    WebDriverWait(driver, 20).until(
+                        EC.presence_of_element_located((By.TAG_NAME, "body"))
+                    )
+                    time.sleep(5)
 
                 bid_details = scrape_bid_details(
                     driver,
@@ -564,22 +575,25 @@ def extract_bids(driver, days, main_dir, script_download_dir):
                 )
                 if bid_details:
                     bids.append(bid_details)
+                    metrics.count(BIDS_SAVED)
                     print(
                         f"✅ Successfully scraped bid: {bid_details['Solicitation Number']}"
                     )
-                    move_remaining_files_for_bid(
-                        main_dir,
-                        script_download_dir,
-                        bid_details["Solicitation Number"],
-                    )
+                    with metrics.span(DOWNLOAD):
+                        move_remaining_files_for_bid(
+                            main_dir,
+                            script_download_dir,
+                            bid_details["Solicitation Number"],
+                        )
 
                 print("🔄 Returning to main page...")
                 driver.execute_script("window.history.go(-1)")
                 time.sleep(3)
 
                 print("🔄 Re-applying filters and sorting...")
-                apply_filters(driver)
-                verify_sort_order(driver)
+                with metrics.span(SEARCH):
+                    apply_filters(driver)
+                    verify_sort_order(driver)
 
             except Exception as e:
                 print(f"❌ Error processing bid: {e}")
@@ -671,6 +685,7 @@ def normalize_filename(filename):
 def scrape_bid_details(
     driver, main_dir, start_date, end_date, agency, script_download_dir
 ):
+    metrics = get_metrics()
     try:
         print("\nScraping bid details:")
         start_date = datetime.strptime(start_date, "%b %d, %Y").strftime("%Y-%m-%d")
@@ -730,7 +745,8 @@ def scrape_bid_details(
         }
         return extractBidDetails();
         """
-        bid_details = driver.execute_script(script)
+        with metrics.span(DETAIL):
+            bid_details = driver.execute_script(script)
 
         for key, value in bid_details.items():
             if key != "attachments":
@@ -745,9 +761,10 @@ def scrape_bid_details(
         folder_name = bid_details["solicitationNumber"].replace("/", "_")
 
         print(f"Extracting attachments for bid: {folder_name}")
-        attachments = extract_attachments(
-            driver, folder_name, main_dir, script_download_dir
-        )
+        with metrics.span(DOWNLOAD):
+            attachments = extract_attachments(
+                driver, folder_name, main_dir, script_download_dir
+            )
 
         bid_data = {
             "Posted Date": start_date,
@@ -771,7 +788,8 @@ def scrape_bid_details(
             f"Successfully extracted bid details: {bid_details['solicitationNumber']}"
         )
 
-        save_to_excel([bid_data], main_dir, append=True)
+        with metrics.span(EXCEL):
+            save_to_excel([bid_data], main_dir, append=True)
 
         return bid_data
     except Exception as e:
@@ -1060,7 +1078,12 @@ def check_for_image_captcha(driver):
             print("1. Please complete the image verification")
             print("2. Select all required images")
             print("3. Click verify when complete")
-            input("\nPress Enter after completing the image verification... ")
+            if not get_intervention_queue().wait(
+                "Image verification CAPTCHA: complete it in the browser, then resolve",
+                driver,
+            ):
+                print("\n❌ Image verification was not completed in time")
+                return False
             print("\n✅ Continuing execution...")
             return True
         else:
@@ -1142,7 +1165,12 @@ def handle_captcha_and_download(driver, download_dir, filename, bid_folder):
             print("3. Click the download button that appears after solving the captcha")
 
         play_notification_sound()
-        input("\nAfter clicking the download button, press Enter to continue... ")
+        if not get_intervention_queue().wait(
+            f"CAPTCHA for {filename}: solve it and click the download button, then resolve",
+            driver,
+        ):
+            print(f"\n❌ Download of {filename} was not completed in time")
+            return None
 
         # Wait for download to complete and get file path
         downloaded_file = wait_for_download_complete(download_dir, filename)
@@ -1642,6 +1670,8 @@ def check_no_results(driver):
 def main():
     args = parse_arguments()
     main_dir, script_download_dir = create_directory_structure()
+    metrics = get_metrics()
+    metrics.set_folder(main_dir)
     driver = init_driver(script_download_dir)
     all_bids = []
 
@@ -1659,15 +1689,18 @@ def main():
             print(f"Waiting {delay:.2f} seconds before processing next URL...")
             time.sleep(delay)
 
-            if start_process(driver, url):
+            with metrics.span(SEARCH):
+                started = start_process(driver, url)
+            if started:
                 try:
                     # Add random delay before applying filters (2-5 seconds)
                     time.sleep(random.uniform(2, 5))
-                    apply_filters(driver)
+                    with metrics.span(SEARCH):
+                        apply_filters(driver)
 
-                    # Add random delay before verifying sort (1-3 seconds)
-                    time.sleep(random.uniform(1, 3))
-                    verify_sort_order(driver)
+                        # Add random delay before verifying sort (1-3 seconds)
+                        time.sleep(random.uniform(1, 3))
+                        verify_sort_order(driver)
 
                     bids = extract_bids(
                         driver, args.days, main_dir, script_download_dir
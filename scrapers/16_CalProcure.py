@@ -22,10 +22,21 @@ from fake_useragent import UserAgent
 from selenium_stealth import stealth
 import pandas as pd
 from utils.utils import safe_move, play_notification_sound
+from utils.table_extract import extract_rows
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 import signal
 from pathlib import Path
 import re
 
+# Event search results, read in one batch by get_bids_list()
+BIDS_LIST_ROW_XPATH = "//tr[starts-with(@id, 'trRESP_INQA_HD_VW_GR$0_row')]"
+BIDS_LIST_COLUMNS = {
+    "bid_number": ".//td[@data-if-label='tdEventId']",
+    "department": ".//td[@data-if-label='tdDepName']",
+    "response_date": ".//td[@data-if-label='tdEndDate']",
+    "title": ".//td[@data-if-label='tdEventName']",
+}
+
 
 class CalProcureScraper:
     def __init__(self, days_back=2):
@@ -286,6 +297,7 @@ class CalProcureScraper:
             self.script_folder = os.path.join(self.main_folder, self.script_folder_name)
             os.makedirs(self.script_folder, exist_ok=True)
             print(f"✅ Created script folder: {self.script_folder}")
+            get_metrics().set_folder(self.script_folder)
 
             # Create temp download folder inside script folder (not main folder)
             self.temp_download_folder = os.path.join(
@@ -896,18 +908,21 @@ class CalProcureScraper:
     def scrape(self):
         """Main scraping function"""
         print("🟢 Bids Extraction Started")
+        metrics = get_metrics()
 
         try:
-            # Load the main page with retry
-            if not self.load_page_with_retry(self.base_url):
-                print("❌ Failed to load main page")
-                return
+            with metrics.span(SEARCH):
+                # Load the main page with retry
+                if not self.load_page_with_retry(self.base_url):
+                    print("❌ Failed to load main page")
+                    return
 
-            # Apply filters
-            self.apply_filters()
+                # Apply filters
+                self.apply_filters()
 
             # Get list of bids with Response Date and Title
-            bids = self.get_bids_list()
+            with metrics.span(LISTING):
+                bids = self.get_bids_list()
             if not bids:
                 print("❌ No bids found")
                 return
@@ -924,21 +939,25 @@ class CalProcureScraper:
                     print(f"📋 Title: {bid['title']}")
                     print(f"🔗 URL: {bid['url']}")
 
-                    # Load bid details page
-                    if not self.load_page_with_retry(bid["url"]):
-                        print("⚠️ Failed to load bid page, skipping...")
-                        continue
+                    with metrics.span(DETAIL):
+                        # Load bid details page
+                        if not self.load_page_with_retry(bid["url"]):
+                            print("⚠️ Failed to load bid page, skipping...")
+                            continue
 
-                    # Extract bid details (passing bid info from main page)
-                    bid_details = self.extract_bid_details(index, bid)
+                        # Extract bid details (passing bid info from main page)
+                        bid_details = self.extract_bid_details(index, bid)
                     if bid_details:
                         # Download attachments
-                        attachments = self.download_attachments(bid["bid_number"])
+                        with metrics.span(DOWNLOAD):
+                            attachments = self.download_attachments(bid["bid_number"])
                         if attachments:
                             bid_details["Attachments"] = attachments
 
                         self.bids_data.append(bid_details)
-                        self.save_to_excel()
+                        with metrics.span(EXCEL):
+                            self.save_to_excel()
+                        metrics.count(BIDS_SAVED)
 
                 except Exception as e:
                     print(f"⚠️ Error processing bid {index}: {str(e)}")
@@ -1246,10 +1265,8 @@ class CalProcureScraper:
                 EC.presence_of_element_located((By.CSS_SELECTOR, "table tbody"))
             )
 
-            # Get all bid rows
-            rows = self.driver.find_elements(
-                By.CSS_SELECTOR, "tr[id^='trRESP_INQA_HD_VW_GR$0_row']"
-            )
+            # Read every bid row in one round trip instead of four lookups per row
+            rows = extract_rows(self.driver, BIDS_LIST_ROW_XPATH, BIDS_LIST_COLUMNS)
             if not rows:
                 print("❌ No bid rows found")
                 return []
@@ -1259,28 +1276,12 @@ class CalProcureScraper:
             # Process each row
             for row in rows:
                 try:
-                    # Get bid number (Event ID)
-                    bid_number = row.find_element(
-                        By.CSS_SELECTOR, "td[data-if-label='tdEventId']"
-                    ).text.strip()
-
-                    # Get department name
-                    department = row.find_element(
-                        By.CSS_SELECTOR, "td[data-if-label='tdDepName']"
-                    ).text.strip()
-
-                    # Get Response Date
-                    response_date = row.find_element(
-                        By.CSS_SELECTOR, "td[data-if-label='tdEndDate']"
-                    ).text.strip()
+                    bid_number = row["bid_number"] or ""
+                    department = row["department"] or ""
                     response_date = self.parse_date(
-                        response_date
+                        row["response_date"] or ""
                     )  # Convert to YYYY-MM-DD
-
-                    # Get Solicitation Title
-                    title = row.find_element(
-                        By.CSS_SELECTOR, "td[data-if-label='tdEventName']"
-                    ).text.strip()
+                    title = row["title"] or ""
 
                     if not bid_number or not department:
                         continue
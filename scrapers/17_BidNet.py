@@ -10,12 +10,21 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.utils import safe_move, play_notification_sound
+from utils.driver_pool import DriverPool
+from utils.interventions import get_intervention_queue
+from utils.sessions import get_session_vault
+from utils.rate_limit import get_rate_limiter
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
 
 import time
 import random
 import logging
 import argparse
 import json
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Optional, Set
@@ -479,16 +488,46 @@ class BidData:
     attachments: str
 
 
+# BidData field -> Excel column
+EXCEL_COLUMN_MAPPING = {
+    "sl_no": "SL No",
+    "posted_date": "Posted Date",
+    "response_date": "Response Date",
+    "notice_type": "Notice Type",
+    "solicitation_number": "Solicitation Number",
+    "solicitation_title": "Solicitation Title",
+    "agency": "Agency",
+    "category": "Category",
+    "description": "Description",
+    "additional_summary": "Additional Summary",
+    "contracting_office_address": "Contracting Office Address",
+    "contact_information": "Contact Information",
+    "bid_detail_page_url": "Bid Detail Page URL",
+    "attachments": "Attachments"
+}
+
+
+DEFAULT_DETAIL_SESSIONS = 2  # Logged-in browsers used by the detail stage
+DEFAULT_GROUP_SESSIONS = 2  # Logged-in browsers listing purchasing groups
+DEFAULT_REQUESTS_PER_MINUTE = 30  # Rate limit of the host, all sessions and processes together
+
+
 class BidNetScraper:
-    def __init__(self, days: int = 2):
+    def __init__(
+        self,
+        days: int = 2,
+        detail_sessions: int = DEFAULT_DETAIL_SESSIONS,
+        group_sessions: int = DEFAULT_GROUP_SESSIONS,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+    ):
         """Initialize the BidNet scraper with configuration"""
         self.days = days
         self.base_url = "https://www.bidnetdirect.com"
-        self.driver = None
+        self._main_driver = None
+        self._local = threading.local()  # Per-thread driver for detail sessions
         self.processed_bids: Set[str] = set()
         self.current_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
         self.bids_data = []
-        self.cookie_banner_handled = False  # Track cookie banner state
 
         # Update folder structure
         self.script_name = "17_BidNet"
@@ -512,9 +551,57 @@ class BidNetScraper:
         self.GET_BID_DETAILS_SCRIPT = GET_BID_DETAILS_SCRIPT
         self.GET_CATEGORY_SCRIPT = GET_CATEGORY_SCRIPT
 
+        # Two-stage pipeline: the listing stage runs on the main driver and hands
+        # unseen bids to detail workers on their own logged-in sessions
+        self.detail_sessions = max(1, detail_sessions)
+        self.detail_pool: Optional[DriverPool] = None
+        self.detail_executor: Optional[ThreadPoolExecutor] = None
+        self.detail_futures = []
+        self.group_pool: Optional[DriverPool] = None
+        self.session_cookies: List[Dict] = []
+        self.cache_index: Optional[Dict[str, Set[str]]] = None
+        self.cache_lock = threading.Lock()
+        self.excel_lock = threading.Lock()
+        # Run statistics, updated under cache_lock
+        self.stats = {"listed": 0, "cached": 0, "detail_loads": 0}
+
+        # Group scheduler: groups are spread over several sessions and finished
+        # groups are checkpointed so an interrupted run resumes where it stopped
+        self.group_sessions = max(1, group_sessions)
+        # Page loads share the host's rate limit with every session and with
+        # any other BidNet process running at the same time
+        self.rate_limiter = get_rate_limiter()
+        self.rate_limiter.configure(urlparse(self.base_url).hostname, requests_per_minute)
+        self.checkpoint_file = self.cache_dir / f"{self.script_name}_groups_checkpoint.json"
+        self.checkpoint_lock = threading.Lock()
+        self.completed_groups: Set[str] = set()
+
         # Setup logging after folder structure is defined
         self.setup_logging()
 
+    @property
+    def driver(self):
+        """Driver of the current detail session, or the main listing driver"""
+        return getattr(self._local, "driver", None) or self._main_driver
+
+    @driver.setter
+    def driver(self, value):
+        self._main_driver = value
+
+    @property
+    def cookie_banner_handled(self) -> bool:
+        """Whether the cookie banner was accepted in the current session"""
+        return getattr(self._local, "cookie_banner_handled", False)
+
+    @cookie_banner_handled.setter
+    def cookie_banner_handled(self, value: bool):
+        self._local.cookie_banner_handled = value
+
+    @property
+    def download_folder(self) -> Path:
+        """Chrome download folder of the current session"""
+        return getattr(self._local, "download_folder", None) or self.script_folder
+
 
     def setup_logging(self):
         """Configure logging with proper directory structure"""
@@ -549,6 +636,7 @@ class BidNetScraper:
             
             # Create script folder inside IN_PROGRESS
             self.script_folder.mkdir(parents=True, exist_ok=True)
+            get_metrics().set_folder(self.script_folder_in_progress)
             
             # Create cache file parent directory
             self.cache_file.parent.mkdir(parents=True, exist_ok=True)
@@ -558,28 +646,31 @@ class BidNetScraper:
             raise
 
     def setup_driver(self):
-        """Setup Selenium WebDriver with anti-bot measures"""
+        """Setup the main Selenium WebDriver used for login and listings"""
+        # Ensure download directory exists before setting it
+        self.script_folder.mkdir(parents=True, exist_ok=True)
+        self.driver = self.build_driver(self.script_folder)
+
+    def build_driver(self, download_folder: Path):
+        """Build a Chrome WebDriver with anti-bot measures"""
         options = webdriver.ChromeOptions()
         options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option("useAutomationExtension", False)
 
-        # Ensure download directory exists before setting it
-        self.script_folder.mkdir(parents=True, exist_ok=True)
-        
         prefs = {
-            "download.default_directory": str(self.script_folder.absolute()),
+            "download.default_directory": str(Path(download_folder).absolute()),
             "download.prompt_for_download": False,
             "download.directory_upgrade": True,
             "safebrowsing.enabled": True,
         }
         options.add_experimental_option("prefs", prefs)
 
-        self.driver = webdriver.Chrome(options=options)
-        self.driver.maximize_window()
+        driver = webdriver.Chrome(options=options)
+        driver.maximize_window()
 
-        self.driver.execute_cdp_cmd(
+        driver.execute_cdp_cmd(
             "Page.addScriptToEvaluateOnNewDocument",
             {
                 "source": """
@@ -589,6 +680,32 @@ class BidNetScraper:
                 """
             },
         )
+        return driver
+
+    def polite_get(self, url: str):
+        """Navigate the current session to url within the host's rate limit"""
+        self.rate_limiter.acquire(url)
+        self.driver.get(url)
+
+    def create_session(self):
+        """Start a browser that reuses the main session's login cookies"""
+        download_folder = Path(tempfile.mkdtemp(prefix="session_", dir=self.script_folder))
+        driver = self.build_driver(download_folder)
+        driver.download_folder = download_folder
+        try:
+            driver.get(self.base_url)
+            for cookie in self.session_cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:
+                    # Cookies of the SAML identity provider belong to another domain
+                    continue
+            driver.refresh()
+            self.logger.info(f"🔑 Started session with {len(self.session_cookies)} login cookies")
+            return driver
+        except Exception:
+            driver.quit()
+            raise
 
     def random_delay(self, min_seconds: float = 1.0, max_seconds: float = 3.0):
         """Add random delay between actions"""
@@ -600,6 +717,27 @@ class BidNetScraper:
             element.send_keys(char)
             time.sleep(random.uniform(0.1, 0.3))
 
+    def is_logged_in(self) -> bool:
+        """Cheap session check: the private search page redirects visitors to the login"""
+        self.driver.get(f"{self.base_url}/private/supplier/solicitations/search")
+        WebDriverWait(self.driver, 20).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        return "private/supplier/solicitations/search" in self.driver.current_url
+
+    def ensure_login(self) -> bool:
+        """Reuse the saved session when it is still valid, log in otherwise"""
+        logged_in = get_session_vault().ensure(
+            self.driver,
+            "bidnet",
+            BIDNET_EMAIL,
+            self.base_url,
+            lambda driver: self.is_logged_in(),
+            lambda driver: self.login(),
+        )
+        self.logger.info(get_session_vault().summary())
+        return logged_in
+
     def login(self) -> bool:
         """Handle login process with SAML authentication and enhanced error handling"""
         try:
@@ -897,8 +1035,56 @@ class BidNetScraper:
             self.logger.error(f"Error loading cache: {str(e)}")
             return {}
 
+    @staticmethod
+    def get_listing_id(url: str) -> str:
+        """Return the numeric solicitation ID at the end of a BidNet bid URL"""
+        match = re.search(r"(\d{5,})/?(?:[?#].*)?$", url or "")
+        return match.group(1) if match else ""
+
+    def build_cache_index(self) -> Dict[str, Set[str]]:
+        """Load the cache once and index it by URL, listing ID and solicitation number"""
+        index = {"urls": set(), "ids": set(), "numbers": set()}
+        for bid_url, entry in self.load_cache().items():
+            index["urls"].add(bid_url)
+            listing_id = entry.get("listing_id") or self.get_listing_id(bid_url)
+            if listing_id:
+                index["ids"].add(listing_id)
+            if entry.get("solicitation_number"):
+                index["numbers"].add(entry["solicitation_number"])
+        return index
+
+    def count(self, stat: str, amount: int = 1):
+        """Add to one of the run statistics; listing and detail threads share them"""
+        with self.cache_lock:
+            self.stats[stat] += amount
+
+    def filter_unseen_bids(self, links: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Drop listing rows that are already cached or queued, before any detail page loads"""
+        with self.cache_lock:
+            if self.cache_index is None:
+                self.cache_index = self.build_cache_index()
+            unseen = []
+            for link in links:
+                listing_id = link.get("listingId") or self.get_listing_id(link["url"])
+                if link["url"] in self.cache_index["urls"] or (
+                    listing_id and listing_id in self.cache_index["ids"]
+                ):
+                    self.logger.info(f"⏭️ Bid already processed (listing): {link['title']}")
+                    self.stats["cached"] += 1
+                    continue
+                # Claim it now so the same bid listed by another group is not queued twice
+                self.cache_index["urls"].add(link["url"])
+                if listing_id:
+                    self.cache_index["ids"].add(listing_id)
+                unseen.append(link)
+            return unseen
+
     def save_to_cache(self, bid_data: Dict):
         """Save processed bid to cache with metadata"""
+        with self.cache_lock:
+            self._save_to_cache(bid_data)
+
+    def _save_to_cache(self, bid_data: Dict):
         try:
             cache = self.load_cache()
             
@@ -913,11 +1099,14 @@ class BidNetScraper:
                 cache[bid_data["bid_detail_page_url"]] = {
                     "posted_date": formatted_date,
                     "last_checked": datetime.now().strftime("%Y-%m-%d"),
-                    "solicitation_number": bid_data["solicitation_number"]
+                    "solicitation_number": bid_data["solicitation_number"],
+                    "listing_id": self.get_listing_id(bid_data["bid_detail_page_url"])
                 }
                 
                 with open(self.cache_file, "w") as f:
                     json.dump(cache, f, indent=2)
+                if self.cache_index is not None:
+                    self.cache_index["numbers"].add(bid_data["solicitation_number"])
                 self.logger.info(f"✅ Successfully cached bid: {bid_data['solicitation_number']}")
             except ValueError as e:
                 self.logger.error(f"Error formatting date for cache: {str(e)}")
@@ -926,73 +1115,279 @@ class BidNetScraper:
             self.logger.error(f"Error saving to cache: {str(e)}")
 
     def is_bid_in_cache(self, url: str, solicitation_number: str) -> bool:
-        """Check if bid is already in cache"""
+        """Check if a bid's solicitation number is already in cache
+
+        URLs and listing IDs are filtered by filter_unseen_bids() before the
+        detail page is loaded; this catches the same solicitation posted
+        under a different URL.
+        """
         try:
-            cache = self.load_cache()
-            
-            # Check by URL
-            if url in cache:
-                self.logger.info(f"⏭️ Bid already processed (URL): {solicitation_number}")
-                return True
-            
-            # Also check by solicitation number as fallback
-            for entry in cache.values():
-                if entry.get("solicitation_number") == solicitation_number:
+            with self.cache_lock:
+                if self.cache_index is None:
+                    self.cache_index = self.build_cache_index()
+                if solicitation_number and solicitation_number in self.cache_index["numbers"]:
                     self.logger.info(f"⏭️ Bid already processed (Number): {solicitation_number}")
                     return True
-                
             return False
             
         except Exception as e:
             self.logger.error(f"Error checking cache: {str(e)}")
             return False
 
-    def process_bid_links(self, links: List[Dict[str, str]]) -> None:
-        """Process list of bid links and save to Excel after each bid"""
-        self.logger.info(f"Processing {len(links)} bid links")
+    def start_detail_stage(self):
+        """Start the detail workers on their own pool of logged-in sessions"""
+        self.session_cookies = self.driver.get_cookies()
+        self.detail_pool = DriverPool(self.create_session, size=self.detail_sessions)
+        self.detail_executor = ThreadPoolExecutor(
+            max_workers=self.detail_sessions, thread_name_prefix="bidnet-detail"
+        )
+        self.logger.info(f"🧵 Detail stage started with {self.detail_sessions} sessions")
+
+    def wait_for_detail_stage(self):
+        """Wait for queued bids to finish and shut the detail sessions down"""
+        if self.detail_futures:
+            self.logger.info(f"⏳ Waiting for {len(self.detail_futures)} queued bids...")
+            wait(self.detail_futures)
+            self.detail_futures = []
+        if self.detail_executor:
+            self.detail_executor.shutdown(wait=True)
+            self.detail_executor = None
+        if self.detail_pool:
+            self.detail_pool.close()
+            self.detail_pool = None
+        self.logger.info(
+            f"📊 Listed {self.stats['listed']} bids, skipped {self.stats['cached']} from cache "
+            f"before loading details, loaded {self.stats['detail_loads']} detail pages"
+        )
+        self.logger.info(f"📊 {self.rate_limiter.summary()}")
 
-        for link in links:
+    def process_bid_links(self, links: List[Dict[str, str]]) -> List:
+        """Queue unseen bids from the listing stage for the detail stage
+
+        Returns:
+            list: Futures of the detail tasks; each resolves to True if its bid was saved.
+        """
+        self.count("listed", len(links))
+        unseen = self.filter_unseen_bids(links)
+        self.logger.info(f"Queueing {len(unseen)} of {len(links)} bid links for details")
+
+        if self.detail_executor is None:
+            # No detail stage running, process on the main driver
+            futures = []
+            for link in unseen:
+                future = Future()
+                future.set_result(self.process_bid_detail(link))
+                futures.append(future)
+            return futures
+
+        futures = [self.detail_executor.submit(self.process_detail_task, link) for link in unseen]
+        self.detail_futures.extend(futures)
+        return futures
+
+    def process_detail_task(self, link: Dict[str, str]) -> bool:
+        """Run process_bid_detail() on a pooled detail session"""
+        with self.detail_pool.driver(self.base_url) as driver:
+            self._local.driver = driver
+            self._local.download_folder = Path(driver.download_folder)
             try:
-                self.logger.info(f"\nProcessing bid: {link['title']}")
+                return self.process_bid_detail(link)
+            finally:
+                self._local.driver = None
+                self._local.download_folder = None
+
+    def process_bid_detail(self, link: Dict[str, str]) -> bool:
+        """Load one bid's detail page, download attachments and save it
 
-                # Extract bid details with dates from link
+        Returns:
+            bool: False if the bid could not be saved, so its group is retried.
+        """
+        metrics = get_metrics()
+        try:
+            self.logger.info(f"\nProcessing bid: {link['title']}")
+
+            # Extract bid details with dates from link
+            self.count("detail_loads")
+            with metrics.span(DETAIL):
                 bid_data = self.extract_bid_details(
                     url=link["url"],
                     posted_date=link["publicationDate"],
                     response_date=link["closingDate"]
                 )
-                if not bid_data:
-                    continue
+            if not bid_data:
+                return False
 
-                # Check if bid is already processed
-                if self.is_bid_in_cache(link["url"], bid_data.solicitation_number):
-                    continue
+            # Same solicitation published under another URL
+            if self.is_bid_in_cache(link["url"], bid_data.solicitation_number):
+                return True
 
-                # Download attachments
+            # Download attachments
+            with metrics.span(DOWNLOAD):
                 attachments = self.download_bid_attachments(bid_data.solicitation_number)
-                bid_data.attachments = attachments
-                if attachments:
-                    self.logger.info(f"Downloaded Attachments: {attachments}")
+            bid_data.attachments = attachments
+            if attachments:
+                self.logger.info(f"Downloaded Attachments: {attachments}")
+
+            # Format dates before saving
+            bid_data.posted_date = self.format_date(bid_data.posted_date)
+            bid_data.response_date = self.format_date(bid_data.response_date)
+
+            # Save to cache
+            self.save_to_cache(asdict(bid_data))
+
+            # Update Excel file
+            with metrics.span(EXCEL):
+                saved = self.update_excel_after_bid(bid_data)
+            if saved:
+                metrics.count(BIDS_SAVED)
+                self.logger.info(f"✅ Successfully processed and saved bid: {bid_data.solicitation_number}")
+            else:
+                self.logger.error(f"❌ Failed to save bid to Excel: {bid_data.solicitation_number}")
 
-                # Format dates before saving
-                bid_data.posted_date = self.format_date(bid_data.posted_date)
-                bid_data.response_date = self.format_date(bid_data.response_date)
+            self.random_delay(2, 4)
+            return bool(saved)
 
-                # Save to cache
-                self.save_to_cache(asdict(bid_data))
+        except Exception as e:
+            self.logger.error(f"❌ Error processing bid {link['title']}: {str(e)}")
+            play_notification_sound()
+            return False
 
-                # Update Excel file
-                if self.update_excel_after_bid(bid_data):
-                    self.logger.info(f"✅ Successfully processed and saved bid: {bid_data.solicitation_number}")
-                else:
-                    self.logger.error(f"❌ Failed to save bid to Excel: {bid_data.solicitation_number}")
+    def load_group_checkpoint(self) -> Set[str]:
+        """Return URLs of groups finished earlier in today's run"""
+        try:
+            if self.checkpoint_file.exists():
+                with open(self.checkpoint_file, "r") as f:
+                    checkpoint = json.load(f)
+                if checkpoint.get("run_date") == self.current_date and checkpoint.get("days") == self.days:
+                    return set(checkpoint.get("completed", []))
+        except Exception as e:
+            self.logger.error(f"Error loading group checkpoint: {str(e)}")
+        return set()
 
-                self.random_delay(2, 4)
+    def resume_previous_output(self):
+        """Bring back the folder and Excel rows of an interrupted run of today"""
+        completed_folder = self.main_folder / f"{self.script_name}_COMPLETED"
+        try:
+            if completed_folder.exists():
+                for item in completed_folder.iterdir():
+                    target = self.script_folder_in_progress / item.name
+                    if not target.exists():
+                        shutil.move(str(item), str(target))
+                shutil.rmtree(completed_folder, ignore_errors=True)
+                self.logger.info(f"♻️ Moved previous output back to {self.script_folder_in_progress}")
 
+            excel_path = self.script_folder_in_progress / f"{self.script_name}.xlsx"
+            if excel_path.exists() and not self.bids_data:
+                df = pd.read_excel(excel_path, dtype=str).fillna("")
+                columns = {column: field for field, column in EXCEL_COLUMN_MAPPING.items()}
+                for record in df.rename(columns=columns).to_dict("records"):
+                    record = {field: record.get(field, "") for field in EXCEL_COLUMN_MAPPING}
+                    record["sl_no"] = len(self.bids_data) + 1
+                    self.bids_data.append(BidData(**record))
+                self.logger.info(f"♻️ Loaded {len(self.bids_data)} bids saved by the interrupted run")
+        except Exception as e:
+            self.logger.error(f"Error restoring previous output: {str(e)}")
+
+    def mark_group_complete(self, group: Dict[str, str]):
+        """Checkpoint a group once its listing and all of its detail work are done"""
+        with self.checkpoint_lock:
+            self.completed_groups.add(group["url"])
+            try:
+                with open(self.checkpoint_file, "w") as f:
+                    json.dump(
+                        {
+                            "run_date": self.current_date,
+                            "days": self.days,
+                            "completed": sorted(self.completed_groups),
+                        },
+                        f,
+                        indent=2,
+                    )
             except Exception as e:
-                self.logger.error(f"❌ Error processing bid {link['title']}: {str(e)}")
-                play_notification_sound()
-                input("Press Enter to continue...")
+                self.logger.error(f"Error saving group checkpoint: {str(e)}")
+        self.logger.info(f"✅ Group complete: {group['name']}")
+
+    def track_group(self, group: Dict[str, str], futures: List):
+        """Mark the group complete when its queued detail tasks have all succeeded"""
+        if not futures:
+            self.mark_group_complete(group)
+            return
+
+        remaining = [len(futures)]
+        failed = []
+        lock = threading.Lock()
+
+        def on_done(future):
+            with lock:
+                remaining[0] -= 1
+                if future.cancelled() or future.exception() or future.result() is False:
+                    failed.append(future)
+                last = remaining[0] == 0
+            if last:
+                if failed:
+                    self.logger.error(f"❌ {len(failed)} bids failed in {group['name']}, not checkpointed")
+                else:
+                    self.mark_group_complete(group)
+
+        for future in futures:
+            future.add_done_callback(on_done)
+
+    def process_group(self, group: Dict[str, str]) -> bool:
+        """Listing stage for one purchasing group on a pooled session"""
+        with self.group_pool.driver(self.base_url) as driver:
+            self._local.driver = driver
+            try:
+                with get_metrics().span(LISTING):
+                    self.logger.info(f"\n🔍 Processing group: {group['name']}")
+                    self.polite_get(group["url"])
+                    self.random_delay(1, 2)
+
+                    # Check if group bids tab exists
+                    bid_count = self.check_group_bids_tab()
+                    if bid_count is None:
+                        self.logger.info(f"⏭️ Skipping {group['name']}, no Group Bids tab found")
+                        self.mark_group_complete(group)
+                        return True
+
+                    self.logger.info(f"📊 Found {bid_count} bids in {group['name']}")
+                    bid_links = self.extract_bid_links()
+                    if not bid_links:
+                        self.logger.info(f"⚠️ No bid links found in date range for {group['name']}")
+            finally:
+                self._local.driver = None
+
+        # Detail work continues on the detail sessions; this session moves on
+        self.track_group(group, self.process_bid_links(bid_links) if bid_links else [])
+        return True
+
+    def run_groups(self, groups: List[Dict[str, str]]):
+        """Spread purchasing groups over the group sessions, skipping checkpointed ones"""
+        self.completed_groups = self.load_group_checkpoint()
+        pending = [group for group in groups if group["url"] not in self.completed_groups]
+        if self.completed_groups:
+            self.resume_previous_output()
+        if len(pending) < len(groups):
+            self.logger.info(
+                f"♻️ Resuming: {len(groups) - len(pending)} groups already finished today, "
+                f"{len(pending)} left"
+            )
+        if not pending:
+            return
+
+        if not self.session_cookies:
+            self.session_cookies = self.driver.get_cookies()
+        sessions = min(self.group_sessions, len(pending))
+        self.group_pool = DriverPool(self.create_session, size=sessions)
+        try:
+            with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="bidnet-group") as executor:
+                futures = {executor.submit(self.process_group, group): group for group in pending}
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.logger.error(f"❌ Error processing group {futures[future]['name']}: {str(e)}")
+        finally:
+            self.group_pool.close()
+            self.group_pool = None
 
     def __enter__(self):
         """Context manager entry"""
@@ -1039,6 +1434,7 @@ class BidNetScraper:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit with folder status update"""
         try:
+            self.wait_for_detail_stage()
             if self.driver:
                 self.driver.quit()
             self.mark_processing_complete()
@@ -1185,41 +1581,18 @@ class BidNetScraper:
             if not self.apply_sort_order_descending():
                 print("Continuing with default order")
 
-            # Get all bid details using JavaScript
-            script = """
-            function getBidLinks() {
-                const bids = [];
-                const links = document.querySelectorAll('a.solicitation-link');
-                
-                for (const link of links) {
-                    try {
-                        const row = link.closest('tr');
-                        if (!row) continue;
-                        
-                        const publicationDate = row.querySelector('span.sol-publication-date span.date-value')?.textContent.trim();
-                        const closingDate = row.querySelector('span.sol-closing-date span.date-value')?.textContent.trim();
-                        
-                        // Construct full URL from href
-                        const href = link.getAttribute('href');
-                        const fullUrl = href.startsWith('http') ? href : 'https://www.bidnetdirect.com' + href;
-                        
-                        bids.push({
-                            title: link.textContent.trim(),
-                            url: fullUrl,
-                            publicationDate: publicationDate,
-                            closingDate: closingDate
-                        });
-                    } catch (e) {
-                        console.error('Error processing bid link:', e);
-                    }
-                }
-                return bids;
-            }
-            return getBidLinks();
-            """
-            
-            bids = self.driver.execute_script(script)
-            
+            # Listing stage: URL, title and dates come from the results table,
+            # no detail page is opened here
+            bids = self.get_bid_details_js()
+            if any(not bid.get("publicationDate") or not bid.get("closingDate") for bid in bids):
+                publication_dates = {d["rowNumber"]: d["publicationDate"] for d in self.get_publication_dates()}
+                closing_dates = {d["rowNumber"]: d["closingDate"] for d in self.get_closing_dates()}
+                for bid in bids:
+                    bid["publicationDate"] = bid.get("publicationDate") or publication_dates.get(bid["rowNumber"], "")
+                    bid["closingDate"] = bid.get("closingDate") or closing_dates.get(bid["rowNumber"], "")
+            for bid in bids:
+                bid["listingId"] = self.get_listing_id(bid["url"])
+
             # Filter bids by date range
             filtered_bids = []
             for bid in bids:
@@ -1513,7 +1886,7 @@ class BidNetScraper:
         """Extract bid details using JavaScript execution"""
         try:
             self.logger.info(f"📄 Extracting details from bid: {url}")
-            self.driver.get(url)
+            self.polite_get(url)
             self.random_delay(3, 5)
 
             # Get main bid details using JavaScript
@@ -1705,7 +2078,7 @@ class BidNetScraper:
             for link in attachment_links:
                 filename = link["filename"]
                 download_path = bid_folder / filename
-                temp_download_path = self.script_folder / filename
+                temp_download_path = self.download_folder / filename
 
                 # Skip if file already exists
                 if download_path.exists():
@@ -1713,7 +2086,7 @@ class BidNetScraper:
                     continue
 
                 try:
-                    self.driver.get(link["url"])
+                    self.polite_get(link["url"])
                     self.logger.info(f"⏳ Downloading: {filename}")
 
                     # Added: Download timeout
@@ -1802,26 +2175,8 @@ class BidNetScraper:
             # Convert bid data to DataFrame
             df = pd.DataFrame([asdict(bid) for bid in self.bids_data])
 
-            # Define column mapping and order
-            column_mapping = {
-                "sl_no": "SL No",
-                "posted_date": "Posted Date",
-                "response_date": "Response Date",
-                "notice_type": "Notice Type",
-                "solicitation_number": "Solicitation Number",
-                "solicitation_title": "Solicitation Title",
-                "agency": "Agency",
-                "category": "Category",
-                "description": "Description",
-                "additional_summary": "Additional Summary",
-                "contracting_office_address": "Contracting Office Address",
-                "contact_information": "Contact Information",
-                "bid_detail_page_url": "Bid Detail Page URL",
-                "attachments": "Attachments"
-            }
-
             # Rename columns
-            df = df.rename(columns=column_mapping)
+            df = df.rename(columns=EXCEL_COLUMN_MAPPING)
 
             # Reorder columns to match required order
             ordered_columns = [
@@ -1869,8 +2224,11 @@ class BidNetScraper:
     def update_excel_after_bid(self, bid_data: BidData) -> bool:
         """Update Excel file after each bid is processed"""
         try:
-            self.bids_data.append(bid_data)
-            if self.save_to_excel():
+            with self.excel_lock:
+                bid_data.sl_no = len(self.bids_data) + 1
+                self.bids_data.append(bid_data)
+                saved = self.save_to_excel()
+            if saved:
                 self.logger.info(
                     f"✅ Successfully updated Excel with bid: {bid_data.solicitation_number}"
                 )
@@ -1890,56 +2248,71 @@ def main():
         default=2,
         help="Number of days to look back for bids (default: 2)",
     )
+    parser.add_argument(
+        "--detail-sessions",
+        type=int,
+        default=DEFAULT_DETAIL_SESSIONS,
+        help=f"Logged-in browsers loading bid detail pages (default: {DEFAULT_DETAIL_SESSIONS})",
+    )
+    parser.add_argument(
+        "--group-sessions",
+        type=int,
+        default=DEFAULT_GROUP_SESSIONS,
+        help=f"Logged-in browsers listing purchasing groups (default: {DEFAULT_GROUP_SESSIONS})",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=int,
+        default=DEFAULT_REQUESTS_PER_MINUTE,
+        help=f"Page loads per minute to BidNet across all sessions and processes (default: {DEFAULT_REQUESTS_PER_MINUTE})",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore today's group checkpoint and crawl every group again",
+    )
     args = parser.parse_args()
 
     print("🟢 BidNet Direct Scraping Started")
 
     try:
-        with BidNetScraper(days=args.days) as scraper:
+        with BidNetScraper(
+            days=args.days,
+            detail_sessions=args.detail_sessions,
+            group_sessions=args.group_sessions,
+            requests_per_minute=args.requests_per_minute,
+        ) as scraper:
+            if args.restart and scraper.checkpoint_file.exists():
+                scraper.checkpoint_file.unlink()
+
             # Login to the site
-            if not scraper.login():
+            if not scraper.ensure_login():
                 print("❌ Login failed, exiting...")
                 return
 
-            # Navigate to purchasing groups
-            if not scraper.navigate_to_purchasing_groups():
-                print("❌ Failed to navigate to purchasing groups")
-                return
+            # Detail pages load on separate sessions while the groups are listed
+            scraper.start_detail_stage()
 
-            # Get all purchasing groups
-            groups = scraper.get_purchasing_groups()
-            print(f"📋 Found {len(groups)} purchasing groups")
+            with get_metrics().span(SEARCH):
+                # Navigate to purchasing groups
+                if not scraper.navigate_to_purchasing_groups():
+                    print("❌ Failed to navigate to purchasing groups")
+                    return
 
-            # Process each group
-            for group in groups:
-                print(f"\n🔍 Processing group: {group['name']}")
-
-                # Navigate to group page
-                scraper.driver.get(group["url"])
-                scraper.random_delay(2, 4)
-
-                # Check if group bids tab exists
-                bid_count = scraper.check_group_bids_tab()
-                if bid_count is None:
-                    print(f"⏭️ Skipping {group['name']}, no Group Bids tab found")
-                    continue
-
-                print(f"📊 Found {bid_count} bids in {group['name']}")
+                # Get all purchasing groups
+                groups = scraper.get_purchasing_groups()
+            print(f"📋 Found {len(groups)} purchasing groups")
 
-                # Extract and process bid links
-                bid_links = scraper.extract_bid_links()
-                if bid_links:
-                    print(f"🔗 Found {len(bid_links)} bid links to process")
-                    scraper.process_bid_links(bid_links)
-                else:
-                    print("⚠️ No bid links found in date range")
+            # Group listings run on several sessions, details on their own pool
+            scraper.run_groups(groups)
 
+            scraper.wait_for_detail_stage()
             print("\n🎉 All Bids and Attachments Extraction Successfully Completed")
 
     except Exception as e:
         print(f"❌ Critical error: {str(e)}")
         play_notification_sound()
-        input("Press Enter to continue...")
+        get_intervention_queue().report(f"Critical error: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -7,7 +7,6 @@ import argparse
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -17,16 +16,46 @@ from selenium.common.exceptions import (
 	WebDriverException,
 	StaleElementReferenceException
 )
-import zipfile
 import requests
 from urllib.parse import urljoin
 import shutil
 from selenium.webdriver.common.action_chains import ActionChains
 import glob
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from bs4 import BeautifulSoup
 
 # Add utils path to system path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.utils import play_notification_sound, safe_move
+from utils.archive_expander import get_archive_expander
+from utils.driver_pool import DriverPool
+from utils.driver_factory import create_driver
+from utils.table_extract import extract_rows
+from utils.listing import DateWindow, iter_listing
+from utils.interventions import get_intervention_queue
+from utils.watermarks import Watermark
+from utils.http_cache import CachingAdapter
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, get_metrics
+
+DEFAULT_WORKERS = 3  # Tenants scraped concurrently, one pooled browser each
+PRECHECK_WORKERS = 8  # Concurrent HTTP pre-checks
+PRECHECK_TIMEOUT = 20
+
+# Bid list grid, read in one batch by get_all_dates_from_main_page()
+BID_LIST_ROW_XPATH = "//tr[contains(@id,'rgBidList_ctl00__')]"
+BID_LIST_COLUMNS = {
+	'solicitation_number': './/td[2]',
+	'solicitation_title': './/td[3]',
+	'agency': './/td[5]',
+	'posted_date': ".//td[contains(@class,'rgSorted')]",
+	'response_date': './/td[7]',
+}
+
+# Shared between tenant workers
+cache_lock = threading.Lock()
+excel_lock = threading.Lock()
 
 def get_cache_file():
 	"""Get the path to the cache file"""
@@ -64,38 +93,32 @@ def clean_old_cache_entries(cache_data):
 	}
 
 def should_process_bid(url, bid_number, posted_date, cache_data):
-	"""Check if a bid should be processed based on cache data"""
-	# First load existing cache
-	existing_cache = load_cache()
-	
-	# Check if bid number exists in any cache entry
-	for _, data in existing_cache.items():
-		if data.get('bid_number') == bid_number:
-			print(f"Bid {bid_number} found in cache, skipping...")
-			return False
-	
-	# Remove entries older than 3 months but keep all other existing entries
-	three_months_ago = (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
-	cleaned_cache = existing_cache.copy()
-	
-	# Only remove entries older than 3 months
-	for key, data in list(cleaned_cache.items()):
-		if data.get('posted_date', '') < three_months_ago:
-			del cleaned_cache[key]
-	
-	# Create unique key with timestamp to prevent overwriting
-	timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-	unique_key = f"{bid_number}_{timestamp}"
-	
-	# Add new bid to cache
-	cleaned_cache[unique_key] = {
-		'bid_number': bid_number,
-		'url': url,
-		'posted_date': posted_date,
-		'last_checked': datetime.now().strftime('%Y-%m-%d')
-	}
-	
-	save_cache(cleaned_cache)
+	"""Check if a bid should be processed based on cache data, recording it if so"""
+	with cache_lock:
+		# Check if bid number exists in any cache entry
+		for _, data in cache_data.items():
+			if data.get('bid_number') == bid_number:
+				print(f"Bid {bid_number} found in cache, skipping...")
+				return False
+		
+		# Only remove entries older than 3 months but keep all other existing entries
+		cleaned_cache = clean_old_cache_entries(cache_data)
+		
+		# Create unique key with timestamp to prevent overwriting
+		timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+		unique_key = f"{bid_number}_{timestamp}"
+		
+		# Add new bid to cache
+		cleaned_cache[unique_key] = {
+			'bid_number': bid_number,
+			'url': url,
+			'posted_date': posted_date,
+			'last_checked': datetime.now().strftime('%Y-%m-%d')
+		}
+		
+		cache_data.clear()
+		cache_data.update(cleaned_cache)
+		save_cache(cache_data)
 	return True
 
 def get_base_folder():
@@ -133,85 +156,68 @@ def notify_completion():
 	logger.info("[COMPLETE] All Bids and Attachments Extraction Successfully Completed")
 	play_notification_sound()
 
-def handle_error(error_msg, play_sound=True, pause=True):
-	"""Handle errors with notifications and optional pause"""
+def handle_error(error_msg, play_sound=True, report=True, driver=None):
+	"""Handle errors with notifications and an optional dashboard report"""
 	logger.error(error_msg)
 	print(f"\nError: {error_msg}")
 	
 	if play_sound:
 		play_notification_sound()
 		
-	if pause:
-		user_input = input("Press Enter to continue, or 'q' to quit: ")
-		if user_input.lower() == 'q':
-			sys.exit(1)
+	if report:
+		get_intervention_queue().report(error_msg, driver)
 
-def pause_on_error():
-	"""Pause script execution on error"""
+def pause_on_error(error_msg="Script paused on error"):
+	"""Report an error to the dashboard without pausing the script"""
 	play_notification_sound()
-	input("Script paused. Press Enter to continue...")
+	get_intervention_queue().report(error_msg)
 
 def setup_driver_with_proxy(use_proxy=False):
 	"""Setup WebDriver with anti-bot measures and optional proxy support"""
 	try:
-		options = webdriver.ChromeOptions()
-		
-		# Anti-bot measures
-		options.add_argument('--disable-blink-features=AutomationControlled')
-		options.add_experimental_option("excludeSwitches", ["enable-automation"])
-		options.add_experimental_option('useAutomationExtension', False)
-		options.add_argument('--disable-extensions')
-		
 		# Create and set download folder
 		yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
 		script_name = os.path.splitext(os.path.basename(__file__))[0]
 		base_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), yesterday)
 		in_progress_folder = os.path.join(base_folder, f"{script_name}_IN_PROGRESS")
-		download_folder = os.path.join(in_progress_folder, script_name)
+		download_root = os.path.join(in_progress_folder, script_name)
 		
-		# Create all necessary folders
-		os.makedirs(download_folder, exist_ok=True)
+		# Each browser gets its own download folder so concurrent tenants
+		# never pick up each other's files
+		os.makedirs(download_root, exist_ok=True)
+		download_folder = tempfile.mkdtemp(prefix='driver_', dir=download_root)
 		print(f"\nConfigured download folder: {download_folder}")
 		
-		# Download settings
-		prefs = {
-			'download.default_directory': download_folder,
-			'download.prompt_for_download': False,
-			'download.directory_upgrade': True,
-			'safebrowsing.enabled': True,
-			'profile.default_content_settings.popups': 0,
-			'profile.default_content_setting_values.automatic_downloads': 1
-		}
-		options.add_experimental_option('prefs', prefs)
-		
-		# Performance settings
-		options.add_argument('--no-sandbox')
-		options.add_argument('--disable-dev-shm-usage')
-		options.add_argument('--disable-gpu')
-		options.add_argument('--disable-infobars')
-		options.add_argument('--disable-notifications')
-		
+		arguments = []
 		if use_proxy:
 			proxy_options = get_proxy_options()
 			if proxy_options:
-				options.add_argument(f'--proxy-server={proxy_options}')
-		
-		# Create driver with configured options
-		driver = webdriver.Chrome(options=options)
-		driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-			'source': '''
-				Object.defineProperty(navigator, 'webdriver', {
-					get: () => undefined
-				})
-			'''
-		})
+				arguments.append(f'--proxy-server={proxy_options}')
 		
+		# Anti-bot, download and performance settings come from the shared factory
+		# One browser serves every tenant
+		driver = create_driver(download_folder=download_folder, site="ionwave", arguments=arguments)
+		driver.download_folder = download_folder
 		return driver
 		
 	except Exception as e:
 		logger.error(f"[ERROR] Failed to setup WebDriver: {str(e)}")
 		return None
 
+http_session = None
+http_session_lock = threading.Lock()
+
+def get_http_session():
+	"""Shared requests session for the pre-checks; an unchanged listing comes from the HTTP cache after a 304"""
+	global http_session
+	with http_session_lock:
+		if http_session is None:
+			http_session = requests.Session()
+			adapter = CachingAdapter(portal=os.path.splitext(os.path.basename(__file__))[0])
+			http_session.mount("http://", adapter)
+			http_session.mount("https://", adapter)
+		return http_session
+
 def download_attachment(driver, url, folder_path, filename):
 	"""Download an attachment and save it to the specified folder"""
 	logger.info(f"[INFO] Starting download of {filename}")
@@ -261,11 +267,9 @@ def download_attachment(driver, url, folder_path, filename):
 			# Handle zip files
 			if filename.lower().endswith('.zip'):
 				try:
-					with zipfile.ZipFile(file_path, 'r') as zip_ref:
-						zip_ref.extractall(folder_path)
-						extracted_files = zip_ref.namelist()
-						logger.info(f"[SUCCESS] Extracted {len(extracted_files)} files from {filename}")
-						return extracted_files
+					extracted_files = get_archive_expander().expand(file_path, folder_path)
+					logger.info(f"[SUCCESS] Extracted {len(extracted_files)} files from {filename}")
+					return extracted_files
 				except Exception as e:
 					logger.error(f"[ERROR] Failed to extract zip file {filename}: {str(e)}")
 					return [filename]
@@ -277,7 +281,7 @@ def download_attachment(driver, url, folder_path, filename):
 			logger.error(error_msg)
 			print(error_msg)
 			play_notification_sound()
-			input("Press Enter to continue...")
+			get_intervention_queue().report(error_msg, url=url)
 			return []
 
 	except Exception as e:
@@ -285,7 +289,7 @@ def download_attachment(driver, url, folder_path, filename):
 		logger.error(error_msg)
 		print(error_msg)
 		play_notification_sound()
-		input("Press Enter to continue...")
+		get_intervention_queue().report(error_msg, url=url)
 		return []
 	finally:
 		if os.path.exists(temp_path):
@@ -394,28 +398,30 @@ def wait_for_fresh_element(driver, locator, timeout=10, retries=3):
 				return None
 	return None
 
-def get_all_dates_from_main_page(driver):
-	"""Get all posted and response dates from the main page at once"""
+def get_all_dates_from_main_page(driver, days_back=None, label="", watermark=None):
+	"""Get all posted and response dates from the main page at once
+
+	With days_back, bids posted before the window are dropped here so no
+	detail page is opened for them. The listing has been sorted newest first
+	by sort_bids_by_date(), so reading stops at the first older bid, or at the
+	tenant's watermark if that is newer.
+	"""
 	try:
 		# Wait for the table to be present
 		WebDriverWait(driver, 10).until(
 			EC.presence_of_element_located((By.XPATH, "//tr[contains(@id,'rgBidList_ctl00__')]"))
 		)
 		
-		# Get all rows at once
-		rows = driver.find_elements(By.XPATH, "//tr[contains(@id,'rgBidList_ctl00__')]")
+		# Read all rows in one script call instead of five lookups per row
+		rows = extract_rows(driver, BID_LIST_ROW_XPATH, BID_LIST_COLUMNS)
 		
 		bids_info = []
 		for row in rows:
 			try:
-				# Extract all needed information from the row
-				bid_info = {
-					'solicitation_number': row.find_element(By.XPATH, ".//td[2]").text.strip(),
-					'solicitation_title': row.find_element(By.XPATH, ".//td[3]").text.strip(),
-					'agency': row.find_element(By.XPATH, ".//td[5]").text.strip(),
-					'posted_date': row.find_element(By.XPATH, ".//td[contains(@class,'rgSorted')]").text.strip(),
-					'response_date': row.find_element(By.XPATH, ".//td[7]").text.strip()
-				}
+				# Rows missing a column were skipped by the old per-cell lookups too
+				if any(value is None for value in row.values()):
+					continue
+				bid_info = dict(row)
 				
 				# Format dates
 				bid_info['formatted_posted_date'] = format_date(bid_info['posted_date'])
@@ -432,7 +438,19 @@ def get_all_dates_from_main_page(driver):
 				logger.error(f"[ERROR] Error extracting data from row: {str(e)}")
 				continue
 				
-		return bids_info
+		if days_back is None:
+			return bids_info
+		# Same cutoff as is_within_date_range(). The whole listing is already read,
+		# so stopping early saves nothing, and the sort clicks are not verified:
+		# every row is checked
+		window = DateWindow(datetime.now() - timedelta(days=days_back), label=label, watermark=watermark)
+		return list(iter_listing(
+			window,
+			read_page=lambda: bids_info,
+			next_page=lambda: False,
+			posted_date=lambda bid: bid['formatted_posted_date'],
+			row_id=lambda bid: bid['solicitation_number'],
+		))
 	except Exception as e:
 		logger.error(f"[ERROR] Error getting dates from main page: {str(e)}")
 		return []
@@ -498,21 +516,99 @@ def update_excel_file(script_folder, script_name, bids_data):
 		logger.error(f"[ERROR] Error updating Excel: {str(e)}")
 		return False
 
-def scrape_ionwave_site(url, days_back=1, use_proxy=False):
-	"""Scrape bids from an Ionwave site"""
+def get_newest_posted_date(url):
+	"""Read the newest bid issue date from a tenant's listing over plain HTTP.
+
+	Returns:
+		tuple: (row_count, newest_date, complete). newest_date is a YYYY-MM-DD
+		string or None, complete is False when the grid is paged so rows beyond
+		the first page were not seen. Returns None if the page could not be read.
+	"""
+	headers = {
+		'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'
+	}
+	try:
+		response = get_http_session().get(url, headers=headers, timeout=PRECHECK_TIMEOUT)
+		if response.status_code != 200:
+			return None
+		soup = BeautifulSoup(response.text, 'html.parser')
+		grid = soup.select_one("table[id$='rgBidList_ctl00']")
+		if grid is None:
+			return None
+
+		# Locate the Bid Issue Date column from the header, defaulting to the 6th
+		date_index = 5
+		for index, header in enumerate(grid.select('thead tr:nth-of-type(1) th')):
+			if 'issue' in header.get_text(' ', strip=True).lower():
+				date_index = index
+				break
+
+		dates = []
+		rows = grid.select("tr[id*='rgBidList_ctl00__']")
+		for row in rows:
+			cells = row.find_all('td', recursive=False)
+			if len(cells) > date_index:
+				formatted = format_date(cells[date_index].get_text(' ', strip=True))
+				if len(formatted) == 10 and formatted[4] == '-':
+					dates.append(formatted)
+
+		if rows and not dates:
+			return None
+		paged = len(grid.select('.rgPager .rgNumPart a')) > 1
+		return len(rows), max(dates) if dates else None, not paged
+	except Exception as e:
+		logger.info(f"[PRECHECK] Could not read {url} over HTTP: {str(e)}")
+		return None
+
+def precheck_tenant(url, days_back):
+	"""Decide cheaply whether a tenant needs a browser at all.
+
+	Returns:
+		tuple: (needs_browser, reason)
+	"""
+	result = get_newest_posted_date(url)
+	if result is None:
+		return True, 'listing not readable over HTTP'
+	row_count, newest_date, complete = result
+	if row_count == 0:
+		return False, 'no open bids'
+	if newest_date and is_within_date_range(newest_date, days_back):
+		return True, f'newest bid {newest_date}'
+	if not complete:
+		return True, 'listing is paged'
+	return False, f'newest bid {newest_date} is outside the date range'
+
+def scrape_ionwave_site(url, days_back=1, use_proxy=False, driver_pool=None, cache_data=None, bids_data=None,
+						full_rescan=False):
+	"""Scrape bids from an Ionwave site, borrowing a warm driver from driver_pool if given.
+
+	cache_data and bids_data are shared by concurrent tenants: the cache is
+	loaded once per run and every tenant's bids go into the same Excel file.
+	Each tenant keeps its own watermark, see utils.watermarks.
+	"""
 	driver = None
+	healthy = True
 	base_folder = get_base_folder()
 	script_name = os.path.splitext(os.path.basename(__file__))[0]
 	script_folder = os.path.join(base_folder, f"{script_name}_IN_PROGRESS")
 	os.makedirs(script_folder, exist_ok=True)
+	metrics = get_metrics()
+	metrics.set_folder(script_folder)
 	
-	# Load cache
-	cache_data = load_cache()
+	if cache_data is None:
+		cache_data = load_cache()
+	if bids_data is None:
+		bids_data = []
+	watermark = Watermark(script_name, tenant=url, full_rescan=full_rescan)
+	logger.info(f"[INFO] {url}: {watermark.describe()}")
 	
 	try:
 		# Initialize WebDriver
-		print("\nInitializing WebDriver...")
-		driver = setup_driver_with_proxy(use_proxy)
+		if driver_pool:
+			driver = driver_pool.checkout(url)
+		else:
+			print("\nInitializing WebDriver...")
+			driver = setup_driver_with_proxy(use_proxy)
 		if not driver:
 			logger.error("[ERROR] Failed to initialize WebDriver")
 			return False
@@ -521,7 +617,6 @@ def scrape_ionwave_site(url, days_back=1, use_proxy=False):
 		logger.info(f"[INFO] Accessing URL: {url}")
 		print(f"\nAccessing URL: {url}")
 		driver.get(url)
-		time.sleep(5)
 
 		if not wait_for_page_load(driver):
 			return True
@@ -531,12 +626,14 @@ def scrape_ionwave_site(url, days_back=1, use_proxy=False):
 			return True
 
 		# Get all dates from main page first
-		bids_info = get_all_dates_from_main_page(driver)
+		with metrics.span(LISTING):
+			bids_info = get_all_dates_from_main_page(driver, days_back, label=url, watermark=watermark)
 		if not bids_info:
-			logger.info("[INFO] No bids found on page")
+			logger.info("[INFO] No bids found within the specified date range")
 			return True
 
-		bids_data = []
+		tenant_bids = []
+		pending_archives = []  # (bid_details, files moved so far, expansion futures)
 		found_recent_bids = False
 
 		# Process each bid that's within date range
@@ -552,6 +649,7 @@ def scrape_ionwave_site(url, days_back=1, use_proxy=False):
 				bid_url = driver.current_url
 				if not should_process_bid(bid_url, bid_info['solicitation_number'], 
 									   bid_info['formatted_posted_date'], cache_data):
+					watermark.advance(bid_info['formatted_posted_date'], bid_info['solicitation_number'])
 					continue
 				
 				# Click view button for this bid
@@ -563,16 +661,20 @@ def scrape_ionwave_site(url, days_back=1, use_proxy=False):
 					time.sleep(3)
 				except Exception as e:
 					logger.error(f"[ERROR] Could not click view button: {str(e)}")
+					watermark.hold(bid_info['formatted_posted_date'])
 					continue
 
 				# Extract additional bid details
-				bid_details = extract_bid_details(driver, bid_info)
+				with metrics.span(DETAIL):
+					bid_details = extract_bid_details(driver, bid_info)
 				if not bid_details:
+					watermark.hold(bid_info['formatted_posted_date'])
 					continue
 
 				# Download attachments
 				print("\nProcessing attachments...")
-				attachments = download_attachments(driver, None)  # Pass None initially
+				with metrics.span(DOWNLOAD):
+					attachments = download_attachments(driver, None)  # Pass None initially
 				
 				if attachments:
 					# Only create bid folder if we have attachments
@@ -580,8 +682,9 @@ def scrape_ionwave_site(url, days_back=1, use_proxy=False):
 					os.makedirs(bid_folder, exist_ok=True)
 					
 					# Move files from download folder to bid folder
-					downloads_folder = get_download_folder()
+					downloads_folder = get_download_folder(driver)
 					processed_files = []
+					archive_futures = []
 					
 					for file in os.listdir(downloads_folder):
 						if file.endswith('.crdownload') or file.endswith('.tmp'):
@@ -591,17 +694,14 @@ def scrape_ionwave_site(url, days_back=1, use_proxy=False):
 						
 						try:
 							if file.lower().endswith('.zip'):
-								print(f"Processing zip file: {file}")
-								with zipfile.ZipFile(file_path, 'r') as zip_ref:
-									for zip_info in zip_ref.infolist():
-										if not zip_info.filename.endswith('/'):  # Skip directories
-											filename = os.path.basename(zip_info.filename)  # Get just filename
-											source = zip_ref.read(zip_info.filename)
-											target_path = os.path.join(bid_folder, filename)
-											with open(target_path, 'wb') as f:
-												f.write(source)
-											processed_files.append(filename)
-								os.remove(file_path)  # Remove zip after extraction
+								# Move the archive out of the shared download folder, then
+								# expand it in the background while the next bid is scraped
+								print(f"Queueing zip file for extraction: {file}")
+								archive_path = os.path.join(bid_folder, file)
+								shutil.move(file_path, archive_path)
+								archive_futures.append(
+									get_archive_expander().submit(archive_path, bid_folder, flatten=True)
+								)
 							else:
 								destination = os.path.join(bid_folder, file)
 								if safe_move(file_path, destination):
@@ -612,21 +712,26 @@ def scrape_ionwave_site(url, days_back=1, use_proxy=False):
 					
 					print(f"Downloaded attachments: {', '.join(processed_files)}")
 					bid_details['Attachments'] = ', '.join(processed_files)
+					if archive_futures:
+						pending_archives.append((bid_details, processed_files, archive_futures))
 				else:
 					print("No attachments downloaded")
 					bid_details['Attachments'] = ''
 
-				bids_data.append(bid_details)
+				tenant_bids.append(bid_details)
 				print(f"Successfully processed bid: {bid_details['Solicitation Number']}")
 
 				# Update Excel file after each bid
-				update_excel_file(script_folder, script_name, bids_data)
+				with excel_lock, metrics.span(EXCEL):
+					bids_data.append(bid_details)
+					update_excel_file(script_folder, script_name, bids_data)
+				metrics.count(BIDS_SAVED)
+				watermark.advance(bid_info['formatted_posted_date'], bid_info['solicitation_number'])
 
 				# Return to listing page before processing next bid
 				if not return_to_listing(driver):
 					logger.error("[ERROR] Failed to return to listing page")
 					driver.get(url)  # Fallback to loading URL if button click fails
-					time.sleep(5)
 					if not wait_for_page_load(driver):
 						continue
 					if not sort_bids_by_date(driver):
@@ -635,11 +740,28 @@ def scrape_ionwave_site(url, days_back=1, use_proxy=False):
 			except Exception as e:
 				logger.error(f"[ERROR] Error processing bid: {str(e)}")
 				print(f"Error processing bid: {str(e)}")
+				watermark.hold(bid_info['formatted_posted_date'])
 				continue
 
+		# Collect background archive expansions and refresh the attachment lists
+		if pending_archives:
+			for bid_details, processed_files, archive_futures in pending_archives:
+				attachments = list(processed_files)
+				for future in archive_futures:
+					try:
+						attachments.extend(future.result())
+					except Exception as e:
+						print(f"Error extracting archive for {bid_details['Solicitation Number']}: {str(e)}")
+				bid_details['Attachments'] = ', '.join(attachments)
+			with excel_lock:
+				update_excel_file(script_folder, script_name, bids_data)
+			get_archive_expander().log_summary()
+
+		watermark.save()
+
 		# Final status
-		if bids_data:
-			print(f"\nProcessed {len(bids_data)} bids successfully")
+		if tenant_bids:
+			print(f"\nProcessed {len(tenant_bids)} bids successfully")
 			return True
 		else:
 			if found_recent_bids:
@@ -650,10 +772,13 @@ def scrape_ionwave_site(url, days_back=1, use_proxy=False):
 				return True
 
 	except Exception as e:
+		healthy = False
 		logger.error(f"[ERROR] Error in scrape_ionwave_site: {str(e)}")
 		return False
 	finally:
-		if driver:
+		if driver and driver_pool:
+			driver_pool.checkin(driver, healthy)
+		elif driver:
 			try:
 				driver.quit()
 			except:
@@ -842,8 +967,10 @@ def scrape_bid_details(driver, bid_info, bid_folder):
 		play_notification_sound()
 		return None
 
-def get_download_folder():
-	"""Get the download folder path for the current script"""
+def get_download_folder(driver=None):
+	"""Get the download folder of a driver, or the script's shared one"""
+	if driver is not None and getattr(driver, 'download_folder', None):
+		return driver.download_folder
 	yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
 	script_name = os.path.splitext(os.path.basename(__file__))[0]
 	base_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), yesterday)
@@ -956,7 +1083,7 @@ def download_attachments(driver, bid_folder):
 			time.sleep(30)  # Initial wait for downloads to start
 			
 			attachments = []
-			downloads_folder = get_download_folder()
+			downloads_folder = get_download_folder(driver)
 			
 			# Wait for and process each downloaded file
 			for filename in downloaded_files:
@@ -1020,8 +1147,13 @@ def wait_for_page_load(driver, timeout=30):
 			lambda d: d.execute_script('return document.readyState') == 'complete'
 		)
 		
-		# Wait for any AJAX calls to complete
-		time.sleep(5)
+		# Wait for the bid grid (or its empty message) instead of a fixed delay
+		try:
+			WebDriverWait(driver, 10).until(
+				lambda d: d.find_elements(By.XPATH, "//tr[contains(@id,'rgBidList_ctl00__')] | //tr[contains(@class,'rgNoRecords')]")
+			)
+		except TimeoutException:
+			pass
 		
 		# Check if page has error message or is empty
 		try:
@@ -1060,10 +1192,17 @@ def main():
 		parser = argparse.ArgumentParser(description='Scrape Ionwave bids')
 		parser.add_argument('--days', type=int, default=1,
 						  help='Number of days back to scrape (default: 1)')
+		parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+						  help=f'Number of tenants scraped concurrently (default: {DEFAULT_WORKERS})')
+		parser.add_argument('--no-precheck', action='store_true',
+						  help='Open every tenant in a browser without the HTTP pre-check')
+		parser.add_argument('--full-rescan', action='store_true',
+						  help='Ignore the stored watermarks and scan the whole --days window')
 		args = parser.parse_args()
 		
 		print(f"\nConfiguration:")
 		print(f"- Days to look back: {args.days}")
+		print(f"- Concurrent tenants: {args.workers}")
 		print(f"- Working folder: {base_folder}")
 		logger.info(f"[CONFIG] Days to look back: {args.days}")
 
@@ -1118,6 +1257,7 @@ def main():
 		processed_urls = 0
 		successful_urls = 0
 		failed_urls = []
+		skipped_urls = []
 
 		print(f"\nTotal URLs to process: {total_urls}")
 		logger.info(f"[INFO] Total URLs to process: {total_urls}")
@@ -1125,41 +1265,64 @@ def main():
 		excel_path = os.path.join(base_folder, '18_Ionwave.xlsx')
 		logger.info(f"[INFO] Excel file will be saved as: {excel_path}")
 
-		for url in urls:
-			try:
+		# Pre-check: read each listing over HTTP and skip tenants with nothing new
+		precheck_start = time.time()
+		if not args.no_precheck:
+			with ThreadPoolExecutor(max_workers=PRECHECK_WORKERS) as executor:
+				futures = {executor.submit(precheck_tenant, url, args.days): url for url in urls}
+				decisions = {futures[future]: future.result() for future in as_completed(futures)}
+			for url in urls:
+				needs_browser, reason = decisions[url]
+				logger.info(f"[PRECHECK] {'scrape' if needs_browser else 'skip'}: {url} ({reason})")
+				if not needs_browser:
+					skipped_urls.append(url)
+			urls = [url for url in urls if url not in skipped_urls]
+			logger.info(
+				f"[PRECHECK] {len(skipped_urls)}/{total_urls} tenants skipped in "
+				f"{time.time() - precheck_start:.1f}s, {len(urls)} need a browser"
+			)
+
+		# Scrape the remaining tenants concurrently on a bounded pool of warm browsers
+		workers = max(1, min(args.workers, len(urls)))
+		cache_data = load_cache()
+		bids_data = []
+		driver_pool = DriverPool(setup_driver_with_proxy, size=workers) if urls else None
+
+		with ThreadPoolExecutor(max_workers=workers) as executor:
+			futures = {
+				executor.submit(
+					scrape_ionwave_site, url, args.days,
+					driver_pool=driver_pool, cache_data=cache_data, bids_data=bids_data,
+					full_rescan=args.full_rescan
+				): url
+				for url in urls
+			}
+			for future in as_completed(futures):
+				url = futures[future]
 				processed_urls += 1
-				print(f"\nProcessing URL {processed_urls}/{total_urls}")
-				print(f"URL: {url}")
-				logger.info(f"[PROGRESS] Processing URL {processed_urls}/{total_urls}: {url}")
-				
-				success = scrape_ionwave_site(url, args.days)
-				
+				try:
+					success = future.result()
+				except Exception as e:
+					logger.error(f"[ERROR] Unexpected error for {url}: {str(e)}")
+					success = False
+
 				if success:
 					successful_urls += 1
-					print(f"Status: Success")
 					logger.info(f"[SUCCESS] Successfully processed URL: {url}")
 				else:
 					failed_urls.append(url)
-					print(f"Status: Failed")
 					logger.error(f"[ERROR] Failed to process URL: {url}")
 					play_notification_sound()
-					user_input = input("Press Enter to continue to next URL, or 'q' to quit: ")
-					if user_input.lower() == 'q':
-						break
-				
-				print(f"Progress: {processed_urls}/{total_urls} URLs processed")
-				time.sleep(2)
+				print(f"Progress: {processed_urls}/{len(urls)} URLs processed")
 
-			except Exception as e:
-				logger.info(f"[INFO] Skipping URL {url}: {str(e)}")
-				print(f"Status: Skipped")
-				time.sleep(2)
-				continue
+		if driver_pool:
+			driver_pool.close()
 
 		# Print summary
 		print("\n" + "="*50)
 		print("Execution Summary:")
 		print(f"Total URLs processed: {processed_urls}/{total_urls}")
+		print(f"Skipped by pre-check: {len(skipped_urls)}")
 		print(f"Successful: {successful_urls}")
 		print(f"Failed: {len(failed_urls)}")
 		
@@ -1173,6 +1336,8 @@ def main():
 		logger.info(f"[SUMMARY] Working folder: {base_folder}")
 		logger.info(f"[SUMMARY] Excel file: {excel_path}")
 		logger.info(f"[SUMMARY] Total URLs processed: {processed_urls}/{total_urls}")
+		logger.info(f"[SUMMARY] Skipped by pre-check: {len(skipped_urls)}")
+		logger.info(f"[SUMMARY] Bids collected: {len(bids_data)}")
 		logger.info(f"[SUMMARY] Successful URLs: {successful_urls}")
 		logger.info(f"[SUMMARY] Failed URLs: {len(failed_urls)}")
 		
@@ -1188,7 +1353,7 @@ def main():
 		logger.error(error_msg)
 		print(f"\nFatal Error: {str(e)}")
 		play_notification_sound()
-		input("Press Enter to exit...")
+		get_intervention_queue().report(error_msg)
 		sys.exit(1)
 
 if __name__ == "__main__":
@@ -7,7 +7,6 @@ import argparse
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -27,6 +26,21 @@ import glob
 # Add utils path to system path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.utils import play_notification_sound, safe_move
+from utils.driver_factory import create_driver
+from utils.table_extract import extract_rows
+from utils.interventions import get_intervention_queue
+from utils.metrics import BIDS_SAVED, DETAIL, DOWNLOAD, EXCEL, LISTING, get_metrics
+
+# Solicitation search results, read in one batch by scrape_pennsylvania_emarketplace()
+BID_ROWS_XPATH = "//tr[td/a[contains(@id, 'HyperLink1')]]"
+BID_ROW_COLUMNS = {
+	'solicitation_number': ".//a[contains(@id, 'HyperLink1')]",
+	'url': (".//a[contains(@id, 'HyperLink1')]", 'href'),
+	'title': ".//span[contains(@id, 'lblTitle')]",
+	'agency': './/td[5]',
+	'posted_date': './/td[8]',
+	'response_date': './/td[9]',
+}
 
 def get_cache_file():
 	"""Get the path to the cache file"""
@@ -145,30 +159,20 @@ def notify_completion():
 	logger.info("[COMPLETE] ✅ All Bids and Attachments Extraction Successfully Completed")
 	play_notification_sound()
 
-def handle_error(error_msg, play_sound=True, pause=True):
-	"""Handle errors with notifications and optional pause"""
+def handle_error(error_msg, play_sound=True, report=True, driver=None):
+	"""Handle errors with notifications and an optional dashboard report"""
 	logger.error(error_msg)
 	print(f"\nError: {error_msg}")
 	
 	if play_sound:
 		play_notification_sound()
 		
-	if pause:
-		user_input = input("Press Enter to continue, or 'q' to quit: ")
-		if user_input.lower() == 'q':
-			sys.exit(1)
+	if report:
+		get_intervention_queue().report(error_msg, driver)
 
 def setup_driver():
 	"""Setup WebDriver with anti-bot measures and download settings"""
 	try:
-		options = webdriver.ChromeOptions()
-		
-		# Anti-bot measures
-		options.add_argument('--disable-blink-features=AutomationControlled')
-		options.add_experimental_option("excludeSwitches", ["enable-automation"])
-		options.add_experimental_option('useAutomationExtension', False)
-		options.add_argument('--disable-extensions')
-		
 		# Create and set download folder
 		yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
 		script_name = os.path.splitext(os.path.basename(__file__))[0]
@@ -180,35 +184,8 @@ def setup_driver():
 		os.makedirs(download_folder, exist_ok=True)
 		print(f"\nConfigured download folder: {download_folder}")
 		
-		# Download settings
-		prefs = {
-			'download.default_directory': download_folder,
-			'download.prompt_for_download': False,
-			'download.directory_upgrade': True,
-			'safebrowsing.enabled': True,
-			'profile.default_content_settings.popups': 0,
-			'profile.default_content_setting_values.automatic_downloads': 1
-		}
-		options.add_experimental_option('prefs', prefs)
-		
-		# Performance settings
-		options.add_argument('--no-sandbox')
-		options.add_argument('--disable-dev-shm-usage')
-		options.add_argument('--disable-gpu')
-		options.add_argument('--disable-infobars')
-		options.add_argument('--disable-notifications')
-		
-		# Create driver with configured options
-		driver = webdriver.Chrome(options=options)
-		driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-			'source': '''
-				Object.defineProperty(navigator, 'webdriver', {
-					get: () => undefined
-				})
-			'''
-		})
-		
-		return driver
+		# Anti-bot, download and performance settings come from the shared factory
+		return create_driver(download_folder=download_folder, site="https://www.emarketplace.state.pa.us")
 		
 	except Exception as e:
 		logger.error(f"[ERROR] Failed to setup WebDriver: {str(e)}")
@@ -286,6 +263,8 @@ def scrape_pennsylvania_emarketplace(driver, days_back=1):
 	script_name = os.path.splitext(os.path.basename(__file__))[0]
 	script_folder = os.path.join(base_folder, f"{script_name}_IN_PROGRESS")
 	os.makedirs(script_folder, exist_ok=True)
+	metrics = get_metrics()
+	metrics.set_folder(script_folder)
 	
 	# Load cache
 	cache_data = load_cache()
@@ -298,7 +277,7 @@ def scrape_pennsylvania_emarketplace(driver, days_back=1):
 		driver.get(url)
 		
 		if not wait_for_page_load(driver):
-			handle_error("Page failed to load")
+			handle_error("Page failed to load", driver=driver)
 			return False
 		
 		# Set date filter for yesterday
@@ -310,7 +289,7 @@ def scrape_pennsylvania_emarketplace(driver, days_back=1):
 			date_input.send_keys(yesterday)
 			print(f"Set date filter to: {yesterday}")
 		else:
-			handle_error("Could not find date input field")
+			handle_error("Could not find date input field", driver=driver)
 			return False
 			
 		# Click search button
@@ -318,11 +297,11 @@ def scrape_pennsylvania_emarketplace(driver, days_back=1):
 		if search_button:
 			search_button.click()
 			if not wait_for_page_load(driver):
-				handle_error("Page failed to load after search")
+				handle_error("Page failed to load after search", driver=driver)
 				return False
 			print("Clicked search button")
 		else:
-			handle_error("Could not find search button")
+			handle_error("Could not find search button", driver=driver)
 			return False
 
 		# Check if no records were found
@@ -352,7 +331,7 @@ def scrape_pennsylvania_emarketplace(driver, days_back=1):
 				
 			sort_link.click()
 			if not wait_for_page_load(driver):
-				handle_error("Page failed to load after sorting")
+				handle_error("Page failed to load after sorting", driver=driver)
 				return False
 			print("Sorted by Solicitation Start Date")
 		except Exception as e:
@@ -365,19 +344,20 @@ def scrape_pennsylvania_emarketplace(driver, days_back=1):
 			from selenium.webdriver.support.ui import Select
 			Select(select_element).select_by_value("32767")  # ALL option
 			if not wait_for_page_load(driver):
-				handle_error("Page failed to load after changing results count")
+				handle_error("Page failed to load after changing results count", driver=driver)
 				return False
 			print("Set results to show ALL")
 		else:
-			handle_error("Could not find results dropdown")
+			handle_error("Could not find results dropdown", driver=driver)
 			return False
 			
 		# Process bids
 		bids_data = []
 		main_window = driver.current_window_handle
 		
-		# Get all bid rows
-		bid_rows = driver.find_elements(By.XPATH, "//tr[td/a[contains(@id, 'HyperLink1')]]")
+		# Read all bid rows in one script call; the "ALL" page can hold hundreds
+		with metrics.span(LISTING):
+			bid_rows = extract_rows(driver, BID_ROWS_XPATH, BID_ROW_COLUMNS)
 		if not bid_rows:
 			print("No bids found")
 			return True
@@ -386,16 +366,15 @@ def scrape_pennsylvania_emarketplace(driver, days_back=1):
 		
 		for row in bid_rows:
 			try:
-				# Get bid link and info before clicking
-				link_element = row.find_element(By.XPATH, ".//a[contains(@id, 'HyperLink1')]")
-				solicitation_number = link_element.text.strip()
-				bid_url = link_element.get_attribute('href')
-				
-				# Get other basic info
-				title = row.find_element(By.XPATH, ".//span[contains(@id, 'lblTitle')]").text.strip()
-				agency = row.find_element(By.XPATH, ".//td[5]").text.strip()
-				posted_date = format_date(row.find_element(By.XPATH, ".//td[8]").text.strip())
-				response_date = format_date(row.find_element(By.XPATH, ".//td[9]").text.strip().split(' ')[0])
+				if any(value is None for value in row.values()):
+					print("Skipping row with missing columns")
+					continue
+				solicitation_number = row['solicitation_number']
+				bid_url = row['url']
+				title = row['title']
+				agency = row['agency']
+				posted_date = format_date(row['posted_date'])
+				response_date = format_date(row['response_date'].split(' ')[0])
 				
 				print(f"\nProcessing bid: {solicitation_number} (Posted: {posted_date})")
 				
@@ -421,6 +400,7 @@ def scrape_pennsylvania_emarketplace(driver, days_back=1):
 				}
 				
 				# Open bid in new tab
+				detail_started = time.perf_counter()
 				driver.execute_script("window.open(arguments[0]);", bid_url)
 				
 				# Switch to new tab
@@ -435,15 +415,19 @@ def scrape_pennsylvania_emarketplace(driver, days_back=1):
 				
 				# Extract additional details
 				bid_details = extract_bid_details_from_page(driver, bid_info)
+				metrics.add_time(DETAIL, time.perf_counter() - detail_started)
 				if bid_details:
 					# Download attachments
-					attachments = download_bid_attachments(driver, script_folder, bid_details['Solicitation Number'])
+					with metrics.span(DOWNLOAD):
+						attachments = download_bid_attachments(driver, script_folder, bid_details['Solicitation Number'])
 					bid_details['Attachments'] = ', '.join(attachments) if attachments else ''
 					
 					bids_data.append(bid_details)
 					
 					# Update Excel after each bid
-					update_excel_file(script_folder, script_name, bids_data)
+					with metrics.span(EXCEL):
+						update_excel_file(script_folder, script_name, bids_data)
+					metrics.count(BIDS_SAVED)
 				
 				# Close tab and switch back to main window
 				driver.close()
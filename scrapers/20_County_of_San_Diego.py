@@ -7,7 +7,6 @@ import argparse
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -27,6 +26,25 @@ import glob
 # Add utils path to system path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.utils import play_notification_sound, safe_move
+from utils.driver_factory import create_driver
+from utils.table_extract import extract_rows
+from utils.listing import DateWindow, iter_listing, sort_newest_first
+from utils.interventions import get_intervention_queue
+from utils.watermarks import Watermark
+from utils.metrics import BIDS_SAVED, CLEANUP, DETAIL, DOWNLOAD, EXCEL, LISTING, SEARCH, get_metrics
+
+# RFx browse grid, read in one batch per page by scrape_bids(). Cells are
+# counted over the whole row like the old find_elements(By.TAG_NAME, "td")
+GRID_ROWS_XPATH = "//tbody//tr"
+GRID_COLUMNS = {
+	'title': ('(.//td)[2]', 'textContent'),
+	'posted_date': ('(.//td)[3]', 'textContent'),
+	'response_date': ('(.//td)[4]', 'textContent'),
+	'code': ('(.//td)[8]', 'textContent'),
+	'url': (".//a[contains(@id, '_img___colManagegrid')]", 'href'),
+}
+# Header of the RFx Begin Date column, clicked to sort the grid newest first
+GRID_POSTED_HEADER_XPATH = "//th[contains(normalize-space(.), 'Begin')]//a"
 
 def get_cache_file():
 	"""Get the path to the cache file"""
@@ -133,30 +151,20 @@ def notify_completion():
 	logger.info("[COMPLETE] All Bids and Attachments Extraction Successfully Completed")
 	play_notification_sound()
 
-def handle_error(error_msg, play_sound=True, pause=True):
-	"""Handle errors with notifications and optional pause"""
+def handle_error(error_msg, play_sound=True, report=True, driver=None):
+	"""Handle errors with notifications and an optional dashboard report"""
 	logger.error(error_msg)
 	print(f"\nError: {error_msg}")
 	
 	if play_sound:
 		play_notification_sound()
 		
-	if pause:
-		user_input = input("Press Enter to continue, or 'q' to quit: ")
-		if user_input.lower() == 'q':
-			sys.exit(1)
+	if report:
+		get_intervention_queue().report(error_msg, driver)
 
 def setup_driver():
 	"""Setup WebDriver with anti-bot measures"""
 	try:
-		options = webdriver.ChromeOptions()
-		
-		# Anti-bot measures
-		options.add_argument('--disable-blink-features=AutomationControlled')
-		options.add_experimental_option("excludeSwitches", ["enable-automation"])
-		options.add_experimental_option('useAutomationExtension', False)
-		options.add_argument('--disable-extensions')
-		
 		# Create and set download folder
 		script_name = os.path.splitext(os.path.basename(__file__))[0]
 		base_folder = get_base_folder()
@@ -167,35 +175,8 @@ def setup_driver():
 		os.makedirs(download_folder, exist_ok=True)
 		print(f"\nConfigured download folder: {download_folder}")
 		
-		# Download settings
-		prefs = {
-			'download.default_directory': download_folder,
-			'download.prompt_for_download': False,
-			'download.directory_upgrade': True,
-			'safebrowsing.enabled': True,
-			'profile.default_content_settings.popups': 0,
-			'profile.default_content_setting_values.automatic_downloads': 1
-		}
-		options.add_experimental_option('prefs', prefs)
-		
-		# Performance settings
-		options.add_argument('--no-sandbox')
-		options.add_argument('--disable-dev-shm-usage')
-		options.add_argument('--disable-gpu')
-		options.add_argument('--disable-infobars')
-		options.add_argument('--disable-notifications')
-		
-		# Create driver with configured options
-		driver = webdriver.Chrome(options=options)
-		driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-			'source': '''
-				Object.defineProperty(navigator, 'webdriver', {
-					get: () => undefined
-				})
-			'''
-		})
-		
-		return driver
+		# Anti-bot, download and performance settings come from the shared factory
+		return create_driver(download_folder=download_folder, site="https://sdbuynet.sandiegocounty.gov")
 		
 	except Exception as e:
 		logger.error(f"[ERROR] Failed to setup WebDriver: {str(e)}")
@@ -410,63 +391,35 @@ def apply_filters(driver):
 		play_notification_sound()
 		return False
 
-def get_bid_links(driver, base_url="https://sdbuynet.sandiegocounty.gov"):
-	"""Get all bid detail page URLs from the current page using JavaScript"""
-	try:
-		# Use JavaScript to get bid links
-		script = """
-			const baseUrl = 'https://sdbuynet.sandiegocounty.gov';
-			const bidLinks = document.querySelectorAll('a[id^="body_x_grid_grd_tr_"][id$="_img___colManagegrid"]');
-			const bidUrls = [];
-			bidLinks.forEach(link => {
-				const href = link.getAttribute('href');
-				if (href) {
-					bidUrls.push(baseUrl + href);
-				}
-			});
-			return bidUrls;
-		"""
-		urls = driver.execute_script(script)
-		print(f"\nFound {len(urls)} bid URLs on current page:")
-		for url in urls:
-			print(f"- {url}")
-		return urls
-	except Exception as e:
-		logger.error(f"[ERROR] Error getting bid links: {str(e)}")
-		return []
-
-def extract_bid_info(driver, current_row):
-	"""Extract bid information from the current row"""
+def extract_bid_info(row):
+	"""Extract bid information from a row read by extract_rows()"""
 	try:
-		# Get the current row's cells
-		cells = current_row.find_elements(By.TAG_NAME, "td")
-		
-		if len(cells) < 8:
+		if row['code'] is None:
 			logger.warning("[WARNING] Row has insufficient cells")
 			return None
 
 		# Posted Date (RFx Begin Date - 3rd column)
-		posted_date = cells[2].get_attribute('textContent').strip()
+		posted_date = row['posted_date']
 		if not posted_date:
 			logger.warning("[WARNING] Missing posted date")
 			return None
 		posted_date = format_date(posted_date)
 
 		# Response Date (RFx End Date - 4th column)
-		response_date = cells[3].get_attribute('textContent').strip()
+		response_date = row['response_date']
 		if not response_date:
 			logger.warning("[WARNING] Missing response date")
 			return None
 		response_date = format_date(response_date)
 
 		# Solicitation Title (RFx Name - 2nd column)
-		title = cells[1].get_attribute('textContent').strip()
+		title = row['title']
 		if not title:
 			logger.warning("[WARNING] Missing solicitation title")
 			return None
 
 		# Solicitation Number (Code - 8th column)
-		code = cells[7].get_attribute('textContent').strip()
+		code = row['code']
 		if not code:
 			logger.warning("[WARNING] Missing solicitation number")
 			return None
@@ -631,128 +584,140 @@ def download_attachments(driver, bid_folder):
 		play_notification_sound()
 		return []
 
-def scrape_bids(driver, days_back=1):
+def scrape_bids(driver, days_back=1, full_rescan=False):
 	"""Main function to scrape bids"""
 	try:
 		base_url = "https://sdbuynet.sandiegocounty.gov"
 		url = f"{base_url}/page.aspx/en/rfp/request_browse_public"
+		metrics = get_metrics()
 		
 		print(f"\nAccessing URL: {url}")
-		driver.get(url)
-		
-		if not wait_for_page_load(driver):
-			logger.error("[ERROR] Initial page load failed")
-			return False
+		with metrics.span(SEARCH):
+			driver.get(url)
 			
-		if not apply_filters(driver):
-			logger.error("[ERROR] Failed to apply filters")
-			return False
+			if not wait_for_page_load(driver):
+				logger.error("[ERROR] Initial page load failed")
+				return False
+				
+			if not apply_filters(driver):
+				logger.error("[ERROR] Failed to apply filters")
+				return False
 			
 		# First collect all bid URLs and info from 2 pages
 		bids_to_process = []
 		processed_bid_numbers = set()  # Track unique bid numbers
 		pages_to_scrape = 2
 		urls_per_page = 15
-		total_urls_needed = 30
 		start_row_index = 7  # Skip first 7 rows
-		
+		bids_per_page = {}
+
+		def read_page():
+			# Read the whole grid in one script call instead of per-cell lookups,
+			# skipping header rows and only keeping actual bid rows
+			rows = extract_rows(driver, GRID_ROWS_XPATH, GRID_COLUMNS)
+			page_bids = []
+			for row_index, row in enumerate(rows[start_row_index:]):
+				try:
+					bid_info = extract_bid_info(row)
+					if bid_info:
+						bid_info['url'] = row['url']
+						page_bids.append(bid_info)
+				except Exception as e:
+					logger.error(f"[ERROR] Error processing row {row_index + start_row_index + 1}: {str(e)}")
+			return page_bids
+
+		def next_page():
+			try:
+				next_button = WebDriverWait(driver, 5).until(
+					EC.presence_of_element_located((By.ID, "body_x_grid_PagerBtnNextPage"))
+				)
+				if not next_button.is_enabled():
+					print("Reached last page")
+					return False
+				print(f"\nNavigating to page {window.pages + 1}...")
+				next_button.click()
+				time.sleep(10)
+				return True
+			except Exception as e:
+				logger.error(f"[ERROR] Error navigating to next page: {str(e)}")
+				return False
+
+		# Newest first lets the listing stop at the first bid older than the window
+		sorted_desc = sort_newest_first(
+			driver,
+			GRID_POSTED_HEADER_XPATH,
+			lambda: [bid['Posted Date'] for bid in read_page()],
+			label="County of San Diego",
+		)
+		# Bids up to the last run's watermark were already scraped
+		watermark = Watermark(os.path.splitext(os.path.basename(__file__))[0], full_rescan=full_rescan)
+		print(f"Incremental crawl: {watermark.describe()}")
+		# Same cutoff as is_within_date_range()
+		window = DateWindow(
+			datetime.now() - timedelta(days=days_back),
+			sorted_desc=sorted_desc,
+			label="County of San Diego",
+			watermark=watermark,
+		)
+
 		print("\n=== Starting URL Collection Phase ===")
+		listing_started = time.perf_counter()
 		print(f"Collecting unique bids across {pages_to_scrape} pages...")
-		
-		for page_num in range(1, pages_to_scrape + 1):
+
+		bids_in_window = iter_listing(
+			window,
+			read_page,
+			next_page,
+			posted_date=lambda bid: bid['Posted Date'],
+			max_pages=pages_to_scrape,
+			row_id=lambda bid: bid['Solicitation Number'],
+		)
+		for bid_info in bids_in_window:
 			try:
-				print(f"\nCollecting bids from page {page_num}/{pages_to_scrape}...")
-				
-				# Wait for page to load after filter/navigation
-				
-				# Get rows for extracting details
-				rows = driver.find_elements(By.CSS_SELECTOR, "tbody tr")
-				
-				# Skip header rows and only process actual bid rows
-				valid_rows = rows[start_row_index:]
-				page_bids = []  # Store unique bids for this page
-				
-				for row_index, row in enumerate(valid_rows):
-					try:
-						actual_row_num = row_index + start_row_index + 1
-						
-						# Extract bid info
-						bid_info = extract_bid_info(driver, row)
-						if not bid_info:
-							continue
-							
-						bid_number = bid_info['Solicitation Number']
-						
-						# Skip if we've already processed this bid number
-						if bid_number in processed_bid_numbers:
-							print(f"\nSkipping duplicate bid {bid_number}")
-							continue
-							
-						processed_bid_numbers.add(bid_number)
-						
-						# Get bid URL
-						try:
-							link_element = row.find_element(By.CSS_SELECTOR, "a[id$='_img___colManagegrid']")
-							href = link_element.get_attribute('href')
-							if not href:
-								continue
-								
-							bid_url = urljoin(base_url, href)
-							bid_info['Bid Detail Page URL'] = bid_url
-							
-							print(f"\nExtracted bid info (#{len(page_bids) + 1} on page {page_num}):")
-							print(f"- Solicitation Number: {bid_info['Solicitation Number']}")
-							print(f"- Posted Date: {bid_info['Posted Date']}")
-							print(f"- Response Date: {bid_info['Response Date']}")
-							print(f"- Title: {bid_info['Solicitation Title']}")
-							print(f"- URL: {bid_url}")
-							
-							if not is_within_date_range(bid_info['Posted Date'], days_back):
-								print(f"Skipping bid {bid_number} - outside date range")
-								continue
-							
-							if should_process_bid(bid_url, bid_number, bid_info['Posted Date'], {}):
-								page_bids.append(bid_info)
-								print(f"Added bid {bid_number} to processing queue")
-							else:
-								print(f"Skipping bid {bid_number} - already processed")
-								
-							if len(page_bids) >= urls_per_page:
-								print(f"\nReached {urls_per_page} unique bids on page {page_num}")
-								break
-								
-						except Exception as e:
-							logger.error(f"[ERROR] Error getting bid URL: {str(e)}")
-							continue
-							
-					except Exception as e:
-						logger.error(f"[ERROR] Error processing row {actual_row_num}: {str(e)}")
-						continue
-				
-				print(f"\nFound {len(page_bids)} unique bids on page {page_num}")
-				bids_to_process.extend(page_bids)
-				
-				if page_num < pages_to_scrape:
-					try:
-						next_button = WebDriverWait(driver, 5).until(
-							EC.presence_of_element_located((By.ID, "body_x_grid_PagerBtnNextPage"))
-						)
-						if not next_button.is_enabled():
-							print("Reached last page")
-							break
-						print(f"\nNavigating to page {page_num + 1}...")
-						next_button.click()
-						time.sleep(10)
-					except Exception as e:
-						logger.error(f"[ERROR] Error navigating to next page: {str(e)}")
-						break
-				
+				page_num = window.pages
+				bid_number = bid_info['Solicitation Number']
+
+				# Skip if we've already processed this bid number
+				if bid_number in processed_bid_numbers:
+					print(f"\nSkipping duplicate bid {bid_number}")
+					continue
+				processed_bid_numbers.add(bid_number)
+
+				if bids_per_page.get(page_num, 0) >= urls_per_page:
+					# Left for the next run; keep the watermark from passing it
+					watermark.hold(bid_info['Posted Date'])
+					continue
+
+				href = bid_info.pop('url')
+				if not href:
+					continue
+				bid_url = urljoin(base_url, href)
+				bid_info['Bid Detail Page URL'] = bid_url
+
+				print(f"\nExtracted bid info (#{bids_per_page.get(page_num, 0) + 1} on page {page_num}):")
+				print(f"- Solicitation Number: {bid_info['Solicitation Number']}")
+				print(f"- Posted Date: {bid_info['Posted Date']}")
+				print(f"- Response Date: {bid_info['Response Date']}")
+				print(f"- Title: {bid_info['Solicitation Title']}")
+				print(f"- URL: {bid_url}")
+
+				# Rows the listing could not date are still checked here
+				if not is_within_date_range(bid_info['Posted Date'], days_back):
+					print(f"Skipping bid {bid_number} - outside date range")
+					continue
+
+				if should_process_bid(bid_url, bid_number, bid_info['Posted Date'], {}):
+					bids_to_process.append(bid_info)
+					bids_per_page[page_num] = bids_per_page.get(page_num, 0) + 1
+					print(f"Added bid {bid_number} to processing queue")
+				else:
+					print(f"Skipping bid {bid_number} - already processed")
+
 			except Exception as e:
-				error_msg = f"[ERROR] Error processing page {page_num}: {str(e)}"
-				logger.error(error_msg)
-				print(f"\n{error_msg}")
+				logger.error(f"[ERROR] Error getting bid URL: {str(e)}")
 				continue
-				
+
+		metrics.add_time(LISTING, time.perf_counter() - listing_started)
 		print(f"\n=== URL Collection Phase Complete ===")
 		print(f"Found {len(bids_to_process)} bids to process")
 		
@@ -788,9 +753,11 @@ def scrape_bids(driver, days_back=1):
 				
 				# Navigate to bid detail page
 				print(f"Accessing bid detail page: {bid_info['Bid Detail Page URL']}")
+				detail_started = time.perf_counter()
 				driver.get(bid_info['Bid Detail Page URL'])
 				if not wait_for_page_load(driver):
 					logger.error("[ERROR] Failed to load bid detail page")
+					watermark.hold(bid_info['Posted Date'])
 					continue
 				
 				# Extract additional details
@@ -811,9 +778,11 @@ def scrape_bids(driver, days_back=1):
 				except Exception as e:
 					logger.warning(f"[WARNING] Error extracting summary: {str(e)}")
 					print("Summary information not found")
+				metrics.add_time(DETAIL, time.perf_counter() - detail_started)
 				
 				# Download attachments
 				print("\nDownloading attachments...")
+				download_started = time.perf_counter()
 				attachments = download_attachments(driver, bid_folder)
 				
 				# Wait for files to appear in either folder
@@ -856,29 +825,39 @@ def scrape_bids(driver, days_back=1):
 						time.sleep(5)
 						attempt += 1
 						os.makedirs(bid_folder, exist_ok=True)
+				metrics.add_time(DOWNLOAD, time.perf_counter() - download_started)
 				
 				bids_data.append(bid_info)
 				
 				# Update Excel after each bid
-				if update_excel_file(script_folder, script_name, bids_data):
+				with metrics.span(EXCEL):
+					saved = update_excel_file(script_folder, script_name, bids_data)
+				if saved:
 					print(f"Bid {bid_info['Solicitation Number']} successfully extracted and saved to Excel.")
 					if bid_info['Attachments']:
 						print(f"   Attachments saved: {bid_info['Attachments']}")
+					watermark.advance(bid_info['Posted Date'], bid_info['Solicitation Number'])
+					metrics.count(BIDS_SAVED)
 				else:
 					logger.error("[ERROR] Failed to update Excel file")
+					watermark.hold(bid_info['Posted Date'])
 				
 			except Exception as e:
 				error_msg = f"[ERROR] Error processing bid {bid_info['Solicitation Number']}: {str(e)}"
 				logger.error(error_msg)
 				print(f"\n{error_msg}")
 				play_notification_sound()
+				watermark.hold(bid_info['Posted Date'])
 				continue
 				
 		if bids_data:
 			# Final Excel update to ensure all attachments are saved
-			if update_excel_file(script_folder, script_name, bids_data):
+			with metrics.span(EXCEL):
+				saved = update_excel_file(script_folder, script_name, bids_data)
+			if saved:
 				print(f"\nFinal Excel update completed with {len(bids_data)} bids.")
 			print(f"\n{len(bids_data)} bid links, posted {days_back} day(s) ago, have been successfully extracted and saved.")
+			watermark.save()
 			return True
 			
 		logger.error("[ERROR] No bids were found or processed")
@@ -908,6 +887,8 @@ def main():
 		parser = argparse.ArgumentParser(description='Scrape County of San Diego bids')
 		parser.add_argument('--days', type=int, default=1,
 						  help='Number of days back to scrape (default: 1)')
+		parser.add_argument('--full-rescan', action='store_true',
+						  help='Ignore the watermark and read the whole look-back window')
 		args = parser.parse_args()
 		
 		print(f"\nConfiguration:")
@@ -915,15 +896,17 @@ def main():
 		print(f"- Working folder: {base_folder}")
 		logger.info(f"[CONFIG] Days to look back: {args.days}")
 
+		get_metrics().set_folder(script_folder)
 		driver = setup_driver()
 		if not driver:
 			logger.error("[ERROR] Failed to initialize WebDriver")
 			return False
 
 		try:
-			success = scrape_bids(driver, args.days)
+			success = scrape_bids(driver, args.days, args.full_rescan)
 			if success:
-				complete_scraping()
+				with get_metrics().span(CLEANUP):
+					complete_scraping()
 				notify_completion()
 				return True
 			else:
@@ -932,14 +915,15 @@ def main():
 
 		finally:
 			if driver:
-				driver.quit()
+				with get_metrics().span(CLEANUP):
+					driver.quit()
 
 	except Exception as e:
 		error_msg = f"[FATAL] Fatal error in main execution: {str(e)}"
 		logger.error(error_msg)
 		print(f"\nFatal Error: {str(e)}")
 		play_notification_sound()
-		input("Press Enter to exit...")
+		get_intervention_queue().report(error_msg)
 		sys.exit(1)
 
 if __name__ == "__main__":
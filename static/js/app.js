@@ -58,8 +58,10 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // Start polling for updates
     fetchInitialData();
+    fetchInterventions();
     setInterval(fetchUpdates, 2000);
     setInterval(checkAppStatus, 5000);
+    setInterval(fetchInterventions, 5000);
 
     // Add event listeners for Excel processing and upload buttons
     document.getElementById('processExcelBtn').addEventListener('click', function() {
@@ -246,6 +248,75 @@ function updateStatistics(data = {}) {
     document.getElementById('totalCount').textContent = data.total || scripts.length;
 }
 
+function fetchInterventions() {
+    fetch('/api/interventions')
+        .then(r => r.json())
+        .then(renderInterventions)
+        .catch(error => console.error('Error fetching interventions:', error));
+}
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text == null ? '' : String(text);
+    return div.innerHTML;
+}
+
+function renderInterventions(items) {
+    const section = document.getElementById('interventionsSection');
+    const list = document.getElementById('interventionList');
+    document.getElementById('interventionCount').textContent = items.length;
+    section.classList.toggle('d-none', items.length === 0);
+
+    list.innerHTML = items.map(item => {
+        const created = new Date(item.created * 1000).toLocaleTimeString();
+        const expires = item.expires ? `, times out ${new Date(item.expires * 1000).toLocaleTimeString()}` : '';
+        const link = item.url ? `<a href="${escapeHtml(item.url)}" target="_blank" rel="noopener">Open page</a>` : '';
+        const screenshot = item.screenshot
+            ? `<a href="/api/interventions/${encodeURIComponent(item.id)}/screenshot" target="_blank">Screenshot</a>`
+            : '';
+        const resolveLabel = item.kind === 'error' ? 'Dismiss' : (item.kind === 'bid' ? 'Retry' : 'Continue');
+        const skipButton = item.kind === 'error'
+            ? ''
+            : `<button class="btn btn-sm btn-outline-secondary" data-id="${escapeHtml(item.id)}" data-action="skipped">Skip</button>`;
+        return `
+            <div class="list-group-item">
+                <div class="d-flex justify-content-between align-items-start">
+                    <div>
+                        <strong>${escapeHtml(item.scraper)}</strong>
+                        <span class="badge bg-secondary">${escapeHtml(item.kind)}</span>
+                        <div>${escapeHtml(item.reason)}</div>
+                        <small class="text-muted">${created}${expires}</small>
+                        <div>${link} ${screenshot}</div>
+                    </div>
+                    <div class="btn-group">
+                        <button class="btn btn-sm btn-success" data-id="${escapeHtml(item.id)}" data-action="resolved">${resolveLabel}</button>
+                        ${skipButton}
+                    </div>
+                </div>
+            </div>`;
+    }).join('');
+
+    list.querySelectorAll('button[data-id]').forEach(button => {
+        button.addEventListener('click', () => resolveIntervention(button.dataset.id, button.dataset.action));
+    });
+}
+
+function resolveIntervention(interventionId, action) {
+    fetch(`/api/interventions/${encodeURIComponent(interventionId)}/resolve`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ action: action })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.status !== 'success') {
+            appendToMainLog(`Error resolving intervention ${interventionId}: ${data.error}`);
+        }
+        fetchInterventions();
+    })
+    .catch(error => console.error('Error resolving intervention:', error));
+}
+
 function startScript(scriptName) {
     fetch('/api/start', {
         method: 'POST',
@@ -0,0 +1,69 @@
+import os
+import sys
+import io
+import zipfile
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.archive_expander import ArchiveExpander, ArchiveExpansionError
+
+
+def _make_zip(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+
+
+def test_expands_nested_archives_and_removes_source(tmp_path):
+    """Nested zips are expanded in place and the outer archive is removed"""
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w") as zf:
+        zf.writestr("plans/sheet1.pdf", b"pdf-bytes")
+
+    archive = tmp_path / "bid.zip"
+    _make_zip(archive, {"spec.docx": b"docx-bytes", "drawings.zip": inner.getvalue()})
+
+    dest = tmp_path / "bid"
+    extracted = ArchiveExpander(chunk_size=4).expand(str(archive), str(dest))
+
+    assert sorted(extracted) == sorted(
+        ["spec.docx", os.path.join("drawings", "plans", "sheet1.pdf")]
+    )
+    assert (dest / "drawings" / "plans" / "sheet1.pdf").read_bytes() == b"pdf-bytes"
+    assert not archive.exists()
+
+
+def test_flatten_keeps_duplicate_names(tmp_path):
+    """Flattened members with the same name get a numeric suffix"""
+    archive = tmp_path / "bid.zip"
+    _make_zip(archive, {"a/addendum.pdf": b"1", "b/addendum.pdf": b"2"})
+
+    extracted = ArchiveExpander().expand(str(archive), str(tmp_path / "out"), flatten=True)
+
+    assert sorted(extracted) == ["addendum.pdf", "addendum_1.pdf"]
+
+
+def test_rejects_path_traversal(tmp_path):
+    """Members that escape the destination folder are refused"""
+    archive = tmp_path / "evil.zip"
+    _make_zip(archive, {"../../outside.txt": b"nope"})
+
+    with pytest.raises(ArchiveExpansionError):
+        ArchiveExpander().expand(str(archive), str(tmp_path / "out"))
+    assert not (tmp_path / "outside.txt").exists()
+    assert archive.exists()
+
+
+def test_rejects_high_compression_ratio(tmp_path):
+    """Archives that inflate far beyond their size are treated as zip-bombs"""
+    archive = tmp_path / "bomb.zip"
+    _make_zip(archive, {"zeros.bin": b"\0" * (10 * 1024 * 1024)})
+
+    expander = ArchiveExpander(max_ratio=50)
+    with pytest.raises(ArchiveExpansionError):
+        expander.expand(str(archive), str(tmp_path / "out"))
+    assert expander.get_metrics()["rejected"] == 1
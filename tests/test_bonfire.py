@@ -0,0 +1,77 @@
+import io
+import os
+import sys
+import queue
+import importlib.util
+from datetime import datetime
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+PORTAL = "https://cabq.bonfirehub.com/portal/?tab=openOpportunities"
+
+
+class FakeDriver:
+    """Browser that loads any page"""
+
+    def get(self, url):
+        pass
+
+
+@pytest.fixture
+def bonfire(monkeypatch):
+    """12_Bonfire loaded as a module, without creating its dated output folder"""
+    for module in ("pandas", "selenium", "webdriver_manager", "dotenv", "winsound"):
+        pytest.importorskip(module)
+    monkeypatch.setenv("FAIRFAX_EMAIL", "buyer@example.com")
+    monkeypatch.setenv("FAIRFAX_PASSWORD", "secret")
+    monkeypatch.setattr(sys, "argv", ["12_Bonfire.py"])
+    # The scraper rewraps stdout on import; give it a buffer of its own
+    monkeypatch.setattr(sys, "stdout", io.TextIOWrapper(io.BytesIO()))
+
+    spec = importlib.util.spec_from_file_location(
+        "bonfire", os.path.join(project_root, "scrapers", "12_Bonfire.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "makedirs", lambda *args, **kwargs: None)
+        spec.loader.exec_module(module)
+    return module
+
+
+def test_portal_retry_opens_the_bid_that_failed(bonfire, monkeypatch):
+    """A bid whose detail page raised is not a duplicate when the portal is retried"""
+    opened = []
+    saved = []
+
+    def extract_bid_details(driver, link, url):
+        opened.append(link)
+        if link == "/b2" and opened.count(link) == 1:
+            raise RuntimeError("detail page timed out")
+        return {"Posted Date": datetime.now().strftime("%Y-%m-%d"), "Solicitation Number": link}
+
+    monkeypatch.setattr(bonfire, "throttle", lambda url: None)
+    monkeypatch.setattr(bonfire, "share_session", lambda driver, url: False)
+    monkeypatch.setattr(bonfire, "extract_bid_links", lambda driver: ["/b1", "/b2", "/b3"])
+    monkeypatch.setattr(bonfire, "extract_bid_details", extract_bid_details)
+    monkeypatch.setattr(bonfire, "download_attachments", lambda driver, number, folder: [])
+    monkeypatch.setattr(bonfire, "update_excel", lambda details, files: saved.append(details["Solicitation Number"]))
+    monkeypatch.setattr(bonfire, "save_bid_cache", lambda cache: None)
+    monkeypatch.setattr(bonfire, "restart_shard_driver", lambda shard, root, path: None)
+
+    work_queue = queue.Queue()
+    work_queue.put((1, PORTAL, 1))
+    shard = {"index": 1, "driver": FakeDriver(), "download_dir": "downloads"}
+    bid_cache = {}
+    results = {}
+
+    bonfire.shard_worker(shard, work_queue, 1, bid_cache, set(), results, "root", None)
+
+    assert results[PORTAL]["status"] == "done"
+    assert results[PORTAL]["attempts"] == 2
+    assert opened == ["/b1", "/b2", "/b2", "/b3"]
+    assert saved == ["/b1", "/b2", "/b3"]
+    assert sorted(bid_cache) == ["/b1", "/b2", "/b3"]
@@ -0,0 +1,100 @@
+import os
+import sys
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.download_slots import DownloadSlotManager, sweep_slots
+
+
+class FakeDriver:
+    """Records the CDP download path like Chrome does"""
+
+    def __init__(self):
+        self.download_path = None
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.download_path = params["downloadPath"]
+
+
+def test_concurrent_downloads_are_attributed_to_their_slot(tmp_path):
+    """Two downloads finishing in reverse order still land under the right names"""
+    driver = FakeDriver()
+    manager = DownloadSlotManager(driver, str(tmp_path / "downloads"))
+
+    pending = {}
+
+    def click(name):
+        def trigger():
+            partial = os.path.join(driver.download_path, f"{name}.crdownload")
+            open(partial, "w").close()
+            pending[name] = partial
+        return trigger
+
+    first = manager.start(click("first.pdf"), label="first.pdf")
+    second = manager.start(click("second.pdf"), label="second.pdf")
+
+    # Finish the second download before the first
+    for name in ("second.pdf", "first.pdf"):
+        partial = pending[name]
+        with open(partial, "w") as f:
+            f.write(name)
+        os.rename(partial, partial[: -len(".crdownload")])
+
+    bid_folder = tmp_path / "bid"
+    assert manager.collect(first, str(bid_folder), timeout=1) == "first.pdf"
+    assert manager.collect(second, str(bid_folder), timeout=1) == "second.pdf"
+    assert (bid_folder / "first.pdf").read_text() == "first.pdf"
+
+    manager.close()
+    assert os.listdir(tmp_path / "downloads") == []
+    assert driver.download_path == str(tmp_path / "downloads")
+
+
+def test_late_download_is_not_credited_to_the_next_slot(tmp_path):
+    """A download that starts after its timeout lands in the next slot and is left over"""
+    driver = FakeDriver()
+    downloads = tmp_path / "downloads"
+    manager = DownloadSlotManager(driver, str(downloads))
+
+    def save(name):
+        def trigger():
+            with open(os.path.join(driver.download_path, name), "w") as f:
+                f.write(name)
+        return trigger
+
+    late = manager.start(lambda: None, label="late.pdf", start_timeout=0.1)
+    current = manager.start(save("current.pdf"), label="current.pdf")
+    save("late.pdf")()  # Chrome finally starts the first download
+
+    bid_folder = tmp_path / "bid"
+    assert manager.collect(current, str(bid_folder), timeout=1) == "current.pdf"
+    assert manager.collect(late, str(bid_folder), timeout=1) is None
+    assert os.listdir(bid_folder) == ["current.pdf"]
+
+    manager.close()
+    assert sorted(os.listdir(downloads)) == ["late.pdf"]
+
+
+def test_close_keeps_files_it_could_not_hand_over(tmp_path):
+    """Uncollected files are moved to the leftovers folder, unfinished ones wait for the sweep"""
+    driver = FakeDriver()
+    downloads = tmp_path / "downloads"
+    leftovers = tmp_path / "leftovers"
+    manager = DownloadSlotManager(driver, str(downloads), leftovers_folder=str(leftovers))
+
+    def write(name):
+        return lambda: open(os.path.join(driver.download_path, name), "w").close()
+
+    manager.start(write("done.pdf"), label="done.pdf")
+    running = manager.start(write("big.zip.crdownload"), label="big.zip")
+    manager.close()
+
+    assert os.listdir(leftovers) == ["done.pdf"]
+    assert os.listdir(running.folder) == ["big.zip.crdownload"]
+
+    os.rename(os.path.join(running.folder, "big.zip.crdownload"), os.path.join(running.folder, "big.zip"))
+    assert sweep_slots(str(downloads), str(leftovers)) == 0
+    assert sorted(os.listdir(leftovers)) == ["big.zip", "done.pdf"]
+    assert os.listdir(downloads) == []
@@ -0,0 +1,58 @@
+import os
+import sys
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import utils.driver_factory
+from utils.driver_factory import PROFILE_ENV_VAR, resolve_profile, site_entry, site_key
+
+
+def test_site_key_accepts_urls_hosts_and_names():
+    assert site_key("https://www.BidBuy.illinois.gov/bso/view/search") == "www.bidbuy.illinois.gov"
+    assert site_key("BuySpeed") == "buyspeed"
+    assert site_key(None) is None
+
+
+def test_site_entry_matches_subdomains_of_dotted_keys():
+    """A leading '.' matches the domain and every subdomain, the longest key wins"""
+    table = {
+        "www.example.gov": "exact",
+        ".example.gov": "domain",
+        ".bids.example.gov": "bids",
+    }
+    assert site_entry(table, "https://www.example.gov/search") == "exact"
+    assert site_entry(table, "https://example.gov/") == "domain"
+    assert site_entry(table, "https://portal.example.gov/") == "domain"
+    assert site_entry(table, "https://city.bids.example.gov/") == "bids"
+    assert site_entry(table, "https://notexample.gov/") is None
+    assert site_entry(table, None) is None
+
+
+def test_resolve_profile_order(monkeypatch):
+    """Argument, then $BIDS_CHROME_PROFILE, then SITE_PROFILES, then compat"""
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    monkeypatch.setattr(utils.driver_factory, "SITE_PROFILES", {".example.gov": "fast"})
+
+    assert resolve_profile(site="https://unlisted.org")["name"] == "compat"
+    assert resolve_profile(site="https://www.example.gov")["name"] == "fast"
+
+    monkeypatch.setenv(PROFILE_ENV_VAR, "balanced")
+    assert resolve_profile(site="https://www.example.gov")["name"] == "balanced"
+    assert resolve_profile("compat", site="https://www.example.gov")["name"] == "compat"
+
+    monkeypatch.setenv(PROFILE_ENV_VAR, "turbo")
+    assert resolve_profile()["name"] == "compat"
+
+
+def test_site_overrides_adjust_the_profile(monkeypatch):
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    monkeypatch.setattr(utils.driver_factory, "SITE_OVERRIDES", {".example.gov": {"headless": False}})
+
+    settings = resolve_profile("fast", site="https://www.example.gov")
+
+    assert settings["headless"] is False
+    assert settings["page_load_strategy"] == "eager"
+    assert settings["name"] == "fast+www.example.gov"
+    assert resolve_profile("fast", site="https://other.org")["headless"] is True
@@ -0,0 +1,76 @@
+import os
+import sys
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.driver_pool import DriverPool
+
+
+class FakeSwitch:
+    def window(self, handle):
+        pass
+
+
+class FakeDriver:
+    """Minimal stand-in for a Chrome WebDriver"""
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.switch_to = FakeSwitch()
+        self.current_url = "about:blank"
+        self.cdp_commands = []
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 1
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_commands.append(cmd)
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_reuses_warm_driver_and_isolates_sites():
+    """The same browser is reused, with cookies cleared when the site changes"""
+    pool = DriverPool(FakeDriver, size=1, prewarm=False)
+
+    first = pool.checkout("https://www.commbuys.com/bso/")
+    first.get("https://www.commbuys.com/bso/results")
+    pool.checkin(first)
+
+    second = pool.checkout("https://gvibuy.buyspeed.com/bso/")
+    assert second is first
+    assert "Network.clearBrowserCookies" in second.cdp_commands
+    assert "Storage.clearDataForOrigin" in second.cdp_commands
+    pool.checkin(second)
+
+    pool.close()
+    assert first.quit_called
+    assert pool.stats["created"] == 1 and pool.stats["reused"] == 1
+
+
+def test_recycles_after_max_uses_and_on_failure():
+    """Worn out or failed drivers are quit and replaced"""
+    pool = DriverPool(FakeDriver, size=1, max_uses=2, prewarm=False)
+
+    driver = pool.checkout("https://a.example.com")
+    pool.checkin(driver)
+    driver = pool.checkout("https://a.example.com")
+    pool.checkin(driver)
+    assert driver.quit_called
+
+    try:
+        with pool.driver("https://a.example.com") as broken:
+            raise RuntimeError("page crashed")
+    except RuntimeError:
+        pass
+    assert broken.quit_called and broken is not driver
+
+    pool.close()
+    assert pool.stats["recycled"] == 1
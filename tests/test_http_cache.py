@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.http_cache import CachingAdapter, HttpCache, is_cached
+
+BODY = b"%PDF attachment"
+
+
+class ValidatingHandler(BaseHTTPRequestHandler):
+    """Serves one attachment with an ETag and answers 304 when it matches"""
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.path == "/plain":
+            self.reply(200, b"no validators")
+        elif self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+        else:
+            self.reply(200, BODY, etag='"v1"')
+
+    def reply(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ValidatingHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HttpCache(folder=str(tmp_path), max_bytes=10_000)
+
+
+def test_store_needs_validators_and_dedupes_bodies(cache, tmp_path):
+    """Only validated responses are kept, and equal bodies are stored once"""
+    assert cache.store("https://a.example.com/1", {}, b"body") is None
+    first = cache.store("https://a.example.com/1", {"etag": '"x"'}, b"body")
+    second = cache.store("https://a.example.com/2", {"last-modified": "Mon, 19 Oct 2026 00:00:00 GMT"}, b"body")
+
+    assert first["digest"] == second["digest"]
+    assert len(list((tmp_path / "bodies").rglob("*"))) == 2  # One prefix folder, one body
+    assert cache.conditional_headers(cache.lookup("https://a.example.com/1")) == {"If-None-Match": '"x"'}
+    assert cache.read_body(cache.lookup("https://a.example.com/2")) == b"body"
+
+
+def test_eviction_drops_least_recently_used(cache):
+    """Going over the cap evicts the entries used longest ago"""
+    for n in range(4):
+        cache.store(f"https://a.example.com/{n}", {"etag": str(n)}, bytes([n]) * 900)
+        time.sleep(0.01)
+    cache.read_body(cache.lookup("https://a.example.com/0"))  # Used again, so kept
+
+    cache.max_bytes = 2000
+    cache.store("https://a.example.com/4", {"etag": "4"}, b"4" * 150)
+
+    kept = [n for n in range(5) if cache.lookup(f"https://a.example.com/{n}")]
+    assert kept == [0, 4]
+
+
+def test_adapter_serves_not_modified_from_cache(cache, server):
+    """The second GET sends the ETag, gets a 304 and returns the cached body"""
+    session = requests.Session()
+    session.mount("http://", CachingAdapter(cache, portal="test"))
+    url = f"http://127.0.0.1:{server.server_address[1]}/file.pdf"
+
+    first = session.get(url)
+    second = session.get(url, stream=True)
+
+    assert not is_cached(first) and first.content == BODY
+    assert is_cached(second) and second.status_code == 200
+    assert b"".join(second.iter_content(4)) == BODY
+    assert second.headers["Content-Type"] == "application/pdf"
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert cache.stats["test"] == {"requests": 2, "hits": 1, "bytes_saved": len(BODY)}
+    assert "test: 1/2 not modified (50%)" in cache.summary()
+
+
+def test_adapter_leaves_unvalidated_responses_alone(cache, server):
+    """Responses without ETag or Last-Modified are neither stored nor revalidated"""
+    session = requests.Session()
+    session.mount("http://", CachingAdapter(cache, portal="test"))
+    url = f"http://127.0.0.1:{server.server_address[1]}/plain"
+
+    session.get(url)
+    session.get(url)
+
+    assert cache.lookup(url) is None
+    assert "If-None-Match" not in server.requests[1]
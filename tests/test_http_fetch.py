@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("requests")
+pytest.importorskip("lxml")
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.http_cache import HttpCache, is_cached
+from utils.http_fetch import HttpFetcher
+
+
+class PortalHandler(BaseHTTPRequestHandler):
+    """Detail pages, a flaky page, a login redirect and an attachment"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.paths.append(self.path)
+        try:
+            time.sleep(0.05)
+            if self.path.startswith("/bid/"):
+                self.reply(200, f"<div class='esbd-result-cell'>{self.path[5:]}</div>")
+            elif self.path == "/flaky":
+                server.flaky_calls += 1
+                if server.flaky_calls == 1:
+                    self.reply(503, "busy")
+                else:
+                    self.reply(200, "<div class='esbd-result-cell'>ok</div>")
+            elif self.path == "/login":
+                self.reply(200, "<form id='login'></form>")
+            elif self.path == "/file.pdf":
+                self.reply(200, "%PDF", content_type="application/pdf")
+            elif self.path == "/etag":
+                if self.headers.get("If-None-Match") == '"e1"':
+                    self.send_response(304)
+                    self.end_headers()
+                else:
+                    self.reply(200, "<div class='esbd-result-cell'>cached</div>", etag='"e1"')
+            elif self.path == "/revised":
+                etag = f'"r{server.revision}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                else:
+                    self.reply(200, f"<div class='esbd-result-cell'>rev {server.revision}</div>", etag=etag)
+            elif self.path == "/cookie":
+                self.reply(200, f"<p>{self.headers.get('Cookie', '')}|{self.headers.get('User-Agent', '')}</p>")
+            else:
+                self.reply(404, "missing")
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def reply(self, status, body, content_type="text/html", etag=None):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeDriver:
+    """Browser holding a session cookie"""
+
+    def get_cookies(self):
+        return [{"name": "session", "value": "abc", "domain": "127.0.0.1", "path": "/"}]
+
+    def execute_script(self, script):
+        return "FakeBrowser/1.0"
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PortalHandler)
+    httpd.lock = threading.Lock()
+    httpd.active = httpd.max_active = httpd.flaky_calls = 0
+    httpd.revision = 1
+    httpd.paths = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def fetcher(server):
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    with HttpFetcher(base_url=base_url, concurrency=3, label="test") as fetcher:
+        yield fetcher
+
+
+def test_pages_are_fetched_in_order_with_bounded_concurrency(fetcher, server):
+    """Many pages go out together, but never more than the concurrency limit"""
+    urls = [f"/bid/{n}" for n in range(9)]
+    pages = fetcher.pages(urls, expect="//div[@class='esbd-result-cell']")
+
+    assert [page.text("//div") for page in pages] == [str(n) for n in range(9)]
+    assert 1 < server.max_active <= 3
+    assert pages[0].url.endswith("/bid/0")
+
+
+def test_unexpected_or_failed_pages_fall_back_to_the_browser(fetcher):
+    """A login page or a 404 comes back as None for the browser to load"""
+    pages = fetcher.pages(["/login", "/nowhere", "/bid/1"], expect="//div[@class='esbd-result-cell']")
+
+    assert [page is None for page in pages] == [True, True, False]
+    assert fetcher.fallbacks == 2
+    assert fetcher.failures == 1
+
+
+def test_busy_responses_are_retried(fetcher, server, monkeypatch):
+    """A 503 is retried before giving up"""
+    monkeypatch.setattr("utils.http_fetch.RETRY_DELAY", 0.01)
+    response = fetcher.fetch("/flaky")
+
+    assert response is not None and response.status_code == 200
+    assert server.flaky_calls == 2
+
+
+def test_download_all_saves_files(fetcher, tmp_path):
+    """Attachments are written to their paths; failures are reported per file"""
+    saved = fetcher.download_all([
+        ("/file.pdf", str(tmp_path / "a.pdf")),
+        ("/nowhere", str(tmp_path / "b.pdf")),
+    ])
+
+    assert saved == [True, False]
+    assert (tmp_path / "a.pdf").read_bytes() == b"%PDF"
+    assert not (tmp_path / "b.pdf").exists()
+    assert "2 requests, 1 failed" in fetcher.summary()
+
+
+def test_from_driver_carries_the_browser_session(server):
+    """Cookies and user agent of the browser are sent with every request"""
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    with HttpFetcher.from_driver(FakeDriver(), base_url=base_url) as fetcher:
+        response = fetcher.fetch("/cookie")
+
+    assert "session=abc|FakeBrowser/1.0" in response.text
+
+
+def test_cache_answers_not_modified_pages(server, tmp_path):
+    """With a cache, an unchanged page is revalidated and served from disk"""
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    cache = HttpCache(folder=str(tmp_path))
+    with HttpFetcher(base_url=base_url, label="test", cache=cache) as fetcher:
+        first = fetcher.fetch("/etag")
+        page = fetcher.pages(["/etag"], expect="//div")[0]
+
+    assert not is_cached(first)
+    assert page.text("//div") == "cached"
+    assert cache.stats["test"]["hits"] == 1
+
+
+def test_changed_pages_skips_unchanged_and_unknown_pages(server, tmp_path):
+    """Only pages fetched before are revalidated, and only changed ones are parsed"""
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    cache = HttpCache(folder=str(tmp_path))
+    with HttpFetcher(base_url=base_url, label="test", cache=cache) as fetcher:
+        fetcher.fetch_all(["/etag", "/revised"])
+        server.revision = 2
+        server.paths.clear()
+        changed = fetcher.changed_pages(["/etag", "/revised", "/bid/7"], expect="//div")
+
+    assert list(changed) == ["/revised"]
+    assert changed["/revised"].text("//div") == "rev 2"
+    assert sorted(server.paths) == ["/etag", "/revised"]
+    assert cache.stats["test"]["hits"] == 1
@@ -0,0 +1,96 @@
+import os
+import sys
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils import interventions
+from utils.interventions import InterventionQueue
+
+
+class FakeDriver:
+    """Driver that writes a dummy screenshot"""
+
+    current_url = "https://example.com/bid/1"
+
+    def save_screenshot(self, path):
+        with open(path, "wb") as f:
+            f.write(b"png")
+        return True
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return InterventionQueue(scraper="test_scraper", folder=str(tmp_path), timeout=60)
+
+
+def test_report_records_error_with_screenshot(queue, tmp_path):
+    """Reports capture the page and stay listed without expiring"""
+    item = queue.report("Something broke", FakeDriver())
+
+    assert item["kind"] == "error"
+    assert item["expires"] is None
+    assert item["url"] == FakeDriver.current_url
+    assert interventions.screenshot_file(item["id"], str(tmp_path))
+    assert [i["id"] for i in interventions.list_interventions(str(tmp_path))] == [item["id"]]
+    assert queue.pending_count == 0
+
+
+def test_parked_bid_is_ready_once_resolved(queue, tmp_path):
+    """A parked bid comes back from ready() after the operator resolves it"""
+    item = queue.park("Bid failed", bid="B-1", context={"retry": [1, "B-1"]})
+    assert queue.ready() == []
+    assert queue.pending_count == 1
+
+    interventions.resolve(item["id"], note="fixed", folder=str(tmp_path))
+    ready = queue.ready()
+
+    assert [i["context"]["retry"] for i in ready] == [[1, "B-1"]]
+    assert ready[0]["note"] == "fixed"
+    assert queue.pending_count == 0
+    assert interventions.list_interventions(str(tmp_path)) == []
+
+
+def test_skipped_and_expired_bids_are_dropped(queue, tmp_path):
+    """Skipped and timed out bids leave the queue without being retried"""
+    skipped = queue.park("Bid failed", bid="B-1")
+    expired = queue.park("Bid failed", bid="B-2", timeout=0)
+    interventions.resolve(skipped["id"], action=interventions.SKIPPED, folder=str(tmp_path))
+
+    assert queue.ready() == []
+    assert queue.pending_count == 0
+    closed = interventions.list_interventions(str(tmp_path), include_closed=True)
+    assert {i["id"]: i["status"] for i in closed} == {
+        skipped["id"]: interventions.SKIPPED,
+        expired["id"]: interventions.TIMED_OUT,
+    }
+
+
+def test_with_retries_yields_resolved_items_again(queue, tmp_path):
+    """Work parked during the first pass is yielded again once resolved"""
+    seen = []
+    for index, name in queue.with_retries(enumerate(["a", "b"], start=1), poll=0.01):
+        seen.append(name)
+        if name == "b" and seen.count("b") == 1:
+            item = queue.park("Bid failed", bid=name, context={"retry": [index, name]})
+            interventions.resolve(item["id"], folder=str(tmp_path))
+
+    assert seen == ["a", "b", "b"]
+
+
+def test_wait_returns_false_on_timeout(queue):
+    """A blocker nobody resolves times out instead of hanging the scraper"""
+    assert queue.wait("Solve the CAPTCHA", timeout=0.05, poll=0.01) is False
+
+
+def test_resolve_rejects_bad_input(tmp_path):
+    """Unknown ids, unsafe ids and unknown actions are refused"""
+    with pytest.raises(KeyError):
+        interventions.resolve("missing-1", folder=str(tmp_path))
+    with pytest.raises(ValueError):
+        interventions.resolve("../escape", folder=str(tmp_path))
+    with pytest.raises(ValueError):
+        interventions.resolve("missing-1", action="deleted", folder=str(tmp_path))
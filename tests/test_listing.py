@@ -0,0 +1,187 @@
+import os
+import sys
+from datetime import date, datetime
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+import utils.listing
+from utils.metrics import BIDS_SEEN, BIDS_SKIPPED, RunMetrics
+from utils.watermarks import Watermark
+from utils.listing import KEEP, TOO_NEW, TOO_OLD, UNDATED, DateWindow, iter_listing, parse_listing_date, sort_newest_first
+
+START = date(2026, 10, 17)
+
+
+def make_pages(*pages):
+    """read_page/next_page callables over fixed pages of posted dates"""
+    state = {"page": 0, "reads": 0}
+
+    def read_page():
+        state["reads"] += 1
+        return [{"posted": posted, "page": state["page"]} for posted in pages[state["page"]]]
+
+    def next_page():
+        if state["page"] + 1 >= len(pages):
+            return False
+        state["page"] += 1
+        return True
+
+    return read_page, next_page, state
+
+
+def test_parse_listing_date_formats():
+    """Listing cells in the portals' formats parse to dates"""
+    assert parse_listing_date("10/18/2026") == date(2026, 10, 18)
+    assert parse_listing_date("2026-10-18") == date(2026, 10, 18)
+    assert parse_listing_date(" 10/18/2026 3:00:00 PM ") == date(2026, 10, 18)
+    assert parse_listing_date("10/18/2026 3:00PM EDT") == date(2026, 10, 18)
+    assert parse_listing_date(datetime(2026, 10, 18, 9)) == date(2026, 10, 18)
+    assert parse_listing_date("") is None
+    assert parse_listing_date("soon") is None
+
+
+def test_window_classifies_rows():
+    """Rows are kept, too old, too new or undated"""
+    window = DateWindow(START, date(2026, 10, 18))
+    assert window.classify("10/17/2026") == KEEP
+    assert window.classify("10/16/2026") == TOO_OLD
+    assert window.classify("10/19/2026") == TOO_NEW
+    assert window.classify(None) == UNDATED
+    assert (window.rows, window.kept, window.too_old, window.too_new, window.undated) == (4, 1, 1, 1, 1)
+
+
+def test_datetime_cutoff_compares_midnight():
+    """A datetime start keeps the scrapers' posted >= now - days comparison"""
+    window = DateWindow(datetime(2026, 10, 17, 14, 30))
+    assert window.classify("2026-10-17") == TOO_OLD
+    assert window.classify("2026-10-18") == KEEP
+
+
+def test_sorted_listing_stops_at_first_old_row():
+    """Newest-first listings stop paginating at the first row before the window"""
+    read_page, next_page, state = make_pages(
+        ["10/19/2026", "10/18/2026"],
+        ["10/17/2026", "10/16/2026", "10/15/2026"],
+        ["10/14/2026"],
+    )
+    window = DateWindow(START, sorted_desc=True)
+    rows = list(iter_listing(window, read_page, next_page, lambda row: row["posted"]))
+
+    assert [row["posted"] for row in rows] == ["10/19/2026", "10/18/2026", "10/17/2026"]
+    assert state["reads"] == 2
+    assert window.stopped_early
+    assert window.avoided == 2
+
+
+def test_unsorted_listing_reads_every_page():
+    """Without a confirmed sort old rows are dropped but pagination continues"""
+    read_page, next_page, state = make_pages(["10/16/2026", "10/18/2026"], ["10/19/2026", None])
+    window = DateWindow(START)
+    rows = list(iter_listing(window, read_page, next_page, lambda row: row["posted"]))
+
+    assert [row["posted"] for row in rows] == ["10/18/2026", "10/19/2026", None]
+    assert state["reads"] == 2
+    assert not window.stopped_early
+    assert window.avoided == 1
+
+
+def test_out_of_order_listing_disables_early_stop():
+    """A newer row after an older one means the sort is not in effect"""
+    read_page, next_page, _ = make_pages(["10/18/2026", "10/19/2026", "10/10/2026", "10/18/2026"])
+    window = DateWindow(START, sorted_desc=True)
+    rows = list(iter_listing(window, read_page, next_page, lambda row: row["posted"]))
+
+    assert not window.sorted_desc
+    assert [row["posted"] for row in rows] == ["10/18/2026", "10/19/2026", "10/18/2026"]
+
+
+def test_max_pages_limits_pagination():
+    read_page, next_page, state = make_pages(["10/18/2026"], ["10/18/2026"], ["10/18/2026"])
+    window = DateWindow(START)
+    assert len(list(iter_listing(window, read_page, next_page, lambda row: row["posted"], max_pages=2))) == 2
+    assert state["reads"] == 2
+
+
+def test_page_limit_holds_the_watermark(tmp_path):
+    """Rows past max_pages are not marked as scraped by the next save"""
+    pages = (["10/19/2026", "10/18/2026"], ["10/18/2026", "10/17/2026"])
+
+    read_page, next_page, _ = make_pages(*pages)
+    watermark = Watermark("sorted", folder=str(tmp_path))
+    window = DateWindow(START, sorted_desc=True, watermark=watermark)
+    rows = list(iter_listing(window, read_page, next_page, lambda row: row["posted"], max_pages=1))
+    for index, row in enumerate(rows):
+        watermark.advance(row["posted"], index)
+    watermark.save()
+
+    assert window.cut_off and not window.stopped_early
+    assert watermark.date == date(2026, 10, 18)
+    assert not watermark.covers("10/18/2026", "unread")
+
+    read_page, next_page, _ = make_pages(*pages)
+    watermark = Watermark("unsorted", folder=str(tmp_path))
+    window = DateWindow(START, watermark=watermark)
+    for index, row in enumerate(iter_listing(window, read_page, next_page, lambda row: row["posted"], max_pages=1)):
+        watermark.advance(row["posted"], index)
+    watermark.save()
+
+    assert watermark.date is None
+
+
+def test_max_pages_counts_each_batch():
+    """A window reused for several batches reads max_pages pages in each"""
+    read_page, next_page, state = make_pages(*[["10/18/2026"]] * 6)
+    window = DateWindow(START)
+    for _ in range(2):
+        assert len(list(iter_listing(window, read_page, next_page, lambda row: row["posted"], max_pages=3))) == 3
+    assert state["reads"] == 6
+    assert window.pages == 6
+
+
+def test_reused_window_counts_each_row_once(monkeypatch):
+    """Run metrics get each call's rows, not the window's running totals"""
+    metrics = RunMetrics("test")
+    monkeypatch.setattr(utils.listing, "get_metrics", lambda: metrics)
+    read_page, next_page, _ = make_pages(["10/18/2026", "10/10/2026"])
+    window = DateWindow(START)
+    for _ in range(2):
+        list(iter_listing(window, read_page, next_page, lambda row: row["posted"]))
+
+    assert window.rows == 4
+    assert metrics.counters == {BIDS_SEEN: 4, BIDS_SKIPPED: 2}
+
+
+class FakeDriver:
+    """Grid whose date column flips order each time the header is clicked"""
+
+    def __init__(self, dates):
+        self.dates = list(dates)
+        self.clicks = 0
+
+    def find_elements(self, by, value):
+        return ["header"]
+
+    def execute_script(self, script, *args):
+        if args:
+            self.clicks += 1
+            self.dates.reverse()
+        return 10_000  # DOM idle for dom_quiet
+
+
+def test_sort_newest_first_confirms_from_dates():
+    """The header is clicked until the dates on the page run newest first"""
+    driver = FakeDriver(["10/15/2026", "10/17/2026", "10/18/2026"])
+    assert sort_newest_first(driver, "//th", lambda: driver.dates)
+    assert driver.clicks == 1
+
+    already = FakeDriver(["10/18/2026", "10/15/2026"])
+    assert sort_newest_first(already, "//th", lambda: already.dates)
+    assert already.clicks == 0
+
+
+def test_sort_newest_first_gives_up_when_unsure():
+    """Identical dates cannot confirm an order"""
+    driver = FakeDriver(["10/18/2026", "10/18/2026"])
+    assert not sort_newest_first(driver, "//th", lambda: driver.dates)
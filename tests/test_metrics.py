@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import time
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.metrics import (
+    BIDS_SAVED,
+    DETAIL,
+    EXCEL,
+    LISTING,
+    ROUND_TRIPS,
+    RUN_METRICS_FILE,
+    RunMetrics,
+    collect_run_metrics,
+    instrument_driver,
+)
+
+
+class FakeDriver:
+    """WebDriver whose commands just return their name"""
+
+    def execute(self, command, params=None):
+        return command
+
+
+def test_spans_add_up_per_phase():
+    """Repeated spans of a phase sum their time and count their calls"""
+    metrics = RunMetrics("03_TXSMartBuy")
+    for _ in range(3):
+        with metrics.span(DETAIL):
+            time.sleep(0.01)
+    with pytest.raises(ValueError):
+        with metrics.span(EXCEL):
+            raise ValueError("locked workbook")
+    metrics.count(BIDS_SAVED, 2)
+
+    data = metrics.to_dict()
+    assert data["phases"][DETAIL]["calls"] == 3
+    assert data["phases"][DETAIL]["seconds"] >= 0.03
+    assert data["phases"][EXCEL]["calls"] == 1  # Failed blocks are still timed
+    assert data["counters"] == {BIDS_SAVED: 2}
+    assert "2 bids saved" in metrics.summary()
+
+
+def test_metrics_are_written_next_to_the_scraper_folder(tmp_path):
+    """The file lands in the date folder, beside the _COMPLETED folder"""
+    metrics = RunMetrics("20_County_of_San_Diego")
+    metrics.set_folder(str(tmp_path / "20_County_of_San_Diego_IN_PROGRESS"))
+    metrics.finish()
+
+    path = tmp_path / "20_County_of_San_Diego_metrics.json"
+    assert json.loads(path.read_text())["scraper"] == "20_County_of_San_Diego"
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+
+
+def test_collect_run_metrics_reports_the_slowest_phase(tmp_path):
+    """The orchestrator gathers every scraper's file into run_metrics.json"""
+    for scraper, phases in [("03_TXSMartBuy", {LISTING: 5, DETAIL: 40}), ("14_NC", {LISTING: 12})]:
+        metrics = RunMetrics(scraper, folder=str(tmp_path))
+        for phase, seconds in phases.items():
+            metrics.add_time(phase, seconds)
+        metrics.write()
+    (tmp_path / "broken_metrics.json").write_text("{")
+
+    run = collect_run_metrics(str(tmp_path))
+
+    assert sorted(run["scrapers"]) == ["03_TXSMartBuy", "14_NC"]
+    assert run["slowest"] == {"03_TXSMartBuy": [DETAIL, 40], "14_NC": [LISTING, 12]}
+    assert json.loads((tmp_path / RUN_METRICS_FILE).read_text()) == run
+
+
+def test_instrumented_driver_counts_round_trips():
+    """Every WebDriver command counts as a browser round trip"""
+    metrics = RunMetrics("test")
+    driver = instrument_driver(FakeDriver(), metrics)
+
+    assert driver.execute("get", {"url": "https://example.com"}) == "get"
+    driver.execute("findElement")
+
+    assert metrics.counters[ROUND_TRIPS] == 2
+
+
+def test_folder_comes_from_the_master_script(tmp_path, monkeypatch):
+    """Without a folder from the master script or set_folder nothing is written"""
+    monkeypatch.delenv("BIDS_METRICS_DIR", raising=False)
+    metrics = RunMetrics("pytest")
+    metrics.count(ROUND_TRIPS, 5)
+    assert metrics.path is None
+    metrics.finish()
+
+    monkeypatch.setenv("BIDS_METRICS_DIR", str(tmp_path))
+    metrics.finish()
+    assert json.loads((tmp_path / "pytest_metrics.json").read_text())["counters"] == {ROUND_TRIPS: 5}
@@ -0,0 +1,109 @@
+import os
+import sys
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+pytest.importorskip("lxml")
+
+from utils.page_parser import ParsedPage, benchmark_parsers, block_text, compile_xpath, cut_region, has_class
+
+PAGE = """
+<html><head><title>Notice</title></head><body>
+  <div class="header nav"><a href="/home">Home</a></div>
+  <div class="esbd-result-title"><a href="/esbd/101">RFP-101 Road resurfacing</a></div>
+  <div class="esbd-result-title"><a href="/esbd/102">RFP-102 Janitorial</a></div>
+  <div class="esbd-result-body-columns">
+    <p><strong>Status:</strong> Posted</p>
+  </div>
+  <div data-if-label="descriptiondetails">
+    Line one
+    <br>Line two
+  </div>
+  <div class="footer">Footer</div>
+</body></html>
+"""
+
+TITLE_LINKS = f"//div[{has_class('esbd-result-title')}]/a"
+
+
+def test_has_class_matches_whole_class_names():
+    """has_class matches one entry of the class list, not a substring"""
+    page = ParsedPage(PAGE)
+    assert len(page.select(f"//div[{has_class('nav')}]")) == 1
+    assert page.select(f"//div[{has_class('esbd-result')}]") == []
+
+
+def test_compile_xpath_is_cached():
+    """The same expression compiles to the same XPath object"""
+    assert compile_xpath(TITLE_LINKS) is compile_xpath(TITLE_LINKS)
+
+
+def test_text_and_attr_defaults():
+    """text/attr read the first match and fall back to the default"""
+    page = ParsedPage(PAGE, url="https://example.com/esbd")
+    assert page.text(TITLE_LINKS) == "RFP-101 Road resurfacing"
+    assert page.attr(TITLE_LINKS, "href") == "/esbd/101"
+    assert page.text("//h1", default="n/a") == "n/a"
+    assert page.attr("//h1", "id") is None
+    assert not page.exists("//h1")
+
+
+def test_context_selects_relative_to_node():
+    """A context node scopes relative selectors"""
+    page = ParsedPage(PAGE)
+    body = page.select_one(f"//div[{has_class('esbd-result-body-columns')}]")
+    assert page.text(".//p", context=body) == "Status: Posted"
+
+
+def test_block_text_keeps_lines():
+    """block_text keeps one line per text node"""
+    page = ParsedPage(PAGE)
+    assert block_text(page.select_one("//div[@data-if-label='descriptiondetails']")) == "Line one\nLine two"
+    assert block_text(None) == ""
+
+
+def test_region_parse_matches_full_parse():
+    """Parsing only the results region finds the same links"""
+    full = ParsedPage(PAGE)
+    region = ParsedPage(PAGE, region=("esbd-result-title", "esbd-result-body-columns"))
+    assert region.partial
+    assert [a.get("href") for a in region.select(TITLE_LINKS)] == [a.get("href") for a in full.select(TITLE_LINKS)]
+    assert not region.exists(f"//div[{has_class('footer')}]")
+
+
+def test_region_falls_back_to_whole_page():
+    """A missing start marker parses the whole document"""
+    assert cut_region(PAGE, ("no-such-marker", None)) is None
+    page = ParsedPage(PAGE, region=("no-such-marker", None))
+    assert not page.partial
+    assert page.exists(f"//div[{has_class('footer')}]")
+
+
+def test_from_driver_saves_fixture(tmp_path, monkeypatch):
+    """With BIDS_SAVE_FIXTURES set the snapshot is written under the fixture name"""
+    import utils.page_parser as page_parser
+
+    class FakeDriver:
+        page_source = PAGE
+        current_url = "https://example.com/esbd"
+
+    monkeypatch.setattr(page_parser, "FIXTURE_DIR", str(tmp_path))
+    monkeypatch.setenv(page_parser.FIXTURE_ENV_VAR, "1")
+    page = ParsedPage.from_driver(FakeDriver(), fixture="03_TXSMartBuy/listing")
+
+    assert page.url == "https://example.com/esbd"
+    assert (tmp_path / "03_TXSMartBuy" / "listing.html").read_text(encoding="utf-8") == PAGE
+
+
+def test_benchmark_parsers_reports_each_method(tmp_path):
+    """The benchmark times full lxml and region parses of a saved page"""
+    path = tmp_path / "page.html"
+    path.write_text(PAGE, encoding="utf-8")
+    rows = benchmark_parsers(str(path), repeats=2, region=("esbd-result-title", None))
+    methods = {row["method"] for row in rows}
+    assert {"lxml", "lxml-region"} <= methods
+    assert all(row["ms"] >= 0 for row in rows)
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import threading
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.rate_limit import RateLimiter, host_of, parse_rates
+
+
+def test_burst_then_steady_rate(tmp_path):
+    """A full bucket lets the burst through, then requests are spaced by the rate"""
+    limiter = RateLimiter(path=str(tmp_path / "buckets.sqlite"), rates={"portal.example.gov": (600, 2)})
+
+    delays = [limiter.reserve("portal.example.gov") for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert 0.05 < delays[2] <= 0.1
+    assert 0.15 < delays[3] <= 0.2
+
+
+def test_processes_share_the_bucket(tmp_path):
+    """Limiters opening the same state file draw from one bucket per host"""
+    path = str(tmp_path / "buckets.sqlite")
+    first = RateLimiter(path=path, rates={"portal.example.gov": (600, 1)})
+    second = RateLimiter(path=path, rates={"portal.example.gov": (600, 1)})
+
+    assert first.reserve("portal.example.gov") == 0.0
+    assert second.reserve("portal.example.gov") > 0.05
+    assert second.reserve("other.example.gov") == 0.0
+
+
+def test_concurrent_acquires_are_spaced(tmp_path):
+    """Threads acquiring together leave one rate interval between requests"""
+    limiter = RateLimiter(path=str(tmp_path / "buckets.sqlite"), rates={"portal.example.gov": (1200, 1)})
+    finished = []
+
+    def worker():
+        limiter.acquire("https://portal.example.gov/bids")
+        finished.append(time.monotonic())
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(finished) - started >= 0.19  # Four waits of 50ms
+    assert limiter.stats["portal.example.gov"]["requests"] == 5
+    assert "portal.example.gov: 5 requests" in limiter.summary()
+
+
+def test_rates_match_subdomains_and_env_overrides(tmp_path, monkeypatch):
+    """Dotted keys cover subdomains; $BIDS_RATE_LIMITS wins over code"""
+    monkeypatch.setenv("BIDS_RATE_LIMITS", "mtc.bonfirehub.com=6/2, broken")
+    limiter = RateLimiter(path=str(tmp_path / "buckets.sqlite"))
+    limiter.configure("mtc.bonfirehub.com", 100)
+
+    assert limiter.rate_for("aps.bonfirehub.com") == (12.0, 1)
+    assert limiter.rate_for("mtc.bonfirehub.com") == (6.0, 2)
+    assert limiter.rate_for("unknown.example.com") == limiter.default
+    assert parse_rates("a.gov=30") == {"a.gov": (30.0, 1)}
+    assert host_of("https://WWW.BidNetDirect.com:443/private") == "www.bidnetdirect.com"
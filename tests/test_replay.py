@@ -0,0 +1,160 @@
+import os
+import ssl
+import sys
+import shutil
+import threading
+import http.client
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.replay import RECORD, REPLAY, Recording, ReplayProxy, load_runs, run_command
+
+
+class PortalHandler(BaseHTTPRequestHandler):
+    """Listing pages that change on every request, and a postback form"""
+
+    def do_GET(self):
+        self.server.count += 1
+        self.reply(f"{self.path} #{self.server.count}".encode())
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.reply(b"posted " + body)
+
+    def reply(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def portal():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PortalHandler)
+    httpd.count = 0
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def through(proxy, url, data=None):
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({"http": proxy.url}))
+    with opener.open(url, data=data, timeout=10) as response:
+        return response.read()
+
+
+def test_lookup_serves_recorded_responses_in_order(tmp_path):
+    """Repeated requests get their recorded responses in turn, then the last one again"""
+    recording = Recording(str(tmp_path / "site"))
+    recording.add("GET", "https://a.example.com/list", None, 200, [("Content-Type", "text/html")], b"page 1")
+    recording.add("GET", "https://a.example.com/list", None, 200, [], b"page 2")
+    recording.add("POST", "https://a.example.com/list", b"page=3", 200, [], b"page 3")
+
+    reloaded = Recording(str(tmp_path / "site"))
+    served = [reloaded.body(reloaded.lookup("GET", "https://a.example.com/list")) for _ in range(3)]
+
+    assert served == [b"page 1", b"page 2", b"page 2"]
+    assert reloaded.body(reloaded.lookup("POST", "https://a.example.com/list", b"page=3")) == b"page 3"
+    assert reloaded.lookup("POST", "https://a.example.com/list", b"page=4") is None
+    assert reloaded.misses == ["POST https://a.example.com/list"]
+
+
+def test_har_round_trip(tmp_path):
+    """Recordings export to HAR and import back with the same bodies"""
+    recording = Recording(str(tmp_path / "site"))
+    recording.add("GET", "https://a.example.com/file.pdf", None, 200, [("Content-Type", "application/pdf")], b"%PDF\x00")
+    assert recording.export_har(str(tmp_path / "site.har")) == 1
+
+    imported = Recording(str(tmp_path / "copy"))
+    assert imported.import_har(str(tmp_path / "site.har")) == 1
+    exchange = imported.lookup("GET", "https://a.example.com/file.pdf")
+    assert imported.body(exchange) == b"%PDF\x00"
+    assert ["Content-Type", "application/pdf"] in exchange["headers"]
+
+
+def test_recorded_run_replays_without_the_portal(tmp_path, portal):
+    """What a run fetched through the recording proxy is served again offline"""
+    recording = Recording(str(tmp_path / "site"))
+    with ReplayProxy(recording, RECORD) as proxy:
+        recorded = [through(proxy, portal + "/list"), through(proxy, portal + "/list"),
+                    through(proxy, portal + "/form", data=b"q=1")]
+
+    with ReplayProxy(Recording(str(tmp_path / "site")), REPLAY) as proxy:
+        replayed = [through(proxy, portal + "/list"), through(proxy, portal + "/list"),
+                    through(proxy, portal + "/form", data=b"q=1")]
+        with pytest.raises(urllib.error.HTTPError):
+            through(proxy, portal + "/never-seen")
+
+    assert recorded == [b"/list #1", b"/list #2", b"posted q=1"]
+    assert replayed == recorded
+    assert proxy.recording.misses == [f"GET {portal}/never-seen"]
+
+
+FETCH_SCRIPT = """
+import os, sys, http.client
+from urllib.parse import urlsplit
+proxy = urlsplit(os.environ["BIDS_REPLAY_PROXY"])
+connection = http.client.HTTPConnection(proxy.hostname, proxy.port, timeout=10)
+connection.request("GET", sys.argv[1])
+print(connection.getresponse().read().decode())
+"""
+
+
+def test_recording_again_replaces_the_capture(tmp_path, portal, capfd):
+    """A second record run under the same name is what replay serves"""
+    command = [sys.executable, "-c", FETCH_SCRIPT, portal + "/list"]
+    for mode in (RECORD, RECORD, REPLAY):
+        assert run_command("site", mode, command, folder=str(tmp_path))["exit_code"] == 0
+
+    assert capfd.readouterr().out.split() == ["/list", "#1", "/list", "#2", "/list", "#2"]
+    assert len(Recording(str(tmp_path / "site")).exchanges) == 1
+    assert len([name for name in os.listdir(tmp_path / "site") if name.startswith("exchanges-")]) == 1
+    assert [run["mode"] for run in load_runs("site", folder=str(tmp_path))] == [RECORD, RECORD, REPLAY]
+
+    run_command("site", RECORD, command, folder=str(tmp_path), append=True)
+    assert len(Recording(str(tmp_path / "site")).exchanges) == 2
+
+
+def test_environment_keeps_loopback_off_the_proxy(tmp_path, monkeypatch):
+    """Selenium's chromedriver commands bypass the proxy; existing NO_PROXY entries stay"""
+    monkeypatch.setenv("NO_PROXY", "intranet.example.gov,localhost")
+    recording = Recording(str(tmp_path / "site"))
+
+    with ReplayProxy(recording, REPLAY, ca_folder=str(tmp_path / "ca")) as proxy:
+        env = proxy.environment()
+
+    assert env["NO_PROXY"] == "intranet.example.gov,localhost,127.0.0.1,::1"
+    assert env["no_proxy"] == env["NO_PROXY"]
+    assert env["HTTPS_PROXY"] == proxy.url
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="openssl is needed for HTTPS interception")
+def test_https_is_replayed_with_a_trusted_local_certificate(tmp_path):
+    """Clients that trust the replay CA get recorded HTTPS responses"""
+    recording = Recording(str(tmp_path / "site"))
+    recording.add("GET", "https://portal.example.gov/bids", None, 200, [("Content-Type", "text/html")], b"bids")
+
+    with ReplayProxy(recording, REPLAY, ca_folder=str(tmp_path / "ca")) as proxy:
+        ca_cert = proxy.environment()["REQUESTS_CA_BUNDLE"]
+        connection = http.client.HTTPSConnection(
+            "127.0.0.1", proxy.server.server_address[1], timeout=10,
+            context=ssl.create_default_context(cafile=ca_cert),
+        )
+        connection.set_tunnel("portal.example.gov", 443)
+        connection.request("GET", "/bids")
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+
+    assert (response.status, body) == (200, b"bids")
@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import threading
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.scheduler import DONE, SKIPPED, Scheduler
+
+
+class FakeScripts:
+    """Runner that sleeps per script and records the start order"""
+
+    def __init__(self, seconds, fail=()):
+        self.seconds = seconds
+        self.fail = set(fail)
+        self.started = []
+        self.lock = threading.Lock()
+
+    def __call__(self, name):
+        with self.lock:
+            self.started.append(name)
+        time.sleep(self.seconds.get(name, 0.01))
+        if name in self.fail:
+            raise RuntimeError("browser crashed")
+        return True
+
+
+def test_freed_slot_starts_the_next_script_at_once():
+    """A long script does not hold back the short ones queued behind it"""
+    seconds = {"slow": 0.4, "a": 0.1, "b": 0.1, "c": 0.1, "d": 0.1}
+    runner = FakeScripts(seconds)
+    scheduler = Scheduler(2, runner, poll=0.05)
+    for name in seconds:
+        scheduler.add(name)
+
+    started = time.monotonic()
+    report = scheduler.run()
+
+    # Batches of two would take 0.4 + 0.1 + 0.1
+    assert time.monotonic() - started < 0.55
+    assert report["per_slot"][1]["jobs"] == ["slow"]
+    assert report["per_slot"][2]["jobs"] == ["a", "b", "c", "d"]
+    assert report["utilization"] > 0.9
+
+
+def test_priorities_and_dependencies_order_the_starts():
+    """Higher priority starts first; dependents wait for their jobs, even failed ones"""
+    runner = FakeScripts({}, fail=["login"])
+    scheduler = Scheduler(1, runner, poll=0.05)
+    scheduler.add("report", after=["login"])
+    scheduler.add("login")
+    scheduler.add("bidnet", priority=5)
+
+    report = scheduler.run()
+
+    assert runner.started == ["bidnet", "login", "report"]
+    assert report["jobs"]["login"]["ok"] is False
+    assert report["jobs"]["report"]["state"] == DONE
+
+
+def test_waits_for_required_files(tmp_path):
+    """A job starts once its file appears and is skipped if nothing can make it"""
+    progress_file = tmp_path / "scraping_progress.json"
+
+    def runner(name):
+        if name == "writer":
+            time.sleep(0.1)
+            progress_file.write_text("{}")
+        return True
+
+    scheduler = Scheduler(2, runner, poll=0.02)
+    scheduler.add("resume", requires=[str(progress_file)])
+    scheduler.add("writer")
+    scheduler.add("never", requires=[str(tmp_path / "missing.json")])
+    scheduler.add("cycle", after=["cycle"])
+
+    report = scheduler.run()
+
+    assert report["jobs"]["resume"]["state"] == DONE
+    assert report["jobs"]["never"]["state"] == SKIPPED
+    assert "missing.json" in report["jobs"]["never"]["reason"]
+    assert report["jobs"]["cycle"]["state"] == SKIPPED
+    assert "2 skipped" in scheduler.summary()
+
+
+def test_stop_skips_queued_scripts():
+    """After stop() the running script finishes and nothing new starts"""
+    runner = FakeScripts({"first": 0.2})
+    scheduler = Scheduler(1, runner, poll=0.05)
+    for name in ["first", "second", "third"]:
+        scheduler.add(name)
+
+    threading.Timer(0.05, scheduler.stop).start()
+    report = scheduler.run()
+
+    assert runner.started == ["first"]
+    assert report["jobs"]["second"]["reason"] == "stopped"
@@ -0,0 +1,119 @@
+import os
+import sys
+import time
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.sessions import SessionVault, session_key
+
+
+class FakeDriver:
+    """Browser with a cookie jar and local storage for the loaded origin"""
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.cookies = []
+        self.storage = {}
+
+    def get(self, url):
+        self.current_url = url
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        if args:
+            self.storage.update(args[0])
+            return len(args[0])
+        return {"origin": "https://portal.example.com", "items": dict(self.storage)}
+
+
+def fake_login(driver):
+    driver.cookies = [
+        {"name": "session", "value": "abc", "domain": ".example.com"},
+        {"name": "idp", "value": "xyz", "domain": "idp.other.com"},
+    ]
+    driver.storage = {"token": "t1"}
+    return True
+
+
+def has_session(driver):
+    return any(cookie["name"] == "session" for cookie in driver.cookies)
+
+
+@pytest.fixture
+def vault(tmp_path):
+    return SessionVault(folder=str(tmp_path))
+
+
+def test_ensure_logs_in_once_then_reuses_session(vault, tmp_path):
+    """The first browser logs in; the next one restores the saved session"""
+    logins = []
+
+    def login(driver):
+        logins.append(driver)
+        return fake_login(driver)
+
+    assert vault.ensure(FakeDriver(), "portal", "me@example.com", "https://portal.example.com/", has_session, login)
+
+    second = FakeDriver()
+    assert vault.ensure(second, "portal", "me@example.com", "https://portal.example.com/", has_session, login)
+
+    assert len(logins) == 1
+    assert [c["name"] for c in second.cookies] == ["session"]  # Other domains are left out
+    assert second.storage == {"token": "t1"}
+    assert vault.stats["portal"] == {"skipped": 1, "performed": 1, "failed": 0}
+    assert "1 logins skipped, 1 performed" in vault.summary()
+
+
+def test_sessions_are_kept_per_account_and_shared_between_vaults(vault, tmp_path):
+    """Another process with its own vault picks up the session for the same account only"""
+    vault.ensure(FakeDriver(), "portal", "me@example.com", "https://portal.example.com/", has_session, fake_login)
+    other = SessionVault(folder=str(tmp_path))
+
+    assert other.load("portal", "me@example.com") is not None
+    assert other.load("portal", "someone@example.com") is None
+    assert "me@example.com" not in session_key("portal", "me@example.com")
+
+
+def test_expired_or_rejected_session_falls_back_to_login(vault):
+    """A session that expired or fails the probe is replaced by a fresh login"""
+    vault.ensure(FakeDriver(), "portal", "me", "https://portal.example.com/", has_session, fake_login)
+    record = vault.load("portal", "me")
+    record_path = os.path.join(vault.folder, record["key"] + ".json")
+
+    vault.max_age = 0
+    vault.save(FakeDriver(), "portal", "me")
+    time.sleep(0.01)
+    assert vault.load("portal", "me") is None
+
+    vault.max_age = 3600
+    vault.ensure(FakeDriver(), "portal", "me", "https://portal.example.com/", lambda d: False, fake_login)
+    assert vault.stats["portal"]["performed"] == 2
+    assert os.path.exists(record_path)
+
+
+def test_failed_login_is_counted_and_not_saved(vault):
+    """A failed login returns False and leaves no session behind"""
+    assert not vault.ensure(FakeDriver(), "portal", "me", "https://portal.example.com/", has_session, lambda d: False)
+    assert vault.load("portal", "me") is None
+    assert vault.stats["portal"]["failed"] == 1
+
+
+def test_stale_login_lock_is_taken_over(vault):
+    """A lock left by a crashed process does not block the login forever"""
+    os.makedirs(vault.folder, exist_ok=True)
+    lock_path = os.path.join(vault.folder, session_key("portal", "me") + ".lock")
+    with open(lock_path, "w") as f:
+        f.write("12345")
+
+    with vault.login_lock("portal", "me", timeout=0.2):
+        assert os.path.exists(lock_path)
+    assert not os.path.exists(lock_path)
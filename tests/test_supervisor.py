@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import time
+import textwrap
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.supervisor import Supervisor, classify_line
+
+
+def write_script(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text(textwrap.dedent(body), encoding="utf-8")
+    return str(path)
+
+
+def read_events(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_output_is_logged_with_levels_and_exit_code(tmp_path):
+    """Both streams reach the text log and the events file; the exit code is kept"""
+    script = write_script(tmp_path, "scraper.py", """
+        import sys
+        print("Processing bid 1 ✓")
+        print("ERROR: detail page failed", file=sys.stderr)
+        print("WARNING slow portal")
+        sys.exit(3)
+    """)
+    seen = []
+    supervisor = Supervisor(
+        events_file=str(tmp_path / "events.jsonl"),
+        on_line=lambda script, stream, level, line: seen.append((stream, level)),
+    )
+    try:
+        result = supervisor.run_sync(script, ["--days", "2"], log_file=str(tmp_path / "scraper.log"))
+    finally:
+        supervisor.close()
+
+    assert (result.returncode, result.ok, result.lines, result.errors) == (3, False, 3, 1)
+    assert sorted(seen) == [("stderr", "error"), ("stdout", "success"), ("stdout", "warning")]
+    log = (tmp_path / "scraper.log").read_text(encoding="utf-8")
+    assert "] Processing bid 1 ✓" in log and "] ERROR: detail page failed" in log
+    events = read_events(tmp_path / "events.jsonl")
+    assert events[0]["event"] == "start" and events[0]["args"] == ["--days", "2"]
+    assert events[-1]["event"] == "exit" and events[-1]["returncode"] == 3
+
+
+def test_timeout_stops_the_scraper(tmp_path):
+    """A scraper running past its timeout is stopped and reported as timed out"""
+    script = write_script(tmp_path, "hangs.py", """
+        import time
+        print("started", flush=True)
+        time.sleep(60)
+    """)
+    supervisor = Supervisor(events_file=str(tmp_path / "events.jsonl"))
+    started = time.monotonic()
+    try:
+        result = supervisor.run_sync(script, timeout=1)
+    finally:
+        supervisor.close()
+
+    assert result.timed_out and not result.ok
+    assert time.monotonic() - started < 15
+    assert [e["event"] for e in read_events(tmp_path / "events.jsonl")] == ["start", "line", "timeout", "exit"]
+
+
+def test_successful_run(tmp_path):
+    """A clean exit is ok and leaves no running processes behind"""
+    script = write_script(tmp_path, "ok.py", "print('done')\n")
+    supervisor = Supervisor()
+    try:
+        result = supervisor.run_sync(script)
+        assert result.ok and result.last_line == "done"
+        assert supervisor.running() == []
+    finally:
+        supervisor.close()
+
+
+def test_classify_line():
+    """Lines get the levels the old console coloring gave them"""
+    assert classify_line("Traceback (most recent call last):") == "error"
+    assert classify_line("Upload FAILED for folder") == "error"
+    assert classify_line("WARNING: retrying") == "warning"
+    assert classify_line("Folder renamed to 03_TXSMartBuy_COMPLETED") == "success"
+    assert classify_line("Processing bid 3/30") == "info"
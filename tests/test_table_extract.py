@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.table_extract import normalize_columns, parse_rows
+
+LISTING = """
+<table id="results"><tbody>
+  <tr rowattribute="101">
+    <td>10/17/2026</td>
+    <td><a href="/bid/101">RFP-101</a></td>
+    <td>  Road
+        resurfacing  </td>
+  </tr>
+  <tr rowattribute="102">
+    <td>10/18/2026</td>
+    <td>RFP-102</td>
+    <td>Janitorial services</td>
+  </tr>
+</tbody></table>
+"""
+
+COLUMNS = {
+    "posted_date": "./td[1]",
+    "url": ("./td[2]/a", "href"),
+    "title": "./td[3]",
+    "row_id": (".", "rowattribute"),
+}
+
+
+def test_normalize_columns_defaults_to_text():
+    """Plain XPaths read text, tuples read the named attribute"""
+    assert normalize_columns(COLUMNS) == [
+        ["posted_date", "./td[1]", "text"],
+        ["url", "./td[2]/a", "href"],
+        ["title", "./td[3]", "text"],
+        ["row_id", ".", "rowattribute"],
+    ]
+
+
+def test_parse_rows_reads_whole_table():
+    """Rows come back in order with collapsed text, absolute links and None for missing cells"""
+    pytest.importorskip("lxml")
+    rows = parse_rows(
+        LISTING, "//table[@id='results']/tbody/tr", COLUMNS, base_url="https://bids.example.gov/search"
+    )
+
+    assert rows == [
+        {
+            "posted_date": "10/17/2026",
+            "url": "https://bids.example.gov/bid/101",
+            "title": "Road resurfacing",
+            "row_id": "101",
+        },
+        {
+            "posted_date": "10/18/2026",
+            "url": None,
+            "title": "Janitorial services",
+            "row_id": "102",
+        },
+    ]
@@ -0,0 +1,148 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils import waits
+
+
+@pytest.fixture(autouse=True)
+def scraper_stats():
+    waits.reset_stats()
+    waits.set_scraper("test_scraper")
+    yield
+    waits.reset_stats()
+
+
+def network_event(method, request_id):
+    return {"message": json.dumps({"message": {"method": method, "params": {"requestId": request_id}}})}
+
+
+class FakeDriver:
+    """Driver whose page activity and performance log are scripted per poll"""
+
+    def __init__(self, log_batches=None, activity=None):
+        self.log_batches = list(log_batches or [])
+        self.activity = activity or {"ready": "complete", "pending": 0, "resources": 3}
+        self.scripts = 0
+
+    def get_log(self, log_type):
+        if self.log_batches is None:
+            raise Exception("log type 'performance' not found")
+        return self.log_batches.pop(0) if self.log_batches else []
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        return self.activity
+
+
+def test_wait_until_returns_result_and_records_saving():
+    """A condition met straight away saves nearly all of the replaced sleep"""
+    assert waits.wait_until(lambda: "done", replaces=10, label="quick") == "done"
+    stats = waits.summary()["test_scraper"]
+    assert stats["waits"] == 1
+    assert stats["replaced"] == 10
+    assert stats["avoided"] > 9.5
+    assert stats["labels"]["quick"]["waits"] == 1
+
+
+def test_wait_until_times_out_without_raising():
+    """Timing out returns None like the sleep it replaces, and errors count as not ready"""
+
+    def failing():
+        raise RuntimeError("stale element")
+
+    assert waits.wait_until(failing, replaces=0.3, poll=0.05) is None
+    stats = waits.summary()["test_scraper"]
+    assert stats["waited"] >= 0.3
+    assert stats["avoided"] <= 0
+
+
+def test_network_idle_waits_for_inflight_requests():
+    """A request seen in the performance log keeps the page busy until it finishes"""
+    driver = FakeDriver(
+        log_batches=[
+            [network_event("Network.requestWillBeSent", "1")],
+            [],
+            [network_event("Network.loadingFinished", "1")],
+        ]
+    )
+    assert waits.network_idle(driver, timeout=5, quiet=0.1)
+    assert driver._wait_inflight == {}
+    assert driver.log_batches == []
+
+
+def test_network_idle_falls_back_without_performance_log():
+    """Without the performance log the page script decides"""
+    driver = FakeDriver(activity={"ready": "complete", "pending": 0, "resources": 5})
+    driver.log_batches = None
+    assert waits.network_idle(driver, timeout=5, quiet=0.1)
+    assert driver._wait_network_log is False
+
+    busy = FakeDriver(activity={"ready": "complete", "pending": 2, "resources": 5})
+    busy.log_batches = None
+    assert not waits.network_idle(busy, timeout=0.3, quiet=0.1)
+
+
+def test_dom_quiet_needs_quiet_period():
+    """The DOM must report no mutations for the quiet period"""
+    driver = FakeDriver(activity=800)
+    assert waits.dom_quiet(driver, timeout=2, quiet=0.5)
+
+    changing = FakeDriver(activity=10)
+    assert not waits.dom_quiet(changing, timeout=0.3, quiet=0.5)
+
+
+def test_element_ready_skips_hidden_elements():
+    """The first displayed element is returned"""
+
+    class Element:
+        def __init__(self, shown):
+            self.shown = shown
+
+        def is_displayed(self):
+            return self.shown
+
+        def is_enabled(self):
+            return True
+
+    shown = Element(True)
+
+    class ElementDriver:
+        def find_elements(self, by, value):
+            return [Element(False), shown]
+
+    assert waits.element_ready(ElementDriver(), ("xpath", "//a"), timeout=1) is shown
+
+
+def test_downloads_finished(tmp_path):
+    """Partial files hold the wait back; a matching finished file ends it"""
+    finished = waits.downloads_finished(str(tmp_path), prefix="Bid")
+    started = waits.folder_changed(str(tmp_path))
+    assert not finished()
+    assert not started()
+
+    (tmp_path / "Unconfirmed 123.crdownload").write_text("")
+    assert started()
+    assert not finished()
+
+    os.remove(tmp_path / "Unconfirmed 123.crdownload")
+    (tmp_path / "bid_document.pdf").write_text("pdf")
+    assert finished()
+
+
+def test_pace_counts_time_since_start(monkeypatch):
+    """Time already spent since the start counts toward the jittered minimum"""
+    monkeypatch.setattr(waits.time, "monotonic", lambda: 100.0)
+    slept = []
+    monkeypatch.setattr(waits.time, "sleep", slept.append)
+
+    assert waits.pace(2, 2, since=99.5) == pytest.approx(1.5)
+    assert waits.pace(2, 2, since=90.0) == 0
+    assert slept == [pytest.approx(1.5)]
+    assert waits.summary()["test_scraper"]["paced"] == pytest.approx(1.5)
@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+from datetime import date
+
+import pytest
+
+# Add the project root directory to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from utils.listing import KEEP, SEEN, TOO_OLD, DateWindow, iter_listing
+from utils.watermarks import FULL_RESCAN_ENV_VAR, Watermark
+
+START = date(2026, 10, 10)
+
+
+@pytest.fixture
+def folder(tmp_path, monkeypatch):
+    monkeypatch.delenv(FULL_RESCAN_ENV_VAR, raising=False)
+    return str(tmp_path)
+
+
+def saved_mark(folder, **processed):
+    """A watermark for source 'site' saved after processing {id: posted} rows"""
+    watermark = Watermark("site", folder=folder)
+    for row_id, posted in processed.items():
+        watermark.advance(posted, row_id)
+    watermark.save()
+    return watermark
+
+
+def test_save_keeps_newest_date_and_its_ids(folder):
+    """The mark stores the newest processed date and only the ids seen on it"""
+    saved_mark(folder, A="10/17/2026", B="10/18/2026", C="10/18/2026")
+    watermark = Watermark("site", folder=folder)
+
+    assert watermark.date == date(2026, 10, 18)
+    assert watermark.ids == {"B", "C"}
+    assert watermark.covers("10/17/2026")
+    assert watermark.covers("10/18/2026", "B")
+    assert not watermark.covers("10/18/2026", "D")  # Posted later the same day
+    assert not watermark.covers("10/19/2026", "E")
+
+
+def test_mark_never_moves_back_and_merges_ids(folder):
+    """A run that only saw older bids keeps the stored mark; the same date adds ids"""
+    saved_mark(folder, B="10/18/2026")
+    saved_mark(folder, A="10/17/2026")
+    saved_mark(folder, C="10/18/2026")
+
+    watermark = Watermark("site", folder=folder)
+    assert watermark.date == date(2026, 10, 18)
+    assert watermark.ids == {"B", "C"}
+
+
+def test_hold_keeps_mark_before_failed_rows(folder):
+    """The mark does not pass a bid that failed, so the next run retries it"""
+    watermark = Watermark("site", folder=folder)
+    watermark.advance("10/16/2026", "A")
+    watermark.advance("10/18/2026", "C")
+    watermark.hold("10/17/2026")
+    watermark.save()
+
+    assert Watermark("site", folder=folder).date == date(2026, 10, 16)
+
+
+def test_tenants_are_stored_separately(folder):
+    """Tenants of one source share a file but not a mark"""
+    first = Watermark("site", tenant="https://a.example.com", folder=folder)
+    first.advance("10/18/2026", "A")
+    first.save()
+    second = Watermark("site", tenant="https://b.example.com", folder=folder)
+    second.advance("10/15/2026", "B")
+    second.save()
+
+    with open(os.path.join(folder, "site.json"), encoding="utf-8") as f:
+        assert set(json.load(f)) == {"https://a.example.com", "https://b.example.com"}
+    assert Watermark("site", tenant="https://a.example.com", folder=folder).date == date(2026, 10, 18)
+
+
+def test_full_rescan_ignores_the_stored_mark(folder, monkeypatch):
+    """--full-rescan, or the environment variable set by the master script, covers nothing"""
+    saved_mark(folder, A="10/18/2026")
+    assert not Watermark("site", folder=folder, full_rescan=True).covers("10/01/2026")
+
+    monkeypatch.setenv(FULL_RESCAN_ENV_VAR, "1")
+    watermark = Watermark("site", folder=folder)
+    assert watermark.describe() == "full rescan"
+    assert not watermark.covers("10/01/2026")
+
+
+def test_window_classifies_against_watermark(folder):
+    """Rows inside the look-back but behind the watermark are dropped"""
+    window = DateWindow(START, watermark=saved_mark(folder, B="10/18/2026"))
+
+    assert window.classify("10/17/2026", "A") == TOO_OLD
+    assert window.classify("10/18/2026", "B") == SEEN
+    assert window.classify("10/18/2026", "C") == KEEP
+    assert window.classify("10/19/2026", "D") == KEEP
+    assert window.watermarked == 2
+    assert "2 already scraped (watermark 2026-10-18 (1 ids))" in window.summary()
+
+
+def test_sorted_listing_stops_at_watermark(folder):
+    """A newest-first listing is read only down to the watermark"""
+    pages = [
+        [("D", "10/19/2026"), ("C", "10/18/2026"), ("B", "10/18/2026")],
+        [("A", "10/17/2026"), ("Z", "10/16/2026")],
+    ]
+    state = {"page": 0, "reads": 0}
+
+    def read_page():
+        state["reads"] += 1
+        return pages[state["page"]]
+
+    def next_page():
+        state["page"] += 1
+        return state["page"] < len(pages)
+
+    window = DateWindow(START, sorted_desc=True, watermark=saved_mark(folder, B="10/18/2026"))
+    rows = list(iter_listing(window, read_page, next_page, lambda row: row[1], row_id=lambda row: row[0]))
+
+    assert [row[0] for row in rows] == ["D", "C"]
+    assert state["reads"] == 2
+    assert window.stopped_early
+    assert window.avoided == 3
@@ -0,0 +1,369 @@
+"""
+Streaming archive expansion for downloaded bid attachments.
+
+Members are copied to disk in fixed-size chunks instead of being read fully
+into memory, archives are checked for zip-bombs and path traversal before
+anything is written, nested archives are expanded in place, and expansion can
+be handed to a small worker pool so the scraping thread keeps going.
+"""
+
+import os
+import sys
+import time
+import atexit
+import shutil
+import logging
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, fall back to getrusage
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Expansion limits
+CHUNK_SIZE = 1024 * 1024  # 1 MB copy buffer
+MAX_WORKERS = 2  # Expansion is disk bound, a small pool is enough
+MAX_MEMBERS = 5000  # Maximum number of members in a single archive
+MAX_MEMBER_BYTES = 2 * 1024**3  # 2 GB per extracted member
+MAX_TOTAL_BYTES = 8 * 1024**3  # 8 GB per top-level archive, nested included
+MAX_COMPRESSION_RATIO = 200  # Uncompressed / compressed size
+MAX_NESTING_DEPTH = 3  # zip inside zip inside zip
+ARCHIVE_EXTENSIONS = (".zip",)
+
+
+class ArchiveExpansionError(Exception):
+    """Raised when an archive is unsafe or exceeds the expansion limits."""
+
+
+class _BoundedReader:
+    """File-like wrapper that stops a copy once a byte budget is exhausted.
+
+    The sizes declared in the zip central directory can lie, so the limits are
+    enforced on the bytes actually produced by the decompressor.
+    """
+
+    def __init__(self, fileobj, limit: int, name: str):
+        self._fileobj = fileobj
+        self._remaining = limit
+        self._name = name
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fileobj.read(size)
+        self.bytes_read += len(data)
+        self._remaining -= len(data)
+        if self._remaining < 0:
+            raise ArchiveExpansionError(
+                f"Member {self._name} exceeds the extraction size limit"
+            )
+        return data
+
+
+def _current_rss() -> int:
+    """Return the resident set size of this process in bytes."""
+    if psutil is not None:
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes on Linux
+        return peak if sys.platform == "darwin" else peak * 1024
+    return 0
+
+
+class ArchiveExpander:
+    """Expands zip archives into bid folders with bounded memory and disk use."""
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        chunk_size: int = CHUNK_SIZE,
+        max_members: int = MAX_MEMBERS,
+        max_member_bytes: int = MAX_MEMBER_BYTES,
+        max_total_bytes: int = MAX_TOTAL_BYTES,
+        max_ratio: float = MAX_COMPRESSION_RATIO,
+        max_depth: int = MAX_NESTING_DEPTH,
+    ):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.max_members = max_members
+        self.max_member_bytes = max_member_bytes
+        self.max_total_bytes = max_total_bytes
+        self.max_ratio = max_ratio
+        self.max_depth = max_depth
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+        self._metrics = {
+            "archives": 0,
+            "members": 0,
+            "bytes_written": 0,
+            "seconds": 0.0,
+            "rejected": 0,
+            "peak_rss_bytes": _current_rss(),
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def expand(
+        self,
+        archive_path: str,
+        dest_folder: str,
+        flatten: bool = False,
+        remove_archive: bool = True,
+    ) -> List[str]:
+        """Expand an archive synchronously.
+
+        Args:
+            archive_path: Path of the zip file to expand.
+            dest_folder: Folder the members are written to.
+            flatten: Write every member directly into dest_folder, dropping
+                the directory structure inside the archive.
+            remove_archive: Delete the archive after a successful expansion.
+
+        Returns:
+            list: Paths of the extracted files, relative to dest_folder.
+        """
+        start = time.perf_counter()
+        budget = {"remaining": self.max_total_bytes}
+        try:
+            extracted = self._expand(archive_path, dest_folder, flatten, 0, budget)
+        except (ArchiveExpansionError, zipfile.BadZipFile) as e:
+            with self._lock:
+                self._metrics["rejected"] += 1
+            logger.error(f"Refused to expand {archive_path}: {str(e)}")
+            raise
+        finally:
+            self._record_rss()
+            with self._lock:
+                self._metrics["seconds"] += time.perf_counter() - start
+
+        if remove_archive:
+            try:
+                os.remove(archive_path)
+            except OSError as e:
+                logger.warning(f"Could not remove archive {archive_path}: {str(e)}")
+
+        logger.info(
+            f"Expanded {os.path.basename(archive_path)}: {len(extracted)} files "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+        return extracted
+
+    def submit(
+        self,
+        archive_path: str,
+        dest_folder: str,
+        flatten: bool = False,
+        remove_archive: bool = True,
+    ) -> Future:
+        """Queue an archive for expansion on the worker pool.
+
+        Returns:
+            Future: Resolves to the list returned by expand().
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="archive-expander",
+                )
+            future = self._executor.submit(
+                self.expand, archive_path, dest_folder, flatten, remove_archive
+            )
+            self._pending.append(future)
+        return future
+
+    def wait_all(self) -> None:
+        """Block until every submitted archive has been expanded."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception:
+                pass  # Already logged by expand()
+
+    def shutdown(self) -> None:
+        """Wait for queued work and stop the worker pool."""
+        self.wait_all()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def get_metrics(self) -> Dict:
+        """Return a snapshot of the expansion metrics."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        seconds = metrics["seconds"]
+        metrics["throughput_mb_s"] = (
+            metrics["bytes_written"] / (1024 * 1024) / seconds if seconds else 0.0
+        )
+        metrics["peak_rss_mb"] = metrics["peak_rss_bytes"] / (1024 * 1024)
+        return metrics
+
+    def log_summary(self) -> None:
+        """Log the expansion metrics collected so far."""
+        metrics = self.get_metrics()
+        if not metrics["archives"] and not metrics["rejected"]:
+            return
+        logger.info(
+            f"[ARCHIVES] {metrics['archives']} archives, {metrics['members']} files, "
+            f"{metrics['bytes_written'] / (1024 * 1024):.1f} MB written, "
+            f"{metrics['throughput_mb_s']:.1f} MB/s, "
+            f"peak RSS {metrics['peak_rss_mb']:.1f} MB, "
+            f"{metrics['rejected']} rejected"
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _expand(
+        self, archive_path: str, dest_folder: str, flatten: bool, depth: int, budget: Dict
+    ) -> List[str]:
+        if depth > self.max_depth:
+            raise ArchiveExpansionError(
+                f"Archive nesting deeper than {self.max_depth} levels"
+            )
+
+        os.makedirs(dest_folder, exist_ok=True)
+        dest_root = os.path.realpath(dest_folder)
+        extracted = []
+
+        with zipfile.ZipFile(archive_path, "r") as zip_ref:
+            members = [info for info in zip_ref.infolist() if not info.is_dir()]
+            self._check_archive(archive_path, members)
+
+            for info in members:
+                target_path = self._target_path(dest_root, info.filename, flatten)
+                if target_path is None:
+                    continue
+
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                limit = min(self.max_member_bytes, budget["remaining"])
+                with zip_ref.open(info, "r") as source:
+                    reader = _BoundedReader(source, limit, info.filename)
+                    with open(target_path, "wb") as target:
+                        shutil.copyfileobj(reader, target, self.chunk_size)
+                budget["remaining"] -= reader.bytes_read
+
+                with self._lock:
+                    self._metrics["members"] += 1
+                    self._metrics["bytes_written"] += reader.bytes_read
+                self._record_rss()
+
+                relative_path = os.path.relpath(target_path, dest_root)
+                if target_path.lower().endswith(ARCHIVE_EXTENSIONS):
+                    nested_folder = (
+                        dest_root
+                        if flatten
+                        else os.path.splitext(target_path)[0]
+                    )
+                    nested = self._expand(
+                        target_path, nested_folder, flatten, depth + 1, budget
+                    )
+                    os.remove(target_path)
+                    nested_prefix = os.path.relpath(nested_folder, dest_root)
+                    extracted.extend(
+                        os.path.normpath(os.path.join(nested_prefix, name))
+                        for name in nested
+                    )
+                else:
+                    extracted.append(relative_path)
+
+        with self._lock:
+            self._metrics["archives"] += 1
+        return extracted
+
+    def _check_archive(self, archive_path: str, members: List[zipfile.ZipInfo]) -> None:
+        """Reject archives whose central directory already looks like a bomb."""
+        if len(members) > self.max_members:
+            raise ArchiveExpansionError(
+                f"{len(members)} members exceeds the limit of {self.max_members}"
+            )
+
+        declared = sum(info.file_size for info in members)
+        if declared > self.max_total_bytes:
+            raise ArchiveExpansionError(
+                f"Declared size {declared} bytes exceeds {self.max_total_bytes} bytes"
+            )
+
+        archive_size = max(os.path.getsize(archive_path), 1)
+        if declared / archive_size > self.max_ratio:
+            raise ArchiveExpansionError(
+                f"Compression ratio {declared / archive_size:.0f} exceeds {self.max_ratio}"
+            )
+
+        for info in members:
+            if info.file_size > self.max_member_bytes:
+                raise ArchiveExpansionError(
+                    f"Member {info.filename} declares {info.file_size} bytes"
+                )
+            if info.compress_size and info.file_size / info.compress_size > self.max_ratio:
+                raise ArchiveExpansionError(
+                    f"Member {info.filename} has a suspicious compression ratio"
+                )
+
+    def _target_path(self, dest_root: str, member_name: str, flatten: bool) -> Optional[str]:
+        """Map a member name to a path inside dest_root, or None to skip it."""
+        name = member_name.replace("\\", "/")
+        parts = [part for part in name.split("/") if part not in ("", ".")]
+        if not parts:
+            return None
+        if name.startswith("/") or ":" in parts[0] or ".." in parts:
+            raise ArchiveExpansionError(f"Unsafe member path: {member_name}")
+
+        if flatten:
+            target_path = self._unique_path(os.path.join(dest_root, parts[-1]))
+        else:
+            target_path = os.path.join(dest_root, *parts)
+
+        resolved = os.path.realpath(target_path)
+        if os.path.commonpath([resolved, dest_root]) != dest_root:
+            raise ArchiveExpansionError(f"Member escapes destination: {member_name}")
+        return resolved
+
+    @staticmethod
+    def _unique_path(path: str) -> str:
+        """Add a numeric suffix when a flattened member name is already taken."""
+        base, ext = os.path.splitext(path)
+        counter = 1
+        while os.path.exists(path):
+            path = f"{base}_{counter}{ext}"
+            counter += 1
+        return path
+
+    def _record_rss(self) -> None:
+        rss = _current_rss()
+        with self._lock:
+            if rss > self._metrics["peak_rss_bytes"]:
+                self._metrics["peak_rss_bytes"] = rss
+
+
+_shared_expander: Optional[ArchiveExpander] = None
+_shared_lock = threading.Lock()
+
+
+def get_archive_expander() -> ArchiveExpander:
+    """Return the process-wide expander shared by all scrapers."""
+    global _shared_expander
+    with _shared_lock:
+        if _shared_expander is None:
+            _shared_expander = ArchiveExpander()
+            atexit.register(_shared_expander.shutdown)
+        return _shared_expander
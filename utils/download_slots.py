@@ -0,0 +1,302 @@
+"""
+Per-download directories for Chrome driven scrapers.
+
+Instead of diffing one shared download folder before and after a click, each
+download gets its own slot directory. The browser is pointed at the slot via
+the CDP ``Browser.setDownloadBehavior`` command before the download is
+triggered, so several downloads can be in flight at once for the same
+driver.
+
+The download path is a browser-wide setting. A download that starts after
+its slot's start timeout lands in whichever slot is current by then, so a
+slot can hold a file that is not its own. ``collect`` prefers the file named
+after the slot's label and leaves any other file where it is. Slots that
+never started, did not finish or still hold files are not deleted: ``close``
+moves their finished files to a leftovers folder and keeps the unfinished
+ones, and ``sweep_slots`` moves what has finished since at the end of a run.
+"""
+
+import os
+import time
+import shutil
+import logging
+import tempfile
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_SUFFIXES = (".crdownload", ".tmp", ".part")
+START_TIMEOUT = 30  # Seconds to wait for Chrome to create the download file
+FINISH_TIMEOUT = 120  # Seconds to wait for a started download to complete
+POLL_INTERVAL = 0.5
+SLOT_PREFIX = "slot_"
+
+
+class DownloadSlot:
+    """A single in-flight download and the directory it is written to."""
+
+    def __init__(self, folder: str, label: str = ""):
+        self.folder = folder
+        self.label = label
+        self.started = False
+        self.file_path: Optional[str] = None
+
+    def _files(self) -> List[str]:
+        try:
+            return os.listdir(self.folder)
+        except FileNotFoundError:
+            return []
+
+    def has_started(self) -> bool:
+        """Return True once Chrome has created any file in the slot."""
+        return bool(self._files())
+
+    def completed_file(self) -> Optional[str]:
+        """Return the finished file in the slot, or None while still downloading."""
+        files = self._files()
+        if not files or any(f.endswith(PARTIAL_SUFFIXES) for f in files):
+            return None
+        if len(files) > 1:
+            # A download that started late for an earlier slot may have landed here
+            named = [f for f in files if self.label and f.lower() == self.label.lower()]
+            if named:
+                return os.path.join(self.folder, named[0])
+            logger.warning(
+                f"Download slot for {self.label or self.folder} holds {len(files)} files, "
+                "using the newest one"
+            )
+        paths = [os.path.join(self.folder, f) for f in files]
+        return max(paths, key=os.path.getmtime)
+
+    def is_downloading(self) -> bool:
+        return any(f.endswith(PARTIAL_SUFFIXES) for f in self._files())
+
+    def wait(self, timeout: float = FINISH_TIMEOUT) -> Optional[str]:
+        """Block until the download finishes and return its path."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            path = self.completed_file()
+            if path:
+                self.file_path = path
+                return path
+            time.sleep(POLL_INTERVAL)
+        logger.warning(f"Download timeout for {self.label or self.folder}")
+        return None
+
+
+class DownloadSlotManager:
+    """Hands out isolated download directories for one WebDriver.
+
+    Args:
+        driver: Chrome WebDriver (or undetected-chromedriver) instance.
+        root_folder: Folder the slot directories are created in.
+        default_folder: Folder restored as the download directory on close().
+        browser_context_id: Optional CDP browser context to scope the setting to.
+        leftovers_folder: Where close() moves finished files that were never
+            collected, defaults to default_folder.
+    """
+
+    def __init__(
+        self,
+        driver,
+        root_folder: str,
+        default_folder: Optional[str] = None,
+        browser_context_id: Optional[str] = None,
+        leftovers_folder: Optional[str] = None,
+    ):
+        self.driver = driver
+        self.root_folder = root_folder
+        self.default_folder = default_folder or root_folder
+        self.browser_context_id = browser_context_id
+        self.leftovers_folder = leftovers_folder or self.default_folder
+        self._lock = threading.Lock()
+        self._slots: List[DownloadSlot] = []
+        os.makedirs(self.root_folder, exist_ok=True)
+
+    def _set_download_path(self, path: str) -> None:
+        params = {"behavior": "allow", "downloadPath": path}
+        if self.browser_context_id:
+            params["browserContextId"] = self.browser_context_id
+        try:
+            self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", params)
+        except Exception:
+            # Older Chrome builds only honour the per-page variant
+            self.driver.execute_cdp_cmd(
+                "Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": path}
+            )
+
+    def start(
+        self,
+        trigger: Callable[[], None],
+        label: str = "",
+        start_timeout: float = START_TIMEOUT,
+    ) -> DownloadSlot:
+        """Point the browser at a fresh slot and run the trigger that starts a download.
+
+        Returns as soon as Chrome has created the download file, so the next
+        download can be started while this one is still transferring.
+        """
+        with self._lock:
+            folder = tempfile.mkdtemp(prefix=SLOT_PREFIX, dir=self.root_folder)
+            slot = DownloadSlot(folder, label)
+            self._slots.append(slot)
+
+            self._set_download_path(folder)
+            trigger()
+
+            deadline = time.time() + start_timeout
+            while time.time() < deadline:
+                if slot.has_started():
+                    slot.started = True
+                    break
+                time.sleep(POLL_INTERVAL)
+            else:
+                logger.warning(f"Download did not start for {label or folder}")
+            return slot
+
+    def collect(
+        self,
+        slot: DownloadSlot,
+        dest_folder: str,
+        filename: Optional[str] = None,
+        timeout: float = FINISH_TIMEOUT,
+    ) -> Optional[str]:
+        """Wait for a slot's download and move it into dest_folder.
+
+        Args:
+            slot: Slot returned by start().
+            dest_folder: Folder the file is moved to.
+            filename: Name to save the file as, defaults to the downloaded name.
+            timeout: Seconds to wait for the download to finish.
+
+        Returns:
+            str: Name of the file inside dest_folder, or None on timeout.
+            A slot that did not start or finish is kept for close().
+        """
+        if not (slot.file_path or slot.started or slot.has_started()):
+            return None
+        source_path = slot.file_path or slot.wait(timeout)
+        if not source_path:
+            return None
+
+        target_path = _move_file(source_path, dest_folder, filename)
+        if not target_path:
+            return None
+        self._discard(slot)
+        return os.path.basename(target_path)
+
+    def download(
+        self,
+        trigger: Callable[[], None],
+        dest_folder: str,
+        filename: Optional[str] = None,
+        timeout: float = FINISH_TIMEOUT,
+    ) -> Optional[str]:
+        """Start a download and wait for it in one call."""
+        slot = self.start(trigger, label=filename or "")
+        return self.collect(slot, dest_folder, filename, timeout)
+
+    def _discard(self, slot: DownloadSlot) -> None:
+        """Remove a collected slot; one that holds another download's file is kept for close()."""
+        if not _remove_if_empty(slot.folder):
+            return
+        with self._lock:
+            if slot in self._slots:
+                self._slots.remove(slot)
+
+    def close(self) -> None:
+        """Restore the default download folder and clear out the remaining slots.
+
+        Finished files nobody collected go to the leftovers folder. Slots
+        still downloading are left on disk for sweep_slots().
+        """
+        # Downloads that start from now on land in the default folder
+        try:
+            self._set_download_path(self.default_folder)
+        except Exception as e:
+            logger.warning(f"Could not restore download folder: {str(e)}")
+        for slot in list(self._slots):
+            if _sweep_slot(slot.folder, self.leftovers_folder):
+                logger.warning(f"Unfinished download {slot.label or slot.folder} left for the final sweep")
+            with self._lock:
+                self._slots.remove(slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def _move_file(source_path: str, dest_folder: str, filename: Optional[str] = None) -> Optional[str]:
+    """Move a finished download into dest_folder under a free name; its new path, or None."""
+    os.makedirs(dest_folder, exist_ok=True)
+    target_name = filename or os.path.basename(source_path)
+    base, ext = os.path.splitext(target_name)
+    if not ext:
+        target_name += os.path.splitext(source_path)[1]
+        base, ext = os.path.splitext(target_name)
+    target_path = os.path.join(dest_folder, target_name)
+    counter = 1
+    while os.path.exists(target_path):
+        target_path = os.path.join(dest_folder, f"{base}_{counter}{ext}")
+        counter += 1
+
+    for attempt in range(5):
+        try:
+            shutil.move(source_path, target_path)
+            return target_path
+        except PermissionError:
+            # Chrome can briefly hold the handle after renaming the download
+            time.sleep(1)
+    logger.error(f"Failed to move {source_path} after 5 attempts")
+    return None
+
+
+def _remove_if_empty(folder: str) -> bool:
+    """Remove an empty slot folder; False if files are left in it."""
+    try:
+        os.rmdir(folder)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.info(f"Keeping download slot {folder}, it holds another download")
+        return False
+    return True
+
+
+def _sweep_slot(folder: str, leftovers_folder: str) -> bool:
+    """Move a slot's finished files to leftovers_folder; True if a download is still running in it."""
+    try:
+        files = os.listdir(folder)
+    except FileNotFoundError:
+        return False
+    if any(name.endswith(PARTIAL_SUFFIXES) for name in files):
+        return True
+    for name in files:
+        moved = _move_file(os.path.join(folder, name), leftovers_folder)
+        if moved:
+            logger.warning(f"Moved uncollected download {name} to {leftovers_folder}")
+    _remove_if_empty(folder)
+    return False
+
+
+def sweep_slots(root_folder: str, leftovers_folder: str) -> int:
+    """Final sweep of the slot folders under root_folder; returns the downloads still unfinished.
+
+    Finished files go to leftovers_folder and emptied slots are removed.
+    """
+    unfinished = 0
+    try:
+        names = os.listdir(root_folder)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        folder = os.path.join(root_folder, name)
+        if name.startswith(SLOT_PREFIX) and os.path.isdir(folder):
+            unfinished += _sweep_slot(folder, leftovers_folder)
+    if unfinished:
+        logger.warning(f"{unfinished} downloads in {root_folder} did not finish")
+    return unfinished
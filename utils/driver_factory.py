@@ -0,0 +1,329 @@
+"""
+Shared Chrome WebDriver factory with selectable performance profiles.
+
+Scrapers used to assemble their own Chrome options. This module builds the
+driver in one place so the cheap wins are applied consistently:
+
+- new headless mode (``--headless=new``)
+- ``eager`` page-load strategy, so ``driver.get`` returns at DOMContentLoaded
+- CDP ``Network.setBlockedURLs`` for images, media, fonts and trackers
+- no background timer/renderer throttling for occluded windows
+
+The profile is chosen with the ``profile`` argument or the
+``BIDS_CHROME_PROFILE`` environment variable. Otherwise a scraper passes its
+``site`` (a URL, host or platform name such as "buyspeed") and gets the
+profile listed for it in ``SITE_PROFILES``. A site that is not listed has not
+been checked against the headless profiles yet and gets ``compat``, the
+headed, unblocked browser the scrapers used before. No site has been checked
+yet, so the faster profiles are opt-in through the environment variable. ``SITE_OVERRIDES``
+adjusts single settings for a site on top of its profile.
+
+Run ``python -m utils.driver_factory URL [URL ...]`` to benchmark page-load
+time and bytes transferred for each profile.
+"""
+
+import os
+import time
+import logging
+import argparse
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selenium import webdriver
+
+from utils.metrics import instrument_driver
+from utils.replay import chrome_arguments as replay_arguments
+from utils.waits import enable_network_events
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV_VAR = "BIDS_CHROME_PROFILE"
+DEFAULT_PROFILE = "compat"  # For sites not yet checked against a faster profile
+
+BLOCK_PATTERNS = {
+    "images": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    ],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav", "*.m4a"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "trackers": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*connect.facebook.net*",
+        "*hotjar.com*",
+        "*clarity.ms*",
+        "*nr-data.net*",
+        "*js-agent.newrelic.com*",
+        "*segment.io*",
+        "*quantserve.com*",
+    ],
+}
+
+PROFILES = {
+    # What the scrapers ran with before: headed, everything loaded
+    "compat": {
+        "headless": False,
+        "page_load_strategy": "normal",
+        "block": [],
+        "disable_throttling": False,
+    },
+    # Headless and eager, but keep images for portals that need them
+    "balanced": {
+        "headless": True,
+        "page_load_strategy": "eager",
+        "block": ["media", "fonts", "trackers"],
+        "disable_throttling": True,
+    },
+    "fast": {
+        "headless": True,
+        "page_load_strategy": "eager",
+        "block": ["images", "media", "fonts", "trackers"],
+        "disable_throttling": True,
+    },
+}
+
+# Profiles a site has been checked against, keyed by host or platform name;
+# a key starting with "." matches every subdomain.
+# Example: {"www.example.gov": "fast", ".example.net": "balanced"}
+SITE_PROFILES: Dict[str, str] = {}
+
+# Adjustments applied on top of a site's profile, keyed like SITE_PROFILES.
+# Example: {"www.example.gov": {"headless": False, "block": ["trackers"]}}
+SITE_OVERRIDES: Dict[str, Dict] = {}
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+)
+
+
+def site_key(site: Optional[str]) -> Optional[str]:
+    """Host of a site URL, or the lowercased host or name itself."""
+    if not site:
+        return None
+    return urlparse(site).netloc.lower() or site.lower()
+
+
+def site_entry(table: Dict, site: Optional[str]):
+    """A site's entry in SITE_PROFILES or SITE_OVERRIDES, longest match first."""
+    key = site_key(site)
+    if key is None:
+        return None
+    if key in table:
+        return table[key]
+    domains = [name for name in table if name.startswith(".") and (key.endswith(name) or key == name[1:])]
+    return table[max(domains, key=len)] if domains else None
+
+
+def resolve_profile(profile: Optional[str] = None, site: Optional[str] = None) -> Dict:
+    """Return the effective settings for a profile name and optional site."""
+    name = profile or os.environ.get(PROFILE_ENV_VAR) or site_entry(SITE_PROFILES, site) or DEFAULT_PROFILE
+    if name not in PROFILES:
+        logger.warning(f"Unknown Chrome profile '{name}', using '{DEFAULT_PROFILE}'")
+        name = DEFAULT_PROFILE
+
+    settings = dict(PROFILES[name])
+    settings["name"] = name
+    override = site_entry(SITE_OVERRIDES, site)
+    if override:
+        settings.update(override)
+        settings["name"] = f"{name}+{site_key(site)}"
+    return settings
+
+
+def blocked_url_patterns(settings: Dict) -> List[str]:
+    """Expand the profile's block categories into CDP URL patterns."""
+    patterns = []
+    for category in settings.get("block", []):
+        patterns.extend(BLOCK_PATTERNS.get(category, []))
+    return patterns
+
+
+def build_chrome_options(
+    settings: Dict,
+    download_folder: Optional[str] = None,
+    arguments: Optional[List[str]] = None,
+    prefs: Optional[Dict] = None,
+):
+    """Build ChromeOptions for the given profile settings."""
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = settings["page_load_strategy"]
+
+    if settings["headless"]:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+        # Headless Chrome advertises itself in the user agent
+        options.add_argument(f"--user-agent={USER_AGENT}")
+
+    if settings["disable_throttling"]:
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-backgrounding-occluded-windows")
+        options.add_argument("--disable-renderer-backgrounding")
+
+    # Anti-bot measures
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+
+    for argument in (
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-gpu",
+        "--disable-extensions",
+        "--disable-infobars",
+        "--disable-notifications",
+    ):
+        options.add_argument(argument)
+    for argument in arguments or []:
+        options.add_argument(argument)
+    # Send traffic through the record/replay proxy when one is running
+    for argument in replay_arguments():
+        options.add_argument(argument)
+
+    chrome_prefs = {
+        "download.prompt_for_download": False,
+        "download.directory_upgrade": True,
+        "safebrowsing.enabled": True,
+        "profile.default_content_settings.popups": 0,
+        "profile.default_content_setting_values.automatic_downloads": 1,
+    }
+    if download_folder:
+        chrome_prefs["download.default_directory"] = download_folder
+    chrome_prefs.update(prefs or {})
+    options.add_experimental_option("prefs", chrome_prefs)
+    return options
+
+
+def apply_runtime_settings(driver, settings: Dict, download_folder: Optional[str] = None) -> None:
+    """Apply the CDP side of a profile to a running driver."""
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument",
+        {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"},
+    )
+
+    patterns = blocked_url_patterns(settings)
+    if patterns:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+    if download_folder and settings["headless"]:
+        # Headless Chrome ignores the download preference without this
+        driver.execute_cdp_cmd(
+            "Browser.setDownloadBehavior",
+            {"behavior": "allow", "downloadPath": download_folder},
+        )
+
+
+def create_driver(
+    download_folder: Optional[str] = None,
+    profile: Optional[str] = None,
+    site: Optional[str] = None,
+    arguments: Optional[List[str]] = None,
+    prefs: Optional[Dict] = None,
+    page_load_timeout: int = 60,
+    script_timeout: int = 60,
+    implicit_wait: int = 0,
+    network_events: bool = False,
+):
+    """Create a Chrome WebDriver configured with a performance profile.
+
+    Args:
+        download_folder: Default download directory for the browser.
+        profile: Profile name from PROFILES, defaults to $BIDS_CHROME_PROFILE,
+            then the site's SITE_PROFILES entry, then 'compat'.
+        site: URL, host or platform name of the portal, used to look up
+            SITE_PROFILES and SITE_OVERRIDES.
+        arguments: Extra Chrome command line arguments.
+        prefs: Extra Chrome preferences.
+        page_load_timeout: Seconds before driver.get gives up.
+        script_timeout: Seconds before execute_async_script gives up.
+        implicit_wait: Implicit wait in seconds; 0 keeps lookups fast.
+        network_events: Record CDP Network events for utils.waits.network_idle.
+
+    Returns:
+        webdriver.Chrome: The configured driver.
+    """
+    settings = resolve_profile(profile, site)
+    options = build_chrome_options(settings, download_folder, arguments, prefs)
+    if network_events:
+        enable_network_events(options)
+
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(page_load_timeout)
+    driver.set_script_timeout(script_timeout)
+    if implicit_wait:
+        driver.implicitly_wait(implicit_wait)
+
+    try:
+        apply_runtime_settings(driver, settings, download_folder)
+    except Exception as e:
+        logger.warning(f"Could not apply CDP settings for profile {settings['name']}: {str(e)}")
+
+    logger.info(f"Started Chrome with '{settings['name']}' profile")
+    return instrument_driver(driver)
+
+
+PAGE_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+    load_ms: nav ? nav.loadEventEnd : null,
+    bytes: (nav ? nav.transferSize : 0) +
+        resources.reduce((total, r) => total + (r.transferSize || 0), 0),
+    requests: resources.length + 1
+};
+"""
+
+
+def benchmark_profiles(urls: List[str], profiles: Optional[List[str]] = None, repeats: int = 1) -> List[Dict]:
+    """Load each URL under each profile and record timing and transfer size.
+
+    Returns:
+        list: One dict per (profile, url, run) with get_seconds, the browser's
+        navigation timings and the bytes transferred.
+    """
+    results = []
+    for name in profiles or list(PROFILES):
+        for url in urls:
+            for run in range(repeats):
+                driver = create_driver(profile=name, site=url)
+                try:
+                    start = time.perf_counter()
+                    driver.get(url)
+                    elapsed = time.perf_counter() - start
+                    metrics = driver.execute_script(PAGE_METRICS_SCRIPT) or {}
+                    results.append(
+                        {"profile": name, "url": url, "run": run + 1, "get_seconds": elapsed, **metrics}
+                    )
+                except Exception as e:
+                    results.append({"profile": name, "url": url, "run": run + 1, "error": str(e)})
+                finally:
+                    driver.quit()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Chrome performance profiles")
+    parser.add_argument("urls", nargs="+", help="Pages to load")
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), help="Profiles to compare")
+    parser.add_argument("--repeats", type=int, default=3, help="Loads per URL and profile")
+    args = parser.parse_args()
+
+    results = benchmark_profiles(args.urls, args.profiles, args.repeats)
+
+    print(f"\n{'Profile':<10} {'get() s':>8} {'DCL ms':>8} {'KB':>9} {'Reqs':>5}  URL")
+    for row in results:
+        if "error" in row:
+            print(f"{row['profile']:<10} {'error':>8}  {row['url']}: {row['error']}")
+            continue
+        print(
+            f"{row['profile']:<10} {row['get_seconds']:>8.2f} "
+            f"{(row.get('dom_content_loaded_ms') or 0):>8.0f} "
+            f"{row.get('bytes', 0) / 1024:>9.1f} {row.get('requests', 0):>5}  {row['url']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Warm WebDriver pool shared by scrapers that visit many sites.
+
+Chrome cold starts cost several seconds each, so scrapers that walk a list of
+portals check a browser out of this pool instead of creating and quitting one
+per site. Drivers are pre-warmed in the background, health checked on
+checkout, recycled after a fixed number of uses, and have their cookies and
+site storage wiped when they move from one site to another.
+"""
+
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_USES = 25  # Checkouts before a driver is replaced
+CHECKOUT_TIMEOUT = 600  # Seconds to wait for a free driver
+
+
+def site_key(url: str) -> str:
+    """Return the key used to isolate browser state, the URL's host name."""
+    return urlparse(url).netloc.lower() or url
+
+
+class PooledDriver:
+    """Bookkeeping for one browser owned by the pool."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.site: Optional[str] = None
+        self.origins = set()
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """Pool of pre-started WebDriver instances with a checkout/checkin API.
+
+    Args:
+        factory: Callable returning a new, fully configured WebDriver.
+        size: Number of browsers kept alive.
+        max_uses: Checkouts after which a browser is quit and replaced.
+        prewarm: Start all browsers in the background right away.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        size: int = DEFAULT_POOL_SIZE,
+        max_uses: int = DEFAULT_MAX_USES,
+        prewarm: bool = True,
+    ):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_uses = max_uses
+
+        self._idle: "queue.LifoQueue[PooledDriver]" = queue.LifoQueue()
+        self._by_driver: Dict[int, PooledDriver] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+
+        if prewarm:
+            for _ in range(self.size):
+                self._reserve_slot()
+                threading.Thread(target=self._spawn_into_idle, daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def checkout(self, site: Optional[str] = None, timeout: float = CHECKOUT_TIMEOUT):
+        """Borrow a healthy driver, isolated for the given site URL or host.
+
+        A driver that last served the same site is preferred so its session
+        stays warm; otherwise the next idle driver is wiped and handed out.
+        """
+        key = site_key(site) if site else None
+        deadline = time.time() + timeout
+
+        while True:
+            entry = self._take_idle(key)
+            if entry is None:
+                if self._reserve_slot():
+                    entry = self._spawn()
+                    if entry is None:
+                        continue
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError("No WebDriver became available in the pool")
+                    try:
+                        entry = self._idle.get(timeout=min(remaining, 5))
+                    except queue.Empty:
+                        continue
+
+            if not self._is_healthy(entry):
+                self.stats["unhealthy"] += 1
+                self._destroy(entry)
+                continue
+
+            if entry.uses:
+                self.stats["reused"] += 1
+            if key and entry.site and entry.site != key:
+                self._isolate(entry)
+            entry.site = key or entry.site
+            entry.uses += 1
+            return entry.driver
+
+    def checkin(self, driver, healthy: bool = True) -> None:
+        """Return a driver; unhealthy or worn out drivers are replaced."""
+        entry = self._by_driver.get(id(driver))
+        if entry is None:
+            return
+        try:
+            entry.origins.add(self._origin(driver.current_url))
+        except Exception:
+            healthy = False
+
+        if self._closed or not healthy or entry.uses >= self.max_uses:
+            if healthy and not self._closed:
+                self.stats["recycled"] += 1
+            self._destroy(entry)
+            if not self._closed and self._reserve_slot():
+                threading.Thread(target=self._spawn_into_idle, daemon=True).start()
+            return
+        self._idle.put(entry)
+
+    @contextmanager
+    def driver(self, site: Optional[str] = None):
+        """Context manager around checkout()/checkin().
+
+        The driver is marked unhealthy if the block raises, so a browser left
+        in a broken state is not handed to the next site.
+        """
+        driver = self.checkout(site)
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            self.checkin(driver, healthy)
+
+    def close(self) -> None:
+        """Quit every browser owned by the pool."""
+        self._closed = True
+        with self._lock:
+            entries = list(self._by_driver.values())
+        for entry in entries:
+            self._destroy(entry)
+        logger.info(
+            f"[POOL] Closed driver pool: {self.stats['created']} started, "
+            f"{self.stats['reused']} reused, {self.stats['recycled']} recycled, "
+            f"{self.stats['unhealthy']} unhealthy"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._closed or self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _spawn(self) -> Optional[PooledDriver]:
+        """Start a browser for a slot reserved with _reserve_slot()."""
+        try:
+            driver = self.factory()
+            if driver is None:
+                raise RuntimeError("Driver factory returned None")
+        except Exception as e:
+            logger.error(f"[POOL] Failed to start WebDriver: {str(e)}")
+            with self._lock:
+                self._created -= 1
+            time.sleep(2)
+            return None
+        entry = PooledDriver(driver)
+        with self._lock:
+            self._by_driver[id(driver)] = entry
+        self.stats["created"] += 1
+        return entry
+
+    def _spawn_into_idle(self) -> None:
+        entry = self._spawn()
+        if entry is not None:
+            if self._closed:
+                self._destroy(entry)
+            else:
+                self._idle.put(entry)
+
+    def _take_idle(self, key: Optional[str]) -> Optional[PooledDriver]:
+        """Pop an idle driver, preferring one already bound to the site."""
+        entries: List[PooledDriver] = []
+        while True:
+            try:
+                entries.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        if not entries:
+            return None
+
+        chosen = next((e for e in entries if key and e.site == key), entries[-1])
+        for entry in entries:
+            if entry is not chosen:
+                self._idle.put(entry)
+        return chosen
+
+    def _is_healthy(self, entry: PooledDriver) -> bool:
+        driver = entry.driver
+        try:
+            handles = driver.window_handles
+            if not handles:
+                return False
+            # Close tabs left open by the previous user
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _isolate(self, entry: PooledDriver) -> None:
+        """Wipe cookies, cache and site storage left by the previous site."""
+        driver = entry.driver
+        try:
+            driver.get("about:blank")
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            for origin in entry.origins:
+                if origin:
+                    driver.execute_cdp_cmd(
+                        "Storage.clearDataForOrigin",
+                        {"origin": origin, "storageTypes": "all"},
+                    )
+        except Exception as e:
+            logger.warning(f"[POOL] CDP isolation failed, clearing cookies only: {str(e)}")
+            try:
+                driver.delete_all_cookies()
+            except Exception:
+                pass
+        entry.origins.clear()
+
+    @staticmethod
+    def _origin(url: str) -> Optional[str]:
+        parsed = urlparse(url)
+        if parsed.scheme in ("http", "https") and parsed.netloc:
+            return f"{parsed.scheme}://{parsed.netloc}"
+        return None
+
+    def _destroy(self, entry: PooledDriver) -> None:
+        with self._lock:
+            if self._by_driver.pop(id(entry.driver), None) is None:
+                return
+            self._created -= 1
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,310 @@
+"""
+Conditional HTTP requests backed by an on-disk cache.
+
+Detail pages of solicitations that stay open for weeks, and their
+attachments, used to be downloaded again on every run. The HTTP cache keeps
+each response body that came with an ``ETag`` or ``Last-Modified`` header,
+and the next request for the same URL sends ``If-None-Match`` /
+``If-Modified-Since``. When the server answers 304 Not Modified, the body is
+served from disk instead of being downloaded again.
+
+Bodies are stored by the SHA-256 of their content, so an attachment linked
+from several bids is kept once. The cache is capped in size. When a store
+pushes it over the cap, the least recently used entries are evicted.
+
+Two ways to use it:
+
+- ``CachingAdapter`` is a ``requests`` transport adapter. Mount it on a
+  session in place of ``HTTPAdapter``; it takes the same ``max_retries``.
+- ``HttpFetcher(cache=...)`` (see ``utils.http_fetch``) does the same for
+  pages fetched over httpx.
+
+Responses served from the cache carry ``X-Cache: HIT``. Each run logs an
+``[HTTP CACHE]`` line per portal with the share of requests that were not
+modified and the bytes saved.
+
+The cache lives in ``http_cache/`` in the project root, or
+``$BIDS_HTTP_CACHE_DIR``. Its size cap is ``$BIDS_HTTP_CACHE_MB``
+(default 1024).
+"""
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Mapping, Optional
+
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+FOLDER_ENV_VAR = "BIDS_HTTP_CACHE_DIR"
+SIZE_ENV_VAR = "BIDS_HTTP_CACHE_MB"
+DEFAULT_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "http_cache")
+DEFAULT_MAX_MB = 1024
+LOW_WATER = 0.9  # Eviction frees space down to this share of the cap
+ORPHAN_GRACE = 60  # Seconds before an unreferenced body may be removed; its entry may still be on the way
+CACHE_HEADER = "X-Cache"
+KEPT_HEADERS = ("content-type", "content-disposition", "etag", "last-modified")
+
+
+def url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def is_cached(response) -> bool:
+    """True if a requests or httpx response was served from the cache."""
+    return response.headers.get(CACHE_HEADER) == "HIT"
+
+
+class HttpCache:
+    """Content-addressed store of validated HTTP responses.
+
+    Args:
+        folder: Where entries and bodies are stored, defaults to http_cache/.
+        max_bytes: Size cap for stored bodies.
+    """
+
+    def __init__(self, folder: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.folder = folder or os.environ.get(FOLDER_ENV_VAR) or DEFAULT_FOLDER
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get(SIZE_ENV_VAR, DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # Bytes of bodies on disk, counted on first store
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _entry_path(self, url: str) -> str:
+        return os.path.join(self.folder, "entries", f"{url_key(url)}.json")
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.folder, "bodies", digest[:2], digest)
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """The cached entry for url, or None if there is none or its body is gone."""
+        try:
+            with open(self._entry_path(url), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return entry if os.path.exists(self._body_path(entry["digest"])) else None
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def read_body(self, entry: Dict) -> Optional[bytes]:
+        """The cached body, marking the entry as recently used; None if it was evicted."""
+        try:
+            with open(self._body_path(entry["digest"]), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        entry["used"] = time.time()
+        try:
+            self._write_atomic(self._entry_path(entry["url"]), json.dumps(entry).encode("utf-8"))
+        except OSError as e:
+            logger.debug(f"[HTTP CACHE] could not update {entry['url']}: {str(e)}")
+        return body
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes) -> Optional[Dict]:
+        """Keep a 200 response that the server can validate later."""
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not (etag or last_modified) or len(body) > self.max_bytes * (1 - LOW_WATER):
+            return None
+
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(digest)
+        added = 0
+        if not os.path.exists(body_path):
+            self._write_atomic(body_path, body)
+            added = len(body)
+        now = time.time()
+        entry = {
+            "url": url,
+            "digest": digest,
+            "size": len(body),
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {name: headers[name] for name in KEPT_HEADERS if name in headers},
+            "stored": now,
+            "used": now,
+        }
+        self._write_atomic(self._entry_path(url), json.dumps(entry).encode("utf-8"))
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_size()
+            else:
+                self._size += added
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+        return entry
+
+    def _disk_size(self) -> int:
+        total = 0
+        for root, _, files in os.walk(os.path.join(self.folder, "bodies")):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the bodies fit; returns bytes freed."""
+        entries = []
+        entry_folder = os.path.join(self.folder, "entries")
+        for name in os.listdir(entry_folder) if os.path.isdir(entry_folder) else []:
+            try:
+                with open(os.path.join(entry_folder, name), encoding="utf-8") as f:
+                    entries.append((name, json.load(f)))
+            except (OSError, json.JSONDecodeError):
+                continue
+
+        references = Counter(entry["digest"] for _, entry in entries)
+        sizes = {entry["digest"]: entry["size"] for _, entry in entries}
+        total = sum(sizes.values())
+        target = self.max_bytes * LOW_WATER
+        freed = 0
+        for name, entry in sorted(entries, key=lambda item: item[1].get("used", 0)):
+            if total <= target:
+                break
+            try:
+                os.remove(os.path.join(entry_folder, name))
+            except FileNotFoundError:
+                pass
+            references[entry["digest"]] -= 1
+            if references[entry["digest"]] == 0:
+                try:
+                    os.remove(self._body_path(entry["digest"]))
+                except FileNotFoundError:
+                    pass
+                total -= entry["size"]
+                freed += entry["size"]
+
+        # Bodies whose URL now points at newer content are no longer referenced
+        now = time.time()
+        for root, _, files in os.walk(os.path.join(self.folder, "bodies")):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if references[name] <= 0 and now - os.path.getmtime(path) > ORPHAN_GRACE:
+                        freed += os.path.getsize(path)
+                        os.remove(path)
+                except OSError:
+                    pass
+
+        with self._lock:
+            self._size = self._disk_size()
+        if freed:
+            logger.info(f"[HTTP CACHE] evicted {freed / 1024 / 1024:.1f} MB, {self._size / 1024 / 1024:.1f} MB kept")
+        return freed
+
+    def record(self, portal: str, hit: bool, saved: int = 0) -> None:
+        with self._lock:
+            counts = self.stats.setdefault(portal or "http", {"requests": 0, "hits": 0, "bytes_saved": 0})
+            counts["requests"] += 1
+            if hit:
+                counts["hits"] += 1
+                counts["bytes_saved"] += saved
+
+    def summary(self) -> str:
+        with self._lock:
+            stats = {portal: dict(counts) for portal, counts in self.stats.items()}
+        parts = [
+            f"{portal}: {counts['hits']}/{counts['requests']} not modified "
+            f"({counts['hits'] / counts['requests']:.0%}), {counts['bytes_saved'] / 1024 / 1024:.1f} MB saved"
+            for portal, counts in sorted(stats.items())
+            if counts["requests"]
+        ]
+        return "[HTTP CACHE] " + ("; ".join(parts) if parts else "no requests")
+
+    def log_summary(self) -> None:
+        if self.stats:
+            logger.info(self.summary())
+
+
+class CachingAdapter(HTTPAdapter):
+    """requests adapter that revalidates GETs against an HttpCache.
+
+    A 304 is turned into a 200 carrying the cached body, so callers see the
+    same response as before and only the download is skipped.
+
+    Args:
+        cache: Cache to use, defaults to the process-wide one.
+        portal: Name the hit ratio is reported under.
+        Other arguments are passed to HTTPAdapter, e.g. max_retries.
+    """
+
+    def __init__(self, cache: Optional[HttpCache] = None, portal: str = "", **kwargs):
+        self.cache = cache or get_http_cache()
+        self.portal = portal
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if request.method != "GET" or "Range" in request.headers:
+            return super().send(request, **kwargs)
+
+        entry = self.cache.lookup(request.url)
+        request.headers.update(self.cache.conditional_headers(entry))
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            body = self.cache.read_body(entry)
+            if body is None:
+                # Evicted meanwhile; ask again without the validators
+                for header in ("If-None-Match", "If-Modified-Since"):
+                    request.headers.pop(header, None)
+                return self.send(request, **kwargs)
+            response.close()
+            response.status_code = 200
+            response.reason = "OK"
+            response.headers.update(entry.get("headers", {}))
+            response.headers["Content-Length"] = str(len(body))
+            response.headers[CACHE_HEADER] = "HIT"
+            response._content = body
+            response._content_consumed = True
+            self.cache.record(self.portal, hit=True, saved=len(body))
+        elif response.status_code == 200:
+            # Only responses the server can validate are read here; others keep streaming
+            if response.headers.get("etag") or response.headers.get("last-modified"):
+                try:
+                    self.cache.store(request.url, response.headers, response.content)
+                except OSError as e:
+                    logger.warning(f"[HTTP CACHE] could not store {request.url}: {str(e)}")
+            self.cache.record(self.portal, hit=False)
+        return response
+
+
+_shared_cache: Optional[HttpCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Return the process-wide HTTP cache."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HttpCache()
+            atexit.register(_shared_cache.log_summary)
+        return _shared_cache
@@ -0,0 +1,298 @@
+"""
+Plain HTTP fetching for portals whose pages do not need a browser.
+
+Some portals only need Selenium for the search form, a login or a CAPTCHA;
+their detail pages and attachments are server-rendered and come back the
+same from a plain GET. ``HttpFetcher`` takes the browser's cookies and user
+agent (``from_driver``) and then fetches those pages over a pooled
+``httpx.AsyncClient``, several at a time up to a fixed concurrency, instead of
+loading them one by one in Chrome.
+
+``pages`` returns ``ParsedPage`` snapshots for the shared lxml parser. A page
+that fails, or does not contain the selector passed as ``expect`` (a login
+page, an error page, a page built by JavaScript), comes back as None so the
+scraper loads that one in the browser as before. Set ``BIDS_HTTP_FETCH=0`` to
+use the browser for everything.
+
+With ``cache`` (an ``HttpCache``, see ``utils.http_cache``) GETs are sent
+as conditional requests, and a 304 is answered from the cache without
+downloading the body again. ``changed_pages`` revalidates pages a scraper
+has already processed and parses only those that changed, so unchanged bids
+can be skipped without reading them again.
+
+Each fetcher logs an ``[HTTP]`` summary of requests, failures and bytes.
+"""
+
+import os
+import time
+import random
+import hashlib
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+import httpx
+
+from utils.http_cache import CACHE_HEADER, HttpCache, is_cached
+from utils.metrics import BYTES_DOWNLOADED, get_metrics
+from utils.page_parser import ParsedPage, Selector
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "BIDS_HTTP_FETCH"
+DEFAULT_CONCURRENCY = 6  # Requests in flight per portal
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 2
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_DELAY = 1.0  # Seconds, doubled on each retry
+
+
+def http_fetch_enabled() -> bool:
+    """False if BIDS_HTTP_FETCH is set to 0/false/no."""
+    return os.environ.get(ENV_VAR, "1").lower() not in ("0", "false", "no")
+
+
+def session_from_driver(driver) -> Tuple[httpx.Cookies, Dict[str, str]]:
+    """Cookies and user agent of a browser session, for use outside the browser."""
+    cookies = httpx.Cookies()
+    for cookie in driver.get_cookies():
+        cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+    headers = {}
+    try:
+        user_agent = driver.execute_script("return navigator.userAgent")
+        if user_agent:
+            headers["User-Agent"] = user_agent
+    except Exception as e:
+        logger.debug(f"[HTTP] could not read the browser user agent: {str(e)}")
+    return cookies, headers
+
+
+class HttpFetcher:
+    """Pooled async HTTP client with bounded concurrency and a sync API.
+
+    The client and its event loop live as long as the fetcher, so connections
+    are kept alive between batches. Use it from one thread at a time and
+    close() it (or use it as a context manager) when done.
+
+    Args:
+        base_url: Prefix for relative URLs.
+        cookies: Cookies sent with every request.
+        headers: Extra headers, such as the browser's User-Agent.
+        concurrency: Requests in flight at once.
+        timeout: Seconds per request.
+        retries: Retries on connection errors and 429/5xx responses.
+        label: Name used in the log summary and the cache statistics.
+        cache: HttpCache to revalidate GETs against.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "",
+        cookies=None,
+        headers: Optional[Dict[str, str]] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        label: str = "",
+        cache: Optional[HttpCache] = None,
+    ):
+        self.base_url = base_url
+        self.cookies = cookies
+        self.headers = headers or {}
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.label = label
+        self.cache = cache
+        self.requests = 0
+        self.failures = 0
+        self.fallbacks = 0  # Pages handed back to the browser
+        self.bytes = 0
+        self.seconds = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs) -> "HttpFetcher":
+        """A fetcher that carries on the browser's session."""
+        cookies, headers = session_from_driver(driver)
+        headers.update(kwargs.pop("headers", None) or {})
+        return cls(cookies=cookies, headers=headers, **kwargs)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                cookies=self.cookies,
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            )
+        return self._client
+
+    def _run(self, coroutine):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            start = time.perf_counter()
+            try:
+                return self._loop.run_until_complete(coroutine)
+            finally:
+                self.seconds += time.perf_counter() - start
+
+    async def _request(self, semaphore: asyncio.Semaphore, method: str, url: str, data=None) -> Optional[httpx.Response]:
+        url = urljoin(self.base_url, url)
+        entry = self.cache.lookup(url) if self.cache is not None and method == "GET" else None
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                self.requests += 1
+                try:
+                    response = await self._get_client().request(
+                        method, url, data=data, headers=self.cache.conditional_headers(entry) if entry else None
+                    )
+                    self.bytes += len(response.content)
+                    get_metrics().count(BYTES_DOWNLOADED, len(response.content))
+                    if response.status_code == 304 and entry:
+                        cached = self._from_cache(entry, response)
+                        if cached is not None:
+                            return cached
+                        # Evicted meanwhile; ask again without the validators
+                        entry = None
+                        reason = "cached body evicted"
+                        continue
+                    if response.status_code == 200 and self.cache is not None and method == "GET":
+                        self._store(url, response)
+                    if response.status_code not in RETRY_STATUSES:
+                        if response.status_code >= 400:
+                            logger.warning(f"[HTTP] {self.label}: {url} returned {response.status_code}")
+                            self.failures += 1
+                            return None
+                        return response
+                    reason = f"HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    reason = f"{type(e).__name__}: {str(e)}"
+                if attempt < self.retries:
+                    await asyncio.sleep(RETRY_DELAY * (2 ** attempt) * random.uniform(0.8, 1.2))
+            logger.warning(f"[HTTP] {self.label}: {url} failed after {self.retries + 1} attempts ({reason})")
+            self.failures += 1
+            return None
+
+    def _from_cache(self, entry: Dict, response: httpx.Response) -> Optional[httpx.Response]:
+        body = self.cache.read_body(entry)
+        if body is None:
+            return None
+        self.cache.record(self.label, hit=True, saved=len(body))
+        headers = dict(entry.get("headers", {}))
+        headers[CACHE_HEADER] = "HIT"
+        return httpx.Response(200, headers=headers, content=body, request=response.request)
+
+    def _store(self, url: str, response: httpx.Response) -> None:
+        try:
+            self.cache.store(url, response.headers, response.content)
+        except OSError as e:
+            logger.warning(f"[HTTP] {self.label}: could not cache {url}: {str(e)}")
+        self.cache.record(self.label, hit=False)
+
+    async def _gather(self, requests: Sequence[Tuple[str, str, object]]) -> List[Optional[httpx.Response]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self._request(semaphore, method, url, data) for method, url, data in requests))
+
+    def fetch_all(self, urls: Sequence[str], method: str = "GET", data=None) -> List[Optional[httpx.Response]]:
+        """Fetch urls concurrently; responses in the same order, None for failures."""
+        return self._run(self._gather([(method, url, data) for url in urls]))
+
+    def fetch(self, url: str, method: str = "GET", data=None) -> Optional[httpx.Response]:
+        return self.fetch_all([url], method, data)[0]
+
+    def pages(self, urls: Sequence[str], expect: Optional[Selector] = None, region=None) -> List[Optional[ParsedPage]]:
+        """Fetch and parse urls; None where the browser should load the page instead.
+
+        expect is a selector every good page matches. Pages without it, such
+        as a login redirect or a page rendered by JavaScript, count as
+        fallbacks.
+        """
+        return [self._parse(url, response, expect, region) for url, response in zip(urls, self.fetch_all(urls))]
+
+    def changed_pages(self, urls: Sequence[str], expect: Optional[Selector] = None,
+                      region=None) -> Dict[str, Optional[ParsedPage]]:
+        """Revalidate pages fetched on an earlier run; the ones that changed since.
+
+        Only urls with a cache entry are requested. A page the server reports
+        as not modified, or that comes back with the cached body, is left out
+        without being parsed, as is a page that failed. A changed page maps to
+        its ParsedPage, or to None if the browser should load it (see pages).
+        """
+        if self.cache is None:
+            return {}
+        known = {url: self.cache.lookup(urljoin(self.base_url, url)) for url in urls}
+        known = {url: entry for url, entry in known.items() if entry}
+        changed = {}
+        for (url, entry), response in zip(known.items(), self.fetch_all(list(known))):
+            if response is None or is_cached(response):
+                continue
+            if hashlib.sha256(response.content).hexdigest() == entry["digest"]:
+                continue
+            changed[url] = self._parse(url, response, expect, region)
+        return changed
+
+    def _parse(self, url: str, response: Optional[httpx.Response], expect: Optional[Selector],
+               region) -> Optional[ParsedPage]:
+        page = None
+        if response is not None:
+            try:
+                page = ParsedPage(response.text, url=str(response.url), region=region)
+            except Exception as e:
+                logger.warning(f"[HTTP] {self.label}: could not parse {url}: {str(e)}")
+            if page is not None and expect is not None and not page.exists(expect):
+                logger.info(f"[HTTP] {self.label}: {url} is missing the expected content, using the browser")
+                page = None
+        if page is None:
+            self.fallbacks += 1
+        return page
+
+    async def _download(self, semaphore: asyncio.Semaphore, url: str, path: str) -> bool:
+        response = await self._request(semaphore, "GET", url)
+        if response is None:
+            return False
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(response.content)
+        os.replace(temp_path, path)
+        return True
+
+    def download_all(self, files: Sequence[Tuple[str, str]]) -> List[bool]:
+        """Download (url, path) pairs concurrently; True for each file saved."""
+
+        async def download():
+            semaphore = asyncio.Semaphore(self.concurrency)
+            return await asyncio.gather(*(self._download(semaphore, url, path) for url, path in files))
+
+        return self._run(download())
+
+    def summary(self) -> str:
+        return (
+            f"[HTTP] {self.label or 'fetcher'}: {self.requests} requests, {self.failures} failed, "
+            f"{self.fallbacks} pages left to the browser, {self.bytes / 1024:.0f} KB in {self.seconds:.1f}s "
+            f"(concurrency {self.concurrency})"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._loop is None:
+                return
+            if self._client is not None:
+                self._loop.run_until_complete(self._client.aclose())
+                self._client = None
+            self._loop.close()
+            self._loop = None
+        if self.requests:
+            logger.info(self.summary())
+
+    def __enter__(self) -> "HttpFetcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,279 @@
+"""
+Human-intervention queue shared by the scrapers and the dashboard.
+
+Scrapers used to stop on ``input("Press Enter to continue...")`` whenever
+something needed a person: an unexpected error, a CAPTCHA, a filter that had
+to be set by hand, or a bid that kept failing. The whole process, and its
+slot in the orchestrator, then waited until someone noticed.
+
+Instead a scraper parks the problem here and carries on:
+
+- ``report`` records an error for the operator without waiting for anyone.
+- ``park`` sets a bid aside with its URL, a screenshot and the reason. The
+  scraper goes on with other bids and later picks up the parked ones the
+  operator resolved (``ready`` / ``drain``). Bids nobody resolves time out.
+- ``wait`` is for steps nothing else can proceed without, such as a login
+  CAPTCHA. It blocks, but only until the item is resolved or times out.
+
+Items are JSON files (plus a PNG screenshot) under ``interventions/`` in the
+project root, or ``$BIDS_INTERVENTION_DIR``, so any process can list and
+resolve them. The dashboard does this through ``list_interventions`` and
+``resolve``.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FOLDER_ENV_VAR = "BIDS_INTERVENTION_DIR"
+DEFAULT_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interventions")
+DEFAULT_TIMEOUT = 30 * 60  # Seconds a parked bid waits for an operator
+POLL_INTERVAL = 5
+
+PENDING = "pending"
+RESOLVED = "resolved"  # Operator fixed it; retry or continue
+SKIPPED = "skipped"  # Operator gave up on it
+TIMED_OUT = "timed_out"
+CLOSED_STATUSES = (RESOLVED, SKIPPED, TIMED_OUT)
+
+_id_lock = threading.Lock()
+_id_counter = 0
+
+
+def intervention_folder(folder: Optional[str] = None) -> str:
+    return folder or os.environ.get(FOLDER_ENV_VAR) or DEFAULT_FOLDER
+
+
+def _new_id(scraper: str) -> str:
+    global _id_counter
+    with _id_lock:
+        _id_counter += 1
+        counter = _id_counter
+    safe_scraper = re.sub(r"[^\w-]", "_", scraper)
+    return f"{safe_scraper}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{counter}"
+
+
+def _path(folder: str, intervention_id: str, extension: str = ".json") -> str:
+    if not re.fullmatch(r"[\w-]+", intervention_id):
+        raise ValueError(f"Invalid intervention id: {intervention_id}")
+    return os.path.join(folder, f"{intervention_id}{extension}")
+
+
+def _write(folder: str, item: Dict) -> None:
+    os.makedirs(folder, exist_ok=True)
+    path = _path(folder, item["id"])
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(item, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def load_intervention(intervention_id: str, folder: Optional[str] = None) -> Optional[Dict]:
+    folder = intervention_folder(folder)
+    try:
+        with open(_path(folder, intervention_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def list_interventions(folder: Optional[str] = None, include_closed: bool = False) -> List[Dict]:
+    """All interventions, oldest first; only pending ones unless include_closed."""
+    folder = intervention_folder(folder)
+    try:
+        names = os.listdir(folder)
+    except FileNotFoundError:
+        return []
+
+    items = []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        item = load_intervention(name[: -len(".json")], folder)
+        if item and (include_closed or item["status"] == PENDING):
+            items.append(item)
+    return sorted(items, key=lambda item: item["created"])
+
+
+def resolve(intervention_id: str, action: str = RESOLVED, note: str = "", folder: Optional[str] = None) -> Dict:
+    """Close a pending intervention as resolved or skipped (used by the dashboard)."""
+    if action not in (RESOLVED, SKIPPED):
+        raise ValueError(f"Unknown intervention action: {action}")
+    folder = intervention_folder(folder)
+    item = load_intervention(intervention_id, folder)
+    if item is None:
+        raise KeyError(intervention_id)
+    if item["status"] == PENDING:
+        item.update(status=action, note=note, closed=time.time())
+        _write(folder, item)
+    return item
+
+
+def screenshot_file(intervention_id: str, folder: Optional[str] = None) -> Optional[str]:
+    path = _path(intervention_folder(folder), intervention_id, ".png")
+    return path if os.path.exists(path) else None
+
+
+class InterventionQueue:
+    """Interventions raised by one scraper process.
+
+    Args:
+        scraper: Name shown on the dashboard, defaults to the script name.
+        folder: Where items are stored, defaults to interventions/.
+        timeout: Seconds a parked item waits for an operator.
+    """
+
+    def __init__(self, scraper: Optional[str] = None, folder: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT):
+        script = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python"
+        self.scraper = scraper or os.path.splitext(script)[0]
+        self.folder = intervention_folder(folder)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._parked: Dict[str, Dict] = {}
+
+    def _create(self, kind: str, reason: str, driver=None, url: Optional[str] = None,
+                bid: Optional[str] = None, context: Optional[Dict] = None, timeout: Optional[float] = None) -> Dict:
+        created = time.time()
+        item = {
+            "id": _new_id(self.scraper),
+            "scraper": self.scraper,
+            "kind": kind,
+            "reason": str(reason),
+            "bid": bid,
+            "url": url,
+            "context": context or {},
+            "status": PENDING,
+            "created": created,
+            # Error reports stay listed until dismissed; nothing waits on them
+            "expires": None if kind == "error" else created + (self.timeout if timeout is None else timeout),
+            "screenshot": None,
+            "note": "",
+            "closed": None,
+        }
+        if driver is not None:
+            try:
+                item["url"] = item["url"] or driver.current_url
+                os.makedirs(self.folder, exist_ok=True)
+                screenshot = _path(self.folder, item["id"], ".png")
+                if driver.save_screenshot(screenshot):
+                    item["screenshot"] = os.path.basename(screenshot)
+            except Exception as e:
+                logger.warning(f"[INTERVENE] Could not capture the page for {item['id']}: {str(e)}")
+        _write(self.folder, item)
+        logger.warning(f"[INTERVENE] {self.scraper}: {kind} needs attention ({item['id']}): {reason}")
+        return item
+
+    def report(self, reason: str, driver=None, url: Optional[str] = None, context: Optional[Dict] = None) -> Dict:
+        """Record an error for the operator and return immediately."""
+        return self._create("error", reason, driver, url, context=context)
+
+    def park(self, reason: str, driver=None, url: Optional[str] = None, bid: Optional[str] = None,
+             context: Optional[Dict] = None, timeout: Optional[float] = None) -> Dict:
+        """Set a bid aside until an operator resolves it; the caller moves on.
+
+        context holds whatever the scraper needs to retry the bid later and
+        must be JSON serializable.
+        """
+        item = self._create("bid", reason, driver, url, bid, context, timeout)
+        with self._lock:
+            self._parked[item["id"]] = item
+        return item
+
+    def status(self, item: Dict) -> str:
+        """Current status of an item, marking it timed out once it expires."""
+        current = load_intervention(item["id"], self.folder) or item
+        expires = current.get("expires")
+        if current["status"] == PENDING and expires is not None and time.time() >= expires:
+            current.update(status=TIMED_OUT, closed=time.time())
+            _write(self.folder, current)
+            logger.warning(f"[INTERVENE] {self.scraper}: {current['id']} timed out: {current['reason']}")
+        return current["status"]
+
+    def wait(self, reason: str, driver=None, url: Optional[str] = None, timeout: Optional[float] = None,
+             poll: float = POLL_INTERVAL, kind: str = "blocker") -> bool:
+        """Raise a blocker and wait for it; True if resolved, False if skipped or timed out."""
+        item = self._create(kind, reason, driver, url, timeout=timeout)
+        while True:
+            status = self.status(item)
+            if status != PENDING:
+                return status == RESOLVED
+            time.sleep(poll)
+
+    def ready(self) -> List[Dict]:
+        """Parked items the operator has resolved since the last call.
+
+        Skipped and timed out items are dropped from the queue.
+        """
+        resolved = []
+        with self._lock:
+            parked = list(self._parked.values())
+        for item in parked:
+            status = self.status(item)
+            if status == PENDING:
+                continue
+            with self._lock:
+                self._parked.pop(item["id"], None)
+            if status == RESOLVED:
+                resolved.append(load_intervention(item["id"], self.folder) or item)
+        return resolved
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._parked)
+
+    def drain(self, poll: float = POLL_INTERVAL) -> Iterator[Dict]:
+        """Yield resolved parked items until none are pending.
+
+        Each item waits at most until its own timeout, so this ends no later
+        than the last parked item expires.
+        """
+        while True:
+            for item in self.ready():
+                yield item
+            if not self.pending_count:
+                return
+            time.sleep(poll)
+
+    def with_retries(self, work: Iterable, poll: float = POLL_INTERVAL) -> Iterator:
+        """Yield each work item, then the parked ones again once resolved.
+
+        Park a failed item with ``context={"retry": item}`` to have it yielded
+        again after the first pass. The item must be JSON serializable, so
+        tuples come back as lists.
+        """
+        yield from work
+        while True:
+            retries = [item["context"]["retry"] for item in self.drain(poll) if "retry" in item["context"]]
+            if not retries:
+                return
+            logger.info(f"[INTERVENE] {self.scraper}: retrying {len(retries)} resolved items")
+            yield from retries
+
+
+_shared_queue: Optional[InterventionQueue] = None
+_shared_lock = threading.Lock()
+
+
+def get_intervention_queue() -> InterventionQueue:
+    """Return the process-wide queue for the running scraper."""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            _shared_queue = InterventionQueue()
+            atexit.register(_log_unresolved, _shared_queue)
+        return _shared_queue
+
+
+def _log_unresolved(queue: InterventionQueue) -> None:
+    if queue.pending_count:
+        logger.warning(f"[INTERVENE] {queue.scraper}: exiting with {queue.pending_count} parked bids unresolved")
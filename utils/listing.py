@@ -0,0 +1,261 @@
+"""
+Date-windowed iteration over paginated bid listings.
+
+Scrapers used to collect every link on a listing and only compare the posted
+date after opening each detail page. ``iter_listing`` instead reads the
+posted date from the listing row, drops rows outside the ``--days`` window
+before any detail navigation, and, when the listing is known to be sorted
+newest first, stops paginating at the first row older than the window.
+
+``sort_newest_first`` clicks a date column header and checks the dates on the
+page to confirm the order, so early stopping is only used on listings that
+are really sorted. ``DateWindow`` also checks the order while iterating and
+falls back to reading every page if a newer row follows an older one.
+
+With a ``Watermark`` (see ``utils.watermarks``) the window also drops rows an
+earlier run already scraped, and a sorted listing stops at the watermark
+instead of at the end of the look-back.
+
+Each run logs a ``[LISTING]`` summary with the detail loads avoided.
+"""
+
+import logging
+from datetime import date, datetime, time
+from typing import Callable, Iterator, List, Optional, Sequence
+
+from utils.metrics import BIDS_SEEN, BIDS_SKIPPED, get_metrics
+from utils.waits import dom_quiet
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMATS = (
+    "%m/%d/%Y",
+    "%Y-%m-%d",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %H:%M",
+    "%m-%d-%Y",
+    "%Y/%m/%d",
+    "%b %d, %Y",
+)
+
+KEEP = "keep"
+TOO_OLD = "too_old"
+TOO_NEW = "too_new"
+UNDATED = "undated"
+SEEN = "seen"  # On the watermark's date and already scraped
+
+
+def parse_listing_date(value, formats: Sequence[str] = DATE_FORMATS) -> Optional[date]:
+    """Parse a posted date as shown on a listing; None if it cannot be read."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = " ".join((value or "").split())
+    if not text:
+        return None
+    # Try the whole cell, then the leading date without a time or time zone
+    for candidate in (text, text.split(" ")[0]):
+        for fmt in formats:
+            try:
+                return datetime.strptime(candidate, fmt).date()
+            except ValueError:
+                continue
+    return None
+
+
+class DateWindow:
+    """Decides which listing rows are in the posted date window and when to stop.
+
+    Args:
+        start: Oldest posted date to keep. A datetime is compared against
+            midnight of the posted date, like the scrapers' own cutoffs.
+        end: Newest posted date to keep, or None for no upper bound.
+        sorted_desc: The listing is sorted newest first, so the first row
+            older than start ends the listing.
+        label: Name used in the log summary.
+        watermark: Optional Watermark; rows older than it count as too old
+            and rows it has already seen are dropped.
+    """
+
+    def __init__(self, start, end=None, sorted_desc: bool = False, label: str = "", watermark=None):
+        self.start = start if isinstance(start, datetime) else parse_listing_date(start)
+        self.end = parse_listing_date(end) if end is not None else None
+        self.sorted_desc = sorted_desc
+        self.label = label
+        self.watermark = watermark
+        self.pages = 0
+        self.rows = 0
+        self.kept = 0
+        self.too_old = 0
+        self.too_new = 0
+        self.undated = 0
+        self.watermarked = 0  # Rows an earlier run already scraped
+        self.avoided = 0  # Detail loads not made for rows dropped from the listing
+        self.stopped_early = False
+        self.cut_off = False  # max_pages ended the listing with pages possibly unread
+        self._previous: Optional[date] = None
+
+    def classify(self, posted, row_id=None) -> str:
+        """Return KEEP, TOO_OLD, TOO_NEW, SEEN or UNDATED for a row's posted date.
+
+        Rows older than the watermark are TOO_OLD, so a sorted listing stops
+        there; row_id is only needed to tell seen rows on the watermark's date.
+        """
+        self.rows += 1
+        posted = parse_listing_date(posted)
+        if posted is None:
+            self.undated += 1
+            return UNDATED
+
+        if self.sorted_desc and self._previous is not None and posted > self._previous:
+            logger.warning(
+                f"[LISTING] {self.label}: {posted} follows {self._previous}, the listing is not "
+                "sorted newest first; reading every page"
+            )
+            self.sorted_desc = False
+        self._previous = posted
+
+        if isinstance(self.start, datetime):
+            too_old = datetime.combine(posted, time.min) < self.start
+        else:
+            too_old = posted < self.start
+        if too_old:
+            self.too_old += 1
+            return TOO_OLD
+        if self.end is not None and posted > self.end:
+            self.too_new += 1
+            return TOO_NEW
+        if self.watermark is not None and self.watermark.covers(posted, row_id):
+            self.watermarked += 1
+            return TOO_OLD if posted < self.watermark.date else SEEN
+        self.kept += 1
+        return KEEP
+
+    def skip(self, count: int) -> None:
+        """Record rows left unread because the listing ended early."""
+        self.avoided += max(count, 0)
+
+    def stop_at_page_limit(self) -> None:
+        """Record that a page limit ended the listing before the window did.
+
+        The watermark is held so it does not pass the rows left unread: on a
+        sorted listing they are no newer than the last row read, otherwise
+        they may be anywhere in the window.
+        """
+        self.cut_off = True
+        if self.watermark is not None:
+            if self.sorted_desc and self._previous is not None:
+                self.watermark.hold(self._previous)
+            else:
+                self.watermark.hold(self.start)
+
+    def summary(self) -> str:
+        pages = f"{self.pages} pages, " if self.pages else ""
+        ending = f", stopped early after page {self.pages}" if self.stopped_early else ""
+        if self.cut_off:
+            ending = f", page limit reached after page {self.pages}"
+        watermarked = (
+            f", {self.watermarked} already scraped ({self.watermark.describe()})"
+            if self.watermark is not None
+            else ""
+        )
+        return (
+            f"[LISTING] {self.label or 'listing'}: {pages}{self.rows} rows, kept {self.kept}, "
+            f"dropped {self.too_old} older and {self.too_new} newer than the window{watermarked}, "
+            f"{self.undated} undated; {self.avoided} detail loads avoided{ending}"
+        )
+
+    def log_summary(self) -> None:
+        logger.info(self.summary())
+
+
+def iter_listing(
+    window: DateWindow,
+    read_page: Callable[[], List],
+    next_page: Callable[[], bool],
+    posted_date: Callable[[object], object],
+    max_pages: Optional[int] = None,
+    row_id: Optional[Callable[[object], object]] = None,
+) -> Iterator:
+    """Yield the listing rows inside the window, page by page.
+
+    Rows whose date cannot be parsed are yielded too, so the caller can
+    still check them on the detail page.
+
+    Args:
+        window: Date window; its counters are updated as rows are read.
+        read_page: Returns the rows of the current page.
+        next_page: Moves to the next page; returns False on the last page.
+        posted_date: Returns a row's posted date (text, date or None).
+        max_pages: Stop after this many pages of this call; a window reused
+            for several batches keeps counting its pages in total.
+        row_id: Returns a row's id, checked against the window's watermark.
+    """
+    pages = 0
+    rows_before, avoided_before = window.rows, window.avoided
+    try:
+        while True:
+            pages += 1
+            window.pages += 1
+            rows = read_page()
+            for index, row in enumerate(rows):
+                verdict = window.classify(posted_date(row), row_id(row) if row_id else None)
+                if verdict in (KEEP, UNDATED):
+                    yield row
+                    continue
+                window.avoided += 1
+                if verdict == TOO_OLD and window.sorted_desc:
+                    # Everything after this row is older still
+                    window.skip(len(rows) - index - 1)
+                    window.stopped_early = True
+                    return
+            if max_pages and pages >= max_pages:
+                window.stop_at_page_limit()
+                return
+            if not next_page():
+                return
+    finally:
+        window.log_summary()
+        metrics = get_metrics()
+        # Only this call's rows; a window may be reused for several batches
+        metrics.count(BIDS_SEEN, window.rows - rows_before)
+        metrics.count(BIDS_SKIPPED, window.avoided - avoided_before)
+
+
+def _is_newest_first(dates: List[Optional[date]]) -> Optional[bool]:
+    """True if dates never increase and do change, False if they increase, None if unsure."""
+    dates = [d for d in dates if d is not None]
+    if len(set(dates)) < 2:
+        return None
+    return all(a >= b for a, b in zip(dates, dates[1:]))
+
+
+def sort_newest_first(
+    driver,
+    header_xpath: str,
+    read_dates: Callable[[], List],
+    max_clicks: int = 2,
+    label: str = "",
+) -> bool:
+    """Click a date column header until the page shows the newest rows first.
+
+    The order is confirmed from the dates on the page rather than from the
+    header's styling. Returns True only when it is confirmed.
+    """
+    for click in range(max_clicks + 1):
+        order = _is_newest_first([parse_listing_date(d) for d in read_dates()])
+        if order:
+            logger.info(f"[LISTING] {label}: listing sorted newest first after {click} header clicks")
+            return True
+        if order is None or click == max_clicks:
+            break
+        headers = driver.find_elements("xpath", header_xpath)
+        if not headers:
+            break
+        driver.execute_script("arguments[0].click();", headers[0])
+        dom_quiet(driver, timeout=10)
+
+    logger.info(f"[LISTING] {label}: could not confirm a newest-first sort, reading every page")
+    return False
@@ -0,0 +1,223 @@
+"""
+Phase timings and counters for scraper runs.
+
+Scrapers report progress as free-text prints, so finding where a run spends
+its time meant reading logs. A scraper wraps its phases in spans and counts
+what it handles:
+
+    metrics = get_metrics()
+    with metrics.span(LISTING):
+        links = get_bid_links(driver)
+    metrics.count(BIDS_SEEN, len(links))
+
+Some numbers are counted without scraper code:
+- browser round trips of drivers made by ``utils.driver_factory``
+- bids seen and skipped in ``utils.listing`` listings
+- login time in ``utils.sessions``
+- bytes fetched by ``utils.http_fetch``
+
+When a scraper exits, the run is written to ``<date folder>/<scraper>_metrics.json``,
+next to the scraper's ``_COMPLETED`` folder. The master script passes the
+date folder to the scrapers it starts in $BIDS_METRICS_DIR, gathers the files
+of a day into ``run_metrics.json`` with ``collect_run_metrics`` and shows the
+slowest phase per scraper. A scraper run by hand writes its metrics only if
+it names its folder with ``set_folder``.
+
+Spans of the same name add up, and nested spans each count their full
+duration, so phase totals may overlap.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FOLDER_ENV_VAR = "BIDS_METRICS_DIR"
+METRICS_SUFFIX = "_metrics.json"
+RUN_METRICS_FILE = "run_metrics.json"
+
+# Phases
+LOGIN = "login"
+SEARCH = "search"  # Filters and search setup
+LISTING = "listing"
+DETAIL = "detail"
+DOWNLOAD = "download"
+EXCEL = "excel"
+CLEANUP = "cleanup"
+
+# Counters
+BIDS_SEEN = "bids_seen"
+BIDS_SKIPPED = "bids_skipped"
+BIDS_SAVED = "bids_saved"
+BYTES_DOWNLOADED = "bytes_downloaded"
+ROUND_TRIPS = "browser_round_trips"
+RATE_LIMIT_WAIT = "rate_limit_wait_seconds"
+
+
+def default_folder() -> Optional[str]:
+    """The date folder given by the master script, if any."""
+    return os.environ.get(FOLDER_ENV_VAR) or None
+
+
+class RunMetrics:
+    """Phase durations and counters of one scraper run.
+
+    Args:
+        scraper: Scraper name, defaults to the script name.
+        folder: Folder the metrics file is written to, defaults to the date folder.
+    """
+
+    def __init__(self, scraper: Optional[str] = None, folder: Optional[str] = None):
+        script = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python"
+        self.scraper = scraper or os.path.splitext(script)[0]
+        self.folder = folder
+        self.started = time.time()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def set_folder(self, script_folder: str) -> None:
+        """Write next to the given _IN_PROGRESS / _COMPLETED folder."""
+        self.folder = os.path.dirname(os.path.abspath(script_folder))
+
+    @contextmanager
+    def span(self, phase: str):
+        """Time a block as part of a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            totals = self.phases.setdefault(phase, {"seconds": 0.0, "calls": 0})
+            totals["seconds"] += seconds
+            totals["calls"] += 1
+
+    def count(self, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            phases = {name: {"seconds": round(t["seconds"], 3), "calls": t["calls"]} for name, t in self.phases.items()}
+            counters = dict(self.counters)
+        return {
+            "scraper": self.scraper,
+            "pid": os.getpid(),
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "wall_seconds": round(time.time() - self.started, 3),
+            "phases": phases,
+            "counters": counters,
+        }
+
+    @property
+    def path(self) -> Optional[str]:
+        folder = self.folder or default_folder()
+        return os.path.join(folder, f"{self.scraper}{METRICS_SUFFIX}") if folder else None
+
+    def write(self, path: Optional[str] = None) -> str:
+        path = path or self.path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(temp_path, path)
+        return path
+
+    def summary(self) -> str:
+        data = self.to_dict()
+        phases = sorted(data["phases"].items(), key=lambda item: -item[1]["seconds"])
+        parts = [f"{name} {totals['seconds']:.1f}s" for name, totals in phases]
+        counters = [f"{value:g} {name.replace('_', ' ')}" for name, value in sorted(data["counters"].items())]
+        return (
+            f"[METRICS] {self.scraper}: {data['wall_seconds']:.1f}s"
+            + (f"; {', '.join(parts)}" if parts else "")
+            + (f"; {', '.join(counters)}" if counters else "")
+        )
+
+    def finish(self) -> None:
+        """Write the metrics file and log the summary (run at exit).
+
+        Nothing is written when no folder is known, e.g. in tests.
+        """
+        if self.path is None:
+            return
+        try:
+            path = self.write()
+            logger.info(f"{self.summary()} -> {path}")
+        except OSError as e:
+            logger.warning(f"[METRICS] could not write metrics for {self.scraper}: {str(e)}")
+
+
+def instrument_driver(driver, metrics: Optional[RunMetrics] = None):
+    """Count the WebDriver commands a driver sends, i.e. its browser round trips."""
+    metrics = metrics or get_metrics()
+    execute = driver.execute
+
+    def counted_execute(*args, **kwargs):
+        metrics.count(ROUND_TRIPS)
+        return execute(*args, **kwargs)
+
+    driver.execute = counted_execute
+    return driver
+
+
+def collect_run_metrics(date_folder: str) -> Dict:
+    """Gather the metrics files of a day into run_metrics.json.
+
+    Returns:
+        dict: {"scrapers": {name: metrics}, "slowest": {name: [phase, seconds]}}
+    """
+    scrapers = {}
+    try:
+        names = sorted(os.listdir(date_folder))
+    except FileNotFoundError:
+        names = []
+    for name in names:
+        if not name.endswith(METRICS_SUFFIX):
+            continue
+        try:
+            with open(os.path.join(date_folder, name), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        scrapers[data.get("scraper") or name[: -len(METRICS_SUFFIX)]] = data
+
+    slowest = {}
+    for scraper, data in scrapers.items():
+        if data.get("phases"):
+            phase, totals = max(data["phases"].items(), key=lambda item: item[1]["seconds"])
+            slowest[scraper] = [phase, totals["seconds"]]
+
+    run = {"date_folder": os.path.basename(os.path.normpath(date_folder)), "scrapers": scrapers, "slowest": slowest}
+    if scrapers:
+        path = os.path.join(date_folder, RUN_METRICS_FILE)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        os.replace(temp_path, path)
+    return run
+
+
+_shared_metrics: Optional[RunMetrics] = None
+_shared_lock = threading.Lock()
+
+
+def get_metrics() -> RunMetrics:
+    """Return the metrics of the running scraper."""
+    global _shared_metrics
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_metrics = RunMetrics()
+            atexit.register(_shared_metrics.finish)
+        return _shared_metrics
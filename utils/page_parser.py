@@ -0,0 +1,231 @@
+"""
+Shared lxml parsing layer for scrapers that read ``driver.page_source``.
+
+Scrapers used to run ``BeautifulSoup(driver.page_source, "html.parser")`` on
+whole pages, sometimes several times for the same page (once to check a date,
+again to extract the details). Each call serializes the full DOM over the
+WebDriver connection and then walks it with a pure Python parser. This module
+instead:
+
+- takes one page source snapshot per navigation (``ParsedPage.from_driver``)
+  and lets callers pass the parsed page around instead of re-reading it
+- parses with ``lxml.html``
+- compiles XPath expressions once (``compile_xpath`` caches them, and
+  scrapers keep the compiled selectors as module constants)
+- can parse only a region of the document, the way ``SoupStrainer`` limits
+  BeautifulSoup, by cutting the source between two markers first
+
+Selectors are XPath; CSS would need the cssselect package. ``has_class``
+builds the class predicate that BeautifulSoup's ``class_=`` matched.
+
+Set ``BIDS_SAVE_FIXTURES=1`` to save every snapshot taken with a fixture name
+under ``tests/fixtures/pages``, and run
+``python -m utils.page_parser FILE [FILE ...]`` to compare BeautifulSoup,
+full lxml and region parsing on saved pages.
+"""
+
+import os
+import re
+import time
+import logging
+import argparse
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+from lxml import etree
+from lxml import html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_ENV_VAR = "BIDS_SAVE_FIXTURES"
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "pages"
+)
+
+Selector = Union[str, etree.XPath]
+
+
+def has_class(name: str) -> str:
+    """XPath predicate matching elements whose class list contains name."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+@lru_cache(maxsize=512)
+def compile_xpath(expression: str) -> etree.XPath:
+    """Compile an XPath expression once and reuse it."""
+    return etree.XPath(expression)
+
+
+def _xpath(selector: Selector) -> etree.XPath:
+    return compile_xpath(selector) if isinstance(selector, str) else selector
+
+
+def select(node, selector: Selector) -> List:
+    """All matches of selector under node."""
+    return _xpath(selector)(node)
+
+
+def select_one(node, selector: Selector):
+    """First match of selector under node, or None."""
+    matches = _xpath(selector)(node)
+    return matches[0] if matches else None
+
+
+def node_text(node) -> str:
+    """Text of an element and its descendants, like BeautifulSoup's .text."""
+    if node is None:
+        return ""
+    if isinstance(node, str):
+        return str(node).strip()
+    return node.text_content().strip()
+
+
+def block_text(node) -> str:
+    """Text with one line per text node, closer to Selenium's .text for blocks."""
+    if node is None:
+        return ""
+    return "\n".join(part.strip() for part in node.itertext() if part.strip())
+
+
+def cut_region(source: str, region: Tuple[str, Optional[str]]) -> Optional[str]:
+    """Return the part of source from the start marker through the end marker.
+
+    Returns None when the start marker is missing so callers can fall back to
+    the whole document. The end marker is optional; lxml closes any tags left
+    open by the cut.
+    """
+    start_marker, end_marker = region
+    start = source.find(start_marker)
+    if start < 0:
+        return None
+    # Back up to the opening of the tag the marker sits in
+    tag_start = source.rfind("<", 0, start + 1)
+    start = tag_start if tag_start >= 0 else start
+    end = len(source)
+    if end_marker:
+        found = source.find(end_marker, start + len(start_marker))
+        if found >= 0:
+            end = found + len(end_marker)
+    return source[start:end]
+
+
+class ParsedPage:
+    """One parsed snapshot of a page.
+
+    Args:
+        source: HTML of the page.
+        url: URL the source was taken from. Links are left as written.
+        region: Optional (start_marker, end_marker) pair; only that part of
+            the source is parsed. Falls back to the whole page if the start
+            marker is not found.
+    """
+
+    def __init__(self, source: str, url: Optional[str] = None, region: Optional[Tuple[str, Optional[str]]] = None):
+        self.url = url
+        self.source_chars = len(source)
+        start = time.perf_counter()
+        fragment = cut_region(source, region) if region else None
+        self.partial = fragment is not None
+        self.root = lxml_html.fromstring(fragment if fragment is not None else source)
+        self.parse_seconds = time.perf_counter() - start
+
+    @classmethod
+    def from_driver(cls, driver, region=None, fixture: Optional[str] = None) -> "ParsedPage":
+        """Snapshot the driver's current page, reading page_source once.
+
+        fixture names the snapshot, e.g. '02_NYC/detail'; with
+        BIDS_SAVE_FIXTURES set the raw source is saved under that name.
+        """
+        source = driver.page_source
+        if fixture and os.environ.get(FIXTURE_ENV_VAR):
+            save_fixture(source, fixture)
+        return cls(source, url=driver.current_url, region=region)
+
+    def select(self, selector: Selector, context=None) -> List:
+        return select(self.root if context is None else context, selector)
+
+    def select_one(self, selector: Selector, context=None):
+        return select_one(self.root if context is None else context, selector)
+
+    def text(self, selector: Selector, context=None, default: str = "") -> str:
+        """Text of the first match, or default when nothing matches."""
+        node = self.select_one(selector, context)
+        return node_text(node) if node is not None else default
+
+    def attr(self, selector: Selector, name: str, context=None, default: Optional[str] = None) -> Optional[str]:
+        """Attribute of the first match, or default."""
+        node = self.select_one(selector, context)
+        if node is None:
+            return default
+        return node.get(name, default)
+
+    def exists(self, selector: Selector, context=None) -> bool:
+        return self.select_one(selector, context) is not None
+
+
+def save_fixture(source: str, name: str) -> str:
+    """Save page source as tests/fixtures/pages/<name>.html."""
+    safe_name = re.sub(r"[^\w/.-]", "_", name)
+    path = os.path.join(FIXTURE_DIR, f"{safe_name}.html")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(source)
+    logger.info(f"[PARSE] Saved fixture {path}")
+    return path
+
+
+def benchmark_parsers(path: str, repeats: int = 20, region=None) -> List[dict]:
+    """Time BeautifulSoup html.parser, full lxml and region lxml parses of a file."""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+
+    methods = {"lxml": lambda: ParsedPage(source)}
+    if region:
+        methods["lxml-region"] = lambda: ParsedPage(source, region=region)
+    try:
+        from bs4 import BeautifulSoup
+
+        methods["bs4-html.parser"] = lambda: BeautifulSoup(source, "html.parser")
+    except ImportError:
+        logger.warning("BeautifulSoup is not installed, skipping it in the benchmark")
+
+    results = []
+    for method, parse in methods.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            parse()
+        results.append(
+            {
+                "file": os.path.basename(path),
+                "method": method,
+                "ms": (time.perf_counter() - start) * 1000 / repeats,
+                "kb": len(source) / 1024,
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page parsing on saved HTML fixtures")
+    parser.add_argument("files", nargs="*", help="HTML files, defaults to every saved fixture")
+    parser.add_argument("--repeats", type=int, default=20, help="Parses per file and method")
+    parser.add_argument("--region", nargs=2, metavar=("START", "END"), help="Also time a region parse")
+    args = parser.parse_args()
+
+    files = args.files
+    if not files:
+        files = [
+            os.path.join(folder, name)
+            for folder, _, names in os.walk(FIXTURE_DIR)
+            for name in sorted(names)
+            if name.endswith(".html")
+        ]
+
+    print(f"\n{'File':<32} {'Method':<16} {'KB':>8} {'ms/parse':>9}")
+    for path in files:
+        for row in benchmark_parsers(path, args.repeats, tuple(args.region) if args.region else None):
+            print(f"{row['file']:<32} {row['method']:<16} {row['kb']:>8.1f} {row['ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
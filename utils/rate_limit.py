@@ -0,0 +1,190 @@
+"""
+Rate limits per host, shared by every scraper process.
+
+Scrapers paced themselves with sleeps of their own, and BidNet spaced its
+page loads with a budget only its own threads knew about. Processes hitting
+the same host at the same time never knew about each other, e.g. BuySpeed
+copies or Bonfire shards of two runs. Together they went faster than any of
+them meant to, and the portal's anti-bot checks answered with blocks.
+
+RateLimiter keeps a token bucket per hostname in a small SQLite file that
+every process opens. acquire(url) takes a token for the URL's host, sleeping
+until one is due:
+
+    throttle(url)
+    driver.get(url)
+
+A bucket refills at the host's rate and holds up to its burst, so after a
+quiet spell a few requests go out at once before settling to the rate.
+Tokens are reserved when asked for (the balance may go negative), so waiting
+processes are served in order instead of polling.
+
+Rates are requests per minute plus a burst. They come from HOST_RATES; a key
+starting with "." matches every subdomain. $BIDS_RATE_LIMITS overrides them,
+e.g. "www.bidnetdirect.com=30/2,.bonfirehub.com=12" (host=rate[/burst]).
+Hosts without an entry get DEFAULT_RATE. The state file is
+$BIDS_RATE_LIMIT_DB (default: <project root>/rate_limits/buckets.sqlite).
+
+Time spent waiting is added to the run metrics as rate_limit_wait_seconds.
+"""
+
+import os
+import time
+import atexit
+import logging
+import sqlite3
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from utils.metrics import RATE_LIMIT_WAIT, get_metrics
+
+logger = logging.getLogger(__name__)
+
+DB_ENV_VAR = "BIDS_RATE_LIMIT_DB"
+RATES_ENV_VAR = "BIDS_RATE_LIMITS"
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rate_limits", "buckets.sqlite")
+
+DEFAULT_RATE = (60.0, 3)  # Requests per minute, burst
+HOST_RATES: Dict[str, Tuple[float, int]] = {
+    "www.bidnetdirect.com": (30.0, 1),
+    ".bonfirehub.com": (12.0, 1),  # One detail page every 5s per portal
+}
+
+
+def host_of(url: str) -> str:
+    """Hostname of a URL, or the text itself if it is a bare host."""
+    host = urlparse(url).hostname if "//" in url else url.split(":")[0]
+    return (host or url).lower()
+
+
+def parse_rates(text: Optional[str]) -> Dict[str, Tuple[float, int]]:
+    """Parse "host=rate[/burst],..." into {host: (rate, burst)}."""
+    rates = {}
+    for entry in (text or "").split(","):
+        if not entry.strip():
+            continue
+        try:
+            host, value = entry.split("=", 1)
+            rate, _, burst = value.partition("/")
+            rates[host.strip().lower()] = (float(rate), int(burst) if burst else 1)
+        except ValueError:
+            logger.warning(f"[RATE LIMIT] ignoring malformed rate {entry.strip()!r} in ${RATES_ENV_VAR}")
+    return rates
+
+
+class RateLimiter:
+    """Token buckets per host, kept in a SQLite file shared across processes.
+
+    Args:
+        path: SQLite file, defaults to $BIDS_RATE_LIMIT_DB.
+        rates: Extra {host: (requests per minute, burst)} entries.
+        default: Rate and burst of hosts without an entry.
+    """
+
+    def __init__(self, path: Optional[str] = None, rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default: Tuple[float, int] = DEFAULT_RATE):
+        self.path = path or os.environ.get(DB_ENV_VAR) or DEFAULT_DB
+        self.rates = dict(HOST_RATES)
+        self.rates.update(rates or {})
+        self.rates.update(parse_rates(os.environ.get(RATES_ENV_VAR)))
+        self.default = default
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (host TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def configure(self, host: str, per_minute: float, burst: int = 1) -> None:
+        """Set a host's rate for this process, unless $BIDS_RATE_LIMITS sets it."""
+        host = host.lower()
+        if host not in parse_rates(os.environ.get(RATES_ENV_VAR)):
+            self.rates[host] = (float(per_minute), burst)
+
+    def rate_for(self, host: str) -> Tuple[float, int]:
+        """The (requests per minute, burst) of a host."""
+        host = host.lower()
+        if host in self.rates:
+            return self.rates[host]
+        domains = [key for key in self.rates if key.startswith(".") and (host.endswith(key) or host == key[1:])]
+        return self.rates[max(domains, key=len)] if domains else self.default
+
+    def reserve(self, host: str) -> float:
+        """Take a token from the host's bucket; returns seconds until it is due."""
+        per_minute, burst = self.rate_for(host)
+        rate = max(per_minute, 0.001) / 60.0
+        connection = self._connect()
+        try:
+            # Serializes the read-modify-write against other processes
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute("SELECT tokens, updated FROM buckets WHERE host = ?", (host,)).fetchone()
+            now = time.time()
+            tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+            tokens -= 1
+            connection.execute(
+                "INSERT OR REPLACE INTO buckets (host, tokens, updated) VALUES (?, ?, ?)", (host, tokens, now)
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        finally:
+            connection.close()
+        return max(0.0, -tokens / rate)
+
+    def acquire(self, url: str) -> float:
+        """Wait until a request to the URL's host is allowed; returns seconds waited."""
+        host = host_of(url)
+        try:
+            delay = self.reserve(host)
+        except sqlite3.Error as e:
+            logger.warning(f"[RATE LIMIT] {host}: state file unavailable, not throttling: {str(e)}")
+            delay = 0.0
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            totals = self.stats.setdefault(host, {"requests": 0, "waited": 0.0})
+            totals["requests"] += 1
+            totals["waited"] += delay
+        get_metrics().count(RATE_LIMIT_WAIT, delay)
+        return delay
+
+    def summary(self) -> str:
+        with self._lock:
+            parts = [
+                f"{host}: {totals['requests']} requests, waited {totals['waited']:.1f}s"
+                for host, totals in sorted(self.stats.items())
+            ]
+        return f"[RATE LIMIT] {'; '.join(parts) if parts else 'no requests'}"
+
+    def log_summary(self) -> None:
+        if self.stats:
+            logger.info(self.summary())
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+            atexit.register(_shared_limiter.log_summary)
+        return _shared_limiter
+
+
+def throttle(url: str) -> float:
+    """Wait for the URL's host under the shared rate limits; returns seconds waited."""
+    return get_rate_limiter().acquire(url)
@@ -0,0 +1,552 @@
+"""
+Record and replay portal traffic for offline scraper runs and benchmarks.
+
+Measuring a scraper used to mean running it against the live portals, whose
+content and speed change from one run to the next. This module puts a local
+HTTP(S) proxy between the scraper and the network:
+
+- ``record`` forwards every request to the real site and saves the request
+  and response, downloads included, in a recording.
+- ``replay`` answers the same requests from the recording without any
+  network access. A request that was recorded several times (pagination
+  postbacks, polling) gets the recorded responses in order.
+
+HTTPS is intercepted with certificates issued on the fly by a local CA
+(made with the ``openssl`` command line tool). Chrome created through
+``utils.driver_factory`` uses the proxy and ignores certificate errors while
+``$BIDS_REPLAY_PROXY`` is set. ``requests`` and ``httpx`` use it through the
+standard ``HTTPS_PROXY`` and ``REQUESTS_CA_BUNDLE`` / ``SSL_CERT_FILE``
+variables.
+
+Recordings live in ``recordings/<name>/`` in the project root (or
+``$BIDS_REPLAY_DIR``). ``exchanges.jsonl`` holds one line per request, and
+bodies are stored under ``bodies/`` by their SHA-256. Recording again under
+the same name starts a new ``exchanges.jsonl`` and keeps the previous one as
+``exchanges-<time>.jsonl``, so a replay serves the latest capture; pass
+``--append`` to add to the existing one instead. HAR files saved from
+Chrome DevTools can be imported, and recordings exported, with
+``import-har`` / ``export-har``.
+
+Every run made through the command line is appended to ``runs.jsonl``:
+wall time, requests served, misses and exit code. ``compare`` prints them
+side by side::
+
+    python -m utils.replay record sandiego -- python scrapers/20_County_of_San_Diego.py
+    python -m utils.replay replay sandiego -- python scrapers/20_County_of_San_Diego.py
+    python -m utils.replay compare sandiego
+
+Only scrapers whose Chrome comes from ``utils.driver_factory`` send their
+browser traffic through the proxy; scrapers that build their own
+ChromeOptions (e.g. Texas SmartBuy) only send their ``requests`` traffic.
+Loopback addresses stay in ``NO_PROXY``, so Selenium's commands to the local
+chromedriver never go through the proxy.
+
+Scrapers compute their date windows from today's date, so pass a ``--days``
+that reaches back to the recording day when replaying it later.
+"""
+
+import os
+import ssl
+import sys
+import json
+import time
+import base64
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+FOLDER_ENV_VAR = "BIDS_REPLAY_DIR"
+PROXY_ENV_VAR = "BIDS_REPLAY_PROXY"
+DEFAULT_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "recordings")
+RECORD = "record"
+REPLAY = "replay"
+UPSTREAM_TIMEOUT = 60
+
+# Selenium talks to chromedriver over loopback; that must never be recorded
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+# Connection-level headers that are not passed through the proxy
+HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-connection", "proxy-authorization", "proxy-authenticate",
+    "te", "trailer", "transfer-encoding", "upgrade", "content-length",
+}
+
+
+def recording_folder(name: str, folder: Optional[str] = None) -> str:
+    return os.path.join(folder or os.environ.get(FOLDER_ENV_VAR) or DEFAULT_FOLDER, name)
+
+
+def body_hash(body: Optional[bytes]) -> str:
+    return hashlib.sha256(body or b"").hexdigest()
+
+
+class Recording:
+    """Saved request/response exchanges of one scraper run.
+
+    Args:
+        path: Folder of the recording; created on the first add().
+        fresh: Move an existing index aside and start an empty one.
+    """
+
+    def __init__(self, path: str, fresh: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self.exchanges: List[Dict] = []
+        self._by_key: Dict[Tuple[str, str, str], List[Dict]] = {}
+        self._served: Dict[Tuple[str, str, str], int] = {}
+        self.hits = 0
+        self.misses: List[str] = []
+        if fresh:
+            self._set_aside()
+        self._load()
+
+    @staticmethod
+    def key(method: str, url: str, request_body: Optional[bytes] = None) -> Tuple[str, str, str]:
+        return method.upper(), url, body_hash(request_body) if method.upper() not in ("GET", "HEAD") else ""
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.path, "exchanges.jsonl")
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.path, "bodies", digest[:2], digest)
+
+    def _set_aside(self) -> None:
+        """Keep the current index as exchanges-<time>.jsonl; bodies are shared."""
+        if not os.path.exists(self.index_path):
+            return
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        old_path = os.path.join(self.path, f"exchanges-{stamp}.jsonl")
+        counter = 1
+        while os.path.exists(old_path):
+            old_path = os.path.join(self.path, f"exchanges-{stamp}-{counter}.jsonl")
+            counter += 1
+        os.replace(self.index_path, old_path)
+        logger.info(f"[REPLAY] Previous recording kept as {old_path}")
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+        except FileNotFoundError:
+            pass
+
+    def _index(self, exchange: Dict) -> None:
+        self.exchanges.append(exchange)
+        key = (exchange["method"], exchange["url"], exchange.get("request_hash", ""))
+        self._by_key.setdefault(key, []).append(exchange)
+
+    def add(self, method: str, url: str, request_body: Optional[bytes], status: int,
+            headers: List[Tuple[str, str]], body: bytes, seconds: float = 0.0) -> Dict:
+        """Save one exchange; bodies are stored once per content."""
+        digest = body_hash(body)
+        key = self.key(method, url, request_body)
+        exchange = {
+            "method": key[0],
+            "url": url,
+            "request_hash": key[2],
+            "status": status,
+            "headers": [[name, value] for name, value in headers],
+            "body": digest,
+            "size": len(body),
+            "seconds": round(seconds, 4),
+        }
+        with self._lock:
+            body_path = self._body_path(digest)
+            if not os.path.exists(body_path):
+                os.makedirs(os.path.dirname(body_path), exist_ok=True)
+                with open(body_path, "wb") as f:
+                    f.write(body)
+            os.makedirs(self.path, exist_ok=True)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(exchange) + "\n")
+            self._index(exchange)
+        return exchange
+
+    def body(self, exchange: Dict) -> bytes:
+        with open(self._body_path(exchange["body"]), "rb") as f:
+            return f.read()
+
+    def lookup(self, method: str, url: str, request_body: Optional[bytes] = None) -> Optional[Dict]:
+        """The next recorded response for a request; the last one repeats."""
+        key = self.key(method, url, request_body)
+        with self._lock:
+            candidates = self._by_key.get(key)
+            if not candidates:
+                self.misses.append(f"{key[0]} {url}")
+                return None
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            self.hits += 1
+            return candidates[min(served, len(candidates) - 1)]
+
+    def import_har(self, har_path: str) -> int:
+        """Add the entries of a HAR file (e.g. saved from Chrome DevTools); returns the count."""
+        with open(har_path, encoding="utf-8") as f:
+            har = json.load(f)
+        count = 0
+        for entry in har.get("log", {}).get("entries", []):
+            request, response = entry["request"], entry["response"]
+            content = response.get("content", {})
+            text = content.get("text") or ""
+            body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+            post_text = (request.get("postData") or {}).get("text")
+            headers = [
+                (h["name"], h["value"]) for h in response.get("headers", [])
+                # HAR bodies are already decoded
+                if h["name"].lower() not in HOP_HEADERS and h["name"].lower() != "content-encoding"
+            ]
+            self.add(request["method"], request["url"], post_text.encode("utf-8") if post_text else None,
+                     response["status"], headers, body, (entry.get("time") or 0) / 1000)
+            count += 1
+        return count
+
+    def export_har(self, har_path: str) -> int:
+        """Write the recording as a HAR file for browser tools; returns the entry count."""
+        entries = []
+        for exchange in self.exchanges:
+            content_type = next((v for n, v in exchange["headers"] if n.lower() == "content-type"), "")
+            entries.append({
+                "startedDateTime": datetime.now(timezone.utc).isoformat(),
+                "time": exchange.get("seconds", 0) * 1000,
+                "request": {"method": exchange["method"], "url": exchange["url"], "httpVersion": "HTTP/1.1",
+                            "headers": [], "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1},
+                "response": {
+                    "status": exchange["status"], "statusText": "", "httpVersion": "HTTP/1.1",
+                    "headers": [{"name": n, "value": v} for n, v in exchange["headers"]], "cookies": [],
+                    "content": {"size": exchange["size"], "mimeType": content_type, "encoding": "base64",
+                                "text": base64.b64encode(self.body(exchange)).decode("ascii")},
+                    "redirectURL": "", "headersSize": -1, "bodySize": exchange["size"],
+                },
+                "cache": {},
+                "timings": {"send": 0, "wait": exchange.get("seconds", 0) * 1000, "receive": 0},
+            })
+        with open(har_path, "w", encoding="utf-8") as f:
+            json.dump({"log": {"version": "1.2", "creator": {"name": "utils.replay", "version": "1"},
+                               "entries": entries}}, f)
+        return len(entries)
+
+
+class CertificateAuthority:
+    """Local CA issuing a certificate per intercepted host with openssl."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.ca_cert = os.path.join(folder, "ca.pem")
+        self.ca_key = os.path.join(folder, "ca.key")
+        self._lock = threading.Lock()
+        self._contexts: Dict[str, ssl.SSLContext] = {}
+
+    def _openssl(self, *args, stdin: Optional[bytes] = None) -> bytes:
+        return subprocess.run(["openssl", *args], input=stdin, capture_output=True, check=True).stdout
+
+    def ensure(self) -> str:
+        """Create the CA on first use; returns the CA certificate path for clients to trust."""
+        with self._lock:
+            if not os.path.exists(self.ca_cert):
+                os.makedirs(self.folder, exist_ok=True)
+                self._openssl(
+                    "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+                    "-keyout", self.ca_key, "-out", self.ca_cert, "-subj", "/CN=bids replay CA",
+                    "-addext", "basicConstraints=critical,CA:TRUE",
+                    "-addext", "keyUsage=critical,keyCertSign,cRLSign",
+                )
+        return self.ca_cert
+
+    def context(self, host: str) -> ssl.SSLContext:
+        """Server-side TLS context with a certificate for host."""
+        self.ensure()
+        with self._lock:
+            if host not in self._contexts:
+                safe_host = "".join(c if c.isalnum() or c in ".-" else "_" for c in host)
+                cert = os.path.join(self.folder, "hosts", f"{safe_host}.pem")
+                key = os.path.join(self.folder, "hosts", f"{safe_host}.key")
+                if not os.path.exists(cert):
+                    os.makedirs(os.path.dirname(cert), exist_ok=True)
+                    csr = self._openssl("req", "-new", "-newkey", "rsa:2048", "-nodes", "-keyout", key,
+                                        "-subj", f"/CN={host}")
+                    san = f"IP:{host}" if host.replace(".", "").isdigit() else f"DNS:{host}"
+                    with tempfile.NamedTemporaryFile("w", suffix=".ext", delete=False) as ext:
+                        ext.write(f"subjectAltName={san}\nbasicConstraints=CA:FALSE\n"
+                                  "keyUsage=digitalSignature,keyEncipherment\nextendedKeyUsage=serverAuth\n"
+                                  "authorityKeyIdentifier=keyid\nsubjectKeyIdentifier=hash\n")
+                    try:
+                        self._openssl("x509", "-req", "-CA", self.ca_cert, "-CAkey", self.ca_key,
+                                      "-set_serial", str(int(time.time() * 1000)), "-days", "825",
+                                      "-extfile", ext.name, "-out", cert, stdin=csr)
+                    finally:
+                        os.remove(ext.name)
+                context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+                context.load_cert_chain(cert, key)
+                self._contexts[host] = context
+            return self._contexts[host]
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Records or replays each request received as a proxy or inside a CONNECT tunnel."""
+
+    protocol_version = "HTTP/1.1"
+    tunnel_host: Optional[str] = None
+
+    def do_CONNECT(self):
+        host, _, port = self.path.partition(":")
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        try:
+            self.connection = self.server.ca.context(host).wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"[REPLAY] TLS setup for {host} failed: {str(e)}")
+            self.close_connection = True
+            return
+        self.rfile = self.connection.makefile("rb", self.rbufsize)
+        self.wfile = self.connection.makefile("wb", 0)
+        self.tunnel_host = host if port in ("", "443") else self.path
+        self.close_connection = False
+        while not self.close_connection:
+            self.handle_one_request()
+
+    def _url(self) -> str:
+        if self.tunnel_host:
+            return f"https://{self.tunnel_host}{self.path}"
+        if self.path.startswith(("http://", "https://")):
+            return self.path
+        return f"http://{self.headers.get('Host', '')}{self.path}"
+
+    def _handle(self):
+        url = self._url()
+        length = int(self.headers.get("Content-Length") or 0)
+        request_body = self.rfile.read(length) if length else None
+
+        if self.server.mode == RECORD:
+            try:
+                status, headers, body, seconds = self._forward(url, request_body)
+            except (OSError, http.client.HTTPException) as e:
+                logger.warning(f"[REPLAY] {self.command} {url} failed upstream: {str(e)}")
+                self._send(502, [("Content-Type", "text/plain")], str(e).encode("utf-8"))
+                return
+            self.server.recording.add(self.command, url, request_body, status, headers, body, seconds)
+        else:
+            exchange = self.server.recording.lookup(self.command, url, request_body)
+            if exchange is None:
+                logger.warning(f"[REPLAY] not recorded: {self.command} {url}")
+                self._send(404, [("Content-Type", "text/plain")], b"Not in the recording")
+                return
+            status, headers, body = exchange["status"], exchange["headers"], self.server.recording.body(exchange)
+        self._send(status, headers, body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = do_PATCH = _handle
+
+    def _forward(self, url: str, request_body: Optional[bytes]):
+        parts = urlsplit(url)
+        if parts.scheme == "https":
+            connection = http.client.HTTPSConnection(parts.netloc, timeout=UPSTREAM_TIMEOUT,
+                                                     context=ssl.create_default_context())
+        else:
+            connection = http.client.HTTPConnection(parts.netloc, timeout=UPSTREAM_TIMEOUT)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in HOP_HEADERS}
+        start = time.perf_counter()
+        try:
+            connection.request(self.command, path, body=request_body, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+        finally:
+            connection.close()
+        response_headers = [(n, v) for n, v in response.getheaders() if n.lower() not in HOP_HEADERS]
+        return response.status, response_headers, body, time.perf_counter() - start
+
+    def _send(self, status: int, headers, body: bytes):
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() not in HOP_HEADERS:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"[REPLAY] {format % args}")
+
+
+class ReplayProxy:
+    """Local proxy that records traffic into, or replays it from, a recording.
+
+    Args:
+        recording: Recording to write to or read from.
+        mode: RECORD or REPLAY.
+        port: Port to listen on, 0 for any free one.
+        ca_folder: Where the CA and host certificates are kept, defaults to
+            the recordings folder so every recording shares one CA.
+    """
+
+    def __init__(self, recording: Recording, mode: str = REPLAY, port: int = 0, ca_folder: Optional[str] = None):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.recording = recording
+        self.mode = mode
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), ProxyHandler)
+        self.server.daemon_threads = True
+        self.server.recording = recording
+        self.server.mode = mode
+        self.server.ca = CertificateAuthority(ca_folder or os.path.join(os.path.dirname(recording.path), "ca"))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self) -> "ReplayProxy":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"[REPLAY] {self.mode} proxy for {self.recording.path} on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "ReplayProxy":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables that send a scraper's traffic through the proxy."""
+        no_proxy = [host.strip() for host in os.environ.get("NO_PROXY", os.environ.get("no_proxy", "")).split(",")]
+        no_proxy = [host for host in no_proxy if host] + [host for host in LOOPBACK_HOSTS if host not in no_proxy]
+        env = {PROXY_ENV_VAR: self.url, "NO_PROXY": ",".join(no_proxy), "no_proxy": ",".join(no_proxy)}
+        for name in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+            env[name] = self.url
+        try:
+            ca_cert = self.server.ca.ensure()
+            env.update(REQUESTS_CA_BUNDLE=ca_cert, SSL_CERT_FILE=ca_cert)
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"[REPLAY] No CA for HTTPS interception, only plain HTTP is covered: {str(e)}")
+        return env
+
+
+def chrome_arguments() -> List[str]:
+    """Chrome arguments for the proxy in $BIDS_REPLAY_PROXY, if any (used by driver_factory)."""
+    proxy = os.environ.get(PROXY_ENV_VAR)
+    if not proxy:
+        return []
+    return [f"--proxy-server={proxy}", "--proxy-bypass-list=<-loopback>", "--ignore-certificate-errors"]
+
+
+def run_command(name: str, mode: str, command: List[str], folder: Optional[str] = None,
+                append: bool = False) -> Dict:
+    """Run a command through the proxy and append its timings to runs.jsonl.
+
+    Recording starts from an empty index unless append is set.
+    """
+    recording = Recording(recording_folder(name, folder), fresh=mode == RECORD and not append)
+    with ReplayProxy(recording, mode) as proxy:
+        env = dict(os.environ, **proxy.environment())
+        start = time.perf_counter()
+        exit_code = subprocess.call(command, env=env)
+        seconds = time.perf_counter() - start
+
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                  text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = ""
+    run = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "mode": mode,
+        "command": " ".join(command),
+        "revision": revision,
+        "seconds": round(seconds, 2),
+        "exit_code": exit_code,
+        "exchanges": len(recording.exchanges),
+        "served": recording.hits,
+        "misses": len(recording.misses),
+    }
+    os.makedirs(recording.path, exist_ok=True)
+    with open(os.path.join(recording.path, "runs.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+    for miss in recording.misses[:20]:
+        print(f"  not recorded: {miss}")
+    return run
+
+
+def load_runs(name: str, folder: Optional[str] = None) -> List[Dict]:
+    try:
+        with open(os.path.join(recording_folder(name, folder), "runs.jsonl"), encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay scraper traffic")
+    commands = parser.add_subparsers(dest="action", required=True)
+    for action in (RECORD, REPLAY):
+        sub = commands.add_parser(action, help=f"{action.capitalize()} a command's traffic")
+        sub.add_argument("name", help="Recording name")
+        if action == RECORD:
+            sub.add_argument("--append", action="store_true", help="Add to the existing recording")
+        sub.add_argument("command", nargs=argparse.REMAINDER, help="-- command to run")
+    serve = commands.add_parser("serve", help="Only run the proxy, e.g. for a debugger")
+    serve.add_argument("name")
+    serve.add_argument("--mode", choices=(RECORD, REPLAY), default=REPLAY)
+    serve.add_argument("--port", type=int, default=8899)
+    serve.add_argument("--append", action="store_true", help="In record mode, add to the existing recording")
+    compare = commands.add_parser("compare", help="Show the runs of a recording")
+    compare.add_argument("name")
+    for action in ("import-har", "export-har"):
+        sub = commands.add_parser(action, help=f"{action.split('-')[0].capitalize()} a HAR file")
+        sub.add_argument("name")
+        sub.add_argument("har")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.action in (RECORD, REPLAY):
+        command = args.command[1:] if args.command[:1] == ["--"] else args.command
+        if not command:
+            parser.error("give the command to run after --")
+        run = run_command(args.name, args.action, command, append=getattr(args, "append", False))
+        print(f"{run['mode']}: {run['seconds']:.1f}s, exit {run['exit_code']}, "
+              f"{run['exchanges']} exchanges, {run['served']} served, {run['misses']} not recorded")
+        sys.exit(run["exit_code"])
+    elif args.action == "serve":
+        recording = Recording(recording_folder(args.name), fresh=args.mode == RECORD and not args.append)
+        proxy = ReplayProxy(recording, args.mode, args.port).start()
+        for name, value in proxy.environment().items():
+            print(f"{name}={value}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            proxy.stop()
+    elif args.action == "compare":
+        print(f"{'Time':<20} {'Mode':<7} {'Rev':<9} {'Seconds':>8} {'Exit':>5} {'Served':>7} {'Misses':>7}  Command")
+        for run in load_runs(args.name):
+            print(f"{run['time']:<20} {run['mode']:<7} {run['revision']:<9} {run['seconds']:>8.1f} "
+                  f"{run['exit_code']:>5} {run['served']:>7} {run['misses']:>7}  {run['command']}")
+    else:
+        recording = Recording(recording_folder(args.name))
+        if args.action == "import-har":
+            print(f"Imported {recording.import_har(args.har)} entries")
+        else:
+            print(f"Exported {recording.export_har(args.har)} entries")
+
+
+if __name__ == "__main__":
+    main()
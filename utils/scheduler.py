@@ -0,0 +1,243 @@
+"""
+Runs scrapers on a fixed number of slots, starting the next one as soon as a slot frees.
+
+The master script took four scripts off its queue, started them and joined
+all four before taking the next four. One slow scraper (BidNet, Connecticut)
+left the other three slots idle until it finished. Finished scripts also
+started more scripts themselves, racing the batch loop for the same queue.
+
+Scheduler has one dispatch loop. Each job runs in a thread of its own, and
+a finished job hands its slot back through a queue, which wakes the loop to
+start the next ready job straight away:
+
+    scheduler = Scheduler(4, run_script)
+    scheduler.add("scrapers/17_BidNet.py", priority=10)
+    scheduler.add("scrapers/02_NYC.py")
+    scheduler.add("reports.py", after=["scrapers/02_NYC.py"], requires=["2026-10-18/02_NYC_metrics.json"])
+    scheduler.run()
+    print(scheduler.summary())
+
+Ready jobs start in order of priority (higher first), then in the order they
+were added. A job is ready when the jobs it runs ``after`` have finished
+(successfully or not) or been skipped, and the files it ``requires`` exist.
+A job that can never become ready is skipped: its dependency is unknown or
+part of a cycle, or its files are still missing once nothing else runs.
+
+The report records when each job waited, ran and on which slot, and how
+busy each slot was; utilization is the busy share of slots x wall time.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+SKIPPED = "skipped"
+
+
+@dataclass
+class Job:
+    """One script to run and the conditions it waits for."""
+
+    name: str
+    priority: int = 0
+    after: Sequence[str] = ()
+    requires: Sequence[str] = ()
+    order: int = 0
+    state: str = PENDING
+    ok: Optional[bool] = None
+    slot: Optional[int] = None
+    started: float = 0.0
+    finished: float = 0.0
+    reason: str = ""
+
+    @property
+    def seconds(self) -> float:
+        return self.finished - self.started if self.finished else 0.0
+
+
+@dataclass
+class _Slot:
+    busy: float = 0.0
+    jobs: List[str] = field(default_factory=list)
+
+
+class Scheduler:
+    """Work-conserving dispatcher of jobs over a fixed number of slots.
+
+    Args:
+        slots: Number of jobs that may run at once.
+        runner: runner(name) runs a job to completion; a falsy result or an
+            exception marks it failed. Jobs still run after failed ones.
+        poll: Seconds between checks for required files while waiting.
+    """
+
+    def __init__(self, slots: int, runner: Callable[[str], object], poll: float = 5.0):
+        self.slots = max(1, slots)
+        self.runner = runner
+        self.poll = poll
+        self.jobs: Dict[str, Job] = {}
+        self.started = 0.0
+        self.finished = 0.0
+        self._slots = {number: _Slot() for number in range(1, self.slots + 1)}
+        self._done: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._stopping = threading.Event()
+
+    def add(self, name: str, priority: int = 0, after: Sequence[str] = (),
+            requires: Sequence[str] = ()) -> Job:
+        """Queue a job; returns it."""
+        if name in self.jobs:
+            raise ValueError(f"{name} is already scheduled")
+        job = Job(name, priority, tuple(after), tuple(requires), order=len(self.jobs))
+        self.jobs[name] = job
+        return job
+
+    def stop(self) -> None:
+        """Start no more jobs; run() returns once the running ones finish."""
+        self._stopping.set()
+        self._done.put(None)
+
+    def _blocked_by(self, job: Job) -> Optional[str]:
+        """Why a pending job cannot start yet, None if it can."""
+        for name in job.after:
+            if name not in self.jobs:
+                return f"unknown dependency {name}"
+            if self.jobs[name].state in (PENDING, RUNNING):
+                return f"waiting for {name}"
+        for path in job.requires:
+            if not os.path.exists(path):
+                return f"waiting for {path}"
+        return None
+
+    def _skip(self, job: Job, reason: str) -> None:
+        job.state = SKIPPED
+        job.reason = reason
+        logger.warning(f"[SCHEDULER] skipping {job.name}: {reason}")
+
+    def _start(self, job: Job, slot: int) -> None:
+        job.state = RUNNING
+        job.slot = slot
+        job.started = time.monotonic()
+        logger.info(f"[SCHEDULER] slot {slot}: starting {job.name}")
+
+        def work():
+            try:
+                job.ok = bool(self.runner(job.name))
+            except Exception as e:
+                logger.error(f"[SCHEDULER] {job.name} failed: {str(e)}")
+                job.ok = False
+            finally:
+                job.finished = time.monotonic()
+                self._done.put(job)
+
+        threading.Thread(target=work, name=f"slot-{slot}", daemon=True).start()
+
+    def run(self) -> Dict:
+        """Run every job, keeping all slots busy while jobs are ready; returns the report."""
+        self.started = time.monotonic()
+        free = list(range(1, self.slots + 1))
+        running = 0
+
+        while True:
+            pending = [job for job in self.jobs.values() if job.state == PENDING]
+            if self._stopping.is_set():
+                for job in pending:
+                    self._skip(job, "stopped")
+                pending = []
+
+            waiting = {}
+            for job in sorted(pending, key=lambda j: (-j.priority, j.order)):
+                reason = self._blocked_by(job)
+                if reason is None and free:
+                    free.sort()
+                    self._start(job, free.pop(0))
+                    running += 1
+                elif reason is not None:
+                    waiting[job.name] = reason
+
+            if running == 0:
+                blocked = [job for job in pending if job.state == PENDING]
+                if not blocked:
+                    break
+                # Nothing left that could finish a dependency or make a file
+                for job in blocked:
+                    self._skip(job, waiting.get(job.name) or "dependency cycle")
+                continue
+
+            try:
+                # Bounded, so required files are checked again and Ctrl+C gets through
+                job = self._done.get(timeout=self.poll)
+            except queue.Empty:
+                continue
+            while job is not None:
+                job.state = DONE
+                slot = self._slots[job.slot]
+                slot.busy += job.seconds
+                slot.jobs.append(job.name)
+                free.append(job.slot)
+                running -= 1
+                logger.info(
+                    f"[SCHEDULER] slot {job.slot}: {job.name} {'finished' if job.ok else 'failed'} "
+                    f"after {job.seconds:.0f}s"
+                )
+                try:
+                    job = self._done.get_nowait()
+                except queue.Empty:
+                    job = None
+
+        self.finished = time.monotonic()
+        return self.report()
+
+    def report(self) -> Dict:
+        """Wall time, slot utilization and per-job timings of the last run."""
+        wall = max((self.finished or time.monotonic()) - self.started, 0.0) if self.started else 0.0
+        busy = sum(slot.busy for slot in self._slots.values())
+        return {
+            "slots": self.slots,
+            "wall_seconds": round(wall, 1),
+            "busy_seconds": round(busy, 1),
+            "utilization": round(busy / (wall * self.slots), 3) if wall else 0.0,
+            "per_slot": {
+                number: {
+                    "busy_seconds": round(slot.busy, 1),
+                    "utilization": round(slot.busy / wall, 3) if wall else 0.0,
+                    "jobs": slot.jobs,
+                }
+                for number, slot in self._slots.items()
+            },
+            "jobs": {
+                job.name: {
+                    "state": job.state,
+                    "ok": job.ok,
+                    "slot": job.slot,
+                    "priority": job.priority,
+                    "waited_seconds": round(job.started - self.started, 1) if job.started else None,
+                    "seconds": round(job.seconds, 1),
+                    "reason": job.reason,
+                }
+                for job in self.jobs.values()
+            },
+        }
+
+    def summary(self) -> str:
+        data = self.report()
+        ran = sum(1 for job in self.jobs.values() if job.state == DONE)
+        skipped = sum(1 for job in self.jobs.values() if job.state == SKIPPED)
+        slots = [
+            f"slot {number} {totals['utilization']:.0%} ({len(totals['jobs'])} jobs)"
+            for number, totals in data["per_slot"].items()
+        ]
+        return (
+            f"[SCHEDULER] {ran} jobs on {self.slots} slots in {data['wall_seconds']:.0f}s, "
+            f"{data['utilization']:.0%} utilized"
+            + (f", {skipped} skipped" if skipped else "")
+            + f"; {', '.join(slots)}"
+        )
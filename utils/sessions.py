@@ -0,0 +1,306 @@
+"""
+Persistent login sessions shared across scrapers, shards and runs.
+
+Logging in is one of the slowest and flakiest steps of a run. The session
+vault keeps the cookies and local storage of a logged-in browser per portal
+and account, with an expiry, in ``sessions/`` in the project root (or
+``$BIDS_SESSION_DIR``). ``SessionVault.ensure`` restores a saved session into
+a new browser and checks it with a cheap authenticated probe; only when there
+is no session or the probe fails does it run the scraper's full login and
+save the result.
+
+Concurrent scrapers or shards for the same portal and account take a lock
+file while logging in, so one logs in and the others wait and reuse its
+session. Each run logs a ``[SESSION]`` summary of logins skipped versus
+performed.
+
+The files hold live session cookies; keep the folder out of version control.
+"""
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from utils.metrics import LOGIN, get_metrics
+
+logger = logging.getLogger(__name__)
+
+FOLDER_ENV_VAR = "BIDS_SESSION_DIR"
+DEFAULT_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sessions")
+DEFAULT_MAX_AGE = 8 * 60 * 60  # Seconds a saved session is trusted before logging in again
+LOCK_TIMEOUT = 10 * 60  # A login lock older than this is considered abandoned
+POLL_INTERVAL = 1
+
+LOCAL_STORAGE_SCRIPT = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return {origin: window.location.origin, items: items};
+"""
+
+RESTORE_LOCAL_STORAGE_SCRIPT = """
+var items = arguments[0];
+for (var key in items) { window.localStorage.setItem(key, items[key]); }
+return Object.keys(items).length;
+"""
+
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "expiry", "sameSite")
+
+
+def session_key(portal: str, account: Optional[str]) -> str:
+    """File name for a portal and account; the account is hashed, not stored."""
+    account_hash = hashlib.sha256((account or "").strip().lower().encode("utf-8")).hexdigest()[:12]
+    safe_portal = "".join(c if c.isalnum() or c in "-_" else "_" for c in portal)
+    return f"{safe_portal}-{account_hash}"
+
+
+def cookie_matches(cookie: Dict, host: str) -> bool:
+    """True if the browser accepts the cookie while a page of host is loaded."""
+    domain = cookie.get("domain", "").lstrip(".").lower()
+    return bool(domain) and (host == domain or host.endswith("." + domain))
+
+
+class SessionVault:
+    """Stores and restores logged-in browser sessions.
+
+    Args:
+        folder: Where sessions are stored, defaults to sessions/.
+        max_age: Seconds a saved session is used before a fresh login.
+    """
+
+    def __init__(self, folder: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE):
+        self.folder = folder or os.environ.get(FOLDER_ENV_VAR) or DEFAULT_FOLDER
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _path(self, key: str, extension: str = ".json") -> str:
+        return os.path.join(self.folder, f"{key}{extension}")
+
+    def _count(self, portal: str, outcome: str) -> None:
+        with self._lock:
+            counts = self.stats.setdefault(portal, {"skipped": 0, "performed": 0, "failed": 0})
+            counts[outcome] += 1
+
+    def load(self, portal: str, account: Optional[str]) -> Optional[Dict]:
+        """The saved session, or None if there is none or it has expired."""
+        try:
+            with open(self._path(session_key(portal, account)), encoding="utf-8") as f:
+                record = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if record.get("expires") and time.time() >= record["expires"]:
+            logger.info(f"[SESSION] {portal}: saved session expired")
+            return None
+        return record
+
+    def save(self, driver, portal: str, account: Optional[str], max_age: Optional[float] = None) -> Dict:
+        """Save the cookies and local storage of a logged-in browser."""
+        saved = time.time()
+        cookies = [{k: c[k] for k in COOKIE_FIELDS if k in c} for c in driver.get_cookies()]
+        local_storage = {}
+        try:
+            storage = driver.execute_script(LOCAL_STORAGE_SCRIPT)
+            if storage and storage.get("items"):
+                local_storage[storage["origin"]] = storage["items"]
+        except Exception as e:
+            logger.debug(f"[SESSION] {portal}: could not read local storage: {str(e)}")
+
+        expires = saved + (self.max_age if max_age is None else max_age)
+        # Never trust the session longer than its longest-lived cookie
+        cookie_expiries = [c["expiry"] for c in cookies if c.get("expiry")]
+        if cookie_expiries:
+            expires = min(expires, max(cookie_expiries))
+
+        record = {
+            "portal": portal,
+            "key": session_key(portal, account),
+            "saved": saved,
+            "expires": expires,
+            "cookies": cookies,
+            "local_storage": local_storage,
+        }
+        os.makedirs(self.folder, exist_ok=True)
+        path = self._path(record["key"])
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(temp_path, path)
+        logger.info(f"[SESSION] {portal}: saved session with {len(cookies)} cookies")
+        return record
+
+    def invalidate(self, portal: str, account: Optional[str]) -> None:
+        try:
+            os.remove(self._path(session_key(portal, account)))
+        except FileNotFoundError:
+            pass
+
+    def restore(self, driver, record: Dict, url: str) -> int:
+        """Load a saved session into a browser; returns the number of cookies added.
+
+        Selenium only accepts cookies for the domain currently loaded, so url
+        is opened first. Cookies of other domains (such as an identity
+        provider) are left out.
+        """
+        driver.get(url)
+        host = urlparse(driver.current_url or url).netloc.lower()
+        now = time.time()
+        added = 0
+        for cookie in record.get("cookies", []):
+            if cookie.get("expiry") and cookie["expiry"] <= now:
+                continue
+            if not cookie_matches(cookie, host):
+                continue
+            try:
+                driver.add_cookie(cookie)
+                added += 1
+            except Exception as e:
+                logger.debug(f"[SESSION] could not restore cookie {cookie.get('name')}: {str(e)}")
+
+        origin = "{0.scheme}://{0.netloc}".format(urlparse(driver.current_url or url))
+        items = record.get("local_storage", {}).get(origin)
+        if items:
+            try:
+                driver.execute_script(RESTORE_LOCAL_STORAGE_SCRIPT, items)
+            except Exception as e:
+                logger.debug(f"[SESSION] could not restore local storage for {origin}: {str(e)}")
+        return added
+
+    @contextmanager
+    def login_lock(self, portal: str, account: Optional[str], timeout: float = LOCK_TIMEOUT):
+        """Hold the cross-process login lock for a portal and account.
+
+        Waits up to timeout for another process to finish logging in, then
+        takes the lock anyway.
+        """
+        key = session_key(portal, account)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            os.makedirs(self.folder, exist_ok=True)
+            lock_path = self._path(key, ".lock")
+            deadline = time.time() + timeout
+            acquired = False
+            while not acquired:
+                try:
+                    fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+                    os.write(fd, str(os.getpid()).encode())
+                    os.close(fd)
+                    acquired = True
+                except FileExistsError:
+                    try:
+                        stale = time.time() - os.path.getmtime(lock_path) > timeout
+                    except FileNotFoundError:
+                        continue
+                    if stale or time.time() >= deadline:
+                        logger.warning(f"[SESSION] {portal}: taking over the login lock")
+                        try:
+                            os.remove(lock_path)
+                        except FileNotFoundError:
+                            pass
+                        continue
+                    time.sleep(POLL_INTERVAL)
+            try:
+                yield
+            finally:
+                try:
+                    os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+
+    def _try_saved(self, driver, portal: str, account: Optional[str], url: str,
+                   probe: Callable, saved_after: float = 0) -> bool:
+        record = self.load(portal, account)
+        if record is None or record["saved"] <= saved_after:
+            return False
+        try:
+            added = self.restore(driver, record, url)
+            if added and probe(driver):
+                age = (time.time() - record["saved"]) / 60
+                logger.info(f"[SESSION] {portal}: reused session saved {age:.0f} minutes ago, login skipped")
+                return True
+        except Exception as e:
+            logger.warning(f"[SESSION] {portal}: saved session could not be checked: {str(e)}")
+        logger.info(f"[SESSION] {portal}: saved session is no longer valid")
+        return False
+
+    def ensure(self, driver, portal: str, account: Optional[str], url: str,
+               probe: Callable, login: Callable) -> bool:
+        """Make sure driver is logged in, reusing a saved session when possible.
+
+        Args:
+            driver: Browser to log in.
+            portal: Short portal name, e.g. "nyc".
+            account: Login name; sessions are kept per portal and account.
+            url: Page of the portal's domain the cookies are restored on.
+            probe: probe(driver) returns True if the browser is logged in.
+                It should load a cheap authenticated page.
+            login: login(driver) performs the full login and returns True on
+                success. Exceptions are passed on.
+        """
+        if self._try_saved(driver, portal, account, url, probe):
+            self._count(portal, "skipped")
+            return True
+
+        checked = time.time()
+        with self.login_lock(portal, account):
+            # Another scraper or shard may have logged in while we waited
+            if self._try_saved(driver, portal, account, url, probe, saved_after=checked):
+                self._count(portal, "skipped")
+                return True
+
+            self.invalidate(portal, account)
+            try:
+                with get_metrics().span(LOGIN):
+                    logged_in = login(driver)
+            except Exception:
+                self._count(portal, "failed")
+                raise
+            if not logged_in:
+                self._count(portal, "failed")
+                return False
+            self._count(portal, "performed")
+            try:
+                self.save(driver, portal, account)
+            except Exception as e:
+                logger.warning(f"[SESSION] {portal}: could not save the session: {str(e)}")
+            return True
+
+    def summary(self) -> str:
+        with self._lock:
+            stats = {portal: dict(counts) for portal, counts in self.stats.items()}
+        parts = [
+            f"{portal}: {counts['skipped']} logins skipped, {counts['performed']} performed"
+            + (f", {counts['failed']} failed" if counts["failed"] else "")
+            for portal, counts in sorted(stats.items())
+        ]
+        return "[SESSION] " + ("; ".join(parts) if parts else "no logins")
+
+    def log_summary(self) -> None:
+        if self.stats:
+            logger.info(self.summary())
+
+
+_shared_vault: Optional[SessionVault] = None
+_shared_lock = threading.Lock()
+
+
+def get_session_vault() -> SessionVault:
+    """Return the process-wide session vault."""
+    global _shared_vault
+    with _shared_lock:
+        if _shared_vault is None:
+            _shared_vault = SessionVault()
+            atexit.register(_shared_vault.log_summary)
+        return _shared_vault
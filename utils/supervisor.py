@@ -0,0 +1,289 @@
+"""
+Runs scrapers as child processes and streams their output into logs.
+
+The master script and the dashboard used to start every scraper through a
+long inline PowerShell command in a new console window. The command used
+Start-Transcript for the log, regexes to color lines and window titles to
+show status. The launcher then polled the process every second, and the
+dashboard also polled for the _COMPLETED folder. It only worked on Windows,
+and every scraper also paid for a PowerShell and a console host.
+
+Supervisor starts scrapers directly with asyncio.create_subprocess_exec and
+reads their stdout and stderr through pipes. Each line is:
+- appended to the scraper's text log ("[HH:MM:SS] line", as before)
+- recorded in a JSON lines events file with its stream and level
+- passed to an optional on_line callback, e.g. to update a progress display
+
+The events file also records each start and exit with its return code and
+duration. A run that exceeds its timeout is stopped, first gently and then
+by force, together with its child processes (chromedriver, Chrome).
+
+Threaded callers use the blocking wrappers, which run on the supervisor's
+own event loop thread:
+
+    supervisor = Supervisor(events_file="2026-10-18/scrapers.jsonl")
+    result = supervisor.run_sync("scrapers/03_TXSMartBuy.py", ["--days", "2"], log_file=log_file)
+    if not result.ok:
+        ...
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import signal
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, only children on POSIX are found without it
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+STOP_GRACE = 10.0  # Seconds between the gentle stop and the kill
+READER_GRACE = 5.0  # Seconds to drain output held open by grandchildren after exit
+LINE_LIMIT = 1024 * 1024  # Longest line read from a scraper
+
+# Same rules the PowerShell launcher used to color lines
+LEVEL_PATTERNS = [
+    ("error", re.compile(r"^ERROR|FAILED|CRITICAL|^Traceback", re.IGNORECASE)),
+    ("warning", re.compile(r"^WARNING", re.IGNORECASE)),
+    ("success", re.compile(r"^SUCCESS|COMPLETED|✓", re.IGNORECASE)),
+]
+
+
+def classify_line(line: str) -> str:
+    """Level of an output line: error, warning, success or info."""
+    for level, pattern in LEVEL_PATTERNS:
+        if pattern.search(line):
+            return level
+    return "info"
+
+
+@dataclass
+class ScraperRun:
+    """Outcome of one scraper process."""
+
+    script: str
+    pid: Optional[int] = None
+    returncode: Optional[int] = None
+    started: float = 0.0
+    finished: float = 0.0
+    timed_out: bool = False
+    lines: int = 0
+    errors: int = 0
+    last_line: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+    @property
+    def seconds(self) -> float:
+        return (self.finished or time.time()) - self.started
+
+
+class Supervisor:
+    """Starts scraper processes and watches them until they exit.
+
+    Args:
+        python: Interpreter the scrapers run with, defaults to this one.
+        events_file: JSON lines file that receives every line and exit.
+        timeout: Default seconds a scraper may run, None for no limit.
+        env: Environment of the scrapers, defaults to this process's.
+        on_line: on_line(script, stream, level, line) called for every line.
+    """
+
+    def __init__(self, python: Optional[str] = None, events_file: Optional[str] = None,
+                 timeout: Optional[float] = None, env: Optional[Dict[str, str]] = None,
+                 on_line: Optional[Callable[[str, str, str, str], None]] = None):
+        self.python = python or sys.executable
+        self.events_file = events_file
+        self.timeout = timeout
+        self.env = env
+        self.on_line = on_line
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
+        self._events_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+    def _event(self, script: str, event: str, **fields) -> None:
+        if not self.events_file:
+            return
+        record = {"time": datetime.now().isoformat(timespec="milliseconds"), "script": script, "event": event}
+        record.update(fields)
+        with self._events_lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.events_file)), exist_ok=True)
+            with open(self.events_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _environment(self) -> Dict[str, str]:
+        env = dict(os.environ if self.env is None else self.env)
+        env["PYTHONUNBUFFERED"] = "1"
+        env["PYTHONIOENCODING"] = "utf-8"
+        return env
+
+    async def run(self, script: str, args: Sequence[str] = (), log_file: Optional[str] = None,
+                  timeout: Optional[float] = None) -> ScraperRun:
+        """Run a scraper to completion; returns its ScraperRun."""
+        timeout = self.timeout if timeout is None else timeout
+        run = ScraperRun(script, started=time.time())
+        process = await asyncio.create_subprocess_exec(
+            self.python, script, *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._environment(),
+            limit=LINE_LIMIT,
+            # Own process group, so a stop reaches chromedriver and Chrome too
+            start_new_session=os.name != "nt",
+        )
+        run.pid = process.pid
+        self.processes[script] = process
+        self._event(script, "start", pid=process.pid, args=list(args))
+        logger.info(f"[SUPERVISOR] started {script} (pid {process.pid})")
+
+        log = open(log_file, "a", encoding="utf-8") if log_file else None
+        try:
+            readers = asyncio.ensure_future(asyncio.gather(
+                self._pump(run, process.stdout, "stdout", log),
+                self._pump(run, process.stderr, "stderr", log),
+            ))
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
+                run.timed_out = True
+                self._event(script, "timeout", seconds=timeout)
+                logger.warning(f"[SUPERVISOR] {script} ran over {timeout:.0f}s, stopping it")
+                await self._stop(process)
+            try:
+                await asyncio.wait_for(readers, READER_GRACE)
+            except asyncio.TimeoutError:
+                # A grandchild kept the pipe open after the scraper exited
+                readers.cancel()
+        finally:
+            if log is not None:
+                log.close()
+            self.processes.pop(script, None)
+
+        run.returncode = process.returncode
+        run.finished = time.time()
+        self._event(
+            script, "exit", returncode=run.returncode, seconds=round(run.seconds, 1),
+            timed_out=run.timed_out, lines=run.lines, errors=run.errors,
+        )
+        logger.info(f"[SUPERVISOR] {script} exited with {run.returncode} after {run.seconds:.0f}s")
+        return run
+
+    async def _pump(self, run: ScraperRun, stream: asyncio.StreamReader, name: str, log) -> None:
+        while True:
+            try:
+                raw = await stream.readline()
+            except ValueError:
+                # Longer than LINE_LIMIT; take what is buffered
+                raw = await stream.read(LINE_LIMIT)
+            if not raw:
+                return
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            if not line:
+                continue
+            level = classify_line(line)
+            run.lines += 1
+            run.errors += level == "error"
+            run.last_line = line
+            if log is not None:
+                log.write(f"[{datetime.now():%H:%M:%S}] {line}\n")
+                log.flush()
+            self._event(run.script, "line", stream=name, level=level, message=line)
+            if self.on_line is not None:
+                try:
+                    self.on_line(run.script, name, level, line)
+                except Exception as e:
+                    logger.debug(f"[SUPERVISOR] on_line failed: {str(e)}")
+
+    async def _stop(self, process: asyncio.subprocess.Process) -> None:
+        """Stop a process and its children, killing them after STOP_GRACE."""
+        if process.returncode is not None:
+            return
+        _signal_tree(process.pid, kill=False)
+        try:
+            await asyncio.wait_for(process.wait(), STOP_GRACE)
+        except asyncio.TimeoutError:
+            _signal_tree(process.pid, kill=True)
+            await process.wait()
+
+    # Blocking wrappers for the threaded master script and dashboard
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="scraper-supervisor", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run_sync(self, script: str, args: Sequence[str] = (), log_file: Optional[str] = None,
+                 timeout: Optional[float] = None) -> ScraperRun:
+        """Run a scraper from any thread and block until it exits."""
+        future = asyncio.run_coroutine_threadsafe(self.run(script, args, log_file, timeout), self._ensure_loop())
+        return future.result()
+
+    def running(self) -> List[str]:
+        return list(self.processes)
+
+    def terminate(self, script: str, wait: bool = True) -> None:
+        """Stop a running scraper and its children."""
+        process = self.processes.get(script)
+        if process is None or self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._stop(process), self._loop)
+        if wait:
+            future.result(STOP_GRACE + 5)
+
+    def terminate_all(self) -> None:
+        for script in self.running():
+            self.terminate(script)
+
+    def close(self) -> None:
+        """Stop every scraper and the event loop thread."""
+        self.terminate_all()
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(5)
+                self._loop = None
+
+
+def _signal_tree(pid: int, kill: bool) -> None:
+    """Terminate (or kill) a process with its children."""
+    if os.name != "nt":
+        try:
+            os.killpg(pid, signal.SIGKILL if kill else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+        return
+
+    if psutil is None:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+        return
+    try:
+        parent = psutil.Process(pid)
+        for process in parent.children(recursive=True) + [parent]:
+            try:
+                (process.kill if kill else process.terminate)()
+            except psutil.NoSuchProcess:
+                pass
+    except psutil.NoSuchProcess:
+        pass
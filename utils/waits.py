@@ -0,0 +1,397 @@
+"""
+Condition-based waits to use in place of fixed ``time.sleep`` calls.
+
+Most sleeps on the scrapers' hot path wait for something the browser can
+report directly: network traffic settling after a click, the DOM stopping
+changing after an AJAX update, an element becoming visible and holding still
+after a scroll, or a download finishing. This module provides those checks:
+
+- ``network_idle``: no requests in flight for a quiet period, read from the
+  CDP ``Network`` events in Chrome's performance log (enable it with
+  ``enable_network_events``). Drivers without the log fall back to counting
+  fetch/XHR calls and resource entries from page JavaScript.
+- ``dom_quiet``: no DOM mutations for a quiet period (``MutationObserver``).
+- ``element_ready`` / ``element_stable``: element state predicates.
+- ``wait_until`` with ``folder_changed`` / ``downloads_finished`` for files.
+- ``pace``: a jittered minimum delay, only where a portal's anti-bot checks
+  need human-like pacing.
+
+Every wait takes ``replaces``, the length of the fixed sleep it stands in for,
+and by default never waits longer than that. The time saved is accumulated per
+scraper and logged when the process exits (``[WAIT]`` lines), or on demand with
+``log_summary``.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import random
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from utils.download_slots import PARTIAL_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.2
+QUIET_PERIOD = 0.5  # Seconds without network or DOM activity that count as settled
+STALE_REQUEST_AGE = 15  # Requests open this long (long polling, beacons) are ignored
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict] = {}
+_scraper_name: Optional[str] = None
+_report_registered = False
+
+
+def set_scraper(name: str) -> None:
+    """Name the scraper that waits are recorded under (defaults to the script name)."""
+    global _scraper_name
+    _scraper_name = name
+
+
+def scraper_name() -> str:
+    if _scraper_name:
+        return _scraper_name
+    script = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else ""
+    return os.path.splitext(script)[0] or "python"
+
+
+def _record(label: str, replaces: Optional[float], waited: float, paced: float = 0.0) -> None:
+    global _report_registered
+    with _stats_lock:
+        stats = _stats.setdefault(
+            scraper_name(), {"waits": 0, "replaced": 0.0, "waited": 0.0, "paced": 0.0, "labels": {}}
+        )
+        if replaces is not None:
+            stats["waits"] += 1
+            stats["replaced"] += replaces
+            stats["waited"] += waited
+            by_label = stats["labels"].setdefault(label or "wait", {"waits": 0, "replaced": 0.0, "waited": 0.0})
+            by_label["waits"] += 1
+            by_label["replaced"] += replaces
+            by_label["waited"] += waited
+        stats["paced"] += paced
+        if not _report_registered:
+            atexit.register(log_summary)
+            _report_registered = True
+
+
+def summary() -> Dict[str, Dict]:
+    """Per-scraper totals, with ``avoided`` = fixed sleep time minus time actually waited."""
+    with _stats_lock:
+        result = json.loads(json.dumps(_stats))
+    for stats in result.values():
+        stats["avoided"] = stats["replaced"] - stats["waited"]
+        for by_label in stats["labels"].values():
+            by_label["avoided"] = by_label["replaced"] - by_label["waited"]
+    return result
+
+
+def log_summary() -> None:
+    """Log how much fixed sleep time each scraper avoided in this run."""
+    for name, stats in summary().items():
+        logger.info(
+            f"[WAIT] {name}: {stats['waits']} waits replaced {stats['replaced']:.1f}s of fixed sleeps "
+            f"with {stats['waited']:.1f}s of waiting ({stats['avoided']:.1f}s avoided), "
+            f"{stats['paced']:.1f}s anti-bot pacing"
+        )
+        for label, by_label in sorted(stats["labels"].items(), key=lambda item: -item[1]["avoided"]):
+            logger.info(
+                f"[WAIT]   {label}: {by_label['waits']} x, {by_label['avoided']:.1f}s avoided"
+            )
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def wait_until(
+    condition: Callable[[], object],
+    timeout: Optional[float] = None,
+    replaces: Optional[float] = None,
+    label: str = "",
+    poll: float = POLL_INTERVAL,
+):
+    """Poll condition until it returns something truthy.
+
+    Unlike WebDriverWait this does not raise on timeout: it returns None, so it
+    can replace a sleep without changing what happens afterwards. Exceptions
+    from the condition (stale elements, a page mid-navigation) count as not
+    ready yet.
+
+    Args:
+        condition: Zero-argument callable.
+        timeout: Seconds to wait at most; defaults to replaces.
+        replaces: Length of the fixed sleep this wait replaces, for the report.
+        label: Name of the wait in the report.
+        poll: Seconds between checks.
+
+    Returns:
+        The condition's truthy result, or None on timeout.
+    """
+    if timeout is None:
+        timeout = replaces if replaces is not None else 30
+    start = time.monotonic()
+    deadline = start + timeout
+    result = None
+    last_error = None
+    while True:
+        try:
+            result = condition()
+        except Exception as e:
+            result, last_error = None, e
+        if result or time.monotonic() >= deadline:
+            break
+        time.sleep(min(poll, max(deadline - time.monotonic(), 0)))
+
+    waited = time.monotonic() - start
+    if not result:
+        result = None
+        reason = f" (last error: {last_error})" if last_error else ""
+        logger.debug(f"[WAIT] {label or 'wait'} not met after {waited:.1f}s{reason}")
+    _record(label, replaces, waited)
+    return result
+
+
+def pace(min_seconds: float, max_seconds: float, since: Optional[float] = None) -> float:
+    """Sleep a jittered minimum between actions for portals with anti-bot checks.
+
+    With since (a time.monotonic() timestamp, e.g. taken before driver.get),
+    only the part of the delay not already spent since then is slept, so slow
+    page loads count toward the pause.
+
+    Returns:
+        float: Seconds actually slept.
+    """
+    delay = random.uniform(min_seconds, max_seconds)
+    if since is not None:
+        delay -= time.monotonic() - since
+    delay = max(delay, 0.0)
+    if delay:
+        time.sleep(delay)
+    _record("pace", None, 0.0, paced=delay)
+    return delay
+
+
+def enable_network_events(options) -> None:
+    """Turn on Chrome's performance log so network_idle can read CDP Network events."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+NETWORK_METHODS_STARTED = ("Network.requestWillBeSent",)
+NETWORK_METHODS_FINISHED = ("Network.loadingFinished", "Network.loadingFailed")
+
+
+def _drain_network_events(driver) -> Optional[bool]:
+    """Update the driver's in-flight request table from the performance log.
+
+    Returns True if any network event arrived, False if none did, and None if
+    the driver has no performance log.
+    """
+    if getattr(driver, "_wait_network_log", True) is False:
+        return None
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        driver._wait_network_log = False
+        logger.debug("[WAIT] Performance log unavailable, using the page script for network idle")
+        return None
+    driver._wait_network_log = True
+
+    inflight = driver.__dict__.setdefault("_wait_inflight", {})
+    seen = False
+    now = time.monotonic()
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get("method", "")
+        if not method.startswith("Network."):
+            continue
+        seen = True
+        request_id = message.get("params", {}).get("requestId")
+        if method in NETWORK_METHODS_STARTED:
+            inflight[request_id] = now
+        elif method in NETWORK_METHODS_FINISHED:
+            inflight.pop(request_id, None)
+
+    for request_id, started in list(inflight.items()):
+        if now - started > STALE_REQUEST_AGE:
+            del inflight[request_id]
+    return seen
+
+
+# Counts fetch/XHR calls made after it is first run, for drivers without the
+# performance log. Resource entries catch requests made before that.
+PAGE_ACTIVITY_SCRIPT = """
+if (!window.__waitPending) {
+    window.__waitPending = {count: 0};
+    const pending = window.__waitPending;
+    const done = () => { pending.count = Math.max(pending.count - 1, 0); };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function() {
+            pending.count++;
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        pending.count++;
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+}
+return {
+    ready: document.readyState,
+    pending: window.__waitPending.count + (window.jQuery ? jQuery.active : 0),
+    resources: performance.getEntriesByType('resource').length
+};
+"""
+
+
+def network_idle(
+    driver,
+    timeout: Optional[float] = None,
+    replaces: Optional[float] = None,
+    quiet: float = QUIET_PERIOD,
+    label: str = "network idle",
+) -> bool:
+    """Wait until the page has loaded and no requests were in flight for quiet seconds."""
+    state = {"quiet_since": time.monotonic(), "resources": None}
+
+    def idle():
+        now = time.monotonic()
+        activity = driver.execute_script(PAGE_ACTIVITY_SCRIPT)
+        busy = activity["ready"] != "complete" or activity["pending"] > 0
+
+        seen = _drain_network_events(driver)
+        if seen is None:
+            # No performance log: new resource entries count as traffic
+            busy = busy or activity["resources"] != state["resources"]
+            state["resources"] = activity["resources"]
+        else:
+            busy = busy or seen or bool(driver._wait_inflight)
+
+        if busy:
+            state["quiet_since"] = now
+            return False
+        return now - state["quiet_since"] >= quiet
+
+    return bool(wait_until(idle, timeout, replaces, label))
+
+
+# Records the time of the last DOM mutation on the page
+DOM_ACTIVITY_SCRIPT = """
+if (!window.__waitLastMutation) {
+    window.__waitLastMutation = performance.now();
+    new MutationObserver(() => { window.__waitLastMutation = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__waitLastMutation;
+"""
+
+
+def dom_quiet(
+    driver,
+    timeout: Optional[float] = None,
+    replaces: Optional[float] = None,
+    quiet: float = QUIET_PERIOD,
+    label: str = "dom quiet",
+) -> bool:
+    """Wait until the DOM has not changed for quiet seconds."""
+    # The first call only installs the observer, so the page must then stay quiet
+    state = {"installed": False}
+
+    def settled():
+        idle_ms = driver.execute_script(DOM_ACTIVITY_SCRIPT)
+        if not state["installed"]:
+            state["installed"] = True
+            return False
+        return idle_ms >= quiet * 1000
+
+    return bool(wait_until(settled, timeout, replaces, label))
+
+
+def element_ready(
+    driver,
+    locator: Tuple[str, str],
+    timeout: Optional[float] = None,
+    replaces: Optional[float] = None,
+    clickable: bool = False,
+    label: str = "",
+):
+    """Wait for an element to be displayed (and enabled if clickable); returns it or None."""
+
+    def ready():
+        for element in driver.find_elements(*locator):
+            if element.is_displayed() and (not clickable or element.is_enabled()):
+                return element
+        return None
+
+    return wait_until(ready, timeout, replaces, label or f"element {locator[1]}")
+
+
+def element_stable(
+    driver,
+    element,
+    timeout: Optional[float] = None,
+    replaces: Optional[float] = None,
+    label: str = "element stable",
+) -> bool:
+    """Wait until an element is displayed and its position stops changing (e.g. after a scroll)."""
+    state = {"rect": None}
+
+    def stable():
+        if not element.is_displayed():
+            return False
+        rect = driver.execute_script(
+            "const r = arguments[0].getBoundingClientRect(); return [r.x, r.y, r.width, r.height];",
+            element,
+        )
+        previous, state["rect"] = state["rect"], rect
+        return rect == previous
+
+    return bool(wait_until(stable, timeout, replaces, label))
+
+
+def _listing(folder: str, ignore: Iterable[str] = ()) -> set:
+    try:
+        return {name for name in os.listdir(folder) if name not in ignore}
+    except FileNotFoundError:
+        return set()
+
+
+def folder_changed(folder: str, ignore: Iterable[str] = ()) -> Callable[[], bool]:
+    """Condition that turns true once files appear in or leave folder (e.g. a download starts)."""
+    ignore = tuple(ignore)
+    before = _listing(folder, ignore)
+    return lambda: _listing(folder, ignore) != before
+
+
+def downloads_finished(
+    folder: str, prefix: Optional[str] = None, ignore: Iterable[str] = ()
+) -> Callable[[], bool]:
+    """Condition that turns true when folder holds a finished download and nothing partial.
+
+    prefix limits the finished file to names starting with it (case-insensitive).
+    Partial files count regardless of prefix, since Chrome may name them
+    "Unconfirmed 1234.crdownload".
+    """
+    ignore = tuple(ignore)
+
+    def finished():
+        names = _listing(folder, ignore)
+        if any(name.endswith(PARTIAL_SUFFIXES) for name in names):
+            return False
+        if prefix:
+            names = {name for name in names if name.lower().startswith(prefix.lower())}
+        return bool(names)
+
+    return finished
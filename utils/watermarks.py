@@ -0,0 +1,155 @@
+"""
+Per-source high-water marks for incremental listing crawls.
+
+A watermark records, per source and tenant, the newest posted date a run has
+scraped and the ids of the bids seen on that date. The next run's
+``DateWindow`` treats rows older than the mark, and rows on the mark's date
+whose id was already seen, as done. On a listing sorted newest first the
+crawl then stops at the mark, so the daily cost follows the number of new
+bids rather than the ``--days`` look-back.
+
+The mark only moves when a run saves it after processing its bids. It never
+passes a bid that failed (``hold``) and never moves back. ``--full-rescan``
+(or ``BIDS_FULL_RESCAN=1``, which the master script sets for every scraper)
+ignores the stored mark for recovery and stores a fresh one at the end of
+the run.
+
+Marks are kept in ``watermarks/<source>.json`` in the project root, or
+``$BIDS_WATERMARK_DIR``.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import date
+from typing import Dict, Optional, Set
+
+from utils.listing import parse_listing_date
+
+logger = logging.getLogger(__name__)
+
+FOLDER_ENV_VAR = "BIDS_WATERMARK_DIR"
+FULL_RESCAN_ENV_VAR = "BIDS_FULL_RESCAN"
+DEFAULT_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "watermarks")
+
+# Tenants of one source may run on several threads and share its file
+_file_lock = threading.Lock()
+
+
+def full_rescan_requested(flag: bool = False) -> bool:
+    """True if --full-rescan was passed or BIDS_FULL_RESCAN is set."""
+    return flag or os.environ.get(FULL_RESCAN_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+class Watermark:
+    """High-water mark of one listing.
+
+    Args:
+        source: Scraper name, one file per source.
+        tenant: Portal or agency within the source ("" for single-site scrapers).
+        folder: Where marks are stored, defaults to watermarks/.
+        full_rescan: Ignore the stored mark for this run.
+    """
+
+    def __init__(self, source: str, tenant: str = "", folder: Optional[str] = None, full_rescan: bool = False):
+        self.source = source
+        self.tenant = tenant
+        self.folder = folder or os.environ.get(FOLDER_ENV_VAR) or DEFAULT_FOLDER
+        self.full_rescan = full_rescan_requested(full_rescan)
+        self.date: Optional[date] = None
+        self.ids: Set[str] = set()
+        self._processed: Dict[date, Set[str]] = {}
+        self._held: Optional[date] = None
+        self._lock = threading.Lock()
+        if not self.full_rescan:
+            self._load()
+
+    @property
+    def path(self) -> str:
+        safe_source = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.source)
+        return os.path.join(self.folder, f"{safe_source}.json")
+
+    def _read_all(self) -> Dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _load(self) -> None:
+        with _file_lock:
+            mark = self._read_all().get(self.tenant)
+        if mark:
+            self.date = parse_listing_date(mark.get("date"))
+            self.ids = set(mark.get("ids", []))
+
+    def covers(self, posted, row_id: Optional[str] = None) -> bool:
+        """True if a row was scraped by an earlier run.
+
+        Rows older than the mark are covered. Rows on the mark's date are
+        covered only when their id was seen, since more bids can be posted
+        later on the same day.
+        """
+        posted = parse_listing_date(posted)
+        if self.full_rescan or self.date is None or posted is None:
+            return False
+        if posted < self.date:
+            return True
+        return posted == self.date and row_id is not None and str(row_id) in self.ids
+
+    def advance(self, posted, row_id: Optional[str] = None) -> None:
+        """Record a processed row; the mark moves when save() is called."""
+        posted = parse_listing_date(posted)
+        if posted is None:
+            return
+        with self._lock:
+            ids = self._processed.setdefault(posted, set())
+            if row_id is not None:
+                ids.add(str(row_id))
+
+    def hold(self, posted) -> None:
+        """Keep the mark from passing a row that failed, so it is tried again."""
+        posted = parse_listing_date(posted)
+        if posted is None:
+            return
+        with self._lock:
+            if self._held is None or posted < self._held:
+                self._held = posted
+
+    def save(self) -> None:
+        """Store the newest processed date; the mark never moves back."""
+        with self._lock:
+            dates = [d for d in self._processed if self._held is None or d <= self._held]
+            if not dates:
+                return
+            new_date = max(dates)
+            new_ids = set(self._processed[new_date])
+
+        with _file_lock:
+            marks = self._read_all()
+            stored = marks.get(self.tenant) or {}
+            stored_date = parse_listing_date(stored.get("date"))
+            if stored_date is not None and new_date < stored_date:
+                logger.info(f"[WATERMARK] {self.source} {self.tenant}: kept {stored_date}, newer than {new_date}")
+                return
+            if stored_date == new_date:
+                new_ids |= set(stored.get("ids", []))
+            marks[self.tenant] = {"date": new_date.isoformat(), "ids": sorted(new_ids), "updated": time.time()}
+
+            os.makedirs(self.folder, exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(marks, f, indent=2)
+            os.replace(temp_path, self.path)
+
+        self.date, self.ids = new_date, new_ids
+        logger.info(f"[WATERMARK] {self.source} {self.tenant}: moved to {new_date} ({len(new_ids)} ids on that date)")
+
+    def describe(self) -> str:
+        if self.full_rescan:
+            return "full rescan"
+        if self.date is None:
+            return "no watermark yet"
+        return f"watermark {self.date} ({len(self.ids)} ids)"